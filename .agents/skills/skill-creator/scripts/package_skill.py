@@ -2,27 +2,160 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+The archive is deterministic: entries are sorted, timestamps and permissions
+are fixed, so packaging an unchanged skill gives a byte-identical file. Entries
+are compressed in parallel; already-compressed files (images, archives, fonts)
+are stored as-is. Each entry records the SHA-256 of its content, so repacking
+copies the compressed bytes of unchanged files straight from the previous
+archive and only recompresses what changed.
+
+With --all, every skill under the skill roots of a repository (``skills/``
+and ``.<agent>/skills/``, e.g. .agents, .codex, .cursor, .github) is packaged
+concurrently into one directory. Mirrored skills are symlinks to the same
+folder, so skills are deduplicated by their resolved path.
+
 Usage:
     python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py --all <output-directory> [repository-root]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py --all ./dist
 """
 
+import hashlib
+import os
+import struct
 import sys
+import time
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from quick_validate import validate_skill
+from quick_validate import validate_skill, validate_skills
+
+# Formats that are already compressed: deflating them again only costs time
+STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".ico",
+    ".zip", ".gz", ".br", ".bz2", ".xz", ".7z", ".skill",
+    ".woff", ".woff2", ".mp3", ".mp4", ".ogg", ".webm", ".pdf",
+}
+COMPRESS_LEVEL = 9
+DOS_DATE = (0 << 9) | (1 << 5) | 1  # 1980-01-01, the earliest zip timestamp
+DOS_TIME = 0
+SHA256_EXTRA_ID = 0x6873  # private extra field in the central directory: content SHA-256
+
+SKILL_ROOT_PATTERNS = ("skills", ".*/skills")
+
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+
+
+def collect_files(skill_path):
+    """Files of a skill as sorted (arcname, path) pairs; arcnames include the skill folder."""
+    files = [p for p in skill_path.rglob("*") if p.is_file()]
+    return sorted((p.relative_to(skill_path.parent).as_posix(), p) for p in files)
+
+
+def _member(path, previous):
+    """
+    Compressed member of one file, taken from ``previous`` when its content is unchanged.
+
+    Returns:
+        (data, sha256, crc, size, method, reused)
+    """
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).digest()
+    method = zipfile.ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+    if digest in previous and previous[digest][0] == method:
+        _, crc, size, data = previous[digest]
+        return data, digest, crc, size, method, True
+
+    data = raw
+    if method == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+        data = compressor.compress(raw) + compressor.flush()
+    return data, digest, zlib.crc32(raw), len(raw), method, False
+
+
+def _previous_members(archive):
+    """Map content SHA-256 -> (method, crc, size, compressed bytes) of an existing archive."""
+    members = {}
+    if not archive.exists():
+        return members
+    try:
+        with zipfile.ZipFile(archive) as zipf, archive.open("rb") as raw:
+            for info in zipf.infolist():
+                extra = info.extra
+                if len(extra) < 36 or struct.unpack("<2H", extra[:4]) != (SHA256_EXTRA_ID, 32):
+                    continue
+                raw.seek(info.header_offset)
+                header = LOCAL_HEADER.unpack(raw.read(LOCAL_HEADER.size))
+                raw.seek(header[-2] + header[-1], os.SEEK_CUR)
+                members[extra[4:36]] = (info.compress_type, info.CRC, info.file_size, raw.read(info.compress_size))
+    except (zipfile.BadZipFile, OSError, struct.error):
+        return {}
+    return members
+
 
+def _mode(path):
+    return 0o755 if os.access(path, os.X_OK) else 0o644
 
-def package_skill(skill_path, output_dir=None):
+
+def write_archive(skill_path, skill_filename, workers=None):
+    """
+    Write the .skill archive, reusing unchanged members of the previous one.
+
+    Returns:
+        Dict with the number of files, reused members and archive size
+    """
+    files = collect_files(skill_path)
+    previous = _previous_members(skill_filename)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        entries = list(pool.map(lambda item: _member(item[1], previous), files))
+
+    tmp = skill_filename.with_name(skill_filename.name + ".tmp")
+    central = []
+    with tmp.open("wb") as out:
+        for (arcname, path), (data, digest, crc, size, method, _) in zip(files, entries):
+            name = arcname.encode("utf-8")
+            flags = 0x800 if not name.isascii() else 0
+            offset = out.tell()
+            out.write(LOCAL_HEADER.pack(
+                b"PK\x03\x04", 20, 0, flags, method, DOS_TIME, DOS_DATE, crc, len(data), size, len(name), 0
+            ))
+            out.write(name)
+            out.write(data)
+            extra = struct.pack("<2H", SHA256_EXTRA_ID, 32) + digest
+            central.append(CENTRAL_HEADER.pack(
+                b"PK\x01\x02", 20, 3, 20, 0, flags, method, DOS_TIME, DOS_DATE, crc, len(data), size,
+                len(name), len(extra), 0, 0, 0, (0o100000 | _mode(path)) << 16, offset,
+            ) + name + extra)
+        if out.tell() > 0xFFFFFFFF or len(central) > 0xFFFF:
+            raise ValueError("Skill is too large for a .skill archive (zip64 is not supported)")
+        start = out.tell()
+        out.write(b"".join(central))
+        out.write(END_RECORD.pack(b"PK\x05\x06", 0, 0, len(central), len(central), out.tell() - start, start, 0))
+    os.replace(tmp, skill_filename)
+
+    return {
+        "files": [arcname for arcname, _ in files],
+        "reused": [arcname for (arcname, _), e in zip(files, entries) if e[-1]],
+        "bytes": skill_filename.stat().st_size,
+    }
+
+
+def package_skill(skill_path, output_dir=None, workers=None):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        workers: Compression threads (defaults to the number of CPUs)
 
     Returns:
         Path to the created .skill file, or None if error
@@ -65,16 +198,17 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        start = time.perf_counter()
+        result = write_archive(skill_path, skill_filename, workers)
+        reused = set(result["reused"])
+        for arcname in result["files"]:
+            print(f"  {'Reused' if arcname in reused else 'Added'}: {arcname}")
+
+        print(
+            f"\n✅ Successfully packaged skill to: {skill_filename} "
+            f"({len(result['files'])} files, {len(reused)} reused, {result['bytes']:,} bytes, "
+            f"{time.perf_counter() - start:.2f}s)"
+        )
         return skill_filename
 
     except Exception as e:
@@ -82,12 +216,91 @@ def package_skill(skill_path, output_dir=None):
         return None
 
 
+def discover_skills(root):
+    """
+    Find every skill below the skill roots of a repository, once per real folder.
+
+    Returns:
+        Dict of resolved skill folder -> sorted paths it is reachable under
+    """
+    root = Path(root)
+    skills = {}
+    for pattern in SKILL_ROOT_PATTERNS:
+        for skill_root in root.glob(pattern):
+            for candidate in skill_root.iterdir() if skill_root.is_dir() else []:
+                if (candidate / "SKILL.md").is_file():
+                    skills.setdefault(candidate.resolve(), []).append(candidate)
+    return {real: sorted(paths) for real, paths in sorted(skills.items())}
+
+
+def package_all(root, output_dir, workers=None):
+    """
+    Validate and package every skill of a repository concurrently into ``output_dir``.
+
+    Returns:
+        One result dict per skill: name, path, aliases, files, reused, bytes, seconds, error
+    """
+    skills = discover_skills(root)
+    output_path = Path(output_dir).resolve()
+    output_path.mkdir(parents=True, exist_ok=True)
+    cpus = os.cpu_count() or 1
+    outer = max(1, min(len(skills), workers or cpus))
+
+    names = {}
+    for real in skills:
+        names.setdefault(real.name, []).append(real)
+    validation = {Path(r["path"]): r for r in validate_skills(skills)}
+
+    def package_one(real):
+        result = {"name": real.name, "path": str(real), "aliases": [str(p) for p in skills[real]],
+                  "files": 0, "reused": 0, "bytes": 0, "seconds": 0.0, "error": None}
+        start = time.perf_counter()
+        try:
+            if len(names[real.name]) > 1:
+                raise ValueError(f"another skill is also named {real.name}")
+            if not validation[real]["valid"]:
+                raise ValueError(validation[real]["message"])
+            archive = write_archive(real, output_path / f"{real.name}.skill", max(1, cpus // outer))
+            result.update(files=len(archive["files"]), reused=len(archive["reused"]), bytes=archive["bytes"])
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=outer) as pool:
+        return list(pool.map(package_one, skills))
+
+
+def print_summary(results, elapsed):
+    """Print a table of packaged skills with sizes and timings."""
+    print(f"{'Skill':<32} {'Files':>6} {'Reused':>7} {'Size':>12} {'Time':>7}  Copies")
+    for r in results:
+        status = f"❌ {r['error']}" if r["error"] else str(len(r["aliases"]))
+        print(f"{r['name']:<32} {r['files']:>6} {r['reused']:>7} {r['bytes']:>12,} {r['seconds']:>6.2f}s  {status}")
+    ok = [r for r in results if not r["error"]]
+    print(
+        f"\n{len(ok)}/{len(results)} skills packaged, {sum(r['bytes'] for r in ok):,} bytes, "
+        f"{sum(len(r['aliases']) - 1 for r in results)} mirrored copies skipped, {elapsed:.2f}s"
+    )
+
+
 def main():
-    if len(sys.argv) < 2:
+    if len(sys.argv) >= 3 and sys.argv[1] == "--all":
+        root = sys.argv[3] if len(sys.argv) > 3 else "."
+        print(f"📦 Packaging all skills under: {Path(root).resolve()}")
+        print(f"   Output directory: {sys.argv[2]}\n")
+        start = time.perf_counter()
+        results = package_all(root, sys.argv[2])
+        print_summary(results, time.perf_counter() - start)
+        sys.exit(0 if results and not any(r["error"] for r in results) else 1)
+
+    if len(sys.argv) < 2 or sys.argv[1] == "--all":
         print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+        print("       python utils/package_skill.py --all <output-directory> [repository-root]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
+        print("  python utils/package_skill.py --all ./dist")
         sys.exit(1)
 
     skill_path = sys.argv[1]
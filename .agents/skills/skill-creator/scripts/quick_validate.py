@@ -1,43 +1,64 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Checks the SKILL.md frontmatter and that the references/ and scripts/ files
+mentioned in its body exist. Parse results are cached by the SKILL.md content
+hash (in SKILL_VALIDATE_CACHE, default ~/.cache/skill-creator/validate.json),
+so unchanged skills are not parsed again; the file checks always run.
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py --json <skill_directory> [<skill_directory> ...]
 """
 
 import sys
 import os
 import re
+import json
+import hashlib
 import yaml
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+# Bump when the rules change so cached results are not reused
+VALIDATOR_VERSION = 2
+CACHE_FILE = Path(
+    os.environ.get("SKILL_VALIDATE_CACHE", Path.home() / ".cache" / "skill-creator" / "validate.json")
+)
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
-    skill_path = Path(skill_path)
+# Paths into the bundled resource folders, outside code spans and fenced blocks
+REFERENCE_PATTERN = re.compile(r"(?<![\w./-])((?:references|scripts)/[\w./-]*[\w])")
+CODE_PATTERN = re.compile(r"```.*?```|`[^`\n]*`", re.DOTALL)
+
+_memory_cache = {}
 
-    # Check SKILL.md exists
-    skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
+def check_skill_md(content):
+    """
+    Validate the content of a SKILL.md (no file system access).
+
+    Returns:
+        (valid, message, referenced resource paths)
+    """
     if not content.startswith("---"):
-        return False, "No YAML frontmatter found"
+        return False, "No YAML frontmatter found", []
 
     # Extract frontmatter
     match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
     if not match:
-        return False, "Invalid frontmatter format"
+        return False, "Invalid frontmatter format", []
 
     frontmatter_text = match.group(1)
+    references = sorted(set(REFERENCE_PATTERN.findall(CODE_PATTERN.sub("", content[match.end():]))))
 
     # Parse YAML frontmatter
     try:
         frontmatter = yaml.safe_load(frontmatter_text)
         if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
+            return False, "Frontmatter must be a YAML dictionary", references
     except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        return False, f"Invalid YAML in frontmatter: {e}", references
 
     # Define allowed properties
     ALLOWED_PROPERTIES = {"name", "description", "license", "allowed-tools", "metadata"}
@@ -48,50 +69,146 @@ def validate_skill(skill_path):
         return False, (
             f"Unexpected key(s) in SKILL.md frontmatter: {', '.join(sorted(unexpected_keys))}. "
             f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
-        )
+        ), references
 
     # Check required fields
     if "name" not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        return False, "Missing 'name' in frontmatter", references
     if "description" not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        return False, "Missing 'description' in frontmatter", references
 
     # Extract name for validation
     name = frontmatter.get("name", "")
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        return False, f"Name must be a string, got {type(name).__name__}", references
     name = name.strip()
     if name:
         # Check naming convention (hyphen-case: lowercase with hyphens)
         if not re.match(r"^[a-z0-9-]+$", name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
+            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)", references
         if name.startswith("-") or name.endswith("-") or "--" in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
+            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens", references
         # Check name length (max 64 characters per spec)
         if len(name) > 64:
-            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters."
+            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters.", references
 
     # Extract and validate description
     description = frontmatter.get("description", "")
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        return False, f"Description must be a string, got {type(description).__name__}", references
     description = description.strip()
     if description:
         # Check for angle brackets
         if "<" in description or ">" in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+            return False, "Description cannot contain angle brackets (< or >)", references
         # Check description length (max 1024 characters per spec)
         if len(description) > 1024:
-            return False, f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            return False, (
+                f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            ), references
+
+    return True, "Skill is valid!", references
+
+
+def _cache_key(content):
+    return f"{VALIDATOR_VERSION}:{hashlib.sha256(content.encode()).hexdigest()}"
 
-    return True, "Skill is valid!"
+
+def _load_cache():
+    if not _memory_cache and CACHE_FILE.exists():
+        try:
+            _memory_cache.update(json.loads(CACHE_FILE.read_text()))
+        except (OSError, ValueError):
+            pass
+    return _memory_cache
+
+
+def _save_cache():
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(_memory_cache, sort_keys=True))
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass  # caching is an optimization only
+
+
+def _finish(skill_path, parsed, cached):
+    """Combine a (cached) parse result with the checks against the skill folder."""
+    valid, message, references = parsed
+    missing = [ref for ref in references if not (skill_path / ref).exists()]
+    if valid and missing:
+        valid, message = False, f"Referenced file(s) not found: {', '.join(missing)}"
+    return {
+        "path": str(skill_path),
+        "name": skill_path.name,
+        "valid": valid,
+        "message": message,
+        "references": references,
+        "missing_references": missing,
+        "cached": cached,
+    }
+
+
+def validate_skills(skill_paths, workers=None):
+    """
+    Validate many skills; SKILL.md files are parsed in parallel unless cached.
+
+    Args:
+        skill_paths: Skill directories
+        workers: Parser processes (defaults to the number of CPUs)
+
+    Returns:
+        One result dict per skill, in input order
+    """
+    skill_paths = [Path(p) for p in skill_paths]
+
+    def read(skill_path):
+        skill_md = skill_path / "SKILL.md"
+        return skill_md.read_text() if skill_md.is_file() else None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        contents = list(pool.map(read, skill_paths))
+
+    cache = _load_cache()
+    keys = [_cache_key(c) if c is not None else None for c in contents]
+    misses = {key: content for key, content in zip(keys, contents) if key is not None and key not in cache}
+    if len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(misses), workers or os.cpu_count() or 1)) as pool:
+            parsed = dict(zip(misses, pool.map(check_skill_md, misses.values())))
+    else:
+        parsed = {key: check_skill_md(content) for key, content in misses.items()}
+    if parsed:
+        cache.update({key: list(result) for key, result in parsed.items()})
+        _save_cache()
+
+    results = []
+    for skill_path, key in zip(skill_paths, keys):
+        if key is None:
+            results.append(_finish(skill_path, (False, "SKILL.md not found", []), False))
+        else:
+            results.append(_finish(skill_path, cache[key], key not in parsed))
+    return results
+
+
+def validate_skill(skill_path):
+    """Basic validation of a skill"""
+    result = validate_skills([skill_path])[0]
+    return result["valid"], result["message"]
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+    if args and args[0] == "--json":
+        results = validate_skills(args[1:])
+        print(json.dumps(results, indent=2))
+        sys.exit(0 if results and all(r["valid"] for r in results) else 1)
+
+    if len(args) != 1:
         print("Usage: python quick_validate.py <skill_directory>")
+        print("       python quick_validate.py --json <skill_directory> [<skill_directory> ...]")
         sys.exit(1)
 
-    valid, message = validate_skill(sys.argv[1])
+    valid, message = validate_skill(args[0])
     print(message)
     sys.exit(0 if valid else 1)
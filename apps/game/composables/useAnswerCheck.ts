@@ -18,8 +18,25 @@ let categoriesCache: Category[] | null = null
 let categoriesCacheTime = 0
 const CATEGORIES_CACHE_DURATION_MS = 5 * 60 * 1000 // 5 minutes
 
+// Per-letter answer shards written by tools/python/answer_bundle.py (absent in dev until compiled)
+const ANSWER_SHARDS_BASE = '/data/answers/'
+
+interface AnswerIndex {
+  version: number
+  shardBy: 'letter' | 'category'
+  source?: string
+  categories: Record<string, { path: string; letters: string }>
+}
+
+let answerIndexPromise: Promise<AnswerIndex | null> | null = null
+
 export function useAnswerCheck() {
   const logger = useLogger()
+  // Set at build time only when the shards match this build's offlineAnswers.json (nuxt.config.ts)
+  const answerBundleSource: string =
+    typeof useRuntimeConfig !== 'undefined'
+      ? String(useRuntimeConfig().public.answerBundleSource || '')
+      : ''
 
   async function searchPetScan(category: string): Promise<string[]> {
     try {
@@ -67,7 +84,48 @@ export function useAnswerCheck() {
 
   type OfflineAnswers = Record<string, Record<string, string[]>>
 
+  function loadAnswerIndex(): Promise<AnswerIndex | null> {
+    if (!answerBundleSource) {
+      return Promise.resolve(null) // no bundle compiled from this build's answers: nothing to request
+    }
+    if (!answerIndexPromise) {
+      answerIndexPromise = $fetch<AnswerIndex>(`${ANSWER_SHARDS_BASE}index.json`)
+        // An index from another build (stale CDN copy, partial deploy) points at other answers
+        .then((index) => (index.source === answerBundleSource ? index : null))
+        .catch((error: unknown) => {
+          answerIndexPromise = null // retry on the next check instead of caching the failure
+          throw error
+        })
+    }
+    return answerIndexPromise
+  }
+
+  async function searchOfflineShard(category: string, letter: string): Promise<string[] | null> {
+    const index = await loadAnswerIndex()
+    const entry = index?.categories?.[category]
+    if (!index || !entry) {
+      return null
+    }
+    if (!entry.letters.includes(letter)) {
+      return []
+    }
+    if (index.shardBy === 'letter') {
+      return await $fetch<string[]>(`${ANSWER_SHARDS_BASE}${entry.path}/${letter}.json`)
+    }
+    const shard = await $fetch<Record<string, string[]>>(`${ANSWER_SHARDS_BASE}${entry.path}`)
+    return shard[letter] || []
+  }
+
   async function searchOffline(category: string, letter: string): Promise<string[]> {
+    try {
+      const answers = await searchOfflineShard(category, letter.toLowerCase())
+      if (answers) {
+        return answers
+      }
+    } catch (error) {
+      logger.warn('Answer shard unavailable, loading all offline answers:', error)
+    }
+
     try {
       const offlineAnswers = await $fetch<OfflineAnswers>('/data/offlineAnswers.json')
       const categoryAnswers = offlineAnswers[category]
@@ -1,3 +1,5 @@
+import { createHash } from 'node:crypto'
+import { readFileSync } from 'node:fs'
 import { getTerraformOutputsFromEnv } from '../../nuxt.config.terraform'
 import { getBuildPlugins, getDevPlugins } from '@riddle-rush/config/vite'
 
@@ -17,6 +19,22 @@ const isLocalhostBuild = [
 
 const shouldMinify = isDev || isLocalhostBuild || isDebugBuild ? false : 'esbuild'
 
+// Hash of offlineAnswers.json if public/data/answers (tools/python/answer_bundle.py) was compiled
+// from it, else '': the client then skips the shards instead of requesting a missing or stale index
+function answerBundleSource(): string {
+  try {
+    const data = new URL('./public/data/', import.meta.url)
+    const source = createHash('sha256')
+      .update(readFileSync(new URL('offlineAnswers.json', data)))
+      .digest('hex')
+      .slice(0, 16)
+    const index = JSON.parse(readFileSync(new URL('answers/index.json', data), 'utf-8'))
+    return index.source === source ? source : ''
+  } catch {
+    return ''
+  }
+}
+
 export default defineNuxtConfig({
   modules: [
     '@pinia/nuxt', // Load Pinia first since stores are used everywhere
@@ -93,6 +111,7 @@ export default defineNuxtConfig({
       gitlabFeatureFlagsUrl: process.env.GITLAB_FEATURE_FLAGS_URL || '',
       gitlabFeatureFlagsToken: process.env.GITLAB_FEATURE_FLAGS_TOKEN || '',
       gtagId: process.env.GTAG_ID || '',
+      answerBundleSource: answerBundleSource(),
       // Additional variables with safe Terraform fallback
       ...((): Record<string, string> => {
         const terraform = getTerraformOutputsFromEnv()
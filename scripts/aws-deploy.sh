@@ -44,6 +44,9 @@ else
 	YELLOW='\033[1;33m'
 	BLUE='\033[0;34m'
 	NC='\033[0m'
+
+	deploy_phase_start() { :; }
+	deploy_phase_end() { :; }
 fi
 
 # Configuration
@@ -142,6 +145,7 @@ fi
 
 # Pre-deployment checks (skip if already done by calling script)
 if [[ -z "${SKIP_PRE_DEPLOYMENT_CHECKS-}" ]]; then
+	deploy_phase_start tests
 	echo -e "\n🔍 Running pre-deployment checks..."
 
 	echo -e "\n📦 Installing dependencies..."
@@ -166,10 +170,12 @@ if [[ -z "${SKIP_PRE_DEPLOYMENT_CHECKS-}" ]]; then
 	}
 
 	echo -e "${GREEN}✓ All pre-deployment checks passed${NC}"
+	deploy_phase_end tests
 fi
 
 # Build the application
 # Always build before deployment to ensure fresh build
+deploy_phase_start build
 echo -e "\n🏗️  Building application..."
 # Use NODE_ENV if set, otherwise default to production
 if [[ -z "${NODE_ENV}" ]]; then
@@ -182,6 +188,14 @@ if [[ "${ENVIRONMENT}" == "development" ]]; then
 	echo -e "  ${BLUE}Building with DEBUG_BUILD=true (unminified, with sourcemaps)${NC}"
 fi
 
+# Compile the offline answer shards from the current offlineAnswers.json before the build embeds
+# their source hash (tools/python/answer_bundle.py); without them the game loads the full file
+if command -v "${S3_SYNC_PYTHON:-python3}" >/dev/null 2>&1; then
+	echo -e "  Compiling offline answer shards..."
+	"${S3_SYNC_PYTHON:-python3}" tools/python/answer_bundle.py >/dev/null ||
+		echo -e "  ${YELLOW}⚠️  Answer shards not compiled; the game falls back to offlineAnswers.json${NC}"
+fi
+
 echo -e "  ${BLUE}Building with NODE_ENV=${NODE_ENV}${NC}"
 (cd apps/game && BASE_URL=/ pnpm run generate)
 
@@ -197,6 +211,7 @@ fi
 # Verify build output
 FILE_COUNT=$(find "${BUILD_DIR}" -type f | wc -l)
 echo -e "  Files generated: ${FILE_COUNT}"
+deploy_phase_end build
 
 # Ensure S3 bucket exists (Terraform should have created it, but check anyway)
 echo -e "\n🪣 Checking S3 bucket: ${S3_BUCKET}..."
@@ -247,6 +262,7 @@ else
 fi
 
 # Upload to S3 with optimized caching
+deploy_phase_start upload
 echo -e "\n☁️  Uploading to S3..."
 TOTAL_SIZE=$(du -sh "${BUILD_DIR}" | cut -f1)
 
@@ -254,6 +270,31 @@ if [[ "${DRY_RUN}" = "true" ]]; then
 	echo -e "${YELLOW}🔍 DRY RUN: Skipping actual S3 upload${NC}"
 	echo -e "  Would upload ${FILE_COUNT} files to s3://${S3_BUCKET}"
 	echo -e "  Total size: ${TOTAL_SIZE}"
+elif [[ "${S3_SYNC_ENGINE-}" = "delta" ]]; then
+	# CloudFront compresses per viewer (compress = true), so origin compression is opt-in:
+	# S3_CONTENT_ENCODING=gzip|br stores that single encoding for every viewer
+	SYNC_ENCODING_ARGS=()
+	if [[ -n "${S3_CONTENT_ENCODING-}" ]]; then
+		# Pre-compress text assets (tools/python/precompress.py, cached by content hash)
+		deploy_phase_start compress
+		echo -e "  Pre-compressing text assets (${S3_CONTENT_ENCODING})..."
+		"${S3_SYNC_PYTHON:-python3}" tools/python/precompress.py "${BUILD_DIR}" \
+			--encodings "${S3_CONTENT_ENCODING}" >/dev/null
+		deploy_phase_end compress
+		SYNC_ENCODING_ARGS=(--content-encoding "${S3_CONTENT_ENCODING}")
+	fi
+
+	# Upload only changed files (tools/python/s3_sync.py), Cache-Control per lambda/cache-control.js
+	echo -e "  Uploading changed files (delta sync)..."
+	"${S3_SYNC_PYTHON:-python3}" tools/python/s3_sync.py \
+		--bucket "${S3_BUCKET}" \
+		--build-dir "${BUILD_DIR}" \
+		--region "${AWS_REGION}" \
+		${SYNC_ENCODING_ARGS[@]+"${SYNC_ENCODING_ARGS[@]}"} \
+		--delete \
+		--invalidation-output "${INVALIDATION_PATHS_FILE:-/tmp/riddle-rush-invalidation.json}"
+
+	echo -e "${GREEN}✓ Files uploaded to S3${NC}"
 else
 	# Upload static assets with long-term caching (1 year)
 	echo -e "  Uploading static assets (CSS, JS, images)..."
@@ -295,9 +336,11 @@ else
 fi
 
 echo -e "  Total size: ${TOTAL_SIZE}"
+deploy_phase_end upload
 
 # Invalidate CloudFront cache if distribution ID is provided
 if [[ -n "${CLOUDFRONT_ID}" ]]; then
+	deploy_phase_start invalidation
 	# Wait a moment to ensure CloudFront distribution is ready after Terraform deployment
 	echo -e "\n⏳ Waiting for CloudFront distribution to be ready before invalidation..."
 	sleep 5
@@ -313,11 +356,20 @@ if [[ -n "${CLOUDFRONT_ID}" ]]; then
 	fi
 
 	echo -e "\nInvalidating CloudFront cache..."
-	INVALIDATION_ID=$(aws cloudfront create-invalidation \
-		--distribution-id "${CLOUDFRONT_ID}" \
-		--paths "/*" \
-		--query 'Invalidation.Id' \
-		--output text 2>/dev/null || echo "")
+	PATHS_FILE="${INVALIDATION_PATHS_FILE:-/tmp/riddle-rush-invalidation.json}"
+	if [[ "${S3_SYNC_ENGINE-}" = "delta" ]] && [[ -f "${PATHS_FILE}" ]]; then
+		# Only the paths that changed since the previous deploy (tools/python/cloudfront_invalidation.py)
+		INVALIDATION_ID=$("${S3_SYNC_PYTHON:-python3}" tools/python/cloudfront_invalidation.py \
+			--distribution-id "${CLOUDFRONT_ID}" \
+			--paths-file "${PATHS_FILE}" | tail -n 1 || echo "")
+		[[ "${INVALIDATION_ID}" = "Nothing to invalidate" ]] && INVALIDATION_ID="none"
+	else
+		INVALIDATION_ID=$(aws cloudfront create-invalidation \
+			--distribution-id "${CLOUDFRONT_ID}" \
+			--paths "/*" \
+			--query 'Invalidation.Id' \
+			--output text 2>/dev/null || echo "")
+	fi
 
 	if [[ -n "${INVALIDATION_ID}" ]]; then
 		echo -e "${GREEN}✓ CloudFront cache invalidated (Invalidation ID: ${INVALIDATION_ID})${NC}"
@@ -328,6 +380,7 @@ if [[ -n "${CLOUDFRONT_ID}" ]]; then
 		echo -e "${YELLOW}   Try running the invalidation manually later:${NC}"
 		echo -e "${YELLOW}   aws cloudfront create-invalidation --distribution-id ${CLOUDFRONT_ID} --paths '/*'${NC}"
 	fi
+	deploy_phase_end invalidation "$([[ -n "${INVALIDATION_ID}" ]] && echo ok || echo error)"
 else
 	echo -e "${YELLOW}⚠️  No CloudFront distribution ID provided. Skipping cache invalidation.${NC}"
 	echo -e "${YELLOW}  Set AWS_CLOUDFRONT_ID environment variable to enable this.${NC}"
@@ -338,6 +391,7 @@ echo -e "\n${GREEN}━━━━━━━━━━━━━━━━━━━━
 echo -e "${GREEN}🎉 Deployment complete!${NC}"
 echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 
+deploy_phase_start verify
 if [[ -n "${CLOUDFRONT_ID}" ]]; then
 	CF_DOMAIN=$(aws cloudfront get-distribution --id "${CLOUDFRONT_ID}" --query 'Distribution.DomainName' --output text)
 	echo -e "\n${BLUE}CloudFront URL:${NC}"
@@ -346,6 +400,7 @@ else
 	echo -e "\n${BLUE}S3 Website URL:${NC}"
 	echo -e "  ${GREEN}http://${S3_BUCKET}.s3-website-${AWS_REGION}.amazonaws.com${NC}"
 fi
+deploy_phase_end verify
 
 # Show additional recommendations (only for production)
 if [[ "${ENVIRONMENT}" = "production" ]]; then
@@ -12,6 +12,21 @@ YELLOW='\033[1;33m'
 BLUE='\033[0;34m'
 NC='\033[0m' # No Color
 
+# ===========================================
+# Phase Markers
+# ===========================================
+# Machine-readable markers that split a deploy into phases (tests, build,
+# upload, invalidation, verify). tools/python/deploy_tracing.py turns them
+# into trace spans; humans can ignore them.
+
+deploy_phase_start() {
+	echo "::deploy-phase::start::$1"
+}
+
+deploy_phase_end() {
+	echo "::deploy-phase::end::$1::${2:-ok}"
+}
+
 # ===========================================
 # AWS Functions
 # ===========================================
@@ -308,6 +323,7 @@ load_aws_config() {
 # ===========================================
 
 run_pre_deployment_checks() {
+	deploy_phase_start tests
 	echo -e "\n🔍 Running pre-deployment checks..."
 	echo ""
 
@@ -348,6 +364,7 @@ run_pre_deployment_checks() {
 	}
 
 	echo -e "\n${GREEN}✓ All pre-deployment checks passed!${NC}"
+	deploy_phase_end tests
 }
 
 # ===========================================
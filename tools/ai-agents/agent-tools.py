@@ -3,65 +3,174 @@
 AI Agent Tools - Additional AI-powered utilities for Riddle Rush
 
 This module provides additional AI tools and utilities that can be used
-by agents or directly in the workflow.
+by agents or directly in the workflow. It imports the shared helpers in
+tools/python, so run it with that directory on PYTHONPATH (pnpm ai:status).
 """
 
 import subprocess
 import json
 import os
+import resource
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
+
+from toolchain_probe import probe_toolchain
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 
-def run_command(cmd: str, cwd: Optional[str] = None, timeout: int = 60) -> Dict[str, Union[str, int]]:
+KILL_GRACE = 2.0  # seconds between SIGTERM and SIGKILL for a timed-out process group
+STRAGGLER_GRACE = 1.0  # seconds background children may keep the output pipes open
+
+
+def _kill_group(pid: int, sig: int) -> None:
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _resource_limits(memory_limit_mb: Optional[int], cpu_limit_s: Optional[int]):
+    """preexec_fn applying rlimits in the child (None if no limit is requested)."""
+    if not memory_limit_mb and not cpu_limit_s:
+        return None
+
+    # resource is imported at module level: importing after fork() can deadlock on the import lock
+    def apply():
+        if memory_limit_mb:
+            # RLIMIT_DATA instead of RLIMIT_AS: V8 reserves far more address space than it uses
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+        if cpu_limit_s:
+            # SIGXCPU at the soft limit, SIGKILL a few seconds later
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit_s, cpu_limit_s + 5))
+
+    return apply
+
+
+def run_command(
+    cmd: Union[str, List[str]],
+    cwd: Optional[str] = None,
+    timeout: int = 60,
+    memory_limit_mb: Optional[int] = None,
+    cpu_limit_s: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Run a shell command and return the results.
     
+    The command runs in its own process group; on timeout the whole group
+    (including node/vitest grandchildren) is terminated. Resource usage comes
+    from wait4(): it covers the command and the descendants it waited for.
+    
     Args:
         cmd: Command to run
         cwd: Working directory (default: PROJECT_ROOT)
         timeout: Timeout in seconds
+        memory_limit_mb: Optional data segment limit per process (RLIMIT_DATA)
+        cpu_limit_s: Optional CPU time limit per process (RLIMIT_CPU)
     
     Returns:
-        Dictionary with stdout, stderr, and returncode
+        Dictionary with stdout, stderr, returncode, wall/user/sys time, peak RSS, output bytes
+        and timed_out (the same keys when the command could not be started)
     """
+    start = time.monotonic()
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd if isinstance(cmd, list) else ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=cwd or str(PROJECT_ROOT)
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd or str(PROJECT_ROOT),
+            start_new_session=True,
+            preexec_fn=_resource_limits(memory_limit_mb, cpu_limit_s),
         )
-        
-        return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
-        }
-    except subprocess.TimeoutExpired:
-        return {
-            "stdout": "",
-            "stderr": f"Command timed out after {timeout} seconds",
-            "returncode": -1
-        }
     except Exception as e:
         return {
             "stdout": "",
             "stderr": str(e),
-            "returncode": -2
+            "returncode": -2,
+            "wall_time_s": round(time.monotonic() - start, 3),
+            "user_time_s": 0.0,
+            "sys_time_s": 0.0,
+            "peak_rss_mb": 0.0,
+            "output_bytes": 0,
+            "timed_out": False,
         }
 
+    output = {}
+
+    def read(name, stream):
+        output[name] = stream.read()
+        stream.close()
+
+    readers = [
+        threading.Thread(target=read, args=("stdout", process.stdout), daemon=True),
+        threading.Thread(target=read, args=("stderr", process.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    # Reap the child ourselves: wait4() returns its resource usage, Popen.wait() does not
+    reaped = {}
+
+    def reap():
+        _, reaped["status"], reaped["usage"] = os.wait4(process.pid, 0)
+
+    waiter = threading.Thread(target=reap, daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    timed_out = waiter.is_alive()
+    if timed_out:
+        _kill_group(process.pid, signal.SIGTERM)
+        waiter.join(KILL_GRACE)
+        _kill_group(process.pid, signal.SIGKILL)
+        waiter.join()
+
+    # Background children still holding the pipes would leak (and block the readers)
+    grace_end = time.monotonic() + STRAGGLER_GRACE
+    for reader in readers:
+        reader.join(max(0.0, grace_end - time.monotonic()))
+    if any(reader.is_alive() for reader in readers):
+        _kill_group(process.pid, signal.SIGKILL)
+        for reader in readers:
+            reader.join()
 
-def get_ai_agent_status() -> Dict[str, Union[str, bool, List[str]]]:
+    process.returncode = os.waitstatus_to_exitcode(reaped["status"])
+    usage = reaped["usage"]
+    stdout = output.get("stdout", b"")
+    stderr = output.get("stderr", b"")
+    result = {
+        "stdout": stdout.decode("utf-8", errors="replace"),
+        "stderr": stderr.decode("utf-8", errors="replace"),
+        "returncode": process.returncode,
+        "wall_time_s": round(time.monotonic() - start, 3),
+        "user_time_s": round(usage.ru_utime, 3),
+        "sys_time_s": round(usage.ru_stime, 3),
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        "peak_rss_mb": round(usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        "output_bytes": len(stdout) + len(stderr),
+        "timed_out": timed_out,
+    }
+    if timed_out:
+        result["stderr"] = "\n".join(filter(None, [result["stderr"], f"Command timed out after {timeout} seconds"]))
+        result["returncode"] = -1
+    return result
+
+
+def get_ai_agent_status(force_probe: bool = False) -> Dict[str, Any]:
     """
     Get the current status of AI agents and tools.
     
+    Args:
+        force_probe: Probe the toolchain again instead of using the stored result
+    
     Returns:
-        Dictionary with AI agent status information
+        Dictionary with AI agent status information and the toolchain probe
     """
     status = {
         "agents_available": [],
@@ -70,21 +179,28 @@ def get_ai_agent_status() -> Dict[str, Union[str, bool, List[str]]]:
         "recommendations": []
     }
 
+    # Cached until PATH, the venv or the lockfiles change (see toolchain_probe.py)
+    toolchain = probe_toolchain(PROJECT_ROOT, force=force_probe)
+    status["toolchain"] = toolchain
+    modules = toolchain["python_modules"]
+
     # Check for FastMCP
-    fastmcp_check = run_command(["python", "-c", "import fastmcp; print('fastmcp_ok')"])
-    if fastmcp_check["returncode"] == 0:
+    if modules["fastmcp"]["available"]:
         status["tools_installed"].append("fastmcp")
         status["agents_available"].append("FastMCP Server")
 
     # Check for LangChain
-    langchain_check = run_command(["python", "-c", "import langchain; print('langchain_ok')"])
-    if langchain_check["returncode"] == 0:
+    if modules["langchain"]["available"]:
         status["tools_installed"].append("langchain")
         status["agents_available"].append("LangChain Tools")
 
+    # Check for CLIs
+    for binary in ("pnpm", "terraform"):
+        if toolchain["binaries"][binary]["available"]:
+            status["tools_installed"].append(binary)
+
     # Check for Trunk
-    trunk_path = PROJECT_ROOT / ".trunk-cache" / "cli"
-    if trunk_path.exists():
+    if toolchain["trunk"]["available"]:
         status["tools_installed"].append("trunk")
         status["agents_available"].append("Trunk Integration")
         status["ai_features_enabled"].append("Automated Code Quality")
@@ -108,73 +224,237 @@ def get_ai_agent_status() -> Dict[str, Union[str, bool, List[str]]]:
     return status
 
 
-def analyze_workspace_health() -> Dict[str, Union[str, int, List[Dict[str, str]]]]:
-    """
-    Analyze the overall health of the workspace.
-    
-    Returns:
-        Dictionary with workspace health analysis
-    """
-    health_report = {
-        "overall_score": 0,
-        "health_indicators": [],
-        "issues_found": [],
-        "recommendations": []
-    }
+HEALTH_DEADLINE = 10.0  # seconds shared by all health probes
+SEVERITY_PENALTY = {"high": 25, "medium": 10, "low": 5}
+PLAN_MAX_AGE = 24 * 3600
+BUILD_SOURCE_SKIP = {"node_modules", ".output", ".nuxt", "dist", "coverage", "test-results", ".turbo"}
+ARTIFACT_GLOBS = (
+    ".playwright-mcp",
+    "playwright-report*",
+    "test-results",
+    "apps/*/playwright-report*",
+    "apps/*/test-results",
+)
+ARTIFACT_LIMIT_BYTES = 1024 * 1024
+
+
+def _remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
 
-    # Check git status
-    git_status = run_command(["git", "status", "--short"])
+def _walk_newest(root: Path, skip: set, deadline: float) -> Dict[str, Any]:
+    """Newest file mtime below root (skipping directories by name); stops at the deadline."""
+    newest, newest_path, stack = 0.0, None, [root]
+    while stack:
+        if time.monotonic() > deadline:
+            return {"mtime": newest, "path": newest_path, "complete": False}
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip and not entry.name.startswith("playwright-report"):
+                    stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                if mtime > newest:
+                    newest, newest_path = mtime, entry.path
+    return {"mtime": newest, "path": newest_path, "complete": True}
+
+
+def _probe_git(deadline: float) -> Dict[str, List[Dict[str, str]]]:
+    """Uncommitted changes."""
+    git_status = run_command(["git", "status", "--short"], timeout=max(1, int(_remaining(deadline))))
     if git_status["returncode"] == 0 and git_status["stdout"].strip():
-        health_report["issues_found"].append({
+        return {"issues": [{
             "type": "git",
             "severity": "medium",
             "message": "Uncommitted changes detected",
             "details": git_status["stdout"].strip()
-        })
+        }]}
+    return {"indicators": [{"type": "git", "status": "ok", "message": "Working tree clean"}]}
 
-    # Check for node_modules
-    node_modules_exists = (PROJECT_ROOT / "node_modules").exists()
-    if not node_modules_exists:
-        health_report["issues_found"].append({
+
+def _probe_dependencies(deadline: float) -> Dict[str, List[Dict[str, str]]]:
+    """node_modules present and installed from the current pnpm-lock.yaml."""
+    node_modules = PROJECT_ROOT / "node_modules"
+    lockfile = PROJECT_ROOT / "pnpm-lock.yaml"
+    if not node_modules.exists():
+        return {"issues": [{
             "type": "dependencies",
             "severity": "high",
             "message": "node_modules not found - dependencies not installed",
             "details": "Run 'pnpm install' to install dependencies"
-        })
-    else:
-        health_report["health_indicators"].append({
+        }]}
+
+    # pnpm rewrites node_modules/.modules.yaml on every install. Its copy of the lockfile
+    # (node_modules/.pnpm/lock.yaml) leaves out skipped optional and platform packages,
+    # so comparing that byte for byte flags healthy installs
+    modules_yaml = node_modules / ".modules.yaml"
+    if lockfile.exists() and modules_yaml.exists() and lockfile.stat().st_mtime > modules_yaml.stat().st_mtime:
+        return {"issues": [{
             "type": "dependencies",
-            "status": "ok",
-            "message": "Dependencies installed"
-        })
+            "severity": "high",
+            "message": "Installed dependencies are out of date",
+            "details": "pnpm-lock.yaml is newer than node_modules/.modules.yaml; run 'pnpm install'"
+        }]}
+    return {"indicators": [{"type": "dependencies", "status": "ok", "message": "Dependencies match pnpm-lock.yaml"}]}
 
-    # Check for build artifacts
-    build_exists = (PROJECT_ROOT / "dist").exists() or \
-                   (PROJECT_ROOT / "apps" / "game" / ".output").exists()
-    if build_exists:
-        health_report["health_indicators"].append({
-            "type": "build",
-            "status": "ok",
-            "message": "Build artifacts found"
-        })
-    else:
-        health_report["issues_found"].append({
+
+def _probe_build(deadline: float) -> Dict[str, List[Dict[str, str]]]:
+    """A build exists and is newer than every source file of the game app."""
+    app = PROJECT_ROOT / "apps" / "game"
+    output = app / ".output"
+    if not output.exists() and not (PROJECT_ROOT / "dist").exists():
+        return {"issues": [{
             "type": "build",
             "severity": "low",
             "message": "No build artifacts found",
             "details": "Run 'pnpm run build' to create production build"
+        }]}
+    if not output.exists():
+        return {"indicators": [{"type": "build", "status": "ok", "message": "Build artifacts found"}]}
+
+    marker = output / "nitro.json"
+    built_at = (marker if marker.exists() else output).stat().st_mtime
+    newest = _walk_newest(app, BUILD_SOURCE_SKIP, deadline)
+    if newest["mtime"] > built_at:
+        return {"issues": [{
+            "type": "build",
+            "severity": "medium",
+            "message": "Build is stale",
+            "details": f"{os.path.relpath(newest['path'], PROJECT_ROOT)} changed after the last build; "
+                       "run 'pnpm run build'"
+        }]}
+    message = "Build is newer than all sources" if newest["complete"] else "Build found (source scan hit the deadline)"
+    return {"indicators": [{"type": "build", "status": "ok", "message": message}]}
+
+
+def _probe_terraform_plans(deadline: float) -> Dict[str, List[Dict[str, str]]]:
+    """Saved plans older than their configuration or than PLAN_MAX_AGE."""
+    issues = []
+    infrastructure = PROJECT_ROOT / "infrastructure"
+    plans = [p for pattern in ("**/tfplan", "**/*.tfplan") for p in infrastructure.glob(pattern)]
+    plans = [p for p in plans if ".terraform" not in p.parts]
+    modules_newest = _walk_newest(infrastructure / "modules", {".terraform"}, deadline)["mtime"]
+    for plan in sorted(plans):
+        planned_at = plan.stat().st_mtime
+        config = [p.stat().st_mtime for p in plan.parent.iterdir() if p.suffix in (".tf", ".tfvars")]
+        reasons = []
+        if max(config + [modules_newest]) > planned_at:
+            reasons.append("configuration changed after it was created")
+        if time.time() - planned_at > PLAN_MAX_AGE:
+            reasons.append(f"older than {PLAN_MAX_AGE // 3600}h")
+        if reasons:
+            issues.append({
+                "type": "terraform",
+                "severity": "medium",
+                "message": f"Stale Terraform plan: {plan.relative_to(PROJECT_ROOT)}",
+                "details": f"{' and '.join(reasons)}; re-run 'terraform plan' before applying"
+            })
+    if issues:
+        return {"issues": issues}
+    return {"indicators": [{"type": "terraform", "status": "ok", "message": f"{len(plans)} saved plan(s), none stale"}]}
+
+
+def _probe_artifacts(deadline: float) -> Dict[str, List[Dict[str, str]]]:
+    """Screenshots and test reports left in the tree."""
+    groups = sorted({p for pattern in ARTIFACT_GLOBS for p in PROJECT_ROOT.glob(pattern) if p.is_dir()})
+    sizes = {}
+    for group in groups:
+        if time.monotonic() > deadline:
+            break
+        sizes[group] = sum(f.stat().st_size for f in group.rglob("*") if f.is_file())
+    large = {g: size for g, size in sizes.items() if size >= ARTIFACT_LIMIT_BYTES}
+    if not large:
+        complete = len(sizes) == len(groups)
+        message = "No oversized test artifacts" if complete else "Artifact scan hit the deadline"
+        return {"indicators": [{"type": "artifacts", "status": "ok" if complete else "partial", "message": message}]}
+
+    rel = [str(g.relative_to(PROJECT_ROOT)) for g in large]
+    tracked = run_command(["git", "ls-files", "--", *rel], timeout=max(1, int(_remaining(deadline))))
+    tracked_dirs = {r for r in rel if any(line.startswith(r + "/") for line in tracked["stdout"].splitlines())}
+    issues = []
+    for r, size in zip(rel, large.values()):
+        committed = r in tracked_dirs
+        issues.append({
+            "type": "artifacts",
+            "severity": "medium" if committed else "low",
+            "message": f"{r} holds {size / 1024 / 1024:.1f} MB of {'committed ' if committed else ''}test artifacts",
+            "details": "Remove them and ignore the folder" if committed else "Delete the folder to reclaim space"
         })
+    return {"issues": issues}
+
+
+HEALTH_PROBES = {
+    "git": _probe_git,
+    "dependencies": _probe_dependencies,
+    "build": _probe_build,
+    "terraform_plans": _probe_terraform_plans,
+    "artifacts": _probe_artifacts,
+}
+
+
+def analyze_workspace_health(deadline_s: float = HEALTH_DEADLINE) -> Dict[str, Any]:
+    """
+    Analyze the overall health of the workspace.
+    
+    All probes run in parallel under one shared deadline; a probe that does
+    not finish in time is reported as timed out instead of delaying the report.
+    
+    Args:
+        deadline_s: Seconds all probes together may take
+    
+    Returns:
+        Dictionary with workspace health analysis and per-probe timings
+    """
+    health_report = {
+        "overall_score": 0,
+        "health_indicators": [],
+        "issues_found": [],
+        "recommendations": [],
+        "probes": {}
+    }
+
+    start = time.monotonic()
+    deadline = start + deadline_s
+
+    def timed(probe):
+        probe_start = time.monotonic()
+        result = probe(deadline)
+        return result, round((time.monotonic() - probe_start) * 1000, 1)
+
+    pool = ThreadPoolExecutor(max_workers=len(HEALTH_PROBES))
+    futures = {pool.submit(timed, probe): name for name, probe in HEALTH_PROBES.items()}
+    done, _ = wait(futures, timeout=deadline_s)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for future, name in futures.items():
+        if future not in done:
+            health_report["probes"][name] = {"status": "timeout", "elapsed_ms": round(deadline_s * 1000, 1)}
+            continue
+        try:
+            result, elapsed_ms = future.result()
+        except Exception as e:
+            health_report["probes"][name] = {"status": "error", "error": str(e)}
+            continue
+        health_report["issues_found"].extend(result.get("issues", []))
+        health_report["health_indicators"].extend(result.get("indicators", []))
+        health_report["probes"][name] = {"status": "issue" if result.get("issues") else "ok", "elapsed_ms": elapsed_ms}
 
     # Calculate overall score
+    penalty = sum(SEVERITY_PENALTY.get(issue["severity"], 5) for issue in health_report["issues_found"])
+    health_report["overall_score"] = max(0, 100 - penalty)
     if not health_report["issues_found"]:
-        health_report["overall_score"] = 100
         health_report["recommendations"].append("Workspace is in excellent health!")
-    elif len(health_report["issues_found"]) == 1:
-        health_report["overall_score"] = 80
-        health_report["recommendations"].append("Address minor issues to improve workspace health")
     else:
-        health_report["overall_score"] = 60
-        health_report["recommendations"].append("Multiple issues detected - review and fix for optimal performance")
+        health_report["recommendations"].extend(
+            f"{issue['message']}: {issue['details']}"
+            for issue in health_report["issues_found"]
+            if issue["type"] != "git"
+        )
+    health_report["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
 
     return health_report
 
@@ -195,7 +475,7 @@ def get_ai_optimization_suggestions() -> Dict[str, List[Dict[str, str]]]:
             },
             {
                 "area": "assets",
-                "suggestion": "Optimize image assets with modern formats (WebP, AVIF)",
+                "suggestion": "Optimize image assets with modern formats (WebP, AVIF) via the optimize_images MCP tool",
                 "impact": "40-60% smaller asset sizes"
             },
             {
@@ -1,3 +1,12 @@
-from .tool import CrewAiTool
+from .generator import AnswerGenerator, DedupeIndex
 
-__all__ = ["CrewAiTool"]
+__all__ = ["AnswerGenerator", "CrewAiTool", "DedupeIndex"]
+
+
+def __getattr__(name):
+    # Only the tool needs crewai: the generator stays importable (and testable) without it
+    if name == "CrewAiTool":
+        from .tool import CrewAiTool
+
+        return CrewAiTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,364 @@
+"""
+Answer generator - fill gaps in offlineAnswers.json with LLM-proposed answers
+
+offlineAnswers.json maps category -> letter -> answers, and many letters have
+fewer answers than a round needs (or none). This finds those gaps, asks an LLM
+for candidates and keeps only answers that are new:
+
+- gaps are (category, letter) slots with fewer than ``target`` answers;
+- slots are sent in batches (several slots of one category per prompt),
+  with at most ``concurrency`` requests in flight;
+- every candidate must start with its letter (umlauts folded) and passes a
+  per-category dedupe index seeded with the existing answers: a normalized
+  key (case, diacritics, ß, punctuation and spaces removed) catches exact
+  duplicates, MinHash signatures over character trigrams with LSH banding
+  catch near-duplicates ("Apothekerin" next to "Apotheker"). LSH candidates
+  are confirmed with the exact Jaccard similarity of their trigrams.
+
+The LLM is any callable taking a prompt and returning text, so tests pass a
+stub; the CrewAI tool passes ``crewai.LLM(...).call``.
+
+Usage:
+    generator = AnswerGenerator(llm=lambda prompt: ..., project_root=root)
+    report = generator.run(categories=["Blumen"], letters="abc")
+    generator.write(report["new"], merge=False)   # review file; merge=True extends offlineAnswers.json
+"""
+
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+DATA_DIR = "apps/game/public/data"
+ANSWERS_FILE = "offlineAnswers.json"
+CATEGORIES_FILE = "categories.json"
+CANDIDATES_FILE = ".answer-candidates.json"
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+TARGET_PER_LETTER = 6
+BATCH_SIZE = 8
+CONCURRENCY = 4
+RETRIES = 1
+NEAR_DUPLICATE = 0.6  # Jaccard similarity of character trigrams (Apothekerin / Apotheker: 0.67)
+NUM_PERM = 60
+BANDS = 20  # 20 bands of 3 rows: pairs at 0.6 become LSH candidates with ~99% probability
+MERSENNE = (1 << 61) - 1
+
+PROMPT = """You add answers to the German word game "Stadt, Land, Fluss".
+Category: {name}
+For each letter below, list {count} more well-known German answers of this category that start with the letter.
+Do not repeat the existing answers. Reply with JSON only: {{"<letter>": ["answer", ...], ...}}
+
+{slots}"""
+
+
+# fold_letter and normalize_answer are copies of tools/python/answer_bundle.py, which compiles the
+# same file: this package is installed on its own and cannot import it (tests/test_generator.py
+# checks that the copies agree)
+def fold_letter(answer: str) -> str:
+    """The game letter an answer counts for: first character without diacritics, lower-case."""
+    first = unicodedata.normalize("NFKD", answer[:1].lower())
+    return "".join(c for c in first if not unicodedata.combining(c))[:1]
+
+
+def normalize_answer(answer: str) -> str:
+    text = " ".join(unicodedata.normalize("NFC", answer).split())
+    return text[:1].upper() + text[1:]
+
+
+def dedupe_key(answer: str) -> str:
+    """Answer reduced to ASCII letters and digits (Sonnen-Blume, sonnenblume -> sonnenblume; Straße -> strasse)."""
+    folded = unicodedata.normalize("NFKD", answer.casefold())
+    return "".join(c for c in folded if c.isalnum() and not unicodedata.combining(c))
+
+
+def shingles(key: str) -> set[str]:
+    padded = f"^{key}$"
+    return {padded[i : i + 3] for i in range(max(1, len(padded) - 2))}
+
+
+def _permutations(count: int) -> list[tuple[int, int]]:
+    seeds = hashlib.blake2b(b"answer-minhash", digest_size=64).digest()
+    values = []
+    for n in range(count):
+        digest = hashlib.blake2b(seeds + n.to_bytes(2, "big"), digest_size=16).digest()
+        a, b = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+        values.append((a % MERSENNE | 1, b % MERSENNE))
+    return values
+
+
+PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def minhash(grams: set[str]) -> tuple[int, ...]:
+    hashes = [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big") for g in grams]
+    return tuple(min((a * h + b) % MERSENNE for h in hashes) for a, b in PERMUTATIONS)
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class DedupeIndex:
+    """Exact (normalized key) and near-duplicate (MinHash LSH) lookup over the answers of one category."""
+
+    def __init__(self, answers=(), threshold: float = NEAR_DUPLICATE):
+        self.threshold = threshold
+        self.keys: dict[str, str] = {}
+        self.grams: dict[str, set[str]] = {}
+        self.buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+        for answer in answers:
+            self.add(answer)
+
+    def _bands(self, signature: tuple[int, ...]):
+        rows = NUM_PERM // BANDS
+        return [(band, signature[band * rows : (band + 1) * rows]) for band in range(BANDS)]
+
+    def check(self, answer: str) -> tuple[str, str | None]:
+        """
+        Classify an answer against the index.
+
+        Returns:
+            ("new", None), ("duplicate", existing answer) or ("near_duplicate", most similar answer)
+        """
+        key = dedupe_key(answer)
+        if key in self.keys:
+            return "duplicate", self.keys[key]
+        grams = shingles(key)
+        candidates = {other for band in self._bands(minhash(grams)) for other in self.buckets.get(band, ())}
+        best = max(candidates, key=lambda other: jaccard(grams, self.grams[other]), default=None)
+        if best is not None and jaccard(grams, self.grams[best]) >= self.threshold:
+            return "near_duplicate", self.keys[best]
+        return "new", None
+
+    def add(self, answer: str) -> None:
+        key = dedupe_key(answer)
+        if not key or key in self.keys:
+            return
+        self.keys[key] = answer
+        self.grams[key] = shingles(key)
+        for band in self._bands(minhash(self.grams[key])):
+            self.buckets.setdefault(band, []).append(key)
+
+
+@dataclass
+class Slot:
+    category: str
+    letter: str
+    existing: list[str]
+    missing: int
+
+
+@dataclass
+class Batch:
+    category: str
+    name: str
+    slots: list[Slot]
+    prompt: str = ""
+    response: dict = field(default_factory=dict)
+    requests: int = 0
+    error: str = ""
+
+
+def find_gaps(
+    answers: dict, categories: list[str], letters: str = LETTERS, target: int = TARGET_PER_LETTER
+) -> list[Slot]:
+    """(category, letter) slots with fewer than ``target`` answers."""
+    gaps = []
+    for category in categories:
+        filed = {letter.lower(): items for letter, items in answers.get(category, {}).items()}
+        for letter in letters:
+            existing = filed.get(letter, [])
+            if len(existing) < target:
+                gaps.append(Slot(category, letter, existing, target - len(existing)))
+    return gaps
+
+
+def parse_response(text: str) -> dict:
+    """The JSON object in an LLM reply (code fences and prose around it are ignored)."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        raise ValueError("no JSON object in response")
+    data = json.loads(match.group(0))
+    if not isinstance(data, dict):
+        raise ValueError("response is not a JSON object")
+    return {
+        str(letter).lower(): [answer for answer in items if isinstance(answer, str)]
+        for letter, items in data.items()
+        if isinstance(items, list)
+    }
+
+
+def dump_answers(answers: dict) -> str:
+    """offlineAnswers.json layout: one line per letter."""
+    lines = []
+    for category, letters in answers.items():
+        rows = [
+            f"    {json.dumps(letter)}: {json.dumps(items, ensure_ascii=False)}" for letter, items in letters.items()
+        ]
+        lines.append(f"  {json.dumps(category, ensure_ascii=False)}: {{\n" + ",\n".join(rows) + "\n  }")
+    return "{\n" + ",\n".join(lines) + "\n}\n"
+
+
+class AnswerGenerator:
+    """Batched, deduplicated LLM generation of offline answers."""
+
+    def __init__(
+        self,
+        llm: Callable[[str], str],
+        project_root: Path,
+        batch_size: int = BATCH_SIZE,
+        concurrency: int = CONCURRENCY,
+        threshold: float = NEAR_DUPLICATE,
+    ):
+        self.llm = llm
+        self.data_dir = Path(project_root) / DATA_DIR
+        self.project_root = Path(project_root)
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.threshold = threshold
+
+    def load(self) -> tuple[dict, dict[str, str]]:
+        """(offlineAnswers.json, offline category key -> display name)"""
+        answers = json.loads((self.data_dir / ANSWERS_FILE).read_text(encoding="utf-8"))
+        categories = json.loads((self.data_dir / CATEGORIES_FILE).read_text(encoding="utf-8"))
+        offline = [c for c in categories if c.get("searchProvider") == "offline"]
+        names = {c["searchWord"]: c.get("name", c["searchWord"]) for c in offline}
+        return answers, names
+
+    def batches(self, gaps: list[Slot], names: dict[str, str]) -> list[Batch]:
+        batches = []
+        for slot in gaps:
+            current = batches[-1] if batches else None
+            if current is None or current.category != slot.category or len(current.slots) >= self.batch_size:
+                current = Batch(slot.category, names.get(slot.category, slot.category), [])
+                batches.append(current)
+            current.slots.append(slot)
+        for batch in batches:
+            lines = [
+                f"{slot.letter.upper()} (existing: {', '.join(slot.existing) or 'none'})" for slot in batch.slots
+            ]
+            count = max(slot.missing for slot in batch.slots)
+            batch.prompt = PROMPT.format(name=batch.name, count=count, slots="\n".join(lines))
+        return batches
+
+    def _request(self, batch: Batch) -> Batch:
+        for _ in range(RETRIES + 1):
+            batch.requests += 1
+            try:
+                batch.response = parse_response(self.llm(batch.prompt))
+                batch.error = ""
+                return batch
+            except Exception as e:
+                batch.error = str(e)
+        return batch
+
+    def run(self, categories: list[str] | None = None, letters: str = LETTERS, target: int = TARGET_PER_LETTER) -> dict:
+        """
+        Generate answers for every gap and keep the new, unique ones.
+
+        Args:
+            categories: Category keys (default: all offline categories)
+            letters: Letters to fill
+            target: Answers wanted per category and letter
+
+        Returns:
+            Report with "new" (category -> letter -> accepted answers), rejection counts,
+            dedupe rate and throughput
+        """
+        start = time.perf_counter()
+        answers, names = self.load()
+        categories = categories or list(names)
+        gaps = find_gaps(answers, categories, letters.lower(), target)
+        batches = self.batches(gaps, names)
+        indexes = {
+            category: DedupeIndex((a for items in answers.get(category, {}).values() for a in items), self.threshold)
+            for category in categories
+        }
+
+        new: dict[str, dict[str, list[str]]] = {}
+        rejected = {"duplicate": 0, "near_duplicate": 0, "wrong_letter": 0, "surplus": 0}
+        near_duplicates = []
+        generated = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # Results are deduplicated in batch order, so a run is reproducible whatever finishes first
+            for batch in pool.map(self._request, batches):
+                index = indexes[batch.category]
+                for slot in batch.slots:
+                    for raw in batch.response.get(slot.letter, []):
+                        answer = normalize_answer(raw)
+                        if not answer:
+                            continue
+                        generated += 1
+                        if fold_letter(answer) != slot.letter:
+                            rejected["wrong_letter"] += 1
+                            continue
+                        kind, match = index.check(answer)
+                        if kind != "new":
+                            rejected[kind] += 1
+                            if kind == "near_duplicate":
+                                near_duplicates.append(
+                                    {"category": slot.category, "answer": answer, "similar_to": match}
+                                )
+                            continue
+                        accepted = new.setdefault(slot.category, {}).setdefault(slot.letter, [])
+                        if len(accepted) >= slot.missing:
+                            rejected["surplus"] += 1
+                            continue
+                        index.add(answer)
+                        accepted.append(answer)
+
+        elapsed = time.perf_counter() - start
+        accepted_count = sum(len(items) for letters in new.values() for items in letters.values())
+        requests = sum(batch.requests for batch in batches)
+        duplicates = rejected["duplicate"] + rejected["near_duplicate"]
+        return {
+            "gaps": len(gaps),
+            "missing": sum(slot.missing for slot in gaps),
+            "batches": len(batches),
+            "requests": requests,
+            "failed_batches": [
+                {"category": b.category, "letters": "".join(s.letter for s in b.slots), "error": b.error}
+                for b in batches
+                if b.error
+            ],
+            "generated": generated,
+            "accepted": accepted_count,
+            "rejected": rejected,
+            "dedupe_rate": round(duplicates / generated, 3) if generated else 0.0,
+            "near_duplicates": near_duplicates,
+            "elapsed_s": round(elapsed, 3),
+            "answers_per_s": round(generated / elapsed, 1) if elapsed else None,
+            "requests_per_s": round(requests / elapsed, 2) if elapsed else None,
+            "new": new,
+        }
+
+    def write(self, new: dict, merge: bool = False) -> Path:
+        """
+        Write accepted answers.
+
+        Args:
+            new: "new" from a report
+            merge: Append to offlineAnswers.json instead of writing the review file (.answer-candidates.json)
+
+        Returns:
+            Path written
+        """
+        if not merge:
+            path = self.project_root / CANDIDATES_FILE
+            path.write_text(json.dumps(new, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+            return path
+        path = self.data_dir / ANSWERS_FILE
+        answers = json.loads(path.read_text(encoding="utf-8"))
+        for category, letters in new.items():
+            filed = answers.setdefault(category, {})
+            for letter, items in letters.items():
+                filed.setdefault(letter, []).extend(items)
+            answers[category] = {letter: filed[letter] for letter in sorted(filed)}
+        path.write_text(dump_answers(answers), encoding="utf-8")
+        return path
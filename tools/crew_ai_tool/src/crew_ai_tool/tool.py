@@ -1,10 +1,58 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional, Type
+
 from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from .generator import BATCH_SIZE, CONCURRENCY, TARGET_PER_LETTER, AnswerGenerator
+
+# tools/crew_ai_tool/src/crew_ai_tool/tool.py -> repository root (RIDDLE_RUSH_ROOT overrides)
+PROJECT_ROOT = Path(os.environ.get("RIDDLE_RUSH_ROOT") or Path(__file__).resolve().parents[4])
+
+
+class CrewAiToolInput(BaseModel):
+    categories: str = Field("", description="Comma-separated category keys (e.g. Blumen,Beruf); default all offline")
+    letters: str = Field("abcdefghijklmnopqrstuvwxyz", description="Letters to fill")
+    target_per_letter: int = Field(TARGET_PER_LETTER, description="Answers wanted per category and letter")
+    merge: bool = Field(False, description="Append to offlineAnswers.json instead of writing .answer-candidates.json")
 
 
 class CrewAiTool(BaseTool):
-    name: str = "Name of my tool"
-    description: str = "What this tool does. It's vital for effective utilization."
+    name: str = "Offline answer generator"
+    description: str = (
+        "Fills gaps in the game's offlineAnswers.json: generates answers for categories and letters "
+        "with too few answers, in batches, and keeps only new answers that are not (near-)duplicates "
+        "of existing ones. Returns a JSON report with throughput and dedupe rates."
+    )
+    args_schema: Type[BaseModel] = CrewAiToolInput
+
+    # Any callable prompt -> text; default: crewai.LLM for the MODEL environment variable
+    llm: Optional[Callable[[str], str]] = None
+    project_root: Path = PROJECT_ROOT
+    batch_size: int = BATCH_SIZE
+    concurrency: int = CONCURRENCY
+
+    def _complete(self) -> Callable[[str], str]:
+        if self.llm is not None:
+            return self.llm
+        from crewai import LLM
+
+        return LLM(model=os.environ.get("MODEL", "gpt-4o-mini")).call
 
-    def _run(self, argument: str) -> str:
-        # Your tool's logic here
-        return "Tool's result"
+    def _run(
+        self,
+        categories: str = "",
+        letters: str = "abcdefghijklmnopqrstuvwxyz",
+        target_per_letter: int = TARGET_PER_LETTER,
+        merge: bool = False,
+    ) -> str:
+        generator = AnswerGenerator(
+            self._complete(), self.project_root, batch_size=self.batch_size, concurrency=self.concurrency
+        )
+        selected = [c.strip() for c in categories.split(",") if c.strip()] or None
+        report: dict[str, Any] = generator.run(selected, letters, target_per_letter)
+        if report["accepted"]:
+            report["output"] = str(generator.write(report["new"], merge=merge))
+        return json.dumps(report, ensure_ascii=False, indent=2)
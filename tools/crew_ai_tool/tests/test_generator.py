@@ -0,0 +1,127 @@
+"""Tests for the batched answer generator (with a stub LLM)."""
+
+import importlib.util
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from crew_ai_tool.generator import AnswerGenerator, DedupeIndex, dump_answers, fold_letter, normalize_answer
+
+ANSWER_BUNDLE = Path(__file__).resolve().parents[2] / "python" / "answer_bundle.py"
+
+ANSWERS = {
+    "Beruf": {"a": ["Arzt", "Apotheker"], "b": ["Bäcker"], "c": []},
+    "Blumen": {"a": ["Aster"], "b": ["Begonie"], "c": ["Chrysantheme"]},
+}
+CATEGORIES = [
+    {"id": 1, "name": "Beruf", "searchWord": "Beruf", "key": "Beruf", "searchProvider": "offline"},
+    {"id": 2, "name": "Blumen", "searchWord": "Blumen", "key": "Blumen", "searchProvider": "offline"},
+    {"id": 3, "name": "Stadt", "searchWord": "Stadt", "key": "Stadt", "searchProvider": "wikipedia"},
+]
+PROPOSALS = {
+    "Beruf": {
+        "a": ["Anwalt", "arzt", "Apothekerin", "Architekt"],
+        "b": ["Bäcker", "Bauer", "Zimmermann", "Bauer"],
+        "c": ["Chemiker", "Chirurg"],
+    },
+    "Blumen": {"a": ["Akelei", "Anemone"], "b": ["Butterblume"], "c": ["Christrose"]},
+}
+
+
+def _project(tmp_path):
+    data = tmp_path / "apps" / "game" / "public" / "data"
+    data.mkdir(parents=True)
+    (data / "offlineAnswers.json").write_text(dump_answers(ANSWERS), encoding="utf-8")
+    (data / "categories.json").write_text(json.dumps(CATEGORIES), encoding="utf-8")
+    return tmp_path
+
+
+class StubLLM:
+    """Answers from PROPOSALS for the letters in a prompt; records concurrency."""
+
+    def __init__(self, delay: float = 0.0, fail: int = 0):
+        self.delay, self.fail = delay, fail
+        self.calls = self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failing = self.calls <= self.fail
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if failing:
+            return "Sorry, I cannot help with that."
+        category = re.search(r"Category: (.+)", prompt).group(1)
+        letters = re.findall(r"^([A-Z]) \(existing", prompt, re.MULTILINE)
+        reply = {letter.lower(): PROPOSALS[category].get(letter.lower(), []) for letter in letters}
+        return f"```json\n{json.dumps(reply, ensure_ascii=False)}\n```"
+
+
+def test_dedupe_index():
+    index = DedupeIndex(["Apotheker", "Sonnenblume", "Rosa"])
+
+    assert index.check("sonnen-blume") == ("duplicate", "Sonnenblume")
+    assert index.check("Apothekerin") == ("near_duplicate", "Apotheker")
+    assert index.check("Rosi") == ("new", None)
+
+
+def test_run_accepts_only_new_unique_answers(tmp_path):
+    llm = StubLLM()
+    report = AnswerGenerator(llm, _project(tmp_path), batch_size=2).run(letters="abc", target=3)
+
+    assert report["new"] == {
+        "Beruf": {"a": ["Anwalt"], "b": ["Bauer"], "c": ["Chemiker", "Chirurg"]},
+        "Blumen": {"a": ["Akelei", "Anemone"], "b": ["Butterblume"], "c": ["Christrose"]},
+    }
+    assert report["rejected"] == {"duplicate": 3, "near_duplicate": 1, "wrong_letter": 1, "surplus": 1}
+    assert report["near_duplicates"] == [{"category": "Beruf", "answer": "Apothekerin", "similar_to": "Apotheker"}]
+    assert (report["gaps"], report["batches"], report["requests"]) == (6, 4, 4)
+    assert report["generated"] == 14 and report["accepted"] == 8
+    assert report["dedupe_rate"] == 0.286
+    assert report["answers_per_s"] > 0
+
+
+def test_bounded_concurrency_and_retries(tmp_path):
+    llm = StubLLM(delay=0.05, fail=1)
+    report = AnswerGenerator(llm, _project(tmp_path), batch_size=1, concurrency=2).run(letters="abc", target=3)
+
+    assert llm.peak == 2
+    assert report["batches"] == 6 and report["requests"] == 7  # one retry
+    assert report["failed_batches"] == []
+
+
+def test_tool_merges_into_dataset(tmp_path):
+    pytest.importorskip("crewai")
+    from crew_ai_tool import CrewAiTool
+
+    root = _project(tmp_path)
+    tool = CrewAiTool(llm=StubLLM(), project_root=root)
+
+    report = json.loads(tool._run(categories="Blumen", letters="ab", target_per_letter=2, merge=True))
+
+    path = root / "apps" / "game" / "public" / "data" / "offlineAnswers.json"
+    merged = json.loads(path.read_text(encoding="utf-8"))
+    assert report["output"] == str(path)
+    assert merged["Blumen"] == {"a": ["Aster", "Akelei"], "b": ["Begonie", "Butterblume"], "c": ["Chrysantheme"]}
+    assert merged["Beruf"] == ANSWERS["Beruf"]
+    assert path.read_text(encoding="utf-8") == dump_answers(merged)
+
+
+@pytest.mark.skipif(not ANSWER_BUNDLE.exists(), reason="needs the repository checkout")
+def test_normalization_matches_answer_bundle(monkeypatch):
+    monkeypatch.syspath_prepend(str(ANSWER_BUNDLE.parent))  # answer_bundle imports precompress
+    spec = importlib.util.spec_from_file_location("answer_bundle", ANSWER_BUNDLE)
+    answer_bundle = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(answer_bundle)
+
+    for answer in ["Öltanker", "  über  den   Berg ", "ßpiel", "Émile", "e\u0301clair", "aster", ""]:
+        assert fold_letter(answer) == answer_bundle.fold_letter(answer)
+        assert normalize_answer(answer) == answer_bundle.normalize_answer(answer)
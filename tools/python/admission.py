@@ -0,0 +1,236 @@
+"""
+Admission - CPU/memory-aware admission control for heavy subprocess tools
+
+JobRunner caps how many subprocesses run at once, but a build, a vitest run
+and a trunk check each use every core, so a few of them at once thrash the
+host. Every heavy tool declares what it costs (cores, memory) and asks the
+AdmissionController for admission before it starts:
+
+- capacity is the CPU count, or the cgroup CPU quota (cpu.max / cfs_quota)
+  when the server runs in a limited container, and the cgroup memory limit or
+  total RAM;
+- load that is not ours shrinks the available cores, so the queue backs off
+  when the host is busy anyway. The 1-minute load average lags: it rises
+  slowly after a job starts and stays up for minutes after it ends. What is
+  subtracted is therefore our own cores as the load average sees them (an
+  exponential average with the same 60s time constant), not the cores
+  admitted right now;
+- waiters are served strictly by priority, then arrival, so a large build
+  is not starved by a stream of small lint jobs;
+- when nothing is admitted, the head of the queue always gets in, so costs
+  larger than the host still run (one at a time).
+
+Each admission reports how long it waited in the queue.
+
+Usage:
+    admission = AdmissionController()
+    with admission.admit("build") as ticket:
+        run_build()
+    print(ticket.wait_s)
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+POLL_INTERVAL = 0.5  # seconds between load re-checks while waiting
+LOADAVG_PERIOD_S = 60.0  # time constant of the kernel's 1-minute load average
+
+
+@dataclass(frozen=True)
+class Cost:
+    """Resources a tool class uses while it runs; lower priority values are admitted first."""
+
+    cores: float
+    memory_mb: int
+    priority: int
+
+
+TOOL_COSTS = {
+    "lint": Cost(cores=2, memory_mb=1024, priority=0),
+    "test": Cost(cores=4, memory_mb=2048, priority=1),
+    "e2e": Cost(cores=2, memory_mb=2048, priority=1),
+    "build": Cost(cores=4, memory_mb=3072, priority=2),
+}
+
+
+@dataclass
+class Ticket:
+    """An admission: what was reserved and how long it waited."""
+
+    tool: str
+    cores: float
+    memory_mb: int
+    wait_s: float = 0.0
+
+
+def cgroup_cpu_limit(root: Path = Path("/sys/fs/cgroup")) -> float | None:
+    """CPU quota in cores from cgroup v2 (cpu.max) or v1 (cfs_quota_us), None if unlimited."""
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def cgroup_memory_limit_mb(root: Path = Path("/sys/fs/cgroup")) -> int | None:
+    """Memory limit in MB from cgroup v2 (memory.max) or v1, None if unlimited."""
+    for path in (root / "memory.max", root / "memory" / "memory.limit_in_bytes"):
+        try:
+            value = path.read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:  # v1 reports "unlimited" as a huge number
+            return int(value) // (1024 * 1024)
+        return None
+    return None
+
+
+def total_memory_mb() -> int | None:
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def _loadavg() -> float:
+    try:
+        return os.getloadavg()[0]
+    except OSError:
+        return 0.0
+
+
+class AdmissionController:
+    """Priority queue admitting tools while their cores and memory fit the host."""
+
+    def __init__(
+        self,
+        cores: float | None = None,
+        memory_mb: int | None = None,
+        costs: dict[str, Cost] | None = None,
+        loadavg=_loadavg,
+        enabled: bool = True,
+        clock=time.monotonic,
+    ):
+        cpu_count = os.cpu_count() or 1
+        quota = cgroup_cpu_limit()
+        self.cores = cores or min(cpu_count, quota or cpu_count)
+        self.memory_mb = memory_mb or cgroup_memory_limit_mb() or total_memory_mb() or 0
+        self.costs = costs or TOOL_COSTS
+        self.enabled = enabled
+        self._loadavg = loadavg
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._used_cores = 0.0
+        self._own_load = 0.0
+        self._own_load_at = clock()
+        self._used_memory = 0
+        self._running = 0
+        self.admitted = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def own_load(self) -> float:
+        """Our admitted cores as the 1-minute load average currently reflects them."""
+        with self._cond:
+            now = self._clock()
+            decay = math.exp(-(now - self._own_load_at) / LOADAVG_PERIOD_S)
+            self._own_load = self._used_cores + (self._own_load - self._used_cores) * decay
+            self._own_load_at = now
+            return self._own_load
+
+    def available_cores(self) -> float:
+        """Capacity minus load that is not from admitted tools."""
+        external = max(0.0, self._loadavg() - self.own_load())
+        return max(0.0, self.cores - external)
+
+    def _fits(self, cores: float, memory_mb: int) -> bool:
+        if self._running == 0:
+            return True
+        memory_ok = not self.memory_mb or self._used_memory + memory_mb <= self.memory_mb
+        return memory_ok and self._used_cores + cores <= self.available_cores()
+
+    @contextmanager
+    def admit(self, tool: str):
+        """Wait until ``tool`` fits, hold its reservation while the block runs, yield the Ticket."""
+        cost = self.costs[tool]
+        ticket = Ticket(tool, min(cost.cores, self.cores), min(cost.memory_mb, self.memory_mb or cost.memory_mb))
+        if not self.enabled:
+            yield ticket
+            return
+
+        start = time.monotonic()
+        entry = (cost.priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while self._queue[0] != entry or not self._fits(ticket.cores, ticket.memory_mb):
+                    self._cond.wait(POLL_INTERVAL)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self.own_load()  # settle the average up to now before the admitted cores change
+            self._used_cores += ticket.cores
+            self._used_memory += ticket.memory_mb
+            self._running += 1
+            ticket.wait_s = round(time.monotonic() - start, 3)
+            self.admitted += 1
+            self.total_wait_s += ticket.wait_s
+            self.max_wait_s = max(self.max_wait_s, ticket.wait_s)
+            self._cond.notify_all()
+        try:
+            yield ticket
+        finally:
+            with self._cond:
+                self.own_load()
+                self._used_cores -= ticket.cores
+                self._used_memory -= ticket.memory_mb
+                self._running -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "cores": self.cores,
+                "memory_mb": self.memory_mb,
+                "available_cores": round(self.available_cores(), 2),
+                "used_cores": self._used_cores,
+                "own_load": round(self.own_load(), 2),
+                "used_memory_mb": self._used_memory,
+                "running": self._running,
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "mean_wait_s": round(self.total_wait_s / self.admitted, 3) if self.admitted else 0.0,
+                "max_wait_s": self.max_wait_s,
+            }
+
+
+def admission_from_env() -> AdmissionController:
+    """Controller configured by MCP_ADMISSION (0 disables), MCP_CPU_CORES and MCP_MEMORY_MB."""
+    return AdmissionController(
+        cores=float(os.environ.get("MCP_CPU_CORES", "0")) or None,
+        memory_mb=int(os.environ.get("MCP_MEMORY_MB", "0")) or None,
+        enabled=os.environ.get("MCP_ADMISSION", "1") != "0",
+    )
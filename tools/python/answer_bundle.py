@@ -0,0 +1,313 @@
+"""
+Answer Bundle - validated, sharded offline answers for the game
+
+apps/game/public/data/offlineAnswers.json maps category -> letter -> answers
+and is downloaded and parsed in full the first time a round checks an answer,
+although a round only ever needs one category and one letter. This compiles
+it (together with categories.json) into:
+
+    apps/game/public/data/answers/index.json
+        {"version": 1, "shardBy": "letter", "source": "9c1e4f0a2b3d5e6f",
+         "categories": {"Blumen": {"path": "blumen.1f2e3d4c", "letters": "abcdefghiklmnoprstuvwz"}, ...}}
+    apps/game/public/data/answers/blumen.1f2e3d4c/a.json      ["Aster", "Akelei", ...]
+    ... plus .br / .gz variants of every file (see precompress.py)
+
+With ``shard_by="category"`` there is one ``{letter: answers}`` file per
+category (``blumen.1f2e3d4c.json``). Shard paths carry a content hash of the
+category, so clients can cache them forever; only index.json keeps its name.
+
+``source`` is the hash of the offlineAnswers.json the bundle was compiled
+from. The game build embeds the hash of its own offlineAnswers.json (see
+apps/game/nuxt.config.ts) and only uses a bundle whose source matches; a
+stale or missing bundle falls back to the full file. scripts/aws-deploy.sh
+compiles the bundle before every build.
+
+Before sharding the data is normalized and every fix is reported:
+
+- answers: Unicode NFC, trimmed, inner whitespace collapsed, first letter
+  upper-case; duplicates (case-insensitive) dropped;
+- letters: keys lower-case; answers filed under the letter they start with,
+  with umlauts folded (Öltanker -> "o", as the game's letters are A-Z);
+- categories: offline categories without answers, answer categories not in
+  categories.json and duplicate search words are reported.
+
+Usage:
+    python answer_bundle.py                 # compile into public/data/answers
+    python answer_bundle.py --benchmark     # also compare parse time and size (1x and synthetic 100x)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+import precompress
+
+DATA_DIR = "apps/game/public/data"
+ANSWERS_FILE = "offlineAnswers.json"
+CATEGORIES_FILE = "categories.json"
+OUTPUT_DIR = "apps/game/public/data/answers"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+SHARD_MODES = ("letter", "category")
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def source_hash(data: bytes) -> str:
+    """Hash of the offlineAnswers.json bytes (same as answerBundleSource in apps/game/nuxt.config.ts)."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def fold_letter(answer: str) -> str:
+    """The game letter an answer counts for: first character without diacritics, lower-case."""
+    first = unicodedata.normalize("NFKD", answer[:1].lower())
+    return "".join(c for c in first if not unicodedata.combining(c))[:1]
+
+
+def slug(key: str) -> str:
+    """ASCII file name part for a category key (Männlicher_Vorname -> maennlicher_vorname)."""
+    folded = unicodedata.normalize("NFKD", key.lower().translate(FOLD))
+    return re.sub(r"[^a-z0-9]+", "_", "".join(c for c in folded if not unicodedata.combining(c))).strip("_")
+
+
+def normalize_answer(answer: str) -> str:
+    text = " ".join(unicodedata.normalize("NFC", answer).split())
+    return text[:1].upper() + text[1:]
+
+
+def normalize(answers: dict, categories: list[dict]) -> tuple[dict, list[dict]]:
+    """
+    Validate and normalize the offline answers.
+
+    Args:
+        answers: Parsed offlineAnswers.json (category -> letter -> answers)
+        categories: Parsed categories.json
+
+    Returns:
+        (normalized answers with letters in A-Z order, list of issues found and fixed or reported)
+    """
+    issues = []
+    result = {}
+    for category, letters in answers.items():
+        seen: dict[str, set[str]] = {}
+        filed: dict[str, list[str]] = {}
+        for letter, items in letters.items():
+            if letter != letter.lower():
+                issues.append({"category": category, "letter": letter, "issue": "letter key not lower-case"})
+            for raw in items:
+                answer = normalize_answer(raw)
+                if not answer:
+                    issues.append({"category": category, "letter": letter, "issue": "empty answer"})
+                    continue
+                if answer != raw:
+                    issues.append({"category": category, "answer": raw, "issue": "normalized", "fixed": answer})
+                target = fold_letter(answer)
+                if target != letter.lower():
+                    issues.append({"category": category, "answer": answer, "issue": "wrong letter", "fixed": target})
+                if answer.casefold() in seen.setdefault(target, set()):
+                    issues.append({"category": category, "letter": target, "answer": answer, "issue": "duplicate"})
+                    continue
+                seen[target].add(answer.casefold())
+                filed.setdefault(target, []).append(answer)
+        result[category] = {letter: filed[letter] for letter in sorted(filed)}
+        missing = [letter for letter in LETTERS if letter not in filed]
+        if missing:
+            issues.append({"category": category, "issue": "letters without answers", "letters": "".join(missing)})
+
+    search_words = [c.get("searchWord") for c in categories]
+    for word in sorted({w for w in search_words if search_words.count(w) > 1}):
+        issues.append({"category": word, "issue": "search word used by several categories"})
+    offline = {c["searchWord"] for c in categories if c.get("searchProvider") == "offline"}
+    for category in sorted(offline - result.keys()):
+        issues.append({"category": category, "issue": "offline category without answers"})
+    for category in sorted(result.keys() - set(search_words)):
+        issues.append({"category": category, "issue": "answers for unknown category"})
+    return result, issues
+
+
+def _dump(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_shards(answers: dict, shard_by: str = "letter") -> tuple[dict, dict[str, bytes]]:
+    """
+    Shard contents and the index that points at them.
+
+    Each category gets a content hash over all its answers. In "letter" mode
+    its shards live in ``<slug>.<hash>/<letter>.json``; in "category" mode the
+    category is one ``<slug>.<hash>.json``. The index lists the letters that
+    have answers, so a client never requests a shard that does not exist.
+
+    Returns:
+        (index, relative path -> bytes)
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"shard_by must be one of {', '.join(SHARD_MODES)}")
+    files: dict[str, bytes] = {}
+    categories = {}
+    for category, letters in answers.items():
+        data = _dump(letters)
+        name = f"{slug(category)}.{hashlib.sha256(data).hexdigest()[:8]}"
+        if shard_by == "category":
+            name += ".json"
+            files[name] = data
+        else:
+            files.update({f"{name}/{letter}.json": _dump(items) for letter, items in letters.items()})
+        categories[category] = {"path": name, "letters": "".join(letters)}
+    index = {"version": INDEX_VERSION, "shardBy": shard_by, "categories": categories}
+    return index, files
+
+
+def write_bundle(output_dir: Path, index: dict, files: dict[str, bytes], cache: Path) -> dict:
+    """Write shards and index, remove stale shards and precompress everything."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for name, data in files.items():
+        path = output_dir / name
+        if not path.exists():  # content-addressed: an existing file already has these bytes
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(data)
+            written += 1
+    index_path = output_dir / INDEX_FILE
+    index_data = _dump(index)
+    if not index_path.exists() or index_path.read_bytes() != index_data:
+        index_path.write_bytes(index_data)
+
+    keep = {name.split("/")[0] for name in files} | {INDEX_FILE}
+    removed = 0
+    for path in output_dir.iterdir():
+        base = path.name[: -len(path.suffix)] if path.suffix in precompress.SUFFIXES.values() else path.name
+        if base in keep:
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        removed += path.name == base
+    # Shards are small: compress them whatever their size; variants that save nothing are still skipped
+    report = precompress.precompress_tree(output_dir, cache, min_size=0, min_savings=0.0)
+    return {"written": written, "unchanged": len(files) - written, "removed": removed, "precompress": report}
+
+
+def _sizes(data: bytes) -> dict:
+    sizes = {"raw": len(data), "gzip": len(gzip.compress(data, compresslevel=9, mtime=0))}
+    if precompress.brotli is not None:
+        sizes["br"] = len(precompress.compress(data, "br"))
+    return sizes
+
+
+def _parse_ms(*payloads: bytes, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            json.loads(payload)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def measure(source: bytes, index: dict, files: dict[str, bytes]) -> dict:
+    """
+    What a round transfers and parses before (whole file) and after (index + one shard).
+
+    The shard is the largest one, so "after" is the worst case of a round.
+    """
+    index_data = _dump(index)
+    shard = max(files.values(), key=len)
+    before = {**_sizes(source), "parse_ms": _parse_ms(source)}
+    after = {
+        "index": _sizes(index_data),
+        "shard": _sizes(shard),
+        "parse_ms": _parse_ms(index_data, shard),
+        "shards": len(files),
+    }
+    after["round_raw"] = after["index"]["raw"] + after["shard"]["raw"]
+    after["round_gzip"] = after["index"]["gzip"] + after["shard"]["gzip"]
+    return {"before": before, "after": after}
+
+
+def synthetic(answers: dict, factor: int) -> dict:
+    """``factor`` times the answers per letter (suffixed copies), to see how the formats scale."""
+    return {
+        category: {
+            letter: [f"{answer} {n}" if n else answer for n in range(factor) for answer in items]
+            for letter, items in letters.items()
+        }
+        for category, letters in answers.items()
+    }
+
+
+def compile_answers(
+    project_root: Path,
+    shard_by: str = "letter",
+    output_dir: Path | None = None,
+    dry_run: bool = False,
+    benchmark: bool = False,
+    synthetic_factor: int = 100,
+) -> dict:
+    """
+    Validate, normalize and shard the offline answers.
+
+    Args:
+        project_root: Repository root
+        shard_by: "letter" (one shard per category and letter) or "category"
+        output_dir: Where to write (default: apps/game/public/data/answers)
+        dry_run: Validate and measure only, write nothing
+        benchmark: Add parse time and sizes before/after for the current data and a synthetic dataset
+        synthetic_factor: Size multiplier of the synthetic dataset
+
+    Returns:
+        Report with the issues found, shard counts, written files and (optionally) the benchmark
+    """
+    start = time.perf_counter()
+    data_dir = Path(project_root) / DATA_DIR
+    source = (data_dir / ANSWERS_FILE).read_bytes()
+    categories = json.loads((data_dir / CATEGORIES_FILE).read_text(encoding="utf-8"))
+    answers, issues = normalize(json.loads(source), categories)
+    index, files = build_shards(answers, shard_by)
+    index["source"] = source_hash(source)
+
+    report = {
+        "categories": len(answers),
+        "answers": sum(len(items) for letters in answers.values() for items in letters.values()),
+        "shard_by": shard_by,
+        "source": index["source"],
+        "shards": len(files),
+        "issues": issues,
+    }
+    if not dry_run:
+        output = Path(output_dir or Path(project_root) / OUTPUT_DIR)
+        report["output_dir"] = str(output)
+        report.update(write_bundle(output, index, files, precompress.cache_dir(Path(project_root))))
+    if benchmark:
+        report["benchmark"] = {"current": measure(source, index, files)}
+        scaled = synthetic(answers, synthetic_factor)
+        scaled_index, scaled_files = build_shards(scaled, shard_by)
+        report["benchmark"][f"synthetic_{synthetic_factor}x"] = measure(
+            json.dumps(scaled, ensure_ascii=False, indent=2).encode("utf-8"), scaled_index, scaled_files
+        )
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent.parent)
+    parser.add_argument("--shard-by", choices=SHARD_MODES, default="letter")
+    parser.add_argument("--dry-run", action="store_true", help="validate and measure only")
+    parser.add_argument("--benchmark", action="store_true", help="compare parse time and size before/after")
+    args = parser.parse_args(argv)
+    report = compile_answers(args.root, args.shard_by, dry_run=args.dry_run, benchmark=args.benchmark)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Atlas Packer - per-screen texture atlases for the game UI artwork
+
+Every screen of the game (alphabets, scoring, players, settings, ...) loads its
+small PNGs from apps/game/public/assets/<screen>/ one request at a time. This
+packs them into atlas pages with a MaxRects bin packer (best short side fit)
+and writes, per screen, to apps/game/public/atlases/:
+
+    <screen>.png, <screen>-1.png, ...   atlas pages
+    <screen>.json                       frame map
+
+    {"frames": {"back.png": {"frame": {"x": 0, "y": 0, "w": 132, "h": 132}, "page": 0}, ...},
+     "meta": {"pages": ["/atlases/scoring.png"], "sizes": [[1719, 1030]], "padding": 2}}
+
+Full-screen backgrounds and other images larger than ``max_sprite`` stay
+separate files. A screen is only repacked when one of its sources (by content
+hash) or the settings changed.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ASSETS_DIR = "apps/game/public/assets"
+OUTPUT_DIR = "apps/game/public/atlases"
+URL_PREFIX = "/atlases/"
+DEFAULT_SCREENS = ("alphabets", "scoring", "players", "settings")
+ATLAS_SIZE = 2048
+MAX_SPRITE = 1024
+PADDING = 2
+STATE_FILE = ".atlas-state.json"
+
+
+@dataclass
+class Rect:
+    x: int
+    y: int
+    w: int
+    h: int
+
+    def contains(self, other: "Rect") -> bool:
+        return (
+            other.x >= self.x
+            and other.y >= self.y
+            and other.x + other.w <= self.x + self.w
+            and other.y + other.h <= self.y + self.h
+        )
+
+    def intersects(self, other: "Rect") -> bool:
+        return not (
+            other.x >= self.x + self.w
+            or other.x + other.w <= self.x
+            or other.y >= self.y + self.h
+            or other.y + other.h <= self.y
+        )
+
+
+class MaxRectsBin:
+    """MaxRects bin packer using the best-short-side-fit heuristic (no rotation)."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.free = [Rect(0, 0, width, height)]
+        self.used: list[Rect] = []
+
+    def insert(self, w: int, h: int) -> Rect | None:
+        """Place a w x h rectangle; None if it does not fit."""
+        best, best_short, best_long = None, None, None
+        for free in self.free:
+            if w <= free.w and h <= free.h:
+                short, long = sorted((free.w - w, free.h - h))
+                if best is None or (short, long) < (best_short, best_long):
+                    best, best_short, best_long = Rect(free.x, free.y, w, h), short, long
+        if best is None:
+            return None
+
+        split: list[Rect] = []
+        for free in self.free:
+            if free.intersects(best):
+                split.extend(self._split(free, best))
+            else:
+                split.append(free)
+        # Drop free rectangles contained in another one (keeping the first of identical ones)
+        self.free = [
+            r
+            for i, r in enumerate(split)
+            if not any(j != i and o.contains(r) and (o != r or j < i) for j, o in enumerate(split))
+        ]
+        self.used.append(best)
+        return best
+
+    @staticmethod
+    def _split(free: Rect, used: Rect) -> list[Rect]:
+        parts = []
+        if used.x > free.x:
+            parts.append(Rect(free.x, free.y, used.x - free.x, free.h))
+        if used.x + used.w < free.x + free.w:
+            parts.append(Rect(used.x + used.w, free.y, free.x + free.w - used.x - used.w, free.h))
+        if used.y > free.y:
+            parts.append(Rect(free.x, free.y, free.w, used.y - free.y))
+        if used.y + used.h < free.y + free.h:
+            parts.append(Rect(free.x, used.y + used.h, free.w, free.y + free.h - used.y - used.h))
+        return parts
+
+    def bounds(self) -> tuple[int, int]:
+        """Smallest width/height covering every placed rectangle."""
+        return max(r.x + r.w for r in self.used), max(r.y + r.h for r in self.used)
+
+
+def pack(sizes: dict[str, tuple[int, int]], atlas_size: int = ATLAS_SIZE, padding: int = PADDING) -> list[dict]:
+    """
+    Pack named sprites into as few pages as needed.
+
+    Returns:
+        One dict per page: {"size": (w, h), "frames": {name: Rect}} (frames exclude padding)
+    """
+    order = sorted(sizes, key=lambda n: (max(sizes[n]), sizes[n][0] * sizes[n][1], n), reverse=True)
+    pages: list[tuple[MaxRectsBin, dict[str, Rect]]] = []
+    for name in order:
+        w, h = sizes[name]
+        for page in pages:
+            placed = page[0].insert(w + padding, h + padding)
+            if placed:
+                break
+        else:
+            page = (MaxRectsBin(atlas_size, atlas_size), {})
+            pages.append(page)
+            placed = page[0].insert(w + padding, h + padding)
+            if placed is None:
+                raise ValueError(f"{name} ({w}x{h}) does not fit into a {atlas_size}px atlas")
+        page[1][name] = Rect(placed.x, placed.y, w, h)
+    return [{"size": bin_.bounds(), "frames": frames} for bin_, frames in pages]
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_screen(
+    assets: Path,
+    output: Path,
+    screen: str,
+    state: dict,
+    force: bool = False,
+    atlas_size: int = ATLAS_SIZE,
+    max_sprite: int = MAX_SPRITE,
+    padding: int = PADDING,
+) -> dict:
+    """
+    Build (or reuse) the atlas pages and frame map of one screen.
+
+    Returns:
+        Report with requests and bytes before/after and whether the screen was rebuilt
+    """
+    from PIL import Image
+
+    sources = sorted(p for p in (assets / screen).glob("*.png") if p.is_file())
+    hashes = {p.name: _sha256(p) for p in sources}
+    settings = {"atlas_size": atlas_size, "max_sprite": max_sprite, "padding": padding}
+    previous = state.get(screen)
+    outputs_exist = previous is not None and all((output / page).exists() for page in previous["pages"])
+    rebuilt = force or not outputs_exist or previous["hashes"] != hashes or previous["settings"] != settings
+
+    if rebuilt:
+        sizes = {}
+        for path in sources:
+            with Image.open(path) as image:
+                if max(image.size) <= max_sprite:
+                    sizes[path.name] = image.size
+
+        for page in previous["pages"] if previous else []:
+            (output / page).unlink(missing_ok=True)
+
+        frames, page_names, page_sizes = {}, [], []
+        for index, page in enumerate(pack(sizes, atlas_size, padding) if sizes else []):
+            canvas = Image.new("RGBA", page["size"], (0, 0, 0, 0))
+            for name, rect in page["frames"].items():
+                with Image.open(assets / screen / name) as sprite:
+                    canvas.paste(sprite.convert("RGBA"), (rect.x, rect.y))
+                frames[name] = {"frame": {"x": rect.x, "y": rect.y, "w": rect.w, "h": rect.h}, "page": index}
+            page_name = f"{screen}.png" if index == 0 else f"{screen}-{index}.png"
+            output.mkdir(parents=True, exist_ok=True)
+            canvas.save(output / page_name, optimize=True)
+            page_names.append(page_name)
+            page_sizes.append(list(page["size"]))
+
+        frame_map = {
+            "frames": dict(sorted(frames.items())),
+            "meta": {"pages": [URL_PREFIX + p for p in page_names], "sizes": page_sizes, "padding": padding},
+        }
+        output.mkdir(parents=True, exist_ok=True)
+        (output / f"{screen}.json").write_text(json.dumps(frame_map, indent=2) + "\n", encoding="utf-8")
+        state[screen] = {"hashes": hashes, "settings": settings, "pages": page_names, "frames": sorted(frames)}
+
+    entry = state[screen]
+    packed = entry["frames"]
+    files_after = [output / p for p in entry["pages"]] + [output / f"{screen}.json"]
+    return {
+        "rebuilt": rebuilt,
+        "sprites": len(packed),
+        "left_separate": sorted(set(hashes) - set(packed)),
+        "requests_before": len(packed),
+        "requests_after": len(entry["pages"]) + 1 if packed else 0,
+        "bytes_before": sum((assets / screen / name).stat().st_size for name in packed),
+        "bytes_after": sum(f.stat().st_size for f in files_after if f.exists()) if packed else 0,
+    }
+
+
+def build_atlases(
+    project_root: Path,
+    screens: tuple[str, ...] = DEFAULT_SCREENS,
+    force: bool = False,
+    atlas_size: int = ATLAS_SIZE,
+    max_sprite: int = MAX_SPRITE,
+) -> dict:
+    """
+    Build the atlases of several screens, repacking only screens whose sources changed.
+
+    Returns:
+        Per-screen reports plus total request and byte reduction
+    """
+    start = time.perf_counter()
+    assets = project_root / ASSETS_DIR
+    output = project_root / OUTPUT_DIR
+    state_path = output / STATE_FILE
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+
+    missing = [s for s in screens if not (assets / s).is_dir()]
+    if missing:
+        raise FileNotFoundError(f"No asset folder for screen(s): {', '.join(missing)}")
+
+    reports = {s: build_screen(assets, output, s, state, force, atlas_size, max_sprite) for s in screens}
+    output.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    return {
+        "screens": reports,
+        "requests_saved": sum(r["requests_before"] - r["requests_after"] for r in reports.values()),
+        "bytes_saved": sum(r["bytes_before"] - r["bytes_after"] for r in reports.values()),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,226 @@
+"""
+AWS Status - fast deployment readiness checks over pooled boto3 clients
+
+``aws_deploy_check`` used to run scripts/terraform-plan.sh (terraform init,
+refresh and plan of the whole environment) only to see whether a deploy can
+go ahead. This asks AWS directly, with all checks running at once under one
+deadline:
+
+    credentials    sts:GetCallerIdentity
+    bucket         s3:HeadBucket (exists and is accessible) plus its region
+    distribution   cloudfront:GetDistribution (Deployed / InProgress, enabled)
+    invalidation   status of the most recent CloudFront invalidation
+
+Creating a boto3 session and client costs tens of milliseconds (loading the
+service models), so ClientPool keeps one session per profile and one client
+per (service, region, profile, endpoint). Clients are thread-safe and shared.
+Their timeouts and retries are kept short so one slow endpoint cannot hold a
+check past its deadline. Checks still running at the deadline are reported
+as "timeout".
+
+Usage:
+    pool = ClientPool()
+    deployment_status(pool, bucket="riddle-rush-pwa", distribution_id="E2ABCDEF123456")
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_DEADLINE_S = 3.0
+CONNECT_TIMEOUT_S = 2
+READ_TIMEOUT_S = 3
+
+
+class ClientPool:
+    """boto3 sessions per profile and clients per (service, region, profile, endpoint), created once."""
+
+    def __init__(self, profile: str | None = None, region: str | None = None, endpoint_url: str | None = None):
+        self.profile = profile or os.environ.get("AWS_PROFILE") or None
+        self.region = region or os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or None
+        self.endpoint_url = endpoint_url or os.environ.get("AWS_ENDPOINT_URL") or None
+        self._lock = threading.Lock()
+        self._sessions: dict = {}
+        self._clients: dict = {}
+        self.created = 0
+
+    def session(self, profile: str | None = None):
+        import boto3
+
+        profile = profile or self.profile
+        with self._lock:
+            if profile not in self._sessions:
+                self._sessions[profile] = boto3.session.Session(profile_name=profile)
+            return self._sessions[profile]
+
+    def client(self, service: str, region: str | None = None, profile: str | None = None):
+        """Shared client; sessions are not thread-safe, so clients are created under the lock."""
+        from botocore.config import Config
+
+        key = (service, region or self.region, profile or self.profile, self.endpoint_url)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is not None:
+            return client
+        session = self.session(profile)
+        config = Config(
+            connect_timeout=CONNECT_TIMEOUT_S,
+            read_timeout=READ_TIMEOUT_S,
+            retries={"max_attempts": 2, "mode": "standard"},
+            max_pool_connections=16,
+        )
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = session.client(
+                    service, region_name=key[1], endpoint_url=self.endpoint_url, config=config
+                )
+                self.created += 1
+            return self._clients[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "clients": sorted(f"{service}@{region or 'default'}" for service, region, _, _ in self._clients),
+            }
+
+
+def _error_code(error: Exception) -> str:
+    response = getattr(error, "response", None) or {}
+    return str(response.get("Error", {}).get("Code", "")) or type(error).__name__
+
+
+def check_credentials(pool: ClientPool) -> dict:
+    identity = pool.client("sts").get_caller_identity()
+    return {"status": "ok", "account": identity["Account"], "arn": identity["Arn"]}
+
+
+def check_bucket(pool: ClientPool, bucket: str) -> dict:
+    client = pool.client("s3")
+    try:
+        client.head_bucket(Bucket=bucket)
+    except Exception as e:
+        code = _error_code(e)
+        if code in ("404", "NoSuchBucket", "NotFound"):
+            return {"status": "error", "bucket": bucket, "detail": "bucket does not exist"}
+        if code in ("403", "AccessDenied", "Forbidden"):
+            return {"status": "error", "bucket": bucket, "detail": "no access to bucket"}
+        raise
+    region = client.get_bucket_location(Bucket=bucket).get("LocationConstraint") or "us-east-1"
+    return {"status": "ok", "bucket": bucket, "region": region}
+
+
+def check_distribution(pool: ClientPool, distribution_id: str) -> dict:
+    try:
+        distribution = pool.client("cloudfront").get_distribution(Id=distribution_id)["Distribution"]
+    except Exception as e:
+        if _error_code(e) == "NoSuchDistribution":
+            return {"status": "error", "distribution_id": distribution_id, "detail": "distribution does not exist"}
+        raise
+    enabled = distribution["DistributionConfig"]["Enabled"]
+    deployed = distribution["Status"] == "Deployed"
+    return {
+        "status": "ok" if deployed and enabled else "warning",
+        "distribution_id": distribution_id,
+        "deployment": distribution["Status"],
+        "enabled": enabled,
+        "domain_name": distribution["DomainName"],
+    }
+
+
+def check_last_invalidation(pool: ClientPool, distribution_id: str) -> dict:
+    try:
+        listing = pool.client("cloudfront").list_invalidations(DistributionId=distribution_id, MaxItems="25")
+    except Exception as e:
+        if _error_code(e) == "NoSuchDistribution":
+            return {"status": "error", "distribution_id": distribution_id, "detail": "distribution does not exist"}
+        raise
+    items = listing.get("InvalidationList", {}).get("Items", [])
+    if not items:
+        return {"status": "ok", "detail": "no invalidations yet"}
+    latest = max(items, key=lambda item: item["CreateTime"])
+    return {
+        "status": "ok" if latest["Status"] == "Completed" else "warning",
+        "id": latest["Id"],
+        "invalidation": latest["Status"],
+        "created": latest["CreateTime"].isoformat(),
+    }
+
+
+def run_checks(checks: dict, deadline_s: float = DEFAULT_DEADLINE_S) -> dict:
+    """
+    Run checks concurrently; those not done by the deadline are reported as timeouts.
+
+    Args:
+        checks: name -> zero-argument callable returning a result dict with a "status"
+        deadline_s: Overall time budget for all checks
+
+    Returns:
+        name -> result dict, each with "elapsed_ms"
+    """
+    started: dict[str, float] = {}
+    finished: dict[str, float] = {}
+
+    def timed(name, check):
+        started[name] = time.perf_counter()
+        try:
+            return check()
+        finally:
+            finished[name] = time.perf_counter()
+
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=max(1, len(checks)))
+    futures = {name: pool.submit(timed, name, check) for name, check in checks.items()}
+    wait(futures.values(), timeout=deadline_s)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            result = {"status": "timeout", "detail": f"no answer within {deadline_s:g}s"}
+        elif future.exception() is not None:
+            error = future.exception()
+            result = {"status": "error", "detail": f"{_error_code(error)}: {error}"}
+        else:
+            result = dict(future.result())
+        end = finished.get(name, time.perf_counter())
+        result["elapsed_ms"] = round((end - started.get(name, start)) * 1000, 1)
+        results[name] = result
+    return results
+
+
+def deployment_status(
+    pool: ClientPool,
+    bucket: str = "",
+    distribution_id: str = "",
+    deadline_s: float = DEFAULT_DEADLINE_S,
+) -> dict:
+    """
+    Deployment readiness of one environment.
+
+    Args:
+        pool: Client pool to use
+        bucket: Website bucket (bucket check skipped when empty)
+        distribution_id: CloudFront distribution (distribution and invalidation checks skipped when empty)
+        deadline_s: Overall time budget
+
+    Returns:
+        Dictionary with per-check results, "ready" (credentials and bucket ok, distribution
+        exists if given) and elapsed_ms
+    """
+    start = time.perf_counter()
+    checks = {"credentials": lambda: check_credentials(pool)}
+    if bucket:
+        checks["bucket"] = lambda: check_bucket(pool, bucket)
+    if distribution_id:
+        checks["distribution"] = lambda: check_distribution(pool, distribution_id)
+        checks["invalidation"] = lambda: check_last_invalidation(pool, distribution_id)
+    results = run_checks(checks, deadline_s)
+    # A distribution that is still deploying or an invalidation in progress does not block a deploy
+    required = [results[name] for name in ("credentials", "bucket", "distribution") if name in results]
+    return {
+        "checks": results,
+        "ready": bool(bucket) and all(r["status"] in ("ok", "warning") for r in required),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
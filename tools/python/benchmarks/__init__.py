@@ -0,0 +1 @@
+"""Benchmark suite for the Riddle Rush FastMCP subagents server."""
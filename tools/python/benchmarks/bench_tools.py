@@ -0,0 +1,316 @@
+"""
+Benchmark every tool in main.py against the fake toolchain.
+
+Every tool runs in a FakeToolchain sandbox: main.py's indexes are rebuilt
+for the sandbox project and the AWS tools talk to moto, not a real account.
+
+Measures, per tool:
+- call latency through an in-memory FastMCP client (p50/p95/mean)
+- cold start: importing main.py in a fresh interpreter and making the first call
+- concurrency scaling: throughput with N simultaneous calls on one session
+- peak Python memory while the fakes emit a huge output
+
+Usage:
+    python -m benchmarks.bench_tools --save-baseline local
+    python -m benchmarks.bench_tools --compare local --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.fake_bins import FAKE_BUCKET, FakeToolchain
+
+SERVER_DIR = Path(__file__).parent.parent
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Arguments for tools whose parameters have no default, or whose defaults find nothing in the sandbox
+TOOL_ARGS: dict[str, dict] = {
+    "aws_deploy": {"environment": "development"},
+    "aws_sync_build": {"environment": "development"},
+    "aws_list_releases": {"environment": "development"},
+    "aws_release_diff": {"environment": "development"},
+    "aws_rollback": {"environment": "development"},
+    "compile_offline_answers": {"dry_run": True},
+    "validate_answers": {"answers": [{"answer": "Astre", "category": "Blumen", "letter": "a"}]},
+    "terraform_find_resource": {"resource_type": "aws_s3_bucket"},
+    "find_symbol": {"name": "formatScore"},
+    "find_references": {"name": "formatScore"},
+    "list_exports": {"module": "packages/shared/src/index.ts"},
+    "load_skill": {"name": "demo-skill"},
+    "load_skill_reference": {"name": "demo-skill", "reference": "references/guide.md"},
+}
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "mean_ms", "cold_start_ms", "peak_memory_mb")
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _load_server(project_root: Path | None = None):
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+    import main
+
+    if project_root is not None:
+        main.set_project_root(project_root)
+    return main
+
+
+@contextmanager
+def fake_aws(server):
+    """Serve every boto3 call from moto, with the sandbox bucket created and a fresh client pool."""
+    import boto3
+    from moto import mock_aws
+
+    original = server.aws_clients
+    with mock_aws():
+        boto3.client("s3").create_bucket(Bucket=FAKE_BUCKET)
+        server.aws_clients = server.aws_status.ClientPool()  # clients made before the mock would reach AWS
+        try:
+            yield
+        finally:
+            server.aws_clients = original
+
+
+async def _tool_names(server) -> list[str]:
+    return sorted(tool.name for tool in await server.mcp.list_tools())
+
+
+async def measure_latency(client, tool: str, args: dict, repeats: int) -> dict[str, float]:
+    """Sequential calls of one tool; returns latency statistics in ms."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await client.call_tool(tool, args, raise_on_error=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+async def measure_concurrency(client, tool: str, args: dict, levels: list[int], rounds: int = 3) -> dict[str, float]:
+    """Throughput (calls/s) with ``level`` simultaneous calls on one session."""
+    throughput: dict[str, float] = {}
+    for level in levels:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(client.call_tool(tool, args, raise_on_error=False) for _ in range(level)))
+        elapsed = time.perf_counter() - start
+        throughput[str(level)] = round(level * rounds / elapsed, 2)
+    return throughput
+
+
+async def measure_memory_peak(client, tool: str, args: dict) -> float:
+    """Peak traced Python allocation in MB during one call."""
+    tracemalloc.start()
+    try:
+        await client.call_tool(tool, args, raise_on_error=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def measure_cold_start(tool: str, args: dict, toolchain: FakeToolchain) -> float:
+    """Fresh interpreter: import main.py, connect a client and make the first call (ms)."""
+    code = (
+        "import asyncio, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "from benchmarks.bench_tools import _load_server, fake_aws\n"
+        "from fastmcp import Client\n"
+        "server = _load_server(__import__('pathlib').Path(sys.argv[1]))\n"
+        "async def first_call():\n"
+        "    async with Client(server.mcp) as client:\n"
+        "        await client.call_tool(sys.argv[2], json.loads(sys.argv[3]), raise_on_error=False)\n"
+        "with fake_aws(server):\n"
+        "    asyncio.run(first_call())\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(toolchain.project_root), tool, json.dumps(args)],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        cwd=SERVER_DIR,
+        env={**os.environ, "PYTHONPATH": str(SERVER_DIR)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"cold start of {tool} failed: {result.stderr.strip()}")
+    return round(float(result.stdout.strip().splitlines()[-1]), 3)
+
+
+async def run_suite(
+    tools: list[str] | None = None,
+    repeats: int = 10,
+    latency_ms: float = 0.0,
+    output_bytes: int = 0,
+    huge_output_bytes: int = 20 * 1024 * 1024,
+    concurrency: list[int] | None = None,
+    cold_start: bool = True,
+    shared_cache: bool = False,
+) -> dict:
+    """
+    Run every benchmark against the fake toolchain.
+
+    Args:
+        tools: Tool names to benchmark (default: every tool registered in main.py)
+        repeats: Sequential calls per tool for the latency statistics
+        latency_ms: Latency of every fake binary
+        output_bytes: Output size of every fake binary during latency runs
+        huge_output_bytes: Output size used for the memory peak measurement
+        concurrency: Concurrency levels for the scaling measurement
+        cold_start: Also measure fresh-interpreter first-call time
+        shared_cache: Keep the server's shared result cache on (off measures the tools themselves)
+
+    Returns:
+        Dictionary with run metadata and per-tool results
+    """
+    from fastmcp import Client
+
+    concurrency = concurrency or [1, 2, 4, 8]
+    results: dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory(prefix="mcp-bench-") as tmp, FakeToolchain(
+        Path(tmp), latency_ms=latency_ms, output_bytes=output_bytes
+    ) as toolchain:
+        server = _load_server()
+        original_root, original_cache = server.PROJECT_ROOT, server.cache.enabled
+        server.set_project_root(toolchain.project_root)
+        server.cache.enabled = shared_cache
+        try:
+            selected = tools or await _tool_names(server)
+            with fake_aws(server):
+                async with Client(server.mcp) as client:
+                    for tool in selected:
+                        args = TOOL_ARGS.get(tool, {})
+                        toolchain.configure(output_bytes=output_bytes)
+                        entry = await measure_latency(client, tool, args, repeats)
+                        entry["throughput_per_s"] = await measure_concurrency(client, tool, args, concurrency)
+                        toolchain.configure(output_bytes=huge_output_bytes)
+                        entry["peak_memory_mb"] = await measure_memory_peak(client, tool, args)
+                        toolchain.configure(output_bytes=output_bytes)
+                        results[tool] = entry
+        finally:
+            server.set_project_root(original_root)
+            server.cache.enabled = original_cache
+
+        if cold_start:
+            for tool in selected:
+                results[tool]["cold_start_ms"] = measure_cold_start(tool, TOOL_ARGS.get(tool, {}), toolchain)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+            "latency_ms": latency_ms,
+            "output_bytes": output_bytes,
+            "huge_output_bytes": huge_output_bytes,
+            "concurrency": concurrency,
+            "shared_cache": shared_cache,
+        },
+        "tools": results,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = 0.25) -> list[dict]:
+    """
+    Find metrics that regressed by more than ``tolerance`` (0.25 = 25%).
+
+    Latency, cold start and memory regress when they grow; throughput
+    regresses when it shrinks.
+    """
+    regressions = []
+    for tool, current in results.get("tools", {}).items():
+        before = baseline.get("tools", {}).get(tool)
+        if not before:
+            continue
+        for metric in LOWER_IS_BETTER:
+            old, new = before.get(metric), current.get(metric)
+            if old and new is not None and new > old * (1 + tolerance):
+                regressions.append({"tool": tool, "metric": metric, "baseline": old, "current": new})
+        for level, new in current.get("throughput_per_s", {}).items():
+            old = before.get("throughput_per_s", {}).get(level)
+            if old and new < old * (1 - tolerance):
+                regressions.append(
+                    {"tool": tool, "metric": f"throughput_per_s[{level}]", "baseline": old, "current": new}
+                )
+    return regressions
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Riddle Rush FastMCP tools against fake binaries")
+    parser.add_argument("--tools", help="Comma-separated tool names (default: all)")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--output-bytes", type=int, default=0)
+    parser.add_argument("--huge-output-bytes", type=int, default=20 * 1024 * 1024)
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--no-cold-start", action="store_true", help="Skip fresh-interpreter measurements")
+    parser.add_argument("--shared-cache", action="store_true", help="Keep the server's shared result cache enabled")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this file")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store results as benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against benchmarks/baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run_suite(
+            tools=args.tools.split(",") if args.tools else None,
+            repeats=args.repeats,
+            latency_ms=args.latency_ms,
+            output_bytes=args.output_bytes,
+            huge_output_bytes=args.huge_output_bytes,
+            concurrency=[int(level) for level in args.concurrency.split(",")],
+            cold_start=not args.no_cold_start,
+            shared_cache=args.shared_cache,
+        )
+    )
+    rendered = json.dumps(results, indent=2)
+
+    if args.output:
+        args.output.write_text(rendered, encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        baseline_path(args.save_baseline).write_text(rendered, encoding="utf-8")
+    if not (args.output or args.save_baseline):
+        print(rendered)
+
+    if args.compare:
+        baseline = json.loads(baseline_path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['tool']} {regression['metric']}: "
+                f"{regression['baseline']} -> {regression['current']}",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Compare per-client stdio servers with one shared streamable HTTP server.
+
+Both runs replay the same trace with the same number of sessions against the
+fake toolchain (see load_replay.py). stdio pays a cold start per session and
+cannot share caches; HTTP starts once and serves every session from one
+process with the shared result cache and bounded worker slots.
+
+Usage:
+    python -m benchmarks.bench_transports --sessions 8 --iterations 3
+    python -m benchmarks.bench_transports --sessions 16 --latency-ms 200 --output transports.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.load_replay import DEFAULT_TRACE, run_load
+from call_recorder import load_trace
+
+COMPARED_METRICS = ("elapsed_s", "throughput_per_s", "error_rate")
+
+
+async def compare_transports(trace: list[dict], sessions: int, iterations: int, latency_ms: float = 0.0) -> dict:
+    """
+    Run the same load over stdio and HTTP.
+
+    Returns:
+        Dictionary with both summaries and HTTP-vs-stdio ratios
+    """
+    results = {}
+    for transport in ("stdio", "http"):
+        results[transport] = await run_load(
+            transport=transport, trace=trace, sessions=sessions, iterations=iterations, latency_ms=latency_ms
+        )
+
+    stdio, http = results["stdio"], results["http"]
+    comparison = {
+        "session_setup_p50_ms": {
+            "stdio": stdio["session_setup_ms"].get("p50"),
+            "http": http["session_setup_ms"].get("p50"),
+        },
+        "latency_p99_ms": {"stdio": stdio["latency_ms"].get("p99"), "http": http["latency_ms"].get("p99")},
+    }
+    for metric in COMPARED_METRICS:
+        comparison[metric] = {"stdio": stdio[metric], "http": http[metric]}
+    if stdio["throughput_per_s"]:
+        comparison["http_throughput_speedup"] = round(http["throughput_per_s"] / stdio["throughput_per_s"], 2)
+
+    return {"comparison": comparison, "runs": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark shared HTTP transport against per-client stdio")
+    parser.add_argument("--trace", type=Path, default=DEFAULT_TRACE)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="Write the full results JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(compare_transports(load_trace(args.trace), args.sessions, args.iterations, args.latency_ms))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps(results["comparison"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
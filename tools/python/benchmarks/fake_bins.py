@@ -0,0 +1,199 @@
+"""
+Deterministic fake toolchain for benchmarking and testing the MCP server.
+
+FakeToolchain builds a sandbox with fake ``pnpm``, ``terraform``, ``git`` and
+``trunk`` executables on PATH plus a minimal project tree (deploy scripts,
+trunk CLI path, Terraform environments, docs, a skill, a TS module, the
+offline answers and a game build) that the tools in main.py expect under
+PROJECT_ROOT. Every fake reads its behaviour from environment variables so
+latency and output size can be changed between calls:
+
+- FAKE_TOOL_LATENCY_MS: sleep before answering
+- FAKE_TOOL_OUTPUT_BYTES: pad the output to at least this many bytes
+- FAKE_TOOL_EXIT_CODE: exit status
+- FAKE_TOOL_LOG: append every invocation (argv) as a JSON line to this file
+
+The sandbox also sets dummy AWS credentials and the fake bucket and
+distribution (AWS_S3_BUCKET, AWS_CLOUDFRONT_ID), so AWS tools run against
+moto (benchmarks.bench_tools.fake_aws) instead of a real account.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+FAKE_BINARIES = ("pnpm", "terraform", "git", "trunk")
+FAKE_SCRIPTS = ("deploy-prod.sh", "deploy-dev.sh", "terraform-plan.sh", "terraform-apply.sh")
+TRUNK_CLI_PATH = Path(".trunk-cache/cli/1.25.0-linux-x86_64/trunk")
+ENVIRONMENTS = ("development", "staging", "production")
+FAKE_BUCKET = "fake-bucket"
+FAKE_DISTRIBUTION_ID = "EFAKE123"
+# Unset inside the sandbox: a real profile would take precedence over the dummy credentials
+UNSET_ENV = ("AWS_PROFILE",)
+
+SKILL_MD = """---
+name: demo-skill
+description: Sandbox skill for the benchmarks.
+---
+
+# Demo skill
+
+Read references/guide.md.
+"""
+SHARED_TS = "export const formatScore = (score: number): string => `${score} points`\n"
+OFFLINE_ANSWERS = {"Blumen": {"a": ["Aster", "Anemone"], "t": ["Tulpe"]}}
+
+FAKE_TOOL_SOURCE = '''#!{python}
+"""Fake tool generated by benchmarks/fake_bins.py."""
+import json
+import os
+import sys
+import time
+
+name = os.path.basename(sys.argv[0])
+args = sys.argv[1:]
+
+log = os.environ.get("FAKE_TOOL_LOG")
+if log:
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps({{"tool": name, "args": args}}) + "\\n")
+
+time.sleep(float(os.environ.get("FAKE_TOOL_LATENCY_MS", "0")) / 1000)
+
+if name == "pnpm" and "list" in args and "--json" in args:
+    body = json.dumps([{{"name": f"@riddle-rush/{{pkg}}", "version": "1.0.0", "path": f"/fake/{{pkg}}"}}
+                       for pkg in ("game", "docs", "shared", "types", "config")])
+elif name == "terraform" and "output" in args:
+    body = json.dumps({{"bucket_name": {{"value": "fake-bucket"}}, "cloudfront_distribution_id": {{"value": "EFAKE123"}}}})
+elif name == "terraform" and "state" in args:
+    body = "\\n".join(["aws_s3_bucket.site", "aws_cloudfront_distribution.cdn", "aws_route53_record.apex"])
+elif name == "git" and "branch" in args:
+    body = "main"
+elif name == "git" and "status" in args:
+    body = " M apps/game/app.vue"
+elif name.startswith("deploy-"):
+    phases = ("tests", "build", "upload", "invalidation", "verify")
+    body = "\\n".join(f"::deploy-phase::start::{{p}}\\n{{p}} done\\n::deploy-phase::end::{{p}}::ok" for p in phases)
+else:
+    body = f"fake {{name}} {{' '.join(args)}}: ok"
+
+target = int(os.environ.get("FAKE_TOOL_OUTPUT_BYTES", "0"))
+sys.stdout.write(body + "\\n")
+# Padding is whitespace so JSON outputs stay parseable
+if target > len(body):
+    line = " " * 79 + "\\n"
+    remaining = target - len(body)
+    sys.stdout.write(line * (remaining // len(line)) + " " * (remaining % len(line)))
+sys.stdout.flush()
+sys.exit(int(os.environ.get("FAKE_TOOL_EXIT_CODE", "0")))
+'''
+
+
+class FakeToolchain:
+    """
+    Sandbox with fake binaries on PATH and a fake project root.
+
+    Use as a context manager: on enter the fakes are installed and
+    ``os.environ`` is patched (PATH, FAKE_TOOL_* and AWS variables); on exit the
+    previous environment is restored.
+    """
+
+    def __init__(self, root: Path, latency_ms: float = 0.0, output_bytes: int = 0, exit_code: int = 0):
+        self.root = Path(root)
+        self.bin_dir = self.root / "bin"
+        self.project_root = self.root / "project"
+        self.log_file = self.root / "invocations.jsonl"
+        self.latency_ms = latency_ms
+        self.output_bytes = output_bytes
+        self.exit_code = exit_code
+        self._saved_env: dict[str, str | None] = {}
+
+    def install(self) -> "FakeToolchain":
+        """Write the fake executables and the project skeleton."""
+        source = FAKE_TOOL_SOURCE.format(python=sys.executable)
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        for name in FAKE_BINARIES:
+            self._write_executable(self.bin_dir / name, source)
+
+        scripts_dir = self.project_root / "scripts"
+        scripts_dir.mkdir(parents=True, exist_ok=True)
+        for name in FAKE_SCRIPTS:
+            self._write_executable(scripts_dir / name, source)
+        self._write_executable(self.project_root / TRUNK_CLI_PATH, source)
+
+        for env in ENVIRONMENTS:
+            (self.project_root / "infrastructure" / "environments" / env).mkdir(parents=True, exist_ok=True)
+        docs_dir = self.project_root / "docs"
+        docs_dir.mkdir(parents=True, exist_ok=True)
+        for doc in ("README.md", "AWS-DEPLOYMENT.md", "TESTING.md"):
+            (docs_dir / doc).write_text(f"# {doc}\n", encoding="utf-8")
+        (self.project_root / ".gitlab-ci.yml").write_text("stages: []\n", encoding="utf-8")
+        (self.project_root / ".husky").mkdir(exist_ok=True)
+
+        skill_dir = self.project_root / ".agents" / "skills" / "demo-skill"
+        (skill_dir / "references").mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(SKILL_MD, encoding="utf-8")
+        (skill_dir / "references" / "guide.md").write_text("# Guide\n\n## Usage\n\nRun it.\n", encoding="utf-8")
+        shared = self.project_root / "packages" / "shared" / "src"
+        shared.mkdir(parents=True, exist_ok=True)
+        (shared / "index.ts").write_text(SHARED_TS, encoding="utf-8")
+        data_dir = self.project_root / "apps" / "game" / "public" / "data"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / "offlineAnswers.json").write_text(json.dumps(OFFLINE_ANSWERS), encoding="utf-8")
+        public = self.project_root / "apps" / "game" / ".output" / "public"
+        public.mkdir(parents=True, exist_ok=True)
+        (public / "index.html").write_text("<!doctype html><title>Riddle Rush</title>\n", encoding="utf-8")
+        return self
+
+    def _write_executable(self, path: Path, source: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+        path.chmod(0o755)
+
+    def env(self) -> dict[str, str]:
+        """Environment variables that activate the fakes."""
+        return {
+            "PATH": f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            "FAKE_TOOL_LATENCY_MS": str(self.latency_ms),
+            "FAKE_TOOL_OUTPUT_BYTES": str(self.output_bytes),
+            "FAKE_TOOL_EXIT_CODE": str(self.exit_code),
+            "FAKE_TOOL_LOG": str(self.log_file),
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "AWS_S3_BUCKET": FAKE_BUCKET,
+            "AWS_CLOUDFRONT_ID": FAKE_DISTRIBUTION_ID,
+        }
+
+    def configure(self, latency_ms: float | None = None, output_bytes: int | None = None) -> None:
+        """Change latency or output size of subsequent fake invocations."""
+        if latency_ms is not None:
+            self.latency_ms = latency_ms
+            os.environ["FAKE_TOOL_LATENCY_MS"] = str(latency_ms)
+        if output_bytes is not None:
+            self.output_bytes = output_bytes
+            os.environ["FAKE_TOOL_OUTPUT_BYTES"] = str(output_bytes)
+
+    def invocations(self) -> list[dict]:
+        """All fake invocations recorded so far."""
+        if not self.log_file.exists():
+            return []
+        return [json.loads(line) for line in self.log_file.read_text(encoding="utf-8").splitlines() if line]
+
+    def __enter__(self) -> "FakeToolchain":
+        self.install()
+        for key, value in self.env().items():
+            self._saved_env[key] = os.environ.get(key)
+            os.environ[key] = value
+        for key in UNSET_ENV:
+            self._saved_env[key] = os.environ.pop(key, None)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env.clear()
@@ -0,0 +1,294 @@
+"""
+Multi-client load generator that replays recorded MCP tool-call traces.
+
+Every simulated agent opens its own MCP session and replays a trace (see
+call_recorder.py for the format and for recording one from a live server).
+The server runs locally against the fake toolchain from fake_bins.py:
+
+- stdio: one server process per session, like agents spawning main.py today
+- http: one shared server process, every session connects to it
+
+Usage:
+    python -m benchmarks.load_replay --transport stdio --sessions 8
+    python -m benchmarks.load_replay --transport http --sessions 32 --rate 50 --iterations 3
+    python -m benchmarks.load_replay --trace recorded.jsonl --speed 2 --latency-ms 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from benchmarks.fake_bins import FakeToolchain
+
+SERVER_DIR = Path(__file__).parent.parent
+DEFAULT_TRACE = Path(__file__).parent / "traces" / "agent-session.jsonl"
+
+sys.path.insert(0, str(SERVER_DIR))
+from call_recorder import LIST_TOOLS, load_trace  # noqa: E402
+
+
+@dataclass
+class CallResult:
+    """Outcome of one replayed request."""
+
+    session: int
+    tool: str
+    latency_ms: float
+    ok: bool
+    error: str = ""
+
+
+class RateLimiter:
+    """Spaces requests across all sessions to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"HTTP server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"HTTP server did not listen on port {port} within {timeout}s")
+
+
+def start_http_server(env: dict[str, str], port: int) -> subprocess.Popen:
+    """Start main.py on the streamable HTTP transport and wait until it accepts connections."""
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "--transport", "http", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, process)
+    except Exception:
+        process.kill()
+        raise
+    return process
+
+
+def _stats(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "p50": pct(50),
+        "p90": pct(90),
+        "p99": pct(99),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+async def _replay_session(
+    session: int,
+    client,
+    trace: list[dict],
+    iterations: int,
+    speed: float,
+    limiter: RateLimiter | None,
+    results: list[CallResult],
+) -> None:
+    trace_span = trace[-1]["t"] if trace else 0.0
+    start = time.monotonic()
+    for iteration in range(iterations):
+        for entry in trace:
+            if speed > 0:
+                due = start + (iteration * trace_span + entry["t"]) / speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if limiter is not None:
+                await limiter.acquire()
+
+            call_start = time.perf_counter()
+            try:
+                if entry["tool"] == LIST_TOOLS:
+                    await client.list_tools()
+                    ok, error = True, ""
+                else:
+                    result = await client.call_tool(entry["tool"], entry["args"], raise_on_error=False)
+                    ok, error = not result.is_error, "tool error" if result.is_error else ""
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            latency = (time.perf_counter() - call_start) * 1000
+            results.append(CallResult(session, entry["tool"], latency, ok, error))
+
+
+def summarize(results: list[CallResult], elapsed: float, setup_ms: list[float]) -> dict:
+    """Aggregate replay results into throughput, latency and error figures."""
+    errors = [r for r in results if not r.ok]
+    per_tool: dict[str, dict] = {}
+    for tool in sorted({r.tool for r in results}):
+        calls = [r for r in results if r.tool == tool]
+        per_tool[tool] = {
+            "calls": len(calls),
+            "errors": sum(1 for r in calls if not r.ok),
+            "latency_ms": _stats([r.latency_ms for r in calls]),
+        }
+    error_kinds: dict[str, int] = {}
+    for r in errors:
+        error_kinds[r.error] = error_kinds.get(r.error, 0) + 1
+    return {
+        "calls": len(results),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _stats([r.latency_ms for r in results]),
+        "session_setup_ms": _stats(setup_ms),
+        "error_kinds": error_kinds,
+        "per_tool": per_tool,
+    }
+
+
+async def run_load(
+    transport: str = "stdio",
+    trace: list[dict] | None = None,
+    sessions: int = 4,
+    iterations: int = 1,
+    speed: float = 0.0,
+    rate: float | None = None,
+    latency_ms: float = 0.0,
+    output_bytes: int = 0,
+) -> dict:
+    """
+    Replay a trace from many concurrent sessions against a local server.
+
+    Args:
+        transport: "stdio" (one server per session) or "http" (one shared server)
+        trace: Trace entries (default: benchmarks/traces/agent-session.jsonl)
+        sessions: Number of simultaneous client sessions
+        iterations: How often each session replays the trace
+        speed: Replay speed relative to the recorded offsets (0 = no pauses)
+        rate: Global cap on requests per second across all sessions
+        latency_ms: Latency of every fake binary
+        output_bytes: Output size of every fake binary
+
+    Returns:
+        Summary with throughput, tail latency and error rates
+    """
+    from fastmcp import Client
+    from fastmcp.client.transports import PythonStdioTransport
+
+    if transport not in ("stdio", "http"):
+        raise ValueError(f"Unknown transport: {transport}. Use 'stdio' or 'http'.")
+    trace = trace if trace is not None else load_trace(DEFAULT_TRACE)
+    results: list[CallResult] = []
+    setup_ms: list[float] = []
+    limiter = RateLimiter(rate) if rate else None
+
+    with tempfile.TemporaryDirectory(prefix="mcp-load-") as tmp, FakeToolchain(
+        Path(tmp), latency_ms=latency_ms, output_bytes=output_bytes
+    ) as toolchain:
+        env = {**os.environ, "RIDDLE_RUSH_ROOT": str(toolchain.project_root)}
+        server = None
+        if transport == "http":
+            port = _free_port()
+            server = start_http_server(env, port)
+
+        def make_client():
+            if transport == "http":
+                return Client(f"http://127.0.0.1:{port}/mcp")
+            return Client(
+                PythonStdioTransport(SERVER_DIR / "main.py", env=env, cwd=str(SERVER_DIR), log_file=Path(tmp) / "stdio.log")
+            )
+
+        async def one_session(session: int) -> None:
+            connect_start = time.perf_counter()
+            try:
+                async with make_client() as client:
+                    setup_ms.append((time.perf_counter() - connect_start) * 1000)
+                    await _replay_session(session, client, trace, iterations, speed, limiter, results)
+            except Exception as e:
+                results.append(CallResult(session, "connect", 0.0, False, f"{type(e).__name__}: {e}"))
+
+        try:
+            start = time.monotonic()
+            await asyncio.gather(*(one_session(session) for session in range(sessions)))
+            elapsed = time.monotonic() - start
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+    summary = summarize(results, elapsed, setup_ms)
+    summary.update({"transport": transport, "sessions": sessions, "iterations": iterations, "trace_length": len(trace)})
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay MCP tool-call traces from many simultaneous sessions")
+    parser.add_argument("--transport", choices=("stdio", "http"), default="stdio")
+    parser.add_argument("--trace", type=Path, default=DEFAULT_TRACE, help="JSONL trace recorded via MCP_RECORD_TRACE")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed factor (0 = as fast as possible)")
+    parser.add_argument("--rate", type=float, help="Global request rate cap (requests/s)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--output-bytes", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the summary JSON to this file")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(
+        run_load(
+            transport=args.transport,
+            trace=load_trace(args.trace),
+            sessions=args.sessions,
+            iterations=args.iterations,
+            speed=args.speed,
+            rate=args.rate,
+            latency_ms=args.latency_ms,
+            output_bytes=args.output_bytes,
+        )
+    )
+    rendered = json.dumps(summary, indent=2)
+    if args.output:
+        args.output.write_text(rendered, encoding="utf-8")
+    else:
+        print(rendered)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
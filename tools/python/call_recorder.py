@@ -0,0 +1,66 @@
+"""
+Tool Call Recorder - capture MCP tool-call traces for later replay
+
+When MCP_RECORD_TRACE is set, main.py installs ToolCallRecorder, which appends
+one JSON line per request to that file:
+
+    {"t": 0.0, "tool": "list_tools", "args": {}}
+    {"t": 1.42, "tool": "get_project_status", "args": {}}
+
+``t`` is the offset in seconds from the first recorded request. The format is
+what benchmarks/load_replay.py replays.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from fastmcp.server.middleware import Middleware
+
+LIST_TOOLS = "list_tools"
+
+
+class ToolCallRecorder(Middleware):
+    """Middleware appending every tools/list and tools/call request to a JSONL trace."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._start: float | None = None
+        self._lock = threading.Lock()
+
+    def _record(self, tool: str, args: dict | None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now
+            entry = {"t": round(now - self._start, 3), "tool": tool, "args": args or {}}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+
+    async def on_list_tools(self, context, call_next):
+        self._record(LIST_TOOLS, None)
+        return await call_next(context)
+
+    async def on_call_tool(self, context, call_next):
+        self._record(context.message.name, context.message.arguments)
+        return await call_next(context)
+
+
+def load_trace(path: Path | str) -> list[dict]:
+    """
+    Read a recorded trace, sorted by offset.
+
+    Returns:
+        List of {"t", "tool", "args"} entries
+    """
+    entries = []
+    for line_number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if "tool" not in entry:
+            raise ValueError(f"{path}:{line_number}: trace entry has no 'tool'")
+        entries.append({"t": float(entry.get("t", 0.0)), "tool": entry["tool"], "args": entry.get("args") or {}})
+    return sorted(entries, key=lambda entry: entry["t"])
@@ -0,0 +1,269 @@
+"""
+CloudFront Invalidation - minimal invalidation set from a deploy manifest diff
+
+scripts/aws-deploy.sh used to invalidate ``/*`` on every deploy, which empties
+every edge cache. Instead, compare the manifests that s3_sync.py stores for the
+previous and the new build:
+
+- hashed, immutable assets (``_nuxt/*``, ``name.<hash>.ext``) get a new name when
+  their content changes, so they never need invalidating;
+- mutable files that changed, were removed or were added (a cached 404) do,
+  including the entry points ``index.html``, ``sw.js`` and the web manifest;
+- an index document is also cached under its directory URLs (``/`` through
+  default_root_object, ``/dir/`` and ``/dir`` for Nuxt page routes), which
+  are invalidated with it;
+- directories whose files all changed collapse to ``/dir/*`` without
+  over-invalidating anything; beyond ``max_paths`` the directories costing the
+  fewest unchanged files are collapsed until the set fits.
+
+The paths are submitted in batches that respect CloudFront's in-progress limits
+(3000 paths, 15 wildcard paths), waiting for earlier batches when needed.
+
+Usage:
+    python cloudfront_invalidation.py --distribution-id E123 --paths-file /tmp/paths.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+
+MAX_PATHS_IN_PROGRESS = 3000
+MAX_WILDCARDS_IN_PROGRESS = 15
+DEFAULT_MAX_PATHS = 50
+INVALIDATE_ALL = "/*"
+
+IMMUTABLE_DIRS = ("_nuxt/",)
+ENTRY_POINTS = ("sw.js", "registerSW.js", "manifest.webmanifest", "manifest.json")
+# a hex content hash, e.g. logo.3f9a2b1c.png; not any long word (icon-maskable.svg, pwa-icon-template.svg)
+HASHED_NAME = re.compile(r"[.-]([0-9a-f]{8,})\.[a-z0-9]+$")
+
+
+def is_immutable(key: str) -> bool:
+    """True for content-hashed assets whose URL changes whenever their content does."""
+    name = PurePosixPath(key).name
+    if name.endswith(".html") or name in ENTRY_POINTS:
+        return False
+    if key.startswith(IMMUTABLE_DIRS):
+        return True
+    return bool(HASHED_NAME.search(name)) and not name.startswith("workbox-")
+
+
+def changed_keys(previous: dict[str, dict], current: dict[str, dict]) -> list[str]:
+    """Keys whose content differs between two manifest ``files`` sections (added, removed or modified)."""
+    keys = set(previous) | set(current)
+    return sorted(k for k in keys if previous.get(k, {}).get("md5") != current.get(k, {}).get("md5"))
+
+
+def _parents(key: str) -> list[str]:
+    """Directory prefixes of a key, outermost first ("" is the root)."""
+    parts = key.split("/")[:-1]
+    return [""] + ["/".join(parts[: i + 1]) + "/" for i in range(len(parts))]
+
+
+def _path(key: str) -> str:
+    return "/" + key
+
+
+def _index_routes(keys: set[str]) -> set[str]:
+    """Directory URLs CloudFront caches index documents under: "/" for index.html, "/dir/" and "/dir"."""
+    routes = set()
+    for key in keys:
+        if PurePosixPath(key).name == "index.html":
+            directory = key[: -len("index.html")]
+            routes.add("/" + directory)
+            if directory:
+                routes.add("/" + directory.rstrip("/"))
+    return routes
+
+
+def _uncovered(paths: set[str]) -> set[str]:
+    """Drop paths that a wildcard in the set already matches ("/dir/*" covers "/dir/" and "/dir/a.json")."""
+    prefixes = [p[:-1] for p in paths if p.endswith("*")]
+    return {p for p in paths if p.endswith("*") or not any(p.startswith(prefix) for prefix in prefixes)}
+
+
+def _wildcard(prefix: str) -> str:
+    return "/" + prefix + "*"
+
+
+def collapse_paths(targets: set[str], known: set[str], max_paths: int = DEFAULT_MAX_PATHS) -> list[str]:
+    """
+    Collapse keys to invalidate into as few CloudFront paths as possible.
+
+    Args:
+        targets: Keys that must be invalidated
+        known: Every key of the old and new build (to see what a wildcard would also hit)
+        max_paths: Upper bound on the number of paths returned
+
+    Returns:
+        Sorted CloudFront paths ("/", "/index.html", "/data/*", ...)
+    """
+    if not targets:
+        return []
+
+    under: dict[str, set[str]] = defaultdict(set)
+    for key in known | targets:
+        for prefix in _parents(key):
+            under[prefix].add(key)
+
+    # Lossless: a directory whose every file is a target becomes one wildcard
+    covered: dict[str, set[str]] = {}
+    for prefix in sorted(under, key=len):
+        if any(prefix.startswith(outer) for outer in covered):
+            continue
+        keys = under[prefix]
+        if len(keys) > 1 and keys <= targets:
+            covered[prefix] = keys
+    remaining = targets - set().union(*covered.values()) if covered else set(targets)
+    paths = _uncovered({_wildcard(p) for p in covered} | {_path(k) for k in remaining} | _index_routes(targets))
+
+    # Lossy: collapse the directory that saves most paths per extra file invalidated
+    while len(paths) > max_paths:
+        best, best_score = None, None
+        for prefix, keys in under.items():
+            inside = {p for p in paths if p.startswith("/" + prefix) and p != _wildcard(prefix)}
+            if len(inside) < 2:
+                continue
+            extra = len(keys - targets)
+            score = (extra + 1) / (len(inside) - 1)
+            if best_score is None or score < best_score:
+                best, best_score = prefix, score
+        if best is None:
+            return [INVALIDATE_ALL]
+        paths = _uncovered(paths | {_wildcard(best)})
+
+    if INVALIDATE_ALL in paths:
+        return [INVALIDATE_ALL]
+    return sorted(paths)
+
+
+@dataclass
+class InvalidationPlan:
+    """Paths to invalidate for a deploy and how they were derived."""
+
+    paths: list[str]
+    changed: list[str] = field(default_factory=list)
+    skipped_immutable: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "paths": self.paths,
+            "changed": len(self.changed),
+            "skipped_immutable": len(self.skipped_immutable),
+            "batches": batch_paths(self.paths),
+        }
+
+
+def plan_invalidation(
+    previous: dict[str, dict], current: dict[str, dict], max_paths: int = DEFAULT_MAX_PATHS
+) -> InvalidationPlan:
+    """
+    Compute the invalidation set between two manifest ``files`` sections.
+
+    Without a previous manifest nothing is known about the edge caches, so
+    everything is invalidated.
+    """
+    if not previous:
+        return InvalidationPlan([INVALIDATE_ALL], sorted(current))
+
+    changed = changed_keys(previous, current)
+    skipped = [k for k in changed if is_immutable(k)]
+    targets = set(changed) - set(skipped)
+    paths = collapse_paths(targets, set(previous) | set(current), max_paths)
+    return InvalidationPlan(paths, changed, skipped)
+
+
+def batch_paths(
+    paths: list[str],
+    max_paths: int = MAX_PATHS_IN_PROGRESS,
+    max_wildcards: int = MAX_WILDCARDS_IN_PROGRESS,
+) -> list[list[str]]:
+    """Split paths into invalidation batches that each fit CloudFront's in-progress limits."""
+    batches: list[list[str]] = []
+    current: list[str] = []
+    wildcards = 0
+    for path in paths:
+        is_wildcard = path.endswith("*")
+        if current and (len(current) >= max_paths or (is_wildcard and wildcards >= max_wildcards)):
+            batches.append(current)
+            current, wildcards = [], 0
+        current.append(path)
+        wildcards += is_wildcard
+    if current:
+        batches.append(current)
+    return batches
+
+
+def wait_for_invalidation(client, distribution_id: str, invalidation_id: str, timeout: float = 900.0, poll: float = 10.0) -> bool:
+    """Poll until an invalidation completed; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get_invalidation(DistributionId=distribution_id, Id=invalidation_id)["Invalidation"]["Status"]
+        if status == "Completed":
+            return True
+        time.sleep(poll)
+    return False
+
+
+def submit_invalidation(client, distribution_id: str, paths: list[str], poll: float = 10.0) -> list[str]:
+    """
+    Submit paths as one or more invalidations.
+
+    A batch rejected with TooManyInvalidationsInProgress is retried once the
+    previously submitted batch has completed.
+
+    Returns:
+        Invalidation IDs in submission order
+    """
+    ids: list[str] = []
+    for batch in batch_paths(paths):
+        request = {
+            "DistributionId": distribution_id,
+            "InvalidationBatch": {
+                "Paths": {"Quantity": len(batch), "Items": batch},
+                "CallerReference": f"deploy-{uuid.uuid4()}",
+            },
+        }
+        while True:
+            try:
+                ids.append(client.create_invalidation(**request)["Invalidation"]["Id"])
+                break
+            except client.exceptions.TooManyInvalidationsInProgress:
+                if not ids or not wait_for_invalidation(client, distribution_id, ids[-1], poll=poll):
+                    raise
+    return ids
+
+
+def make_client(region: str | None = None):
+    import boto3
+
+    return boto3.client("cloudfront", region_name=region)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Submit a minimal CloudFront invalidation computed by s3_sync.py")
+    parser.add_argument("--distribution-id", required=True)
+    parser.add_argument("--paths-file", required=True, help="JSON written by s3_sync.py --invalidation-output")
+    args = parser.parse_args(argv)
+
+    with open(args.paths_file, encoding="utf-8") as handle:
+        paths = json.load(handle)["paths"]
+    if not paths:
+        print("Nothing to invalidate")
+        return 0
+
+    ids = submit_invalidation(make_client(), args.distribution_id, paths)
+    print(f"Invalidated {len(paths)} path(s) in {len(ids)} batch(es): {' '.join(paths[:10])}")
+    # Last line is the most recent invalidation ID (read by aws-deploy.sh)
+    print(ids[-1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
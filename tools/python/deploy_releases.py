@@ -0,0 +1,228 @@
+"""
+Deploy Releases - content-addressed release manifests and instant rollback
+
+Every sync by s3_sync.py records the deployed site as an immutable release
+manifest next to the S3 objects:
+
+    .deploy/manifest.json              the live release (what s3_sync compares against)
+    .deploy/releases/<id>.json         one manifest per release, <id> = hash of its files
+    .deploy/releases/index.json        releases, oldest first
+    .deploy/blobs/<md5>                copies of mutable files (index.html, sw.js, data/*.json, ...)
+
+Content-addressed assets (``_nuxt/*``, or a name carrying a prefix of the
+file's own md5) cannot change under a given name, so a release only needs blob
+copies of the other files; a name that merely looks hashed is copied too. Rolling back then means
+server-side copying those blobs back over the live keys: no rebuild, no
+upload. s3_sync keeps the assets of the last RETAIN_RELEASES releases when it
+deletes stale objects, so they are still there for a rollback.
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+from cloudfront_invalidation import HASHED_NAME, IMMUTABLE_DIRS, plan_invalidation
+
+DEPLOY_PREFIX = ".deploy/"
+MANIFEST_KEY = DEPLOY_PREFIX + "manifest.json"
+RELEASES_PREFIX = DEPLOY_PREFIX + "releases/"
+INDEX_KEY = RELEASES_PREFIX + "index.json"
+BLOBS_PREFIX = DEPLOY_PREFIX + "blobs/"
+MANIFEST_VERSION = 1
+RETAIN_RELEASES = 5
+
+
+def release_id(files: dict[str, dict]) -> str:
+    """Content address of a release: hash over every path and its content hash and headers."""
+    fields = ("md5", "cache_control", "content_type", "content_encoding")
+    canonical = json.dumps({key: [f.get(name) for name in fields] for key, f in sorted(files.items())})
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def is_content_addressed(key: str, md5: str) -> bool:
+    """True if ``key`` can only ever hold this content: a build asset or a name embedding the md5."""
+    if key.startswith(IMMUTABLE_DIRS):
+        return True
+    match = HASHED_NAME.search(PurePosixPath(key).name)
+    return bool(match) and md5.startswith(match.group(1))
+
+
+def _get_json(client, bucket: str, key: str):
+    try:
+        return json.loads(client.get_object(Bucket=bucket, Key=key)["Body"].read())
+    except client.exceptions.NoSuchKey:
+        return None
+
+
+def _put_json(client, bucket: str, key: str, value) -> None:
+    client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(value, indent=2).encode(),
+        ContentType="application/json",
+        CacheControl="no-store",
+    )
+
+
+def load_current_manifest(client, bucket: str) -> dict:
+    """The live release manifest ({} if none or written by an incompatible version)."""
+    manifest = _get_json(client, bucket, MANIFEST_KEY) or {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def list_releases(client, bucket: str) -> list[dict]:
+    """Recorded releases, oldest first: {"id", "created", "files", "bytes"}."""
+    return _get_json(client, bucket, INDEX_KEY) or []
+
+
+def load_release(client, bucket: str, ref: str) -> dict:
+    """
+    Load a release manifest by id, unique id prefix, or "current" / "previous".
+
+    Raises:
+        KeyError: No (unique) release matches
+    """
+    releases = list_releases(client, bucket)
+    if ref in ("current", "previous"):
+        current = load_current_manifest(client, bucket).get("release")
+        ids = [r["id"] for r in releases]
+        if current not in ids or (ref == "previous" and ids.index(current) == 0):
+            raise KeyError(f"No {ref} release recorded")
+        ref = current if ref == "current" else ids[ids.index(current) - 1]
+
+    matches = [r["id"] for r in releases if r["id"].startswith(ref)]
+    if len(matches) != 1:
+        raise KeyError(f"{'Ambiguous' if matches else 'Unknown'} release: {ref}")
+    return _get_json(client, bucket, f"{RELEASES_PREFIX}{matches[0]}.json")
+
+
+def _ensure_blobs(client, bucket: str, files: dict[str, dict], workers: int) -> int:
+    """Copy all but content-addressed files to .deploy/blobs/<md5> unless the blob exists. Returns copies made."""
+    existing = set()
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=BLOBS_PREFIX):
+        existing.update(obj["Key"] for obj in page.get("Contents", []))
+
+    todo = {
+        BLOBS_PREFIX + f["md5"]: key
+        for key, f in files.items()
+        if not is_content_addressed(key, f["md5"]) and BLOBS_PREFIX + f["md5"] not in existing
+    }
+
+    def copy(blob: str) -> None:
+        client.copy_object(Bucket=bucket, Key=blob, CopySource={"Bucket": bucket, "Key": todo[blob]})
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(copy, todo))
+    return len(todo)
+
+
+def record_release(client, bucket: str, manifest: dict, workers: int = 8) -> dict:
+    """
+    Store ``manifest`` (already uploaded) as an immutable release and make it the live one.
+
+    Returns:
+        Index entry of the release
+    """
+    files = manifest["files"]
+    rid = release_id(files)
+    _ensure_blobs(client, bucket, files, workers)
+
+    release = {**manifest, "release": rid}
+    _put_json(client, bucket, f"{RELEASES_PREFIX}{rid}.json", release)
+
+    entry = {"id": rid, "created": manifest["created"], "files": len(files), "bytes": sum(f["size"] for f in files.values())}
+    releases = [r for r in list_releases(client, bucket) if r["id"] != rid] + [entry]
+    _put_json(client, bucket, INDEX_KEY, releases)
+    _put_json(client, bucket, MANIFEST_KEY, release)
+    return entry
+
+
+def retained_keys(client, bucket: str, retain: int = RETAIN_RELEASES) -> set[str]:
+    """Object keys referenced by the last ``retain`` releases (kept when deleting stale objects)."""
+    keys: set[str] = set()
+    for entry in list_releases(client, bucket)[-retain:] if retain > 0 else []:
+        release = _get_json(client, bucket, f"{RELEASES_PREFIX}{entry['id']}.json") or {}
+        keys.update(release.get("files", {}))
+    return keys
+
+
+def diff_releases(base: dict, target: dict) -> dict:
+    """
+    Compare two release manifests.
+
+    Returns:
+        Added/removed/changed paths, unchanged count and byte delta (target - base)
+    """
+    a, b = base["files"], target["files"]
+    changed = sorted(k for k in a.keys() & b.keys() if a[k]["md5"] != b[k]["md5"])
+    same_content = [k for k in a.keys() & b.keys() if a[k]["md5"] == b[k]["md5"]]
+    header_only = sorted(k for k in same_content if a[k].get("cache_control") != b[k].get("cache_control"))
+    return {
+        "base": base.get("release"),
+        "target": target.get("release"),
+        "added": sorted(b.keys() - a.keys()),
+        "removed": sorted(a.keys() - b.keys()),
+        "changed": changed,
+        "headers_changed": header_only,
+        "unchanged": len(a.keys() & b.keys()) - len(changed) - len(header_only),
+        "bytes_delta": sum(f["size"] for f in b.values()) - sum(f["size"] for f in a.values()),
+    }
+
+
+def rollback(client, bucket: str, ref: str, dry_run: bool = False, workers: int = 8) -> dict:
+    """
+    Make an earlier release live again by restoring its files from blobs.
+
+    Content-addressed assets are only checked for presence. Files added after the
+    target release are left in place (nothing references them any more).
+
+    Returns:
+        Restored keys, missing objects (rollback refused if any) and the invalidation plan
+    """
+    target = load_release(client, bucket, ref)
+    current = load_current_manifest(client, bucket)
+    live = current.get("files", {})
+
+    existing = set()
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+        existing.update(obj["Key"] for obj in page.get("Contents", []))
+
+    differing = sorted(k for k, f in target["files"].items() if live.get(k, {}).get("md5") != f["md5"] or k not in existing)
+    pinned = {k for k in differing if is_content_addressed(k, target["files"][k]["md5"])}
+    restore = [k for k in differing if k not in pinned]
+    missing = [k for k in differing if k in pinned and k not in existing]
+    missing += [k for k in restore if BLOBS_PREFIX + target["files"][k]["md5"] not in existing]
+    result = {
+        "release": target["release"],
+        "from_release": current.get("release"),
+        "restored": restore,
+        "missing": missing,
+        "dry_run": dry_run,
+        "invalidation": plan_invalidation(live, target["files"]).to_dict() if live else {"paths": ["/*"]},
+    }
+    if missing or dry_run:
+        return result
+
+    def restore_one(key: str) -> None:
+        f = target["files"][key]
+        extra = {"ContentType": f.get("content_type") or "application/octet-stream"}
+        if f.get("cache_control"):
+            extra["CacheControl"] = f["cache_control"]
+        if f.get("content_encoding"):
+            extra["ContentEncoding"] = f["content_encoding"]
+        client.copy_object(
+            Bucket=bucket,
+            Key=key,
+            CopySource={"Bucket": bucket, "Key": BLOBS_PREFIX + f["md5"]},
+            MetadataDirective="REPLACE",
+            **extra,
+        )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(restore_one, restore))
+    _put_json(client, bucket, MANIFEST_KEY, target)
+    result["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return result
@@ -0,0 +1,334 @@
+"""
+Deploy Tracing - phase-level spans for the AWS deploy scripts
+
+The deploy scripts (scripts/deploy-*.sh, scripts/aws-deploy.sh) print phase
+markers through ``deploy_phase_start`` / ``deploy_phase_end`` from
+scripts/lib/deploy-common.sh:
+
+    ::deploy-phase::start::build
+    ::deploy-phase::end::build::ok
+
+This module runs a deploy script, timestamps those markers as they arrive,
+turns them into spans and exports the trace as OTLP-compatible JSON
+(the ``resourceSpans`` layout accepted by OTLP/HTTP collectors).
+"""
+
+import contextlib
+import json
+import os
+import secrets
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PHASE_MARKER_PREFIX = "::deploy-phase::"
+KILL_GRACE_S = 5  # SIGTERM -> SIGKILL delay for a timed out deploy
+
+# OTLP enum values (opentelemetry-proto trace.proto)
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+SERVICE_NAME = "riddle-rush-deploy"
+SCOPE_NAME = "riddle-rush-agents.deploy_tracing"
+
+
+@dataclass
+class Span:
+    """A single timed span of a deploy trace."""
+
+    name: str
+    span_id: str
+    parent_span_id: str
+    start_ns: int
+    end_ns: int | None = None
+    status: str = "ok"
+    attributes: dict[str, str | int] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else self.start_ns
+        return (end_ns - self.start_ns) / 1_000_000
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+class DeployTrace:
+    """
+    Collects spans for one deploy run.
+
+    A root span covers the whole script; every ``start``/``end`` marker pair
+    becomes a child span of the root.
+    """
+
+    def __init__(self, name: str, attributes: dict[str, str | int] | None = None):
+        self.trace_id = secrets.token_hex(16)
+        self.root = Span(
+            name=name,
+            span_id=_new_span_id(),
+            parent_span_id="",
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        self.phases: list[Span] = []
+        self._open: dict[str, Span] = {}
+
+    def start_phase(self, name: str, timestamp_ns: int | None = None) -> None:
+        # A repeated start (e.g. checks run twice) closes the previous span first
+        if name in self._open:
+            self.end_phase(name, timestamp_ns=timestamp_ns)
+        span = Span(
+            name=name,
+            span_id=_new_span_id(),
+            parent_span_id=self.root.span_id,
+            start_ns=time.time_ns() if timestamp_ns is None else timestamp_ns,
+        )
+        self._open[name] = span
+        self.phases.append(span)
+
+    def end_phase(self, name: str, status: str = "ok", timestamp_ns: int | None = None) -> None:
+        span = self._open.pop(name, None)
+        if span is None:
+            return
+        span.end_ns = time.time_ns() if timestamp_ns is None else timestamp_ns
+        span.status = status
+
+    def handle_line(self, line: str) -> bool:
+        """
+        Feed one line of script output into the trace.
+
+        Args:
+            line: A single output line (with or without trailing newline)
+
+        Returns:
+            True if the line was a phase marker, False otherwise
+        """
+        stripped = line.strip()
+        if not stripped.startswith(PHASE_MARKER_PREFIX):
+            return False
+
+        parts = stripped[len(PHASE_MARKER_PREFIX):].split("::")
+        if len(parts) < 2 or not parts[1]:
+            return False
+
+        event, name = parts[0], parts[1]
+        if event == "start":
+            self.start_phase(name)
+        elif event == "end":
+            self.end_phase(name, status=parts[2] if len(parts) > 2 and parts[2] else "ok")
+        else:
+            return False
+        return True
+
+    def finish(self, returncode: int) -> None:
+        """Close the root span and any phase left open by a failing script."""
+        now = time.time_ns()
+        for name in list(self._open):
+            self.end_phase(name, status="error", timestamp_ns=now)
+        self.root.end_ns = now
+        self.root.status = "ok" if returncode == 0 else "error"
+        self.root.attributes["process.exit_code"] = returncode
+
+    def phase_durations(self) -> dict[str, float]:
+        """Duration in milliseconds per phase (repeated phases are summed)."""
+        durations: dict[str, float] = {}
+        for span in self.phases:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration_ms
+        return durations
+
+    def to_otlp(self) -> dict:
+        """Export the trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [self._otlp_span(span) for span in [self.root, *self.phases]],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _otlp_span(self, span: Span) -> dict:
+        end_ns = span.end_ns if span.end_ns is not None else span.start_ns
+        return {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_span_id,
+            "name": span.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": STATUS_CODE_OK if span.status == "ok" else STATUS_CODE_ERROR},
+        }
+
+
+def _otlp_attributes(attributes: dict[str, str | int]) -> list[dict]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+def _kill_group(process: subprocess.Popen, sig: int) -> None:
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(process.pid, sig)
+
+
+def run_traced(
+    cmd: list[str],
+    trace: DeployTrace,
+    cwd: Path | str | None = None,
+    timeout: int = 600,
+    env: dict[str, str] | None = None,
+    popen=subprocess.Popen,
+) -> dict[str, str | int]:
+    """
+    Run a command, feeding its stdout through the trace as it streams.
+
+    Phase markers are removed from the returned stdout.
+
+    Args:
+        cmd: Command to run
+        trace: Trace receiving the phase markers
+        cwd: Working directory
+        timeout: Timeout in seconds (the process group is killed when exceeded)
+        env: Environment for the child process
+        popen: Process factory (e.g. JobRunner.popen to track the deploy)
+
+    Returns:
+        Dictionary with stdout, stderr, returncode and timed_out
+    """
+    process = popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,
+    )
+
+    stdout_lines: list[str] = []
+    stderr_chunks: list[str] = []
+
+    def _read_stdout() -> None:
+        assert process.stdout is not None
+        for line in process.stdout:
+            if not trace.handle_line(line):
+                stdout_lines.append(line)
+
+    def _read_stderr() -> None:
+        assert process.stderr is not None
+        stderr_chunks.append(process.stderr.read())
+
+    readers = [threading.Thread(target=_read_stdout, daemon=True), threading.Thread(target=_read_stderr, daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        # terraform/aws children share the pipes: stop the whole group, not just the script
+        _kill_group(process, signal.SIGTERM)
+        try:
+            returncode = process.wait(timeout=KILL_GRACE_S)
+        except subprocess.TimeoutExpired:
+            _kill_group(process, signal.SIGKILL)
+            returncode = process.wait()
+
+    for reader in readers:
+        reader.join(timeout=5)
+
+    trace.finish(returncode)
+    if timed_out:
+        trace.root.attributes["deploy.timed_out"] = True
+
+    return {
+        "stdout": "".join(stdout_lines),
+        "stderr": "".join(stderr_chunks),
+        "returncode": returncode,
+        "timed_out": timed_out,
+    }
+
+
+def trace_dir(project_root: Path) -> Path:
+    """Directory holding exported traces (override with DEPLOY_TRACE_DIR)."""
+    return Path(os.environ.get("DEPLOY_TRACE_DIR", project_root / ".deploy-traces"))
+
+
+def write_trace(trace: DeployTrace, directory: Path, environment: str) -> Path:
+    """
+    Write a trace as OTLP JSON to ``<directory>/<environment>-<timestamp>.json``.
+
+    Returns:
+        Path of the written file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(trace.root.start_ns / 1_000_000_000))
+    path = directory / f"{environment}-{stamp}-{trace.root.span_id[:6]}.json"
+    path.write_text(json.dumps(trace.to_otlp(), indent=2), encoding="utf-8")
+    return path
+
+
+def load_phase_durations(path: Path) -> dict[str, float]:
+    """Read an exported OTLP trace file back into per-phase durations (ms)."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    durations: dict[str, float] = {}
+    for resource_spans in data.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                if not span.get("parentSpanId"):
+                    continue
+                duration = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1_000_000
+                durations[span["name"]] = durations.get(span["name"], 0.0) + duration
+    return durations
+
+
+def compare_traces(baseline: Path, current: Path) -> dict[str, dict[str, float | None]]:
+    """
+    Compare per-phase durations of two exported traces.
+
+    Returns:
+        Mapping of phase name to baseline_ms, current_ms, delta_ms and delta_pct
+    """
+    before = load_phase_durations(baseline)
+    after = load_phase_durations(current)
+    comparison: dict[str, dict[str, float | None]] = {}
+    for name in sorted(set(before) | set(after)):
+        old = before.get(name)
+        new = after.get(name)
+        delta = new - old if old is not None and new is not None else None
+        comparison[name] = {
+            "baseline_ms": old,
+            "current_ms": new,
+            "delta_ms": delta,
+            "delta_pct": round(delta / old * 100, 1) if delta is not None and old else None,
+        }
+    return comparison
+
+
+def latest_traces(directory: Path, environment: str, count: int = 2) -> list[Path]:
+    """Most recent trace files for an environment, oldest first."""
+    if not directory.exists():
+        return []
+    files = sorted(directory.glob(f"{environment}-*.json"), key=lambda p: p.stat().st_mtime)
+    return files[-count:]
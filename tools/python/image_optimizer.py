@@ -0,0 +1,239 @@
+"""
+Image Optimizer - responsive WebP/AVIF variants of the game and docs artwork
+
+Transcodes the PNG/JPEG artwork (apps/game/public/assets/*, the PWA icons and
+docs/gfx) to WebP and AVIF at several responsive widths, in a process pool
+across all cores. Every output directory gets a ``manifest.json`` mapping the
+original URL to its variants and ready-made ``srcset`` strings:
+
+    {"/assets/splash/LOGO.png": {
+        "width": 812, "height": 400, "bytes": 183211,
+        "srcset": {"avif": "/optimized/assets/splash/LOGO-320w.avif 320w, ...", "webp": "..."},
+        "variants": {"avif": [{"url": ..., "width": 320, "bytes": 9120}, ...], "webp": [...]}}}
+
+Inputs are keyed by content hash in ``.image-state.json`` next to the manifest:
+an input whose bytes and settings did not change is not transcoded again.
+
+Pillow is optional (``uv sync --extra assets``); AVIF needs Pillow >= 11.3 or
+the pillow-avif-plugin.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+DEFAULT_WIDTHS = (320, 640, 1080)
+QUALITY = {"webp": 80, "avif": 50}
+STATE_FILE = ".image-state.json"
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ImageTarget:
+    """A set of source images and where their variants go."""
+
+    name: str
+    root: str  # relative to the project root
+    patterns: tuple[str, ...]
+    output: str  # relative to the project root
+    url_prefix: str  # prepended to variant names to form their URL
+    source_url_prefix: str  # prepended to source paths to form the manifest keys
+
+
+DEFAULT_TARGETS = (
+    ImageTarget(
+        "game-assets",
+        "apps/game/public/assets",
+        ("**/*",),
+        "apps/game/public/optimized/assets",
+        "/optimized/assets/",
+        "/assets/",
+    ),
+    ImageTarget(
+        "pwa-icons",
+        "apps/game/public",
+        ("pwa-*.png", "apple-touch-icon.png", "favicon-*.png"),
+        "apps/game/public/optimized/icons",
+        "/optimized/icons/",
+        "/",
+    ),
+    ImageTarget("docs-gfx", "docs/gfx", ("**/*",), "docs/gfx/optimized", "optimized/", ""),
+)
+
+
+def available_formats() -> tuple[str, ...]:
+    """Output formats this Pillow build can encode (empty without Pillow)."""
+    try:
+        from PIL import features
+    except ImportError:
+        return ()
+    return tuple(fmt for fmt in ("avif", "webp") if features.check(fmt))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _variant_name(rel: str, width: int, fmt: str) -> str:
+    stem = rel.rsplit(".", 1)[0]
+    return f"{stem}-{width}w.{fmt}"
+
+
+def _transcode(source: str, output: str, rel: str, widths: tuple[int, ...], formats: tuple[str, ...]) -> dict:
+    """Worker: write every width/format variant of one image. Returns its manifest entry (relative names)."""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("P", "LA") else "RGB")
+        width, height = image.size
+        targets = sorted({w for w in widths if w < width} | {width})
+
+        variants: dict[str, list[dict]] = {fmt: [] for fmt in formats}
+        for target_width in targets:
+            resized = image
+            if target_width != width:
+                resized = image.resize((target_width, max(1, round(height * target_width / width))), Image.LANCZOS)
+            for fmt in formats:
+                name = _variant_name(rel, target_width, fmt)
+                path = Path(output) / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                resized.save(path, fmt.upper(), quality=QUALITY[fmt])
+                variants[fmt].append({"name": name, "width": target_width, "bytes": path.stat().st_size})
+
+    return {"width": width, "height": height, "bytes": os.path.getsize(source), "variants": variants}
+
+
+def _collect(root: Path, patterns: tuple[str, ...], output: Path) -> list[Path]:
+    files = {p for pattern in patterns for p in root.glob(pattern)}
+    return sorted(p for p in files if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS and output not in p.parents)
+
+
+def _srcset(url_prefix: str, variants: list[dict]) -> str:
+    return ", ".join(f"{url_prefix}{v['name']} {v['width']}w" for v in variants)
+
+
+def optimize_target(
+    project_root: Path,
+    target: ImageTarget,
+    widths: tuple[int, ...] = DEFAULT_WIDTHS,
+    formats: tuple[str, ...] | None = None,
+    pool: ProcessPoolExecutor | None = None,
+) -> dict:
+    """
+    Transcode the changed images of one target and rewrite its manifest.
+
+    Returns:
+        Report with processed/unchanged/removed counts and bytes before/after
+    """
+    formats = tuple(formats or available_formats())
+    if not formats:
+        raise RuntimeError("Pillow with WebP or AVIF support is required (uv sync --extra assets)")
+
+    root = project_root / target.root
+    output = project_root / target.output
+    state_path = output / STATE_FILE
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+    settings = {"widths": sorted(widths), "formats": sorted(formats), "quality": QUALITY}
+
+    sources = {p.relative_to(root).as_posix(): p for p in _collect(root, target.patterns, output)}
+    hashes = {rel: _sha256(p) for rel, p in sources.items()}
+
+    def up_to_date(rel: str) -> bool:
+        entry = state.get(rel)
+        return (
+            entry is not None
+            and entry["hash"] == hashes[rel]
+            and entry["settings"] == settings
+            and all((output / v["name"]).exists() for vs in entry["image"]["variants"].values() for v in vs)
+        )
+
+    stale = [rel for rel in sources if not up_to_date(rel)]
+    own_pool = pool is None
+    pool = pool or ProcessPoolExecutor(max_workers=os.cpu_count())
+    try:
+        futures = {
+            rel: pool.submit(_transcode, str(sources[rel]), str(output), rel, tuple(widths), formats) for rel in stale
+        }
+        for rel, future in futures.items():
+            state[rel] = {"hash": hashes[rel], "settings": settings, "image": future.result()}
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    removed = [rel for rel in state if rel not in sources]
+    for rel in removed:
+        for variants in state.pop(rel)["image"]["variants"].values():
+            for v in variants:
+                (output / v["name"]).unlink(missing_ok=True)
+
+    manifest = {}
+    bytes_after = dict.fromkeys(formats, 0)
+    for rel in sorted(sources):
+        image = state[rel]["image"]
+        manifest[target.source_url_prefix + rel] = {
+            "width": image["width"],
+            "height": image["height"],
+            "bytes": image["bytes"],
+            "srcset": {fmt: _srcset(target.url_prefix, vs) for fmt, vs in image["variants"].items()},
+            "variants": {
+                fmt: [{"url": target.url_prefix + v["name"], "width": v["width"], "bytes": v["bytes"]} for v in vs]
+                for fmt, vs in image["variants"].items()
+            },
+        }
+        for fmt, vs in image["variants"].items():
+            if fmt in bytes_after:
+                bytes_after[fmt] += vs[-1]["bytes"]  # full-width variant
+
+    output.mkdir(parents=True, exist_ok=True)
+    (output / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    return {
+        "images": len(sources),
+        "processed": len(stale),
+        "unchanged": len(sources) - len(stale),
+        "removed": len(removed),
+        "bytes_before": sum(state[rel]["image"]["bytes"] for rel in sources),
+        "bytes_after_full_width": bytes_after,
+        "manifest": str(output / MANIFEST_FILE),
+    }
+
+
+def optimize_images(
+    project_root: Path,
+    targets: tuple[ImageTarget, ...] = DEFAULT_TARGETS,
+    widths: tuple[int, ...] = DEFAULT_WIDTHS,
+    formats: tuple[str, ...] | None = None,
+    workers: int | None = None,
+) -> dict:
+    """
+    Optimize every target with one shared process pool.
+
+    Returns:
+        Per-target reports plus totals of bytes before and after (full-width variants)
+    """
+    start = time.perf_counter()
+    formats = tuple(formats or available_formats())
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        reports = {t.name: optimize_target(project_root, t, widths, formats, pool) for t in targets}
+
+    before = sum(r["bytes_before"] for r in reports.values())
+    after = {fmt: sum(r["bytes_after_full_width"][fmt] for r in reports.values()) for fmt in formats}
+    return {
+        "targets": reports,
+        "bytes_before": before,
+        "bytes_after_full_width": after,
+        "saved_percent": {fmt: round(100 * (1 - size / before), 1) if before else 0.0 for fmt, size in after.items()},
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,160 @@
+"""
+Job Runner - bounded, drainable subprocess execution for the MCP server
+
+Every tool that shells out goes through one JobRunner so that:
+- at most ``max_workers`` subprocess jobs run at once (MCP_WORKERS), no matter
+  how many clients share the server;
+- each job runs in its own process group, so a timeout kills node/vitest
+  grandchildren as well;
+- shutdown can drain: new jobs are rejected, running ones get a grace period
+  and are then terminated.
+
+``JobRunner.run`` mirrors ``subprocess.run`` (CompletedProcess result,
+TimeoutExpired on timeout) so tools keep their existing error handling.
+
+The tools stay sync functions: FastMCP 3 and later runs them in its
+threadpool, so concurrent calls really share the slots and a blocked call
+does not stall the event loop (2.x ran them inline, one at a time).
+"""
+
+import contextlib
+import os
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+
+class JobRejected(RuntimeError):
+    """Raised when a job is submitted while the runner is draining."""
+
+
+def _kill_group(process: subprocess.Popen, sig: int) -> None:
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(process.pid, sig)
+
+
+class JobRunner:
+    """Runs subprocess jobs with a concurrency limit and graceful draining."""
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen] = set()
+        self._draining = False
+        self.started = 0
+        self.rejected = 0
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def running(self) -> list[subprocess.Popen]:
+        """Processes that have not exited yet."""
+        with self._lock:
+            self._processes = {p for p in self._processes if p.poll() is None}
+            return list(self._processes)
+
+    @contextmanager
+    def slot(self):
+        """Hold one worker slot; blocks while all slots are busy."""
+        if self._draining:
+            self.rejected += 1
+            raise JobRejected("Server is shutting down, not starting new jobs")
+        self._slots.acquire()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def popen(self, cmd, **kwargs) -> subprocess.Popen:
+        """Start a tracked process in its own process group (caller must hold a slot)."""
+        if self._draining:
+            self.rejected += 1
+            raise JobRejected("Server is shutting down, not starting new jobs")
+        kwargs.setdefault("start_new_session", True)
+        process = subprocess.Popen(cmd, **kwargs)
+        with self._lock:
+            self._processes.add(process)
+            self.started += 1
+        return process
+
+    def run(
+        self,
+        cmd,
+        *,
+        capture_output: bool = False,
+        text: bool = False,
+        timeout: float | None = None,
+        cwd=None,
+        env: dict[str, str] | None = None,
+        input: str | bytes | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command like ``subprocess.run`` inside a worker slot.
+
+        Raises:
+            subprocess.TimeoutExpired: The job exceeded ``timeout`` (its process group is killed)
+            JobRejected: The runner is draining
+        """
+        pipe = subprocess.PIPE if capture_output else None
+        with self.slot():
+            process = self.popen(
+                cmd,
+                stdin=subprocess.PIPE if input is not None else None,
+                stdout=pipe,
+                stderr=pipe,
+                text=text,
+                cwd=cwd,
+                env=env,
+            )
+            try:
+                stdout, stderr = process.communicate(input=input, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_group(process, signal.SIGKILL)
+                process.communicate()
+                raise
+            finally:
+                with self._lock:
+                    self._processes.discard(process)
+        return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+    def drain(self, grace: float = 30.0, kill_after: float = 5.0) -> dict[str, int]:
+        """
+        Stop accepting jobs, wait up to ``grace`` seconds for running ones, then terminate the rest.
+
+        Returns:
+            Dictionary with the number of jobs that finished and that were terminated
+        """
+        self._draining = True
+        initial = len(self.running())
+        deadline = time.monotonic() + grace
+        while self.running() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        leftover = self.running()
+        for process in leftover:
+            _kill_group(process, signal.SIGTERM)
+        deadline = time.monotonic() + kill_after
+        while any(p.poll() is None for p in leftover) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        for process in leftover:
+            if process.poll() is None:
+                _kill_group(process, signal.SIGKILL)
+
+        return {"finished": initial - len(leftover), "terminated": len(leftover)}
+
+    def resume(self) -> None:
+        """Accept jobs again (a new server lifespan after a drain)."""
+        self._draining = False
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "max_workers": self.max_workers,
+            "running": len(self.running()),
+            "started": self.started,
+            "rejected": self.rejected,
+            "draining": self._draining,
+        }
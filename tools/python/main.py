@@ -10,518 +10,414 @@ This FastMCP server provides specialized subagents for:
 - Documentation generation
 """
 
-from fastmcp import FastMCP
-import subprocess
+import argparse
+import asyncio
 import json
 import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-# MAIN ENTRY POINT
-# ============================================================================
+from fastmcp import FastMCP
+
+import answer_bundle
+import atlas_packer
+import aws_status
+import cloudfront_invalidation
+import deploy_releases
+import image_optimizer
+import tf_affected
+from admission import admission_from_env
+from answer_matcher import AnswerMatcher
+from call_recorder import ToolCallRecorder
+from deploy_tracing import DeployTrace, compare_traces, latest_traces, run_traced, trace_dir, write_trace
+from job_runner import JobRunner
+from s3_sync import make_client, sync_directory
+from shared_cache import cache_from_env
+from skill_registry import SkillRegistry
+from symbol_index import SymbolIndex
+from tfstate_index import StateIndex
+
+# Subprocess jobs shared by all sessions (MCP_WORKERS caps how many run at once)
+jobs = JobRunner(int(os.environ.get("MCP_WORKERS", "0")) or None)
+
+# Admission of CPU-heavy tools by cores/memory (MCP_ADMISSION=0 disables)
+admission = admission_from_env()
+
+# Results of slow read-only tools, shared by all sessions (MCP_SHARED_CACHE=0 disables)
+cache = cache_from_env()
+
+
+@asynccontextmanager
+async def lifespan(server):
+    """Drain running subprocess jobs when the server shuts down."""
+    jobs.resume()
+    try:
+        yield {}
+    finally:
+        await asyncio.to_thread(jobs.drain, float(os.environ.get("MCP_DRAIN_TIMEOUT", "30")))
+
+
+# Initialize FastMCP server
+mcp = FastMCP("riddle-rush-agents", lifespan=lifespan)
+
+# Record tool-call traces for benchmarks/load_replay.py
+if os.environ.get("MCP_RECORD_TRACE"):
+    mcp.add_middleware(ToolCallRecorder(os.environ["MCP_RECORD_TRACE"]))
+
+# Project root directory (RIDDLE_RUSH_ROOT points the server at another checkout or a sandbox)
+PROJECT_ROOT = Path(os.environ.get("RIDDLE_RUSH_ROOT") or Path(__file__).parent.parent.parent)
+
+# Agent skills (.agents/skills and its mirrors), indexed once and loaded section by section
+skills = SkillRegistry(PROJECT_ROOT)
+
+# Local Terraform states, read directly and re-indexed when their serial changes
+tfstate = StateIndex(PROJECT_ROOT)
+
+# boto3 sessions and clients shared by the AWS status checks
+aws_clients = aws_status.ClientPool()
+
+# Fuzzy indexes over the offline answers, rebuilt when offlineAnswers.json changes
+answer_index = AnswerMatcher(PROJECT_ROOT)
+
+# TS/Vue symbols of apps/game, apps/docs and packages/* in SQLite, re-scanned per changed file
+symbols = SymbolIndex(PROJECT_ROOT)
+
+
+def set_project_root(root: Path) -> None:
+    """Point every tool at another checkout, rebuilding the indexes that were built for PROJECT_ROOT."""
+    global PROJECT_ROOT, skills, tfstate, answer_index, symbols
+    PROJECT_ROOT = Path(root)
+    skills = SkillRegistry(PROJECT_ROOT)
+    tfstate = StateIndex(PROJECT_ROOT)
+    answer_index = AnswerMatcher(PROJECT_ROOT)
+    symbols = SymbolIndex(PROJECT_ROOT)
+
 
-if __name__ == "__main__":
-    # Run the FastMCP server
-    mcp.run()
-=======
 # ============================================================================
-# AI CODE ANALYSIS SUBAGENT
+# AWS DEPLOYMENT SUBAGENT
 # ============================================================================
 
+# Short environment names, mapped to their infrastructure/environments folder as in scripts/aws-deploy.sh
+ENVIRONMENT_ALIASES = {"dev": "development", "prod": "production"}
+
+
+def _deploy_targets(environment: str) -> tuple[str, str, str]:
+    """Bucket and distribution id of an environment from AWS_S3_BUCKET/AWS_CLOUDFRONT_ID or its local state."""
+    environment = ENVIRONMENT_ALIASES.get(environment, environment)
+    bucket = os.environ.get("AWS_S3_BUCKET", "")
+    distribution_id = os.environ.get("AWS_CLOUDFRONT_ID", "")
+    if bucket and distribution_id:
+        return bucket, distribution_id, "environment variables"
+    state = f"environments/{environment}/"
+    if not bucket:
+        found = tfstate.find_resource(type="aws_s3_bucket", state=state)["matches"]
+        bucket = next((m["attributes"]["bucket"] for m in found if "bucket" in m["attributes"]), "")
+    if not distribution_id:
+        found = tfstate.find_resource(type="aws_cloudfront_distribution", state=state)["matches"]
+        distribution_id = next((m["attributes"]["id"] for m in found if "id" in m["attributes"]), "")
+    return bucket, distribution_id, "local Terraform state"
+
+
 @mcp.tool()
-def analyze_code_complexity(file_path: str = "apps/game") -> dict:
+def aws_deploy_check(
+    environment: str = "development", bucket: str = "", distribution_id: str = "", deadline_s: float = 3.0
+) -> str:
     """
-    Analyze code complexity metrics for the specified directory.
+    Check AWS deployment status and prerequisites for a given environment.
+    
+    Asks AWS directly (credentials, bucket, CloudFront distribution, last invalidation) over
+    pooled boto3 clients, all checks at once, instead of running a Terraform plan.
     
     Args:
-        file_path: Directory path to analyze (default: apps/game)
+        environment: The deployment environment (development, staging, production)
+        bucket: Website bucket (default: AWS_S3_BUCKET or the environment's Terraform state)
+        distribution_id: CloudFront distribution id (default: AWS_CLOUDFRONT_ID or the Terraform state)
+        deadline_s: Time budget for all checks; slower checks are reported as timeouts
     
     Returns:
-        Dictionary with complexity analysis results
+        Status report including credentials, bucket info, and deployment readiness
     """
     try:
-        # This would integrate with AI tools for complexity analysis
-        # For now, return a placeholder response
-        return {
-            "status": "success",
-            "message": f"Code complexity analysis for {file_path}",
-            "metrics": {
-                "cyclomatic_complexity": "Would be calculated by AI tools",
-                "maintainability_index": "Would be calculated by AI tools",
-                "technical_debt": "Would be estimated by AI tools"
-            },
-            "recommendations": [
-                "Consider breaking down large functions",
-                "Add more unit tests for complex logic",
-                "Review cyclomatic complexity in key components"
-            ]
-        }
+        source = "arguments"
+        if not bucket or not distribution_id:
+            found_bucket, found_distribution, source = _deploy_targets(environment)
+            bucket, distribution_id = bucket or found_bucket, distribution_id or found_distribution
+        status = aws_status.deployment_status(aws_clients, bucket, distribution_id, deadline_s)
+
+        icons = {"ok": "✅", "warning": "⚠️", "error": "❌", "timeout": "⏱️"}
+        lines = [f"AWS Deployment Check for {environment} ({status['elapsed_ms']:.0f} ms):", ""]
+        for name, result in status["checks"].items():
+            details = ", ".join(f"{k}={v}" for k, v in result.items() if k not in ("status", "elapsed_ms"))
+            lines.append(f"{icons.get(result['status'], '•')} {name}: {details} [{result['elapsed_ms']:.0f} ms]")
+        if not bucket:
+            lines.append(f"❌ bucket: unknown (pass bucket=, set AWS_S3_BUCKET or apply {environment} first)")
+        if not distribution_id:
+            lines.append("⚠️ distribution: unknown, not checked")
+        lines += ["", f"Targets from: {source}", f"Ready to deploy: {'yes' if status['ready'] else 'no'}"]
+        return "\n".join(lines)
     except Exception as e:
-        return {"error": str(e)}
+        return f"❌ Error checking AWS deployment: {str(e)}"
+
+
+@cache.cached(ttl=60)
+def _terraform_outputs(environment: str) -> dict:
+    """Values of ``terraform output -json`` for an environment, {"error": stderr} if Terraform fails."""
+    cmd = f"cd {PROJECT_ROOT}/infrastructure/environments/{environment} && terraform output -json"
+    result = jobs.run(
+        ["bash", "-c", cmd],
+        capture_output=True,
+        text=True,
+        timeout=30
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr}
+    return {k: v.get("value") for k, v in json.loads(result.stdout).items()}
+
 
 @mcp.tool()
-def generate_ai_documentation(module_name: str = "game") -> dict:
+def aws_get_outputs(environment: str = "production") -> dict:
     """
-    Generate AI-assisted documentation for the specified module.
+    Get Terraform outputs for AWS infrastructure (bucket names, CloudFront IDs, etc.)
     
     Args:
-        module_name: Module name to document (default: game)
+        environment: The environment to get outputs for (development, staging, production)
     
     Returns:
-        Dictionary with documentation generation results
+        Dictionary of Terraform outputs including S3 bucket, CloudFront distribution, etc.
     """
     try:
-        # This would integrate with AI documentation tools
-        # For now, return a placeholder response
-        return {
-            "status": "success",
-            "message": f"AI documentation generation for {module_name} module",
-            "generated_files": [
-                f"docs/{module_name}-architecture.md",
-                f"docs/{module_name}-api-reference.md",
-                f"docs/{module_name}-best-practices.md"
-            ],
-            "coverage": "Comprehensive API documentation and usage examples"
-        }
+        return _terraform_outputs(environment)
     except Exception as e:
         return {"error": str(e)}
 
+
 @mcp.tool()
-def ai_code_review(file_path: str = "apps/game/composables") -> dict:
+def aws_deploy(environment: str, skip_tests: bool = False, delta_sync: bool = True) -> str:
     """
-    Perform AI-assisted code review on the specified files.
+    Deploy the application to AWS (S3 + CloudFront) for the specified environment.
+    
+    The deploy is traced per phase (tests, build, upload, invalidation, verify)
+    and the trace is written as OTLP JSON to .deploy-traces/ (or DEPLOY_TRACE_DIR).
     
     Args:
-        file_path: File or directory path to review
+        environment: Target environment (development, production)
+        skip_tests: Skip pre-deployment tests (default: False)
+        delta_sync: Upload only changed files via s3_sync.py and invalidate only the changed
+            CloudFront paths, instead of full aws s3 sync passes and a /* invalidation
     
     Returns:
-        Dictionary with code review results and suggestions
+        Deployment status, URLs, per-phase timings and the invalidated paths
     """
     try:
-        # This would integrate with AI code review tools
-        # For now, return a placeholder response
-        return {
-            "status": "success",
-            "message": f"AI code review for {file_path}",
-            "findings": {
-                "best_practices": [
-                    "Consider using composable functions for better reusability",
-                    "Add proper error handling for async operations",
-                    "Implement proper cleanup for event listeners"
-                ],
-                "performance": [
-                    "Optimize image loading with lazy loading",
-                    "Consider memoization for expensive computations",
-                    "Review bundle size for production builds"
-                ],
-                "security": [
-                    "Validate all user inputs",
-                    "Use secure storage for sensitive data",
-                    "Implement proper CSRF protection"
-                ]
-            },
-            "score": "85/100 - Good quality with room for improvement"
+        script_map = {
+            "production": "deploy-prod.sh",
+            "development": "deploy-dev.sh"
         }
+        
+        script = script_map.get(environment)
+        if not script:
+            return f"❌ Invalid environment: {environment}. Use 'development' or 'production'."
+        
+        cmd = [f"./scripts/{script}"]
+        if skip_tests:
+            cmd.append("--skip-checks")
+        
+        trace = DeployTrace(f"deploy {environment}", {"deploy.environment": environment, "deploy.script": script})
+        with tempfile.TemporaryDirectory(prefix="deploy-") as tmp:
+            paths_file = Path(tmp) / "invalidation.json"
+            env = None
+            if delta_sync:
+                env = {
+                    **os.environ,
+                    "S3_SYNC_ENGINE": "delta",
+                    "S3_SYNC_PYTHON": sys.executable,
+                    "INVALIDATION_PATHS_FILE": str(paths_file),
+                }
+            
+            with jobs.slot():
+                result = run_traced(cmd, trace, cwd=PROJECT_ROOT, timeout=600, env=env, popen=jobs.popen)  # 10 minutes
+            invalidation = json.loads(paths_file.read_text()) if paths_file.exists() else None
+        trace_file = write_trace(trace, trace_dir(PROJECT_ROOT), environment)
+        
+        phases = "\n".join(
+            f"  {name}: {duration / 1000:.1f}s" for name, duration in trace.phase_durations().items()
+        )
+        summary = f"Phase timings:\n{phases or '  (no phase markers seen)'}\nTrace: {trace_file}"
+        if invalidation is not None:
+            batches = len(invalidation["batches"])
+            summary += (
+                f"\nCloudFront invalidation ({len(invalidation['paths'])} path(s), {batches} batch(es), "
+                f"{invalidation['skipped_immutable']} immutable asset(s) skipped): "
+                f"{' '.join(invalidation['paths']) or '(none)'}"
+            )
+        
+        if result["timed_out"]:
+            return f"❌ Deployment timed out for {environment}\n\n{summary}"
+        
+        return f"AWS Deployment to {environment}:\n\n{result['stdout']}\n\nErrors (if any):\n{result['stderr']}\n\n{summary}"
     except Exception as e:
-        return {"error": str(e)}
+        return f"❌ Error deploying to AWS: {str(e)}"
 
-# ============================================================================
-# AI WORKFLOW AUTOMATION SUBAGENT
-# ============================================================================
 
 @mcp.tool()
-def ai_optimize_workflow(workflow_type: str = "build") -> dict:
+def aws_sync_build(environment: str = "development", dry_run: bool = True, delete: bool = False) -> dict:
     """
-    Optimize the specified workflow using AI analysis.
+    Sync the existing game build (apps/game/.output/public) to the environment's S3 bucket.
+    
+    Only new or changed files are uploaded; unchanged objects are detected from
+    their ETags and the manifest stored by the previous sync.
     
     Args:
-        workflow_type: Type of workflow to optimize (build, test, deploy, lint)
+        environment: Environment whose bucket to sync to (development, staging, production)
+        dry_run: Only report what would be uploaded (default: True)
+        delete: Delete objects that are no longer part of the build
     
     Returns:
-        Dictionary with optimization recommendations
+        Dictionary with uploaded, unchanged and deleted files plus timings
     """
     try:
-        optimizations = {
-            "build": {
-                "recommendations": [
-                    "Enable parallel builds with Turbo",
-                    "Implement caching for dependencies",
-                    "Optimize asset compression settings",
-                    "Review bundle analysis for optimization opportunities"
-                ],
-                "estimated_improvement": "20-30% faster builds"
-            },
-            "test": {
-                "recommendations": [
-                    "Implement test parallelization",
-                    "Add test result caching",
-                    "Optimize test setup/teardown",
-                    "Review slowest test cases for optimization"
-                ],
-                "estimated_improvement": "40-50% faster test runs"
-            },
-            "deploy": {
-                "recommendations": [
-                    "Implement blue-green deployments",
-                    "Add automated rollback capabilities",
-                    "Optimize CloudFront cache invalidation",
-                    "Review deployment timeout settings"
-                ],
-                "estimated_improvement": "30% faster deployments with better reliability"
-            },
-            "lint": {
-                "recommendations": [
-                    "Enable parallel linting",
-                    "Implement lint result caching",
-                    "Review lint rules for performance impact",
-                    "Optimize file patterns for linting"
-                ],
-                "estimated_improvement": "50% faster linting"
-            }
-        }
-        
-        return {
-            "status": "success",
-            "workflow": workflow_type,
-            "optimizations": optimizations.get(workflow_type, {"recommendations": []}),
-            "implementation": "Review and implement recommendations in CI/CD pipelines"
-        }
+        bucket = _deploy_outputs(environment)["bucket_name"]
+        with jobs.slot():
+            return sync_directory(bucket, PROJECT_ROOT / "apps/game/.output/public", delete=delete, dry_run=dry_run)
     except Exception as e:
         return {"error": str(e)}
 
+
+def _deploy_outputs(environment: str) -> dict:
+    """
+    Bucket and distribution id of an environment; raises if no bucket is found.
+    
+    Terraform outputs are used when the environment defines them, otherwise
+    AWS_S3_BUCKET/AWS_CLOUDFRONT_ID or the local state (see _deploy_targets).
+    """
+    try:
+        outputs = _terraform_outputs(ENVIRONMENT_ALIASES.get(environment, environment))
+    except (subprocess.SubprocessError, OSError, ValueError):
+        outputs = {}
+    if "error" in outputs:
+        outputs = {}
+    if not (outputs.get("bucket_name") and outputs.get("cloudfront_distribution_id")):
+        bucket, distribution_id, _ = _deploy_targets(environment)
+        outputs = {
+            **outputs,
+            "bucket_name": outputs.get("bucket_name") or bucket,
+            "cloudfront_distribution_id": outputs.get("cloudfront_distribution_id") or distribution_id,
+        }
+    if not outputs["bucket_name"]:
+        raise RuntimeError(
+            f"No bucket for {environment}: no bucket_name output, AWS_S3_BUCKET or aws_s3_bucket in the local state"
+        )
+    return outputs
+
+
 @mcp.tool()
-def ai_generate_ci_pipeline() -> dict:
+def aws_list_releases(environment: str = "production") -> dict:
     """
-    Generate optimized CI/CD pipeline configuration using AI.
+    List the releases recorded for an environment (content-addressed deploy manifests).
+    
+    Args:
+        environment: Environment whose bucket to read (development, staging, production)
     
     Returns:
-        Dictionary with pipeline generation results
+        Dictionary with the live release id and all recorded releases, oldest first
     """
     try:
-        # This would generate an optimized CI pipeline
+        bucket = _deploy_outputs(environment)["bucket_name"]
+        client = make_client()
         return {
-            "status": "success",
-            "message": "AI-generated CI/CD pipeline configuration",
-            "pipeline_features": [
-                "Parallel job execution",
-                "Automated caching strategies",
-                "Intelligent test distribution",
-                "Automated deployment strategies",
-                "Comprehensive error handling"
-            ],
-            "estimated_improvement": "50-70% faster pipeline execution",
-            "implementation": "Review generated .gitlab-ci.yml and implement changes"
+            "current": deploy_releases.load_current_manifest(client, bucket).get("release"),
+            "releases": deploy_releases.list_releases(client, bucket),
         }
     except Exception as e:
         return {"error": str(e)}
 
-# ============================================================================
-# MAIN ENTRY POINT
-# ============================================================================
-
-if __name__ == "__main__":
-    # Run the FastMCP server
-    mcp.run()WORKSPACE MANAGEMENT SUBAGENT
-# ============================================================================
 
 @mcp.tool()
-def workspace_info() -> dict:
+def aws_release_diff(environment: str = "production", base: str = "previous", target: str = "current") -> dict:
     """
-    Get information about the monorepo workspace structure.
+    Diff two deployed releases: added, removed and changed files plus size delta.
+    
+    Args:
+        environment: Environment whose releases to compare
+        base: Release id (or unique prefix), "previous" or "current"
+        target: Release id (or unique prefix), "previous" or "current"
     
     Returns:
-        Dictionary with workspace packages and their status
+        Dictionary with added/removed/changed paths and the byte delta
     """
     try:
-        # Get workspace packages
-        result = subprocess.run(
-            ["pnpm", "list", "-r", "--depth", "0", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=PROJECT_ROOT
+        bucket = _deploy_outputs(environment)["bucket_name"]
+        client = make_client()
+        return deploy_releases.diff_releases(
+            deploy_releases.load_release(client, bucket, base), deploy_releases.load_release(client, bucket, target)
         )
-        
-        if result.returncode == 0:
-            packages = json.loads(result.stdout)
-            return {
-                "packages": [
-                    {
-                        "name": pkg.get("name"),
-                        "version": pkg.get("version"),
-                        "path": pkg.get("path", "").replace(str(PROJECT_ROOT), "")
-                    }
-                    for pkg in packages
-                ]
-            }
-        else:
-            return {"error": result.stderr}
     except Exception as e:
         return {"error": str(e)}
-=======
-# ============================================================================
-# WORKSPACE MANAGEMENT SUBAGENT
-# ============================================================================
+
 
 @mcp.tool()
-def workspace_info() -> dict:
+def aws_rollback(environment: str, release: str = "previous", dry_run: bool = True) -> dict:
     """
-    Get information about the monorepo workspace structure.
+    Roll the site back to an earlier release without rebuilding or re-uploading.
+    
+    Files that are not content-addressed (index.html, sw.js, data files, ...) are
+    restored from the release's stored copies; _nuxt/ assets are still in the bucket. The changed
+    paths are then invalidated in CloudFront.
+    
+    Args:
+        environment: Environment to roll back (development, staging, production)
+        release: Release id (or unique prefix) or "previous" (default)
+        dry_run: Only report what would be restored (default: True)
     
     Returns:
-        Dictionary with workspace packages and their status
+        Dictionary with restored keys, missing objects and invalidation details
     """
     try:
-        # Get workspace packages
-        result = subprocess.run(
-            ["pnpm", "list", "-r", "--depth", "0", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=PROJECT_ROOT
-        )
-        
-        if result.returncode == 0:
-            packages = json.loads(result.stdout)
-            return {
-                "packages": [
-                    {
-                        "name": pkg.get("name"),
-                        "version": pkg.get("version"),
-                        "path": pkg.get("path", "").replace(str(PROJECT_ROOT), "")
-                    }
-                    for pkg in packages
-                ]
-            }
-        else:
-            return {"error": result.stderr}
+        outputs = _deploy_outputs(environment)
+        with jobs.slot():
+            result = deploy_releases.rollback(make_client(), outputs["bucket_name"], release, dry_run=dry_run)
+            distribution_id = outputs.get("cloudfront_distribution_id")
+            paths = result["invalidation"]["paths"]
+            if not dry_run and not result["missing"] and distribution_id and paths:
+                result["invalidation"]["ids"] = cloudfront_invalidation.submit_invalidation(
+                    cloudfront_invalidation.make_client(), distribution_id, paths
+                )
+        return result
     except Exception as e:
         return {"error": str(e)}
 
-@mcp.tool()
-def run_trunk_check(filter_linters: str = "all") -> str:
-    """
-    Run Trunk check with optional linter filtering.
-    
-    Args:
-        filter_linters: Comma-separated list of linters to run (e.g., 'eslint,prettier') or 'all'
-    
-    Returns:
-        Trunk check results
-    """
-    try:
-        if filter_linters.lower() == "all":
-            cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --all"
-        else:
-            cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter={filter_linters}"
-        
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        
-        return f"Trunk Check Results:
-
-{result.stdout}
-
-Errors (if any):
-{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ Trunk check timed out"
-    except Exception as e:
-        return f"❌ Error running trunk check: {str(e)}"
-
-@mcp.tool()
-def run_trunk_format() -> str:
-    """
-    Run Trunk format to auto-fix formatting issues.
-    
-    Returns:
-        Trunk format results
-    """
-    try:
-        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk fmt --all"
-        
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=180
-        )
-        
-        return f"Trunk Format Results:
-
-{result.stdout}
-
-Errors (if any):
-{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ Trunk format timed out"
-    except Exception as e:
-        return f"❌ Error running trunk format: {str(e)}"
-
-@mcp.tool()
-def run_eslint_fix() -> str:
-    """
-    Run ESLint with auto-fix on all JavaScript/TypeScript files.
-    
-    Returns:
-        ESLint fix results
-    """
-    try:
-        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter=eslint --fix"
-        
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        return f"ESLint Fix Results:
-
-{result.stdout}
-
-Errors (if any):
-{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ ESLint fix timed out"
-    except Exception as e:
-        return f"❌ Error running eslint fix: {str(e)}"
-
-@mcp.tool()
-def run_prettier_fix() -> str:
-    """
-    Run Prettier with auto-fix on all supported files.
-    
-    Returns:
-        Prettier fix results
-    """
-    try:
-        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter=prettier --fix"
-        
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        return f"Prettier Fix Results:
-
-{result.stdout}
-
-Errors (if any):
-{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ Prettier fix timed out"
-    except Exception as e:
-        return f"❌ Error running prettier fix: {str(e)}"Initialize FastMCP server
-mcp = FastMCP("riddle-rush-agents")
-
-# Project root directory
-PROJECT_ROOT = Path(__file__).parent
-
-
-# ============================================================================
-# AWS DEPLOYMENT SUBAGENT
-# ============================================================================
-
-@mcp.tool()
-def aws_deploy_check(environment: str = "development") -> str:
-    """
-    Check AWS deployment status and prerequisites for a given environment.
-    
-    Args:
-        environment: The deployment environment (development, staging, production)
-    
-    Returns:
-        Status report including credentials, bucket info, and deployment readiness
-    """
-    try:
-        result = subprocess.run(
-            ["bash", "-c", f"cd {PROJECT_ROOT} && ./scripts/terraform-plan.sh {environment}"],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        return f"AWS Deployment Check for {environment}:\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ Terraform plan timed out for {environment}"
-    except Exception as e:
-        return f"❌ Error checking AWS deployment: {str(e)}"
-
 
 @mcp.tool()
-def aws_get_outputs(environment: str = "production") -> dict:
+def aws_deploy_trace_compare(environment: str = "production", baseline: str = "", current: str = "") -> dict:
     """
-    Get Terraform outputs for AWS infrastructure (bucket names, CloudFront IDs, etc.)
+    Compare per-phase durations of two deploy traces to see which phase got slower.
     
     Args:
-        environment: The environment to get outputs for (development, staging, production)
+        environment: Environment whose traces to compare when no files are given
+        baseline: Path to the older trace file (default: second most recent trace)
+        current: Path to the newer trace file (default: most recent trace)
     
     Returns:
-        Dictionary of Terraform outputs including S3 bucket, CloudFront distribution, etc.
+        Dictionary with per-phase baseline/current durations and deltas
     """
     try:
-        # Source the get-terraform-outputs script
-        cmd = f"cd {PROJECT_ROOT}/infrastructure/environments/{environment} && terraform output -json"
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        if not (baseline and current):
+            recent = latest_traces(trace_dir(PROJECT_ROOT), environment)
+            if len(recent) < 2:
+                return {"error": f"Need two traces for {environment}, found {len(recent)}"}
+            baseline, current = str(recent[0]), str(recent[1])
         
-        if result.returncode == 0:
-            outputs = json.loads(result.stdout)
-            return {k: v.get("value") for k, v in outputs.items()}
-        else:
-            return {"error": result.stderr}
-    except Exception as e:
-        return {"error": str(e)}
-
-
-@mcp.tool()
-def aws_deploy(environment: str, skip_tests: bool = False) -> str:
-    """
-    Deploy the application to AWS (S3 + CloudFront) for the specified environment.
-    
-    Args:
-        environment: Target environment (development, production)
-        skip_tests: Skip pre-deployment tests (default: False)
-    
-    Returns:
-        Deployment status and URLs
-    """
-    try:
-        script_map = {
-            "production": "deploy-prod.sh",
-            "development": "deploy-dev.sh"
+        return {
+            "baseline": baseline,
+            "current": current,
+            "phases": compare_traces(Path(baseline), Path(current))
         }
-        
-        script = script_map.get(environment)
-        if not script:
-            return f"❌ Invalid environment: {environment}. Use 'development' or 'production'."
-        
-        cmd = f"cd {PROJECT_ROOT} && ./scripts/{script}"
-        if skip_tests:
-            cmd += " --skip-tests"
-        
-        result = subprocess.run(
-            ["bash", "-c", cmd],
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minutes
-        )
-        
-        return f"AWS Deployment to {environment}:\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
-    except subprocess.TimeoutExpired:
-        return f"❌ Deployment timed out for {environment}"
     except Exception as e:
-        return f"❌ Error deploying to AWS: {str(e)}"
+        return {"error": str(e)}
 
 
 # ============================================================================
@@ -529,18 +425,48 @@ def aws_deploy(environment: str, skip_tests: bool = False) -> str:
 # ============================================================================
 
 @mcp.tool()
-def terraform_plan(environment: str = "development") -> str:
+def terraform_plan(environment: str = "development", affected_only: bool = False, base_ref: str = "") -> str:
     """
     Run Terraform plan to preview infrastructure changes.
     
     Args:
         environment: Target environment (development, staging, production)
+        affected_only: Only plan the module instances touched by changed files (git), skipping the
+            refresh when that is safe; falls back to a full plan when root configuration changed
+        base_ref: Git ref the changes are compared with in affected mode (default: uncommitted changes)
     
     Returns:
-        Terraform plan output showing proposed changes
+        Terraform plan output showing proposed changes, preceded by the planned scope in affected mode
     """
     try:
-        result = subprocess.run(
+        environment = ENVIRONMENT_ALIASES.get(environment, environment)
+        header = ""
+        if affected_only:
+            scope = tf_affected.decide_refresh(
+                tf_affected.affected_scope(PROJECT_ROOT, environment, base_ref=base_ref), PROJECT_ROOT, tfstate
+            )
+            header = _plan_scope_header(scope)
+            if scope.mode == "none":
+                return f"Terraform Plan for {environment}:\n\n{header}\nNothing to plan."
+            if scope.mode == "targeted":
+                env_dir = PROJECT_ROOT / "infrastructure" / "environments" / environment
+                if not (env_dir / ".terraform").is_dir():
+                    init = jobs.run(
+                        ["terraform", "init", "-input=false"], capture_output=True, text=True, timeout=120, cwd=env_dir
+                    )
+                    if init.returncode != 0:
+                        return f"❌ terraform init failed for {environment}:\n{init.stdout}\n{init.stderr}"
+                result = jobs.run(
+                    ["terraform", "plan", "-input=false", "-no-color", *tf_affected.terraform_plan_args(scope)],
+                    capture_output=True,
+                    text=True,
+                    timeout=120,
+                    cwd=env_dir,
+                )
+                output = f"{header}\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+                return f"Terraform Plan for {environment}:\n\n{output}"
+
+        result = jobs.run(
             ["pnpm", "run", "terraform:plan", environment],
             capture_output=True,
             text=True,
@@ -548,11 +474,27 @@ def terraform_plan(environment: str = "development") -> str:
             cwd=PROJECT_ROOT
         )
         
-        return f"Terraform Plan for {environment}:\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+        return f"Terraform Plan for {environment}:\n\n{header}{result.stdout}\n\nErrors (if any):\n{result.stderr}"
     except Exception as e:
         return f"❌ Error running terraform plan: {str(e)}"
 
 
+def _plan_scope_header(scope: tf_affected.Scope) -> str:
+    """Human-readable summary of what an affected-only plan covers."""
+    changed = ", ".join(scope.changed_files) or "none"
+    if scope.mode == "none":
+        return f"Scope: nothing (no changed files used by this environment)\nChanged files: {changed}\n"
+    if scope.mode == "full":
+        return f"Scope: FULL environment, refreshed\nWhy: {'; '.join(scope.reasons)}\nChanged files: {changed}\n"
+    refresh = "skipped" if not scope.refresh else "on"
+    return (
+        f"Scope: TARGETED {', '.join(scope.targets)}\n"
+        f"Refresh: {refresh} ({scope.refresh_reason})\n"
+        f"Changed files: {changed}\n"
+        "Other resources of the environment were not planned.\n"
+    )
+
+
 @mcp.tool()
 def terraform_apply(environment: str = "development", auto_approve: bool = False) -> str:
     """
@@ -570,7 +512,7 @@ def terraform_apply(environment: str = "development", auto_approve: bool = False
         if auto_approve:
             cmd += " --auto-approve"
         
-        result = subprocess.run(
+        result = jobs.run(
             ["bash", "-c", cmd],
             capture_output=True,
             text=True,
@@ -583,6 +525,7 @@ def terraform_apply(environment: str = "development", auto_approve: bool = False
 
 
 @mcp.tool()
+@cache.cached(ttl=30)
 def terraform_status() -> dict:
     """
     Get current Terraform state and infrastructure status across all environments.
@@ -596,7 +539,7 @@ def terraform_status() -> dict:
     for env in environments:
         try:
             cmd = f"cd {PROJECT_ROOT}/infrastructure/environments/{env} && terraform state list"
-            result = subprocess.run(
+            result = jobs.run(
                 ["bash", "-c", cmd],
                 capture_output=True,
                 text=True,
@@ -613,6 +556,37 @@ def terraform_status() -> dict:
     return status
 
 
+@mcp.tool()
+def terraform_find_resource(
+    query: str = "",
+    resource_type: str = "",
+    module: str = "",
+    address: str = "",
+    state: str = "",
+    limit: int = 100,
+) -> dict:
+    """
+    Find resources in the local Terraform state files without running Terraform.
+    
+    Args:
+        query: Bucket name, distribution id, ARN or other key attribute value, or part of an address
+        resource_type: Resource type (e.g. aws_s3_bucket, aws_cloudfront_distribution)
+        module: Module path (e.g. module.cdn), "root" for the root module
+        address: Exact resource address
+        state: Only states whose path contains this (e.g. environments/development)
+        limit: Maximum number of matches
+    
+    Returns:
+        Dictionary with matching resources, their key attributes and the indexed states
+    """
+    try:
+        result = tfstate.find_resource(query, resource_type, module, address, state, limit)
+        result["states"] = tfstate.summary()
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # ============================================================================
 # CI/CD WORKFLOW SUBAGENT
 # ============================================================================
@@ -660,12 +634,9 @@ def run_quality_checks(fix: bool = False) -> str:
         Quality check results
     """
     try:
-        if fix:
-            cmd = "pnpm run agent:fix"
-        else:
-            cmd = "pnpm run workspace:check"
+        cmd = "pnpm run agent:fix" if fix else "pnpm run workspace:check"
         
-        result = subprocess.run(
+        result = jobs.run(
             ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
             capture_output=True,
             text=True,
@@ -703,14 +674,15 @@ def run_tests(test_type: str = "unit", coverage: bool = False) -> str:
         
         cmd = cmd_map.get(test_type, "pnpm run test:unit")
         
-        result = subprocess.run(
-            ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        with admission.admit("e2e" if test_type.startswith("e2e") else "test") as ticket:
+            result = jobs.run(
+                ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
         
-        return f"Test Results ({test_type}):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+        return f"Test Results ({test_type}, queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
     except subprocess.TimeoutExpired:
         return f"❌ Tests timed out ({test_type})"
     except Exception as e:
@@ -731,14 +703,15 @@ def test_deployed_site(environment: str = "production") -> str:
     try:
         cmd = f"pnpm run test:e2e:{environment}"
         
-        result = subprocess.run(
-            ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
-            capture_output=True,
-            text=True,
-            timeout=600
-        )
+        with admission.admit("e2e") as ticket:
+            result = jobs.run(
+                ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
+                capture_output=True,
+                text=True,
+                timeout=600
+            )
         
-        return f"E2E Tests ({environment}):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+        return f"E2E Tests ({environment}, queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
     except Exception as e:
         return f"❌ Error testing deployed site: {str(e)}"
 
@@ -759,7 +732,7 @@ def get_project_status() -> dict:
         status = {}
         
         # Git status
-        git_result = subprocess.run(
+        git_result = jobs.run(
             ["git", "status", "--short"],
             capture_output=True,
             text=True,
@@ -769,7 +742,7 @@ def get_project_status() -> dict:
         status["git_status"] = git_result.stdout.strip()
         
         # Current branch
-        branch_result = subprocess.run(
+        branch_result = jobs.run(
             ["git", "branch", "--show-current"],
             capture_output=True,
             text=True,
@@ -804,19 +777,17 @@ def run_build(app: str = "game") -> str:
         Build output
     """
     try:
-        if app == "all":
-            cmd = "pnpm run build"
-        else:
-            cmd = f"pnpm --filter @riddle-rush/{app} run build"
+        cmd = "pnpm run build" if app == "all" else f"pnpm --filter @riddle-rush/{app} run build"
         
-        result = subprocess.run(
-            ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        with admission.admit("build") as ticket:
+            result = jobs.run(
+                ["bash", "-c", f"cd {PROJECT_ROOT} && {cmd}"],
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
         
-        return f"Build Output ({app}):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+        return f"Build Output ({app}, queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
     except Exception as e:
         return f"❌ Error building: {str(e)}"
 
@@ -826,6 +797,7 @@ def run_build(app: str = "game") -> str:
 # ============================================================================
 
 @mcp.tool()
+@cache.cached(ttl=30)
 def list_documentation() -> list:
     """
     List all available documentation files.
@@ -882,6 +854,7 @@ def get_quick_reference() -> dict:
 # ============================================================================
 
 @mcp.tool()
+@cache.cached(ttl=60)
 def workspace_info() -> dict:
     """
     Get information about the monorepo workspace structure.
@@ -891,7 +864,7 @@ def workspace_info() -> dict:
     """
     try:
         # Get workspace packages
-        result = subprocess.run(
+        result = jobs.run(
             ["pnpm", "list", "-r", "--depth", "0", "--json"],
             capture_output=True,
             text=True,
@@ -917,10 +890,610 @@ def workspace_info() -> dict:
         return {"error": str(e)}
 
 
-# ============================================================================
-# MAIN ENTRY POINT
-# ============================================================================
+@mcp.tool()
+def run_trunk_check(filter_linters: str = "all") -> str:
+    """
+    Run Trunk check with optional linter filtering.
+    
+    Args:
+        filter_linters: Comma-separated list of linters to run (e.g., 'eslint,prettier') or 'all'
+    
+    Returns:
+        Trunk check results
+    """
+    try:
+        if filter_linters.lower() == "all":
+            cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --all"
+        else:
+            cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter={filter_linters}"
+        
+        with admission.admit("lint") as ticket:
+            result = jobs.run(
+                ["bash", "-c", cmd],
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
+        
+        return f"Trunk Check Results (queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+    except subprocess.TimeoutExpired:
+        return "❌ Trunk check timed out"
+    except Exception as e:
+        return f"❌ Error running trunk check: {str(e)}"
 
-if __name__ == "__main__":
+@mcp.tool()
+def run_trunk_format() -> str:
+    """
+    Run Trunk format to auto-fix formatting issues.
+    
+    Returns:
+        Trunk format results
+    """
+    try:
+        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk fmt --all"
+        
+        with admission.admit("lint") as ticket:
+            result = jobs.run(
+                ["bash", "-c", cmd],
+                capture_output=True,
+                text=True,
+                timeout=180
+            )
+        
+        return f"Trunk Format Results (queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+    except subprocess.TimeoutExpired:
+        return "❌ Trunk format timed out"
+    except Exception as e:
+        return f"❌ Error running trunk format: {str(e)}"
+
+@mcp.tool()
+def run_eslint_fix() -> str:
+    """
+    Run ESLint with auto-fix on all JavaScript/TypeScript files.
+    
+    Returns:
+        ESLint fix results
+    """
+    try:
+        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter=eslint --fix"
+        
+        with admission.admit("lint") as ticket:
+            result = jobs.run(
+                ["bash", "-c", cmd],
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
+        
+        return f"ESLint Fix Results (queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+    except subprocess.TimeoutExpired:
+        return "❌ ESLint fix timed out"
+    except Exception as e:
+        return f"❌ Error running eslint fix: {str(e)}"
+
+@mcp.tool()
+def run_prettier_fix() -> str:
+    """
+    Run Prettier with auto-fix on all supported files.
+    
+    Returns:
+        Prettier fix results
+    """
+    try:
+        cmd = f"cd {PROJECT_ROOT} && ./.trunk-cache/cli/1.25.0-linux-x86_64/trunk check --filter=prettier --fix"
+        
+        with admission.admit("lint") as ticket:
+            result = jobs.run(
+                ["bash", "-c", cmd],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+        
+        return f"Prettier Fix Results (queued {ticket.wait_s:.1f}s):\n\n{result.stdout}\n\nErrors (if any):\n{result.stderr}"
+    except subprocess.TimeoutExpired:
+        return "❌ Prettier fix timed out"
+    except Exception as e:
+        return f"❌ Error running prettier fix: {str(e)}"
+
+
+# ============================================================================
+# ASSET OPTIMIZATION SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def optimize_images(targets: str = "", widths: str = "320,640,1080", formats: str = "") -> dict:
+    """
+    Transcode game artwork, PWA icons and docs/gfx to responsive WebP/AVIF variants.
+    
+    Unchanged images (same content hash and settings) are skipped. Each output
+    directory gets a manifest.json with srcset strings for the app.
+    
+    Args:
+        targets: Comma-separated targets (game-assets, pwa-icons, docs-gfx); default all
+        widths: Comma-separated responsive widths; the original width is always included
+        formats: Comma-separated formats (avif, webp); default all supported by Pillow
+    
+    Returns:
+        Dictionary with per-target counts, manifest paths and total bytes before/after
+    """
+    try:
+        selected = image_optimizer.DEFAULT_TARGETS
+        if targets:
+            names = {name.strip() for name in targets.split(",")}
+            selected = tuple(t for t in selected if t.name in names)
+            unknown = names - {t.name for t in selected}
+            if unknown:
+                return {"error": f"Unknown targets: {', '.join(sorted(unknown))}"}
+        
+        with jobs.slot():
+            return image_optimizer.optimize_images(
+                PROJECT_ROOT,
+                targets=selected,
+                widths=tuple(int(w) for w in widths.split(",") if w.strip()),
+                formats=tuple(f.strip() for f in formats.split(",") if f.strip()) or None,
+            )
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def build_texture_atlases(screens: str = "", force: bool = False) -> dict:
+    """
+    Pack the small UI images of game screens into texture atlases with JSON frame maps.
+    
+    Writes apps/game/public/atlases/<screen>.png (+ extra pages) and <screen>.json.
+    Screens whose source images did not change are not repacked.
+    
+    Args:
+        screens: Comma-separated asset folders (default: alphabets, scoring, players, settings)
+        force: Repack every screen even if nothing changed
+    
+    Returns:
+        Dictionary with per-screen request and byte counts before/after
+    """
+    try:
+        selected = tuple(s.strip() for s in screens.split(",") if s.strip()) or atlas_packer.DEFAULT_SCREENS
+        with jobs.slot():
+            return atlas_packer.build_atlases(PROJECT_ROOT, selected, force=force)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def compile_offline_answers(shard_by: str = "letter", dry_run: bool = False, benchmark: bool = True) -> dict:
+    """
+    Validate, normalize and shard the game's offline answers for per-round loading.
+    
+    Reads apps/game/public/data/offlineAnswers.json and categories.json, fixes duplicates,
+    casing, whitespace and umlaut letters, and writes content-hashed shards plus index.json
+    (with .br/.gz variants) to apps/game/public/data/answers/.
+    
+    Args:
+        shard_by: "letter" (one shard per category and letter) or "category"
+        dry_run: Only validate and measure, write nothing
+        benchmark: Report parse time and bytes before/after for the current data and a synthetic 100x dataset
+    
+    Returns:
+        Dictionary with the issues found, shard counts, written files and the benchmark
+    """
+    try:
+        with jobs.slot():
+            return answer_bundle.compile_answers(PROJECT_ROOT, shard_by, dry_run=dry_run, benchmark=benchmark)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# ============================================================================
+# ANSWER VALIDATION SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def validate_answers(answers: list[dict], category: str = "", letter: str = "") -> dict:
+    """
+    Score player answers against the offline answers, tolerating typos, case and missing umlauts.
+    
+    Each answer is matched within its category and letter: exactly after folding
+    (Müller = muller), else within a small edit distance (1 for up to 6 letters, 2 above).
+    
+    Args:
+        answers: Items with "answer" and "category"/"letter" (unless given below);
+            other keys such as "player" are returned unchanged
+        category: Category key for items without one (e.g. Blumen, Beruf)
+        letter: Round letter for items without one
+    
+    Returns:
+        Dictionary with per-item results (valid, match, distance or reason), counts and answers/second
+    """
+    try:
+        start = time.perf_counter()
+        results = answer_index.validate_batch(answers, category=category, letter=letter)
+        elapsed = time.perf_counter() - start
+        return {
+            "results": results,
+            "total": len(results),
+            "valid": sum(r["valid"] for r in results),
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "answers_per_s": int(len(results) / elapsed) if elapsed else None,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# ============================================================================
+# CODE INDEX SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def find_symbol(name: str, kind: str = "", exported_only: bool = False, limit: int = 50) -> dict:
+    """
+    Find where a TS/Vue symbol is defined in apps/game, apps/docs or packages/*.
+    
+    Covers top-level functions, consts, classes, interfaces, types and enums, and
+    Vue components under their Nuxt names (components/Base/Button.vue -> BaseButton).
+    
+    Args:
+        name: Symbol name; a trailing * matches by prefix (e.g. use*)
+        kind: Only this kind (function, const, class, interface, type, enum, component, page, layout)
+        exported_only: Only exported definitions
+        limit: Maximum results
+    
+    Returns:
+        Dictionary with definitions (path, line, kind, exported, signature) and total
+    """
+    try:
+        return symbols.find_symbol(name, kind=kind, exported_only=exported_only, limit=limit)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def find_references(name: str, path: str = "", kinds: str = "", limit: int = 50) -> dict:
+    """
+    Find where a TS/Vue symbol or component is used (code, imports, re-exports, templates).
+    
+    Comments and strings are not matched.
+    
+    Args:
+        name: Identifier or component name
+        path: Only files under this path (e.g. apps/game/pages)
+        kinds: Comma-separated kinds: code, import, export, template, member (property access);
+            default all but member
+        limit: Maximum references returned (each with its source line)
+    
+    Returns:
+        Dictionary with definitions, references, total and number of files
+    """
+    try:
+        return symbols.find_references(name, path=path, kinds=kinds, limit=limit)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def list_exports(module: str, follow: bool = True) -> dict:
+    """
+    List what a module exports.
+    
+    Args:
+        module: File path (packages/shared/src/utils.ts), directory (apps/game/composables)
+            or workspace package (@riddle-rush/shared, @riddle-rush/types/game)
+        follow: Expand "export * from" into the re-exported names
+    
+    Returns:
+        Dictionary mapping each module path to its exports (name, kind, line, from)
+    """
+    try:
+        return symbols.list_exports(module, follow=follow)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# ============================================================================
+# SKILL REGISTRY SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def list_skills() -> dict:
+    """
+    List the agent skills with their descriptions and the section outline of their references.
+    
+    Load only what a task needs afterwards with load_skill / load_skill_reference.
+    
+    Returns:
+        Dictionary with one entry per skill (mirrored copies are listed once)
+    """
+    try:
+        return {"skills": skills.list_skills()}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def load_skill(name: str) -> dict:
+    """
+    Load the SKILL.md instructions of one skill (without its reference files).
+    
+    Args:
+        name: Skill name, e.g. component-refactoring
+    
+    Returns:
+        Dictionary with the SKILL.md body and the sizes of its reference files
+    """
+    try:
+        return skills.load_skill(name)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def load_skill_reference(name: str, reference: str, section: str = "") -> dict:
+    """
+    Load one reference file of a skill, or a single section of it.
+    
+    Args:
+        name: Skill name, e.g. component-refactoring
+        reference: Reference file, e.g. references/hook-extraction.md (the references/ prefix is optional)
+        section: Section id or title from list_skills (default: the whole file)
+    
+    Returns:
+        Dictionary with the requested content
+    """
+    try:
+        return skills.load_reference(name, reference, section)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+def skill_registry_stats(reindex: bool = False) -> dict:
+    """
+    Bytes served by the skill tools versus loading every requested skill in full, and cache usage.
+    
+    Args:
+        reindex: Rediscover the skills first (after adding or removing one)
+    
+    Returns:
+        Dictionary with request, byte and cache counters
+    """
+    try:
+        if reindex:
+            skills.reindex()
+        return skills.stats()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# ============================================================================
+# AI CODE ANALYSIS SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def analyze_code_complexity(file_path: str = "apps/game") -> dict:
+    """
+    Analyze code complexity metrics for the specified directory.
+    
+    Args:
+        file_path: Directory path to analyze (default: apps/game)
+    
+    Returns:
+        Dictionary with complexity analysis results
+    """
+    try:
+        # This would integrate with AI tools for complexity analysis
+        # For now, return a placeholder response
+        return {
+            "status": "success",
+            "message": f"Code complexity analysis for {file_path}",
+            "metrics": {
+                "cyclomatic_complexity": "Would be calculated by AI tools",
+                "maintainability_index": "Would be calculated by AI tools",
+                "technical_debt": "Would be estimated by AI tools"
+            },
+            "recommendations": [
+                "Consider breaking down large functions",
+                "Add more unit tests for complex logic",
+                "Review cyclomatic complexity in key components"
+            ]
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+@mcp.tool()
+def generate_ai_documentation(module_name: str = "game") -> dict:
+    """
+    Generate AI-assisted documentation for the specified module.
+    
+    Args:
+        module_name: Module name to document (default: game)
+    
+    Returns:
+        Dictionary with documentation generation results
+    """
+    try:
+        # This would integrate with AI documentation tools
+        # For now, return a placeholder response
+        return {
+            "status": "success",
+            "message": f"AI documentation generation for {module_name} module",
+            "generated_files": [
+                f"docs/{module_name}-architecture.md",
+                f"docs/{module_name}-api-reference.md",
+                f"docs/{module_name}-best-practices.md"
+            ],
+            "coverage": "Comprehensive API documentation and usage examples"
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+@mcp.tool()
+def ai_code_review(file_path: str = "apps/game/composables") -> dict:
+    """
+    Perform AI-assisted code review on the specified files.
+    
+    Args:
+        file_path: File or directory path to review
+    
+    Returns:
+        Dictionary with code review results and suggestions
+    """
+    try:
+        # This would integrate with AI code review tools
+        # For now, return a placeholder response
+        return {
+            "status": "success",
+            "message": f"AI code review for {file_path}",
+            "findings": {
+                "best_practices": [
+                    "Consider using composable functions for better reusability",
+                    "Add proper error handling for async operations",
+                    "Implement proper cleanup for event listeners"
+                ],
+                "performance": [
+                    "Optimize image loading with lazy loading",
+                    "Consider memoization for expensive computations",
+                    "Review bundle size for production builds"
+                ],
+                "security": [
+                    "Validate all user inputs",
+                    "Use secure storage for sensitive data",
+                    "Implement proper CSRF protection"
+                ]
+            },
+            "score": "85/100 - Good quality with room for improvement"
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+# ============================================================================
+# AI WORKFLOW AUTOMATION SUBAGENT
+# ============================================================================
+
+@mcp.tool()
+def ai_optimize_workflow(workflow_type: str = "build") -> dict:
+    """
+    Optimize the specified workflow using AI analysis.
+    
+    Args:
+        workflow_type: Type of workflow to optimize (build, test, deploy, lint)
+    
+    Returns:
+        Dictionary with optimization recommendations
+    """
+    try:
+        optimizations = {
+            "build": {
+                "recommendations": [
+                    "Enable parallel builds with Turbo",
+                    "Implement caching for dependencies",
+                    "Optimize asset compression settings",
+                    "Review bundle analysis for optimization opportunities"
+                ],
+                "estimated_improvement": "20-30% faster builds"
+            },
+            "test": {
+                "recommendations": [
+                    "Implement test parallelization",
+                    "Add test result caching",
+                    "Optimize test setup/teardown",
+                    "Review slowest test cases for optimization"
+                ],
+                "estimated_improvement": "40-50% faster test runs"
+            },
+            "deploy": {
+                "recommendations": [
+                    "Implement blue-green deployments",
+                    "Add automated rollback capabilities",
+                    "Optimize CloudFront cache invalidation",
+                    "Review deployment timeout settings"
+                ],
+                "estimated_improvement": "30% faster deployments with better reliability"
+            },
+            "lint": {
+                "recommendations": [
+                    "Enable parallel linting",
+                    "Implement lint result caching",
+                    "Review lint rules for performance impact",
+                    "Optimize file patterns for linting"
+                ],
+                "estimated_improvement": "50% faster linting"
+            }
+        }
+        
+        return {
+            "status": "success",
+            "workflow": workflow_type,
+            "optimizations": optimizations.get(workflow_type, {"recommendations": []}),
+            "implementation": "Review and implement recommendations in CI/CD pipelines"
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+@mcp.tool()
+def ai_generate_ci_pipeline() -> dict:
+    """
+    Generate optimized CI/CD pipeline configuration using AI.
+    
+    Returns:
+        Dictionary with pipeline generation results
+    """
+    try:
+        # This would generate an optimized CI pipeline
+        return {
+            "status": "success",
+            "message": "AI-generated CI/CD pipeline configuration",
+            "pipeline_features": [
+                "Parallel job execution",
+                "Automated caching strategies",
+                "Intelligent test distribution",
+                "Automated deployment strategies",
+                "Comprehensive error handling"
+            ],
+            "estimated_improvement": "50-70% faster pipeline execution",
+            "implementation": "Review generated .gitlab-ci.yml and implement changes"
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# ============================================================================
+# SERVER RUNTIME
+# ============================================================================
+
+@mcp.tool()
+def server_status() -> dict:
+    """
+    Get runtime status of this MCP server (worker slots, running jobs, admission queue, shared cache).
+    
+    Returns:
+        Dictionary with job runner, admission and cache statistics
+    """
+    return {"jobs": jobs.stats(), "admission": admission.stats(), "cache": cache.stats()}
+
+
+# ============================================================================
+# MAIN ENTRY POINT
+# ============================================================================
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Riddle Rush FastMCP subagents server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=os.environ.get("MCP_TRANSPORT", "stdio"),
+                        help="stdio (one server per agent) or http (long-lived, shared by many agents)")
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("MCP_WORKERS", "0")) or None,
+                        help="Maximum concurrent subprocess jobs (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.workers:
+        jobs = JobRunner(args.workers)
+    
     # Run the FastMCP server
-    mcp.run()
+    if args.transport == "http":
+        # Streamable HTTP: every client gets its own MCP session on one shared process
+        mcp.run(transport="http", host=args.host, port=args.port)
+    else:
+        mcp.run()
@@ -0,0 +1,189 @@
+"""
+Precompress - brotli/gzip variants of text assets before upload
+
+Compresses JS, CSS, HTML, JSON (e.g. public/data/offlineAnswers.json), SVG and
+other text assets of the build output at maximum levels (brotli 11, gzip 9) in
+a process pool across all cores. The variants are written next to the source
+as ``<file>.br`` / ``<file>.gz``; s3_sync.py can upload them in place of the
+original with a matching Content-Encoding.
+
+Compressed output is cached by content hash (PRECOMPRESS_CACHE_DIR, default
+<repo>/.precompress-cache), so an unchanged asset is never recompressed, even
+across clean builds. Variants that save less than MIN_SAVINGS are skipped.
+
+Only the encoding that is uploaded is worth building: the CLI defaults to
+S3_CONTENT_ENCODING (the variant s3_sync.py uploads) when it is set. CloudFront
+compresses on its own, so scripts/aws-deploy.sh only runs this when origin
+compression is enabled.
+
+brotli is optional (``pip install brotli``); without it only gzip variants are
+produced.
+
+Usage:
+    S3_CONTENT_ENCODING=gzip python precompress.py ../../apps/game/.output/public
+    python precompress.py dist --encodings br --workers 4
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+TEXT_EXTENSIONS = (".js", ".mjs", ".css", ".html", ".json", ".svg", ".txt", ".xml", ".webmanifest")
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+MIN_SIZE = 1024
+MIN_SAVINGS = 0.10
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def cache_dir(project_root: Path) -> Path:
+    return Path(os.environ.get("PRECOMPRESS_CACHE_DIR") or project_root / ".precompress-cache")
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress at the maximum level; gzip output is reproducible (no timestamp)."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def is_variant(path: Path) -> bool:
+    """True for a .br/.gz file produced from a sibling asset."""
+    return path.suffix in SUFFIXES.values() and path.with_suffix("").exists()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _precompress_file(path: str, encodings: tuple[str, ...], cache: str, min_size: int, min_savings: float) -> dict:
+    """Worker: produce (or remove) the variants of one file. Returns sizes per encoding."""
+    source = Path(path)
+    data = source.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    result = {"path": path, "size": len(data), "variants": {}, "skipped": [], "cache_hits": 0}
+
+    for encoding in encodings:
+        variant = source.with_name(source.name + SUFFIXES[encoding])
+        if len(data) < min_size:
+            compressed = None
+        else:
+            cached = Path(cache) / digest[:2] / f"{digest}{SUFFIXES[encoding]}"
+            if cached.exists():
+                compressed = cached.read_bytes()
+                result["cache_hits"] += 1
+            else:
+                compressed = compress(data, encoding)
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                _write_atomic(cached, compressed)
+
+        if compressed is None or len(compressed) > len(data) * (1 - min_savings):
+            variant.unlink(missing_ok=True)
+            result["skipped"].append(encoding)
+            continue
+        if not variant.exists() or variant.read_bytes() != compressed:
+            _write_atomic(variant, compressed)
+        result["variants"][encoding] = len(compressed)
+    return result
+
+
+def precompress_tree(
+    root: Path | str,
+    cache: Path | str,
+    encodings: tuple[str, ...] | None = None,
+    workers: int | None = None,
+    min_size: int = MIN_SIZE,
+    min_savings: float = MIN_SAVINGS,
+) -> dict:
+    """
+    Write compressed variants for every text asset below ``root``.
+
+    Args:
+        root: Build output directory
+        cache: Content-hash cache directory
+        encodings: Encodings to produce (default: br and gzip, gzip only without brotli)
+        workers: Worker processes (default: all cores)
+        min_size: Files smaller than this are not compressed
+        min_savings: Minimum fraction a variant must save to be kept
+
+    Returns:
+        Report with bytes saved per asset type and encoding, skipped files and cache hits
+    """
+    root = Path(root)
+    encodings = tuple(encodings or available_encodings())
+    if "br" in encodings and brotli is None:
+        raise RuntimeError("brotli is not installed (pip install brotli)")
+
+    files = sorted(
+        str(p) for p in root.rglob("*") if p.is_file() and p.suffix.lower() in TEXT_EXTENSIONS and not is_variant(p)
+    )
+    start = time.perf_counter()
+    task = partial(_precompress_file, encodings=encodings, cache=str(cache), min_size=min_size, min_savings=min_savings)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(task, files, chunksize=8))
+
+    per_type: dict[str, dict] = {}
+    for r in results:
+        ext = Path(r["path"]).suffix.lower()
+        entry = per_type.setdefault(
+            ext, {"files": 0, "bytes": 0, "saved": dict.fromkeys(encodings, 0), "skipped": dict.fromkeys(encodings, 0)}
+        )
+        entry["files"] += 1
+        entry["bytes"] += r["size"]
+        for encoding in encodings:
+            if encoding in r["variants"]:
+                entry["saved"][encoding] += r["size"] - r["variants"][encoding]
+            else:
+                entry["skipped"][encoding] += 1
+
+    return {
+        "root": str(root),
+        "encodings": list(encodings),
+        "files": len(results),
+        "bytes": sum(r["size"] for r in results),
+        "saved": {e: sum(t["saved"][e] for t in per_type.values()) for e in encodings},
+        "cache_hits": sum(r["cache_hits"] for r in results),
+        "per_type": dict(sorted(per_type.items())),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write brotli/gzip variants of text assets")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--cache-dir", type=Path, help="Content-hash cache (default: PRECOMPRESS_CACHE_DIR or <repo>/.precompress-cache)")
+    parser.add_argument(
+        "--encodings",
+        default=os.environ.get("S3_CONTENT_ENCODING"),
+        help="Comma-separated: br,gzip (default: S3_CONTENT_ENCODING, else all available)",
+    )
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    cache = args.cache_dir or cache_dir(Path(__file__).parent.parent.parent)
+    encodings = tuple(args.encodings.split(",")) if args.encodings else None
+    report = precompress_tree(args.root, cache, encodings, args.workers)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
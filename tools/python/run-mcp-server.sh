@@ -5,4 +5,4 @@ cd "$(dirname "$0")/../.." || exit 1
 
 # Use uv to run the Python script with dependencies
 # This ensures all dependencies from pyproject.toml are available
-exec uv run --no-project --directory tools/python python tools/python/main.py
+exec uv run --no-project --directory tools/python python tools/python/main.py "$@"
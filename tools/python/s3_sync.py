@@ -0,0 +1,383 @@
+"""
+S3 Sync - delta upload of the built site to S3
+
+Replaces the four ``aws s3 sync`` passes in scripts/aws-deploy.sh, which
+re-upload and re-check the whole build output on every deploy:
+
+1. hash every file under the build dir in parallel (MD5 plus the ETag S3 will
+   report for it, multipart-aware);
+2. compare against the bucket listing and the live release manifest
+   (MANIFEST_KEY, see deploy_releases.py);
+3. upload only new or changed objects over one pooled boto3 client, using
+   multipart transfers for large assets;
+4. optionally delete objects that are gone from the build (keeping those of
+   recent releases for rollback), then record the new release;
+5. derive the CloudFront invalidation set from the old and new manifest
+   (see cloudfront_invalidation.py).
+
+Cache-Control follows the rules of the Lambda@Edge function in
+infrastructure/lambda/cache-control.js, so objects carry the same header at the
+origin that the edge would set. With ``content_encoding`` set, variants written
+by precompress.py (``<file>.gz`` / ``<file>.br``) are uploaded under the
+original key with a matching Content-Encoding.
+
+Usage:
+    python s3_sync.py --bucket riddle-rush-pwa --build-dir ../../apps/game/.output/public
+    python s3_sync.py --bucket my-bucket --build-dir dist --endpoint-url http://localhost:9000 --dry-run
+    python s3_sync.py --bucket riddle-rush-pwa --build-dir dist --invalidation-output /tmp/paths.json
+    python precompress.py dist && python s3_sync.py --bucket riddle-rush-pwa --build-dir dist --content-encoding gzip
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from cloudfront_invalidation import plan_invalidation
+from deploy_releases import (
+    DEPLOY_PREFIX,
+    MANIFEST_VERSION,
+    RETAIN_RELEASES,
+    load_current_manifest,
+    record_release,
+    release_id,
+    retained_keys,
+)
+from precompress import SUFFIXES, is_variant
+
+DEFAULT_WORKERS = 16
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+# Mirrors infrastructure/lambda/cache-control.js
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SHORT_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+DATA_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+ASSET_EXTENSIONS = (
+    ".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".svg",
+    ".woff", ".woff2", ".ttf", ".eot", ".ico", ".json",
+)  # fmt: skip
+
+CONTENT_TYPE_OVERRIDES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".webmanifest": "application/manifest+json",
+    ".woff2": "font/woff2",
+}
+
+
+def cache_control_for(key: str) -> str:
+    """Cache-Control header for an object key, using the same rules as the edge function."""
+    uri = "/" + key.lower()
+    if uri.endswith(".html") or "sw.js" in uri or "workbox-" in uri:
+        return SHORT_CACHE_CONTROL
+    if uri.endswith(ASSET_EXTENSIONS):
+        return IMMUTABLE_CACHE_CONTROL
+    if uri.startswith("/data/"):
+        return DATA_CACHE_CONTROL
+    return IMMUTABLE_CACHE_CONTROL
+
+
+def content_type_for(key: str) -> str:
+    suffix = Path(key).suffix.lower()
+    if suffix in CONTENT_TYPE_OVERRIDES:
+        return CONTENT_TYPE_OVERRIDES[suffix]
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+@dataclass
+class LocalFile:
+    """A file of the build output with the checksums needed to compare it to S3."""
+
+    key: str
+    path: Path
+    size: int
+    md5: str
+    etag: str
+    cache_control: str
+    content_type: str
+    content_encoding: str | None = None
+
+
+def hash_file(
+    path: Path, key: str, multipart_threshold: int, chunksize: int, content_encoding: str | None = None
+) -> LocalFile:
+    """
+    Hash a file and predict the ETag S3 reports after uploading it.
+
+    Single-part uploads get the plain MD5 as ETag; multipart uploads get the MD5
+    of the concatenated part digests followed by ``-<parts>``. ``path`` is the
+    file whose bytes are uploaded (a compressed variant when ``content_encoding``
+    is set); ``key`` decides the headers.
+    """
+    whole = hashlib.md5(usedforsecurity=False)
+    part_digests = []
+    size = 0
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunksize):
+            whole.update(chunk)
+            part_digests.append(hashlib.md5(chunk, usedforsecurity=False).digest())
+            size += len(chunk)
+
+    md5 = whole.hexdigest()
+    if size >= multipart_threshold and len(part_digests) > 1:
+        etag = f"{hashlib.md5(b''.join(part_digests), usedforsecurity=False).hexdigest()}-{len(part_digests)}"
+    else:
+        etag = md5
+    return LocalFile(key, path, size, md5, etag, cache_control_for(key), content_type_for(key), content_encoding)
+
+
+def _upload_source(path: Path, content_encoding: str | None) -> tuple[Path, str | None]:
+    """The file to upload for ``path``: its precompressed variant if one exists."""
+    if content_encoding:
+        variant = path.with_name(path.name + SUFFIXES[content_encoding])
+        if variant.exists():
+            return variant, content_encoding
+    return path, None
+
+
+def hash_tree(
+    root: Path,
+    workers: int = DEFAULT_WORKERS,
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    chunksize: int = MULTIPART_CHUNKSIZE,
+    content_encoding: str | None = None,
+) -> dict[str, LocalFile]:
+    """
+    Hash every file below ``root`` in parallel.
+
+    Precompressed variants are never published as objects of their own; with
+    ``content_encoding`` they replace the body of their source file.
+
+    Returns:
+        Mapping of S3 key (POSIX path relative to root) to LocalFile
+    """
+    paths = sorted(p for p in root.rglob("*") if p.is_file() and not is_variant(p))
+
+    def hash_one(path: Path) -> LocalFile:
+        source, encoding = _upload_source(path, content_encoding)
+        return hash_file(source, path.relative_to(root).as_posix(), multipart_threshold, chunksize, encoding)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return {f.key: f for f in pool.map(hash_one, paths)}
+
+
+def list_remote(client, bucket: str) -> dict[str, dict]:
+    """
+    List every object in the bucket.
+
+    Returns:
+        Mapping of key to {"etag", "size"}
+    """
+    remote = {}
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+        for obj in page.get("Contents", []):
+            remote[obj["Key"]] = {"etag": obj["ETag"].strip('"'), "size": obj["Size"]}
+    return remote
+
+
+def load_remote_manifest(client, bucket: str) -> dict[str, dict]:
+    """Files section of the live release manifest (empty if there is none)."""
+    return load_current_manifest(client, bucket).get("files", {})
+
+
+def build_manifest(local: dict[str, LocalFile]) -> dict:
+    return {
+        "version": MANIFEST_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": {
+            key: {
+                "md5": f.md5,
+                "etag": f.etag,
+                "size": f.size,
+                "cache_control": f.cache_control,
+                "content_type": f.content_type,
+                "content_encoding": f.content_encoding,
+            }
+            for key, f in sorted(local.items())
+        },
+    }
+
+
+@dataclass
+class SyncPlan:
+    """What a sync has to do: keys to upload, keys already up to date and keys to delete."""
+
+    upload: list[str]
+    unchanged: list[str]
+    delete: list[str]
+
+
+def plan_sync(
+    local: dict[str, LocalFile],
+    remote: dict[str, dict],
+    manifest: dict[str, dict],
+    delete: bool = False,
+    keep: set[str] | frozenset[str] = frozenset(),
+) -> SyncPlan:
+    """
+    Decide which objects need uploading.
+
+    An object is unchanged when S3 still holds the ETag we expect for the local
+    content, either predicted directly or recorded in the previous manifest
+    (objects uploaded with a different part size), and its Cache-Control and
+    Content-Encoding have not changed since. Deletion spares the .deploy/
+    bookkeeping and every key in ``keep``.
+    """
+    upload, unchanged = [], []
+    for key, f in local.items():
+        obj = remote.get(key)
+        recorded = manifest.get(key, {})
+        same_content = obj is not None and obj["size"] == f.size and (
+            obj["etag"] == f.etag or (recorded.get("md5") == f.md5 and recorded.get("etag") == obj["etag"])
+        )
+        same_headers = recorded.get("cache_control", f.cache_control) == f.cache_control and (
+            recorded.get("content_encoding", f.content_encoding) == f.content_encoding
+        )
+        (unchanged if same_content and same_headers else upload).append(key)
+
+    stale = []
+    if delete:
+        stale = sorted(k for k in remote if k not in local and k not in keep and not k.startswith(DEPLOY_PREFIX))
+    return SyncPlan(sorted(upload), sorted(unchanged), stale)
+
+
+def make_client(region: str | None = None, endpoint_url: str | None = None, workers: int = DEFAULT_WORKERS):
+    """boto3 S3 client with a connection pool large enough for ``workers`` parallel transfers."""
+    import boto3
+    from botocore.config import Config
+
+    config = Config(max_pool_connections=workers * 2, retries={"max_attempts": 10, "mode": "adaptive"})
+    return boto3.client("s3", region_name=region, endpoint_url=endpoint_url, config=config)
+
+
+def sync_directory(
+    bucket: str,
+    build_dir: Path | str,
+    client=None,
+    workers: int = DEFAULT_WORKERS,
+    delete: bool = False,
+    dry_run: bool = False,
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    chunksize: int = MULTIPART_CHUNKSIZE,
+    content_encoding: str | None = None,
+    retain_releases: int = RETAIN_RELEASES,
+) -> dict:
+    """
+    Upload the changed files of ``build_dir`` to ``bucket``.
+
+    Args:
+        bucket: Target S3 bucket
+        build_dir: Directory to publish (e.g. apps/game/.output/public)
+        client: boto3 S3 client (default: make_client())
+        workers: Parallel hashing and upload workers
+        delete: Delete objects that are no longer in the build
+        dry_run: Only compute the plan
+        multipart_threshold: Files at least this large are uploaded in parts
+        chunksize: Multipart part size
+        content_encoding: Upload precompress.py variants of this encoding ("gzip" or "br")
+        retain_releases: With ``delete``, keep objects of this many recent releases for rollback
+
+    Returns:
+        Summary with uploaded/unchanged/deleted keys, bytes, timings and the
+        CloudFront invalidation plan
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    build_dir = Path(build_dir)
+    if not build_dir.is_dir():
+        raise FileNotFoundError(f"Build directory not found: {build_dir}")
+    client = client or make_client(workers=workers)
+
+    start = time.perf_counter()
+    local = hash_tree(build_dir, workers, multipart_threshold, chunksize, content_encoding)
+    hashed = time.perf_counter()
+    previous = load_remote_manifest(client, bucket)
+    keep = retained_keys(client, bucket, retain_releases) if delete else frozenset()
+    plan = plan_sync(local, list_remote(client, bucket), previous, delete, keep)
+    manifest = build_manifest(local)
+    planned = time.perf_counter()
+
+    if not dry_run:
+        transfer = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=chunksize,
+            max_concurrency=max(1, workers // 2),
+        )
+
+        def upload(key: str) -> None:
+            f = local[key]
+            extra = {"CacheControl": f.cache_control, "ContentType": f.content_type}
+            if f.content_encoding:
+                extra["ContentEncoding"] = f.content_encoding
+            client.upload_file(str(f.path), bucket, key, ExtraArgs=extra, Config=transfer)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(upload, plan.upload))
+
+        for batch_start in range(0, len(plan.delete), 1000):
+            batch = plan.delete[batch_start : batch_start + 1000]
+            client.delete_objects(Bucket=bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True})
+
+        record_release(client, bucket, manifest, workers)
+    done = time.perf_counter()
+
+    return {
+        "bucket": bucket,
+        "release": release_id(manifest["files"]),
+        "dry_run": dry_run,
+        "files": len(local),
+        "uploaded": plan.upload,
+        "unchanged": len(plan.unchanged),
+        "deleted": plan.delete,
+        "bytes_uploaded": sum(local[key].size for key in plan.upload),
+        "bytes_total": sum(f.size for f in local.values()),
+        "precompressed": sum(1 for f in local.values() if f.content_encoding),
+        "invalidation": plan_invalidation(previous, manifest["files"]).to_dict(),
+        "timings_s": {
+            "hash": round(hashed - start, 3),
+            "plan": round(planned - hashed, 3),
+            "transfer": round(done - planned, 3),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Upload only changed build files to S3")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--build-dir", type=Path, required=True)
+    parser.add_argument("--region", default=os.environ.get("AWS_REGION"))
+    parser.add_argument("--endpoint-url", help="S3-compatible endpoint (MinIO, moto server)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--delete", action="store_true", help="Delete objects that are no longer in the build")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--content-encoding", choices=tuple(SUFFIXES), help="Upload precompress.py variants")
+    parser.add_argument("--invalidation-output", type=Path, help="Write the CloudFront invalidation plan (JSON) here")
+    args = parser.parse_args(argv)
+
+    summary = sync_directory(
+        args.bucket,
+        args.build_dir,
+        client=make_client(args.region, args.endpoint_url, args.workers),
+        workers=args.workers,
+        delete=args.delete,
+        dry_run=args.dry_run,
+        content_encoding=args.content_encoding,
+    )
+    print(f"Files: {summary['files']}, uploaded: {len(summary['uploaded'])}, unchanged: {summary['unchanged']}, "
+          f"deleted: {len(summary['deleted'])}, invalidation paths: {len(summary['invalidation']['paths'])}")
+    if args.invalidation_output:
+        args.invalidation_output.write_text(json.dumps(summary["invalidation"], indent=2), encoding="utf-8")
+    print(json.dumps({k: v for k, v in summary.items() if k not in ("uploaded", "deleted")}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Shared Cache - TTL cache for tool results shared by every MCP session
+
+In the long-lived HTTP mode many agents hit the same server; results of slow,
+read-only tools (pnpm workspace listing, terraform state, docs listing) are
+computed once and served to every session until they expire. Concurrent
+identical calls wait for the first computation instead of spawning their own
+subprocess (single flight).
+
+Callers always receive a deep copy, so one session mutating a result cannot
+leak into another. Set MCP_SHARED_CACHE=0 to disable caching.
+"""
+
+import copy
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+class SharedCache:
+    """Thread-safe TTL cache with single-flight computation."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._entries: dict[tuple, tuple[float, Any]] = {}
+        self._inflight: dict[tuple, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: tuple, ttl: float, compute: Callable[[], Any], cacheable=None) -> Any:
+        """
+        Return the cached value for ``key`` or compute and store it.
+
+        Args:
+            key: Hashable cache key
+            ttl: Seconds the value stays valid
+            compute: Zero-argument function producing the value
+            cacheable: Predicate deciding whether a computed value is stored (default: not an error dict)
+        """
+        if not self.enabled or ttl <= 0:
+            return compute()
+        cacheable = cacheable or (lambda value: not _is_error(value))
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self.hits += 1
+                    return copy.deepcopy(entry[1])
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            waiter.wait()
+
+        try:
+            value = compute()
+            if cacheable(value):
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + ttl, value)
+            return copy.deepcopy(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def cached(self, ttl: float) -> Callable:
+        """Decorator caching a function's result per arguments for ``ttl`` seconds."""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+                return self.get_or_compute(key, ttl, lambda: func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | bool]:
+        with self._lock:
+            return {"enabled": self.enabled, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def cache_from_env() -> SharedCache:
+    """SharedCache honouring MCP_SHARED_CACHE=0 (disabled)."""
+    return SharedCache(enabled=os.environ.get("MCP_SHARED_CACHE", "1") != "0")
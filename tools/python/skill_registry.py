@@ -0,0 +1,284 @@
+"""
+Skill Registry - progressive, section-level loading of agent skills
+
+Skills follow the skill-creator layout (``<skill>/SKILL.md`` with YAML
+frontmatter plus ``references/*.md``) and are mirrored into several agent
+folders (.agents, .codex, .cursor, ... /skills), usually as symlinks. The
+registry indexes every skill once per real folder: its frontmatter and the
+heading outline of each reference file. Agents then fetch the SKILL.md body or
+single reference sections on demand instead of the whole skill.
+
+Loaded files are kept in an LRU bounded by bytes; a file is re-read (and its
+skill re-indexed) when its mtime or size changes. ``stats()`` compares the
+bytes served with what loading full skills would have sent.
+
+Usage:
+    registry = SkillRegistry(project_root)
+    registry.list_skills()
+    registry.load_reference("component-refactoring", "references/hook-extraction.md", "when-to-extract-hooks")
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+SKILL_ROOT_PATTERNS = ("skills", ".*/skills")
+CACHE_BYTES = 4 * 1024 * 1024
+
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+FRONTMATTER = re.compile(r"\A---\n(.*?)\n---\n?", re.DOTALL)
+
+
+def split_frontmatter(text: str) -> tuple[str | None, str]:
+    """Split a SKILL.md into its raw frontmatter (None if there is none) and body."""
+    match = FRONTMATTER.match(text)
+    if not match:
+        return None, text
+    return match.group(1), text[match.end() :]
+
+
+def parse_frontmatter(text: str) -> tuple[dict, str]:
+    """
+    Split a SKILL.md into its frontmatter (dict) and body.
+
+    Raises:
+        ValueError: The frontmatter is not valid YAML or not a mapping
+    """
+    raw, body = split_frontmatter(text)
+    if raw is None:
+        return {}, body
+    try:
+        import yaml
+    except ImportError:
+        # Without PyYAML: top-level "key: value" scalars are all a registry needs
+        meta = {}
+        for line in raw.splitlines():
+            key, sep, value = line.partition(":")
+            if sep and key and not key[0].isspace():
+                meta[key.strip()] = value.strip().strip("\"'")
+        return meta, body
+    try:
+        meta = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
+    if meta is None:
+        return {}, body
+    if not isinstance(meta, dict):
+        raise ValueError(f"Frontmatter must be a YAML mapping, got {type(meta).__name__}")
+    return meta, body
+
+
+def _slug(title: str) -> str:
+    """GitHub-style heading anchor."""
+    return re.sub(r"[^\w\- ]", "", title.lower().replace("`", "")).strip().replace(" ", "-")
+
+
+def outline(text: str) -> list[dict]:
+    """
+    Headings of a markdown document, ignoring fenced code blocks.
+
+    Returns:
+        One dict per section: id, title, level, start/end line (end exclusive) and bytes
+    """
+    lines = text.splitlines(keepends=True)
+    headings, in_fence, seen = [], False, {}
+    for number, line in enumerate(lines):
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            slug = _slug(match.group(2))
+            count = seen.get(slug, 0)
+            seen[slug] = count + 1
+            headings.append(
+                {
+                    "id": f"{slug}-{count}" if count else slug,
+                    "title": match.group(2),
+                    "level": len(match.group(1)),
+                    "start": number,
+                }
+            )
+
+    for i, heading in enumerate(headings):
+        end = next((h["start"] for h in headings[i + 1 :] if h["level"] <= heading["level"]), len(lines))
+        heading["end"] = end
+        heading["bytes"] = len("".join(lines[heading["start"] : end]).encode())
+    return headings
+
+
+class SkillRegistry:
+    """Index of the skills of a checkout with lazily loaded, LRU-cached content."""
+
+    def __init__(self, project_root: Path, cache_bytes: int = CACHE_BYTES):
+        self.project_root = Path(project_root)
+        self.cache_bytes = cache_bytes
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[Path, tuple[tuple[int, int], str]] = OrderedDict()
+        self._cached_bytes = 0
+        self._skills: dict[str, dict] = {}
+        self.metrics = {"requests": 0, "bytes_served": 0, "bytes_full_load": 0, "cache_hits": 0, "cache_misses": 0}
+        self.reindex()
+
+    # -- content -----------------------------------------------------------
+
+    def _read(self, path: Path) -> str:
+        """File content through the LRU (keyed by path, validated by mtime and size)."""
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry and entry[0] == signature:
+                self._cache.move_to_end(path)
+                self.metrics["cache_hits"] += 1
+                return entry[1]
+        text = path.read_text(encoding="utf-8")
+        with self._lock:
+            self.metrics["cache_misses"] += 1
+            old = self._cache.pop(path, None)
+            if old:
+                self._cached_bytes -= len(old[1])
+            self._cache[path] = (signature, text)
+            self._cached_bytes += len(text)
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+        return text
+
+    # -- index -------------------------------------------------------------
+
+    def _signature(self, folder: Path) -> tuple:
+        files = [folder / "SKILL.md", *sorted((folder / "references").glob("*.md"))]
+        return tuple((str(f), f.stat().st_mtime_ns, f.stat().st_size) for f in files if f.is_file())
+
+    def _index_skill(self, folder: Path, aliases: list[Path]) -> dict:
+        text = self._read(folder / "SKILL.md")
+        try:
+            meta, body = parse_frontmatter(text)
+            error = None
+        except ValueError as e:
+            # Still listed (under its folder name) so a broken skill is visible rather than fatal
+            meta, body, error = {}, split_frontmatter(text)[1], str(e)
+        references = {}
+        for path in sorted((folder / "references").glob("*.md")):
+            text = self._read(path)
+            references[path.relative_to(folder).as_posix()] = {
+                "bytes": len(text.encode()),
+                "sections": outline(text),
+            }
+        skill_md_bytes = (folder / "SKILL.md").stat().st_size
+        return {
+            "name": str(meta.get("name") or folder.name),
+            "description": str(meta.get("description") or ""),
+            "path": str(folder),
+            "aliases": [str(a.relative_to(self.project_root)) for a in aliases],
+            "body_bytes": len(body.encode()),
+            "full_bytes": skill_md_bytes + sum(r["bytes"] for r in references.values()),
+            "references": references,
+            "signature": self._signature(folder),
+            "error": error,
+        }
+
+    def reindex(self) -> dict:
+        """Discover all skills (deduplicated by real folder) and index them."""
+        found: dict[Path, list[Path]] = {}
+        for pattern in SKILL_ROOT_PATTERNS:
+            for root in sorted(self.project_root.glob(pattern)):
+                for candidate in sorted(root.iterdir()) if root.is_dir() else []:
+                    if (candidate / "SKILL.md").is_file():
+                        found.setdefault(candidate.resolve(), []).append(candidate)
+        skills = {}
+        for folder, aliases in sorted(found.items()):
+            skill = self._index_skill(folder, aliases)
+            skills.setdefault(skill["name"], skill)
+        self._skills = skills
+        return {"skills": len(skills)}
+
+    def _skill(self, name: str) -> dict:
+        skill = self._skills.get(name)
+        if skill is None:
+            raise KeyError(f"Unknown skill: {name} (available: {', '.join(sorted(self._skills))})")
+        folder = Path(skill["path"])
+        if not (folder / "SKILL.md").is_file():
+            self.reindex()  # moved or deleted
+            return self._skill(name)
+        if self._signature(folder) != skill["signature"]:
+            skill = self._skills[name] = self._index_skill(folder, [self.project_root / a for a in skill["aliases"]])
+        return skill
+
+    def _serve(self, skill: dict, text: str) -> str:
+        with self._lock:
+            self.metrics["requests"] += 1
+            self.metrics["bytes_served"] += len(text.encode())
+            self.metrics["bytes_full_load"] += skill["full_bytes"]
+        return text
+
+    # -- queries -----------------------------------------------------------
+
+    def list_skills(self) -> list[dict]:
+        """Name, description, sizes and reference outline (ids and titles) of every skill."""
+        return [
+            {
+                "name": skill["name"],
+                "description": skill["description"],
+                "valid": skill["error"] is None,
+                "error": skill["error"],
+                "aliases": skill["aliases"],
+                "body_bytes": skill["body_bytes"],
+                "full_bytes": skill["full_bytes"],
+                "references": {
+                    ref: [{key: s[key] for key in ("id", "title", "level", "bytes")} for s in info["sections"]]
+                    for ref, info in skill["references"].items()
+                },
+            }
+            for skill in (self._skill(name) for name in sorted(self._skills))
+        ]
+
+    def load_skill(self, name: str) -> dict:
+        """The SKILL.md body (without frontmatter) and the list of reference files."""
+        skill = self._skill(name)
+        _, body = split_frontmatter(self._read(Path(skill["path"]) / "SKILL.md"))
+        return {
+            "name": name,
+            "description": skill["description"],
+            "error": skill["error"],
+            "body": self._serve(skill, body),
+            "references": {ref: info["bytes"] for ref, info in skill["references"].items()},
+        }
+
+    def load_reference(self, name: str, reference: str, section: str = "") -> dict:
+        """
+        A reference file, or one section of it (by id or exact title).
+
+        Raises:
+            KeyError: Unknown skill, reference or section
+        """
+        skill = self._skill(name)
+        if reference not in skill["references"] and f"references/{reference}" in skill["references"]:
+            reference = f"references/{reference}"
+        info = skill["references"].get(reference)
+        if info is None:
+            raise KeyError(f"Unknown reference {reference!r} of {name} (available: {', '.join(skill['references'])})")
+
+        text = self._read(Path(skill["path"]) / reference)
+        if not section:
+            return {"name": name, "reference": reference, "content": self._serve(skill, text)}
+
+        match = next((s for s in info["sections"] if section in (s["id"], s["title"])), None)
+        if match is None:
+            raise KeyError(f"Unknown section {section!r} in {reference}")
+        lines = text.splitlines(keepends=True)
+        content = "".join(lines[match["start"] : match["end"]])
+        return {"name": name, "reference": reference, "section": match["id"], "content": self._serve(skill, content)}
+
+    def stats(self) -> dict:
+        """Bytes served vs. full-skill loading, plus LRU usage."""
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics.update(cached_files=len(self._cache), cached_bytes=self._cached_bytes, cache_limit=self.cache_bytes)
+        full = metrics["bytes_full_load"]
+        metrics["saved_percent"] = round(100 * (1 - metrics["bytes_served"] / full), 1) if full else 0.0
+        metrics["skills"] = len(self._skills)
+        return metrics
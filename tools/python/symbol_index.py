@@ -0,0 +1,667 @@
+"""
+Symbol Index - persistent index of TS/Vue definitions, exports, imports and references
+
+Agents looking for "where is useGameStore defined" or "who uses BaseButton"
+used to grep the whole tree. This scans apps/game, apps/docs and packages/*
+(.ts, .tsx, .js, .mjs, .vue) once into SQLite and answers lookups from there:
+
+    symbols   top-level declarations (function, class, interface, type, enum,
+              const/let/var, namespace) and Vue components (Nuxt names:
+              components/Base/Button.vue -> BaseButton)
+    exports   exported names, including ``export { a as b } from`` and
+              ``export * from`` (resolved to files by list_exports)
+    imports   imported names with their module
+    refs      identifier occurrences (code, imports, member accesses and Vue
+              template tags / expressions) outside declarations
+
+There is no TypeScript parser here, so sources are scanned: comments, string
+and template contents and regex literals are blanked first (offsets and lines
+are kept), then declarations are matched at brace depth 0.
+
+Updates are incremental. A refresh compares each file's mtime and size with
+the stored ones and re-hashes only those that differ; a file is re-scanned
+only when its content hash changed. Refreshes run at most every
+REFRESH_INTERVAL_S, and a file watcher can report changed paths directly
+through ``update(paths)``.
+
+Usage:
+    index = SymbolIndex(project_root)
+    index.find_symbol("useGameStore")
+    index.find_references("BaseButton")
+    index.list_exports("@riddle-rush/shared")
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SOURCE_ROOTS = ("apps/game", "apps/docs", "packages")
+EXTENSIONS = (".ts", ".tsx", ".mts", ".js", ".mjs", ".vue")
+EXCLUDED_DIRS = {"node_modules", ".nuxt", ".output", "dist", "coverage", ".cache", "playwright-report", "test-results"}
+RESOLVE_SUFFIXES = ("", ".ts", ".tsx", ".js", ".mjs", ".vue", "/index.ts", "/index.js")
+REFRESH_INTERVAL_S = 2.0
+SCHEMA_VERSION = 1
+DEFAULT_LIMIT = 50
+
+KEYWORDS = {
+    "abstract", "any", "as", "async", "await", "boolean", "break", "case", "catch", "class", "const", "constructor",
+    "continue", "debugger", "declare", "default", "delete", "do", "else", "enum", "export", "extends", "false",
+    "finally", "for", "from", "function", "get", "if", "implements", "import", "in", "infer", "instanceof", "interface",
+    "is", "keyof", "let", "module", "namespace", "never", "new", "null", "number", "object", "of", "package", "private",
+    "protected", "public", "readonly", "return", "satisfies", "set", "static", "string", "super", "switch", "symbol",
+    "this", "throw", "true", "try", "type", "typeof", "undefined", "unique", "unknown", "var", "void", "while", "with",
+    "yield",
+}
+
+SCHEMA = """
+CREATE TABLE files (path TEXT PRIMARY KEY, hash TEXT, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE symbols (path TEXT, name TEXT, kind TEXT, line INTEGER, col INTEGER, exported INTEGER, signature TEXT);
+CREATE TABLE exports (path TEXT, name TEXT, local TEXT, source TEXT, line INTEGER);
+CREATE TABLE imports (path TEXT, name TEXT, local TEXT, source TEXT, line INTEGER, type_only INTEGER);
+CREATE TABLE refs (path TEXT, name TEXT, line INTEGER, col INTEGER, kind TEXT);
+CREATE INDEX symbols_name ON symbols (name);
+CREATE INDEX symbols_path ON symbols (path);
+CREATE INDEX exports_path ON exports (path);
+CREATE INDEX imports_path ON imports (path);
+CREATE INDEX imports_name ON imports (name);
+CREATE INDEX refs_name ON refs (name);
+CREATE INDEX refs_path ON refs (path);
+"""
+
+IDENT = r"[A-Za-z_$][\w$]*"
+TOKENS = re.compile(
+    rf"""
+    (?P<open>\{{)|(?P<close>\}})
+    |(?P<exportlist>\bexport\s+(?:type\s+)?\{{[^}}]*\}}(?:\s*from\s*(?P<listsource>['"][^'"\n]*['"]))?)
+    |(?P<exportall>\bexport\s+\*(?:\s+as\s+(?P<namespace>{IDENT}))?\s+from\s*(?P<allsource>['"][^'"\n]*['"]))
+    |(?P<import>\bimport\s+(?P<typeonly>type\s+)?(?P<clause>[\w$\s,*{{}}]*?)\s*(?:\bfrom\s*)?
+        (?P<source>['"][^'"\n]*['"]))
+    |(?P<decl>\b(?P<export>export\s+(?P<default>default\s+)?)?(?:declare\s+)?(?:async\s+)?
+        (?P<kind>function\s*\*?|abstract\s+class|class|interface|type|const\s+enum|enum|const|let|var|namespace)
+        \s+(?P<name>{IDENT}))
+    |(?P<exportdefault>\bexport\s+default\b)
+    |(?P<ident>{IDENT})
+    """,
+    re.VERBOSE,
+)
+FUNCTION_VALUE = re.compile(rf"\s*(?::[^=]*)?=\s*(?:async\s*)?(?:function\b|\([^()]*\)\s*(?::[^=]+)?=>|{IDENT}\s*=>)")
+SPECIFIER = re.compile(rf"(?:type\s+)?({IDENT}|default)(?:\s+as\s+({IDENT}|default))?")
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^") | {""}
+SCRIPT_BLOCK = re.compile(r"<script\b[^>]*>(.*?)</script>", re.DOTALL)
+TEMPLATE_BLOCK = re.compile(r"<template\b[^>]*>(.*)</template>", re.DOTALL)
+TEMPLATE_TAG = re.compile(r"<([A-Z][\w]*|[a-z][\w]*(?:-[\w]+)+)")
+TEMPLATE_EXPRESSION = re.compile(r'\{\{(.*?)\}\}|\s(?:[:@#]|v-[\w-]+)[^\s=>]*="([^"]*)"', re.DOTALL)
+KIND_NAMES = {"abstract class": "class", "const enum": "enum", "function *": "function"}
+
+
+def mask_script(text: str) -> str:
+    """
+    ``text`` with comments, string/template contents and regex literals blanked.
+
+    Quotes stay, newlines stay and every character keeps its offset, so
+    positions in the result are positions in the source. Template
+    ``${...}`` expressions are code and stay.
+    """
+    out = list(text)
+    n = len(text)
+    i = 0
+    braces: list[int] = []  # open braces per ${ } level; a template resumes when its level closes
+    last = ""  # last significant code character, to tell regex literals from division
+
+    def blank(start: int, end: int) -> None:
+        for k in range(start, min(end, n)):
+            if out[k] != "\n":
+                out[k] = " "
+
+    def template(start: int) -> int:
+        """Blank a template literal body from ``start``; returns the index after it or after ``${``."""
+        k = start
+        while k < n:
+            c = text[k]
+            if c == "\\":
+                k += 2
+                continue
+            if c == "`":
+                blank(start, k)
+                return k + 1
+            if c == "$" and text.startswith("${", k):
+                blank(start, k)
+                braces.append(1)
+                return k + 2
+            k += 1
+        blank(start, n)
+        return n
+
+    while i < n:
+        c = text[i]
+        if c in " \t\r\n":
+            i += 1
+            continue
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end < 0 else end
+            blank(i, end)
+            i = end
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            blank(i, end)
+            i = end
+            continue
+        if c in "'\"":
+            k = i + 1
+            while k < n and text[k] != c and text[k] != "\n":
+                k += 2 if text[k] == "\\" else 1
+            blank(i + 1, k)
+            i = k + 1
+            last = c
+            continue
+        if c == "`":
+            i = template(i + 1)
+            last = "`"
+            continue
+        if c == "/" and last in REGEX_PRECEDERS:
+            k, in_class = i + 1, False
+            while k < n and text[k] != "\n":
+                if text[k] == "\\":
+                    k += 2
+                    continue
+                if text[k] == "[":
+                    in_class = True
+                elif text[k] == "]":
+                    in_class = False
+                elif text[k] == "/" and not in_class:
+                    break
+                k += 1
+            blank(i + 1, k)
+            i = k + 1
+            last = "/"
+            continue
+        if braces:
+            if c == "{":
+                braces[-1] += 1
+            elif c == "}":
+                braces[-1] -= 1
+                if braces[-1] == 0:
+                    braces.pop()
+                    i = template(i + 1)
+                    last = "`"
+                    continue
+        if c.isalnum() or c in "_$":
+            k = i
+            while k < n and (text[k].isalnum() or text[k] in "_$"):
+                k += 1
+            word = text[i:k]
+            # After these keywords a slash starts a regex, after other words it divides
+            last = "(" if word in ("return", "typeof", "case", "in", "of", "yield", "await") else "a"
+            i = k
+            continue
+        last = c
+        i += 1
+    return "".join(out)
+
+
+def vue_blocks(text: str) -> tuple[str, str]:
+    """(script code with everything else blanked, template markup with everything else blanked), same offsets."""
+
+    def only(spans: list[tuple[int, int]]) -> str:
+        out = [ch if ch == "\n" else " " for ch in text]
+        for start, end in spans:
+            out[start:end] = text[start:end]
+        return "".join(out)
+
+    scripts = [m.span(1) for m in SCRIPT_BLOCK.finditer(text)]
+    template = TEMPLATE_BLOCK.search(text)
+    return only(scripts), only([template.span(1)] if template else [])
+
+
+def component_name(path: str) -> tuple[str, str]:
+    """(name, kind) of a Vue file, with Nuxt's names for components (components/Base/Button.vue -> BaseButton)."""
+    parts = Path(path).with_suffix("").parts
+
+    def pascal(part: str) -> str:
+        return "".join(word[:1].upper() + word[1:] for word in re.split(r"[^A-Za-z0-9]+", part) if word)
+
+    if "components" in parts:
+        name = ""
+        for part in parts[parts.index("components") + 1 :]:
+            piece = pascal(part)
+            name = piece if piece.startswith(name) else name + piece
+        return name, "component"
+    kind = "page" if "pages" in parts else "layout" if "layouts" in parts else "component"
+    return pascal(parts[-1]) or "Index", kind
+
+
+def _string(source: str | None) -> str:
+    return source[1:-1] if source else ""
+
+
+def scan(path: str, text: str) -> dict:
+    """
+    Symbols, exports, imports and references of one source file.
+
+    Args:
+        path: Path relative to the project root (used for Vue component names)
+        text: File content
+
+    Returns:
+        {"symbols": [...], "exports": [...], "imports": [...], "refs": [...]}, rows as tuples in table order
+    """
+    template = ""
+    if path.endswith(".vue"):
+        code, template = vue_blocks(text)
+    else:
+        code = text
+    masked = mask_script(code)
+    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    lines = text.split("\n")
+
+    def position(offset: int) -> tuple[int, int]:
+        line = bisect.bisect_right(starts, offset)
+        return line, offset - starts[line - 1] + 1
+
+    symbols, exports, imports, refs = [], [], [], []
+    depth = 0
+    for match in TOKENS.finditer(masked):
+        start = match.start()
+        if match.group("open"):
+            depth += 1
+        elif match.group("close"):
+            depth = max(0, depth - 1)
+        elif match.group("decl") is not None:
+            if depth > 0:  # locals of functions and blocks are not indexed
+                continue
+            line, col = position(match.start("name"))
+            name = match.group("name")
+            kind = " ".join(match.group("kind").replace("*", " *").split())
+            kind = KIND_NAMES.get(kind, kind)
+            if kind in ("const", "let", "var") and FUNCTION_VALUE.match(masked, match.end()):
+                kind = "function"
+            exported = bool(match.group("export"))
+            symbols.append((name, kind, line, col, int(exported), lines[line - 1].strip()[:160]))
+            if exported:
+                exports.append(("default" if match.group("default") else name, name, "", line))
+        elif match.group("exportlist") is not None:
+            quoted = text[match.start("listsource") : match.end("listsource")] if match.group("listsource") else None
+            source = _string(quoted)
+            body_start = masked.index("{", start) + 1
+            line, _ = position(start)
+            for spec in SPECIFIER.finditer(masked[body_start : masked.index("}", start)]):
+                local, exported = spec.group(1), spec.group(2) or spec.group(1)
+                exports.append((exported, local, source, line))
+                if local != "default":
+                    refs.append((local, *position(body_start + spec.start(1)), "export"))
+        elif match.group("exportall") is not None:
+            source = _string(text[match.start("allsource") : match.end("allsource")])
+            exports.append((match.group("namespace") or "*", "*", source, position(start)[0]))
+        elif match.group("import") is not None:
+            source = _string(text[match.start("source") : match.end("source")])
+            clause = match.group("clause") or ""
+            type_only = int(bool(match.group("typeonly")))
+            line, _ = position(start)
+            clause_start = match.start("clause")
+            names = []
+            default = re.match(rf"\s*({IDENT})\s*(?:,|$)", clause)
+            if default and default.group(1) not in ("type",):
+                names.append(("default", default.group(1), clause_start + default.start(1)))
+            namespace = re.search(rf"\*\s+as\s+({IDENT})", clause)
+            if namespace:
+                names.append(("*", namespace.group(1), clause_start + namespace.start(1)))
+            braces = re.search(r"\{([^}]*)\}", clause)
+            if braces:
+                for spec in SPECIFIER.finditer(braces.group(1)):
+                    offset = clause_start + braces.start(1) + spec.start(2 if spec.group(2) else 1)
+                    names.append((spec.group(1), spec.group(2) or spec.group(1), offset))
+            for name, local, offset in names:
+                imports.append((name, local, source, line, type_only))
+                refs.append((name if name not in ("default", "*") else local, *position(offset), "import"))
+            if not names:  # side-effect import
+                imports.append(("", "", source, line, 0))
+        elif match.group("exportdefault") is not None:
+            exports.append(("default", "", "", position(start)[0]))
+        elif match.group("ident") is not None:
+            name = match.group("ident")
+            if name in KEYWORDS:
+                continue
+            line, col = position(start)
+            member = start > 0 and masked[start - 1] == "." and not masked.startswith("...", max(0, start - 3))
+            refs.append((name, line, col, "member" if member else "code"))
+
+    if path.endswith(".vue"):
+        name, kind = component_name(path)
+        symbols.append((name, kind, 1, 1, 1, f"<{name}> ({path})"))
+        if not any(row[0] == "default" for row in exports):
+            exports.append(("default", name, "", 1))
+        for match in TEMPLATE_TAG.finditer(template):
+            tag = match.group(1)
+            tag_name = "".join(part[:1].upper() + part[1:] for part in tag.split("-")) if "-" in tag else tag
+            refs.append((tag_name, *position(match.start(1)), "template"))
+        for match in TEMPLATE_EXPRESSION.finditer(template):
+            group = 1 if match.group(1) is not None else 2
+            expression = match.group(group)
+            for ident in re.finditer(IDENT, mask_script(expression)):
+                previous = expression[ident.start() - 1 : ident.start()]
+                if ident.group() in KEYWORDS or previous == "-":
+                    continue
+                kind = "member" if previous == "." else "template"
+                refs.append((ident.group(), *position(match.start(group) + ident.start()), kind))
+    return {"symbols": symbols, "exports": exports, "imports": imports, "refs": refs}
+
+
+class SymbolIndex:
+    """SQLite-backed symbol index over the TS/Vue sources, refreshed incrementally."""
+
+    def __init__(self, project_root: Path, db_path: Path | None = None, roots: tuple[str, ...] = SOURCE_ROOTS):
+        self.project_root = Path(project_root)
+        self.db_path = Path(
+            db_path or os.environ.get("SYMBOL_INDEX_PATH") or self.project_root / ".symbol-index.sqlite"
+        )
+        self.roots = roots
+        self._lock = threading.RLock()
+        self._db: sqlite3.Connection | None = None
+        self._refreshed = 0.0
+        self.last_refresh: dict = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for (table,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                    db.execute(f"DROP TABLE {table}")
+                db.executescript(SCHEMA)
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                db.commit()
+            self._db = db
+        return self._db
+
+    def sources(self) -> dict[str, os.stat_result]:
+        """Relative path -> stat of every indexed source file."""
+        found = {}
+        for root in self.roots:
+            base = self.project_root / root
+            if not base.is_dir():
+                continue
+            for directory, dirs, files in os.walk(base):
+                dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith(".")]
+                for name in files:
+                    if name.endswith(EXTENSIONS):
+                        path = os.path.join(directory, name)
+                        found[os.path.relpath(path, self.project_root).replace(os.sep, "/")] = os.stat(path)
+        return found
+
+    def _store(self, db: sqlite3.Connection, path: str, data: bytes, stat: os.stat_result, digest: str) -> None:
+        self._forget(db, path)
+        rows = scan(path, data.decode("utf-8", errors="replace"))
+        db.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (path, digest, stat.st_mtime_ns, stat.st_size))
+        db.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?)", [(path, *r) for r in rows["symbols"]])
+        db.executemany("INSERT INTO exports VALUES (?, ?, ?, ?, ?)", [(path, *r) for r in rows["exports"]])
+        db.executemany("INSERT INTO imports VALUES (?, ?, ?, ?, ?, ?)", [(path, *r) for r in rows["imports"]])
+        db.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?)", [(path, *r) for r in rows["refs"]])
+
+    @staticmethod
+    def _forget(db: sqlite3.Connection, path: str) -> None:
+        for table in ("files", "symbols", "exports", "imports", "refs"):
+            db.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def _sync(self, db: sqlite3.Connection, path: str, stat: os.stat_result | None, known: dict) -> str:
+        """Bring one file up to date; returns "added", "updated", "touched", "removed" or "unchanged"."""
+        previous = known.get(path)
+        if stat is None:
+            if previous is None:
+                return "unchanged"
+            self._forget(db, path)
+            return "removed"
+        if previous is not None and (previous["mtime_ns"], previous["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return "unchanged"
+        data = (self.project_root / path).read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if previous is not None and previous["hash"] == digest:
+            db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (stat.st_mtime_ns, stat.st_size, path))
+            return "touched"
+        self._store(db, path, data, stat, digest)
+        return "updated" if previous is not None else "added"
+
+    def refresh(self, force: bool = False) -> dict:
+        """
+        Re-scan new and changed files and drop deleted ones.
+
+        Args:
+            force: Refresh even if the last refresh is younger than REFRESH_INTERVAL_S
+
+        Returns:
+            Counts of added, updated, touched (same content), removed and unchanged files and elapsed_ms
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed < REFRESH_INTERVAL_S:
+                return self.last_refresh
+            start = time.perf_counter()
+            db = self._connect()
+            known = {row["path"]: row for row in db.execute("SELECT path, hash, mtime_ns, size FROM files")}
+            current = self.sources()
+            counts = dict.fromkeys(("added", "updated", "touched", "removed", "unchanged"), 0)
+            with db:
+                for path in sorted(current.keys() | known.keys()):
+                    counts[self._sync(db, path, current.get(path), known)] += 1
+            self._refreshed = time.monotonic()
+            self.last_refresh = {**counts, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+            return self.last_refresh
+
+    def update(self, paths: list[str]) -> dict:
+        """Re-index only the given paths (absolute or relative), e.g. from file watcher events."""
+        with self._lock:
+            db = self._connect()
+            counts: dict[str, int] = {}
+            with db:
+                for raw in paths:
+                    full = Path(raw) if Path(raw).is_absolute() else self.project_root / raw
+                    path = os.path.relpath(full, self.project_root).replace(os.sep, "/")
+                    if not path.endswith(EXTENSIONS):
+                        continue
+                    known = {row["path"]: row for row in db.execute("SELECT * FROM files WHERE path = ?", (path,))}
+                    stat = full.stat() if full.is_file() else None
+                    result = self._sync(db, path, stat, known)
+                    counts[result] = counts.get(result, 0) + 1
+            return counts
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        self.refresh()
+        with self._lock:
+            return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def find_symbol(self, name: str, kind: str = "", exported_only: bool = False, limit: int = DEFAULT_LIMIT) -> dict:
+        """
+        Definitions of a symbol.
+
+        Args:
+            name: Symbol name; a trailing * matches by prefix (use*)
+            kind: Only this kind (function, const, class, interface, type, enum, component, page, layout, ...)
+            exported_only: Only exported definitions
+            limit: Maximum results
+
+        Returns:
+            {"symbols": [{name, kind, path, line, col, exported, signature}], "total"}
+        """
+        start = time.perf_counter()
+        if name.endswith("*"):
+            where, params = _starts_with("name", name[:-1])
+        else:
+            where, params = "name = ?", (name,)
+        if kind:
+            where += " AND kind = ?"
+            params += (kind,)
+        if exported_only:
+            where += " AND exported = 1"
+        rows = self._query(
+            f"SELECT name, kind, path, line, col, exported, signature FROM symbols WHERE {where} "
+            "ORDER BY exported DESC, path, line",
+            params,
+        )
+        for row in rows:
+            row["exported"] = bool(row["exported"])
+        return {"symbols": rows[:limit], "total": len(rows), "elapsed_ms": _elapsed(start)}
+
+    def find_references(self, name: str, path: str = "", kinds: str = "", limit: int = DEFAULT_LIMIT) -> dict:
+        """
+        Where a name is used.
+
+        Args:
+            name: Identifier or component name
+            path: Only files under this path prefix
+            kinds: Comma-separated reference kinds (code, import, export, member, template); default all but member
+            limit: Maximum results (with the source line)
+
+        Returns:
+            {"definitions", "references": [{path, line, col, kind, text}], "total", "files"}
+        """
+        start = time.perf_counter()
+        selected = tuple(k.strip() for k in kinds.split(",") if k.strip()) or ("code", "import", "export", "template")
+        where = f"name = ? AND kind IN ({', '.join('?' * len(selected))})"
+        params: tuple = (name, *selected)
+        if path:
+            prefix_where, prefix_params = _starts_with("path", path.rstrip("/"))
+            where += f" AND {prefix_where}"
+            params += prefix_params
+        rows = self._query(f"SELECT path, line, col, kind FROM refs WHERE {where} ORDER BY path, line, col", params)
+        lines: dict[str, list[str]] = {}
+        for row in rows[:limit]:
+            if row["path"] not in lines:
+                try:
+                    lines[row["path"]] = (self.project_root / row["path"]).read_text(encoding="utf-8").split("\n")
+                except OSError:
+                    lines[row["path"]] = []
+            source = lines[row["path"]]
+            row["text"] = source[row["line"] - 1].strip()[:160] if row["line"] <= len(source) else ""
+        definitions = self._query("SELECT kind, path, line FROM symbols WHERE name = ? ORDER BY path, line", (name,))
+        return {
+            "definitions": definitions,
+            "references": rows[:limit],
+            "total": len(rows),
+            "files": len({row["path"] for row in rows}),
+            "elapsed_ms": _elapsed(start),
+        }
+
+    def resolve(self, module: str, importer: str = "") -> str | None:
+        """
+        Indexed file for a module specifier.
+
+        Args:
+            module: Relative path ("./utils", from ``importer``), project path ("packages/shared/src/index.ts")
+                or workspace package ("@riddle-rush/shared", "@riddle-rush/shared/constants")
+            importer: File the specifier appears in (for relative specifiers)
+        """
+        if module.startswith("."):
+            base = os.path.normpath(os.path.join(os.path.dirname(importer), module)).replace(os.sep, "/")
+        elif module.startswith("@") or not any(module.startswith(root) for root in self.roots):
+            base = self._package_entry(module)
+            if base is None:
+                return None
+        else:
+            base = module.rstrip("/")
+        known = {row["path"] for row in self._query("SELECT path FROM files")}
+        for suffix in RESOLVE_SUFFIXES:
+            if base + suffix in known:
+                return base + suffix
+        return None
+
+    def _package_entry(self, module: str) -> str | None:
+        parts = module.split("/")
+        name, subpath = ("/".join(parts[:2]), parts[2:]) if module.startswith("@") else (parts[0], parts[1:])
+        for manifest in (self.project_root / "packages").glob("*/package.json"):
+            try:
+                package = json.loads(manifest.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if package.get("name") != name:
+                continue
+            directory = manifest.parent.relative_to(self.project_root).as_posix()
+            key = "./" + "/".join(subpath) if subpath else "."
+            exports = package.get("exports")
+            target = exports.get(key) if isinstance(exports, dict) else None
+            if isinstance(target, dict):
+                target = target.get("import") or target.get("default")
+            if target is None and key == ".":
+                target = package.get("main") or "index"
+            if target is None:
+                target = key
+            return os.path.normpath(f"{directory}/{target}").replace(os.sep, "/")
+        return None
+
+    def list_exports(self, module: str, follow: bool = True) -> dict:
+        """
+        Exported names of a module.
+
+        Args:
+            module: File path, directory prefix (every file below) or workspace package name
+            follow: Expand ``export * from`` into the re-exported module's names
+
+        Returns:
+            {"modules": {path: [{name, kind, line, from}]}}
+        """
+        start = time.perf_counter()
+        path = self.resolve(module)
+        if path is not None:
+            paths = [path]
+        else:
+            prefix = module.rstrip("/") + "/"
+            where, params = _starts_with("path", prefix)
+            paths = [row["path"] for row in self._query(f"SELECT path FROM files WHERE {where}", params)]
+            if not paths:
+                return {"error": f"No indexed module matches {module}"}
+        return {"modules": {p: self._exports(p, follow, set()) for p in paths}, "elapsed_ms": _elapsed(start)}
+
+    def _exports(self, path: str, follow: bool, seen: set[str]) -> list[dict]:
+        seen.add(path)
+        kinds = {
+            row["name"]: row["kind"]
+            for row in self._query("SELECT name, kind FROM symbols WHERE path = ? AND exported = 1", (path,))
+        }
+        result = []
+        for row in self._query("SELECT name, local, source, line FROM exports WHERE path = ? ORDER BY line", (path,)):
+            if row["name"] == "*" and follow:
+                target = self.resolve(row["source"], path)
+                if target and target not in seen:
+                    for item in self._exports(target, follow, seen):
+                        if item["name"] != "default":
+                            result.append({**item, "from": item.get("from") or target})
+                    continue
+            kind = kinds.get(row["local"] or row["name"], "reexport" if row["source"] else "value")
+            entry = {"name": row["name"], "kind": kind, "line": row["line"]}
+            if row["source"]:
+                entry["from"] = self.resolve(row["source"], path) or row["source"]
+            result.append(entry)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._connect()
+            counts = {
+                table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("files", "symbols", "exports", "imports", "refs")
+            }
+        return {**counts, "db_path": str(self.db_path), "last_refresh": self.last_refresh}
+
+
+def _starts_with(column: str, prefix: str) -> tuple[str, tuple]:
+    # A range on the column, which its index answers. Not LIKE: it folds ASCII case and reads % and _
+    # as wildcards. Text compares by UTF-8 bytes, which order like code points, so every key starting
+    # with the prefix lies between it and the prefix with its last character incremented
+    if not prefix:
+        return f"{column} >= ?", ("",)
+    if prefix[-1] == "\U0010ffff":  # no next character: bound below, check the rest
+        return f"{column} >= ? AND substr({column}, 1, ?) = ?", (prefix, len(prefix), prefix)
+    return f"{column} >= ? AND {column} < ?", (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
+def _elapsed(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,7 @@
+"""Shared pytest setup for the FastMCP subagents server tests."""
+
+import sys
+from pathlib import Path
+
+# The server modules live next to main.py rather than in an installed package
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,156 @@
+"""Tests for the CPU/memory admission controller."""
+
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+from fastmcp import Client
+
+from admission import AdmissionController, Cost, cgroup_cpu_limit, cgroup_memory_limit_mb
+from benchmarks.bench_tools import _load_server
+from benchmarks.fake_bins import FakeToolchain
+from job_runner import JobRunner
+
+COSTS = {
+    "lint": Cost(cores=1, memory_mb=100, priority=0),
+    "build": Cost(cores=2, memory_mb=100, priority=2),
+}
+
+
+def _hold(controller, tool, seconds, order, started=None):
+    with controller.admit(tool) as ticket:
+        order.append(tool)
+        if started:
+            started.set()
+        time.sleep(seconds)
+    return ticket
+
+
+def test_cgroup_limits(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    (tmp_path / "memory.max").write_text(str(512 * 1024 * 1024))
+    assert cgroup_cpu_limit(tmp_path) == 1.5
+    assert cgroup_memory_limit_mb(tmp_path) == 512
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    (tmp_path / "memory.max").write_text("max\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+    assert cgroup_memory_limit_mb(tmp_path) is None
+
+
+def test_saturated_host_queues_and_reports_wait():
+    controller = AdmissionController(cores=2, memory_mb=1000, costs=COSTS, loadavg=lambda: 0.0)
+    order, started = [], threading.Event()
+    first = threading.Thread(target=_hold, args=(controller, "build", 0.3, order, started))
+    first.start()
+    started.wait()
+
+    ticket = _hold(controller, "lint", 0, order)
+    first.join()
+
+    assert order == ["build", "lint"]
+    assert ticket.wait_s >= 0.2
+    assert controller.stats()["admitted"] == 2
+
+
+def test_priority_decides_who_goes_next():
+    controller = AdmissionController(cores=2, memory_mb=1000, costs=COSTS, loadavg=lambda: 0.0)
+    order, started = [], threading.Event()
+    blocker = threading.Thread(target=_hold, args=(controller, "build", 0.3, order, started))
+    blocker.start()
+    started.wait()
+
+    waiting_build = threading.Thread(target=_hold, args=(controller, "build", 0, order))
+    waiting_build.start()
+    time.sleep(0.05)
+    waiting_lint = threading.Thread(target=_hold, args=(controller, "lint", 0, order))
+    waiting_lint.start()
+    for thread in (blocker, waiting_build, waiting_lint):
+        thread.join()
+
+    assert order == ["build", "lint", "build"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_external_load_shrinks_capacity_but_idle_host_still_admits():
+    load, clock = {"value": 4.0}, Clock()
+    controller = AdmissionController(cores=4, memory_mb=1000, costs=COSTS, loadavg=lambda: load["value"], clock=clock)
+    assert controller.available_cores() == 0.0
+
+    with controller.admit("lint") as first:  # nothing running: always admitted
+        assert first.wait_s < 0.1
+        clock.now += 1200  # the load average has caught up with our core
+        load["value"] = 1.0 + 0.5  # ours (1) plus 0.5 external
+        assert controller.available_cores() == pytest.approx(3.5)
+        with controller.admit("build") as second:
+            assert second.cores == 2
+    assert controller.stats()["used_cores"] == 0
+
+
+def test_finished_jobs_are_not_counted_as_external_load():
+    load, clock = {"value": 0.0}, Clock()
+    controller = AdmissionController(cores=4, memory_mb=1000, costs=COSTS, loadavg=lambda: load["value"], clock=clock)
+    with controller.admit("build"):
+        clock.now += 1200
+    assert controller.own_load() == pytest.approx(2.0)
+
+    clock.now += 30  # the 1-minute average still shows most of the finished build
+    load["value"] = 2.0 * math.exp(-0.5)
+    assert controller.available_cores() == pytest.approx(4.0)
+    assert controller.own_load() == pytest.approx(load["value"])
+
+
+def test_memory_budget():
+    costs = {"big": Cost(cores=1, memory_mb=600, priority=0)}
+    controller = AdmissionController(cores=8, memory_mb=1000, costs=costs, loadavg=lambda: 0.0)
+    assert controller._fits(1, 600)
+    with controller.admit("big"):
+        assert not controller._fits(1, 600)
+
+
+def test_queued_tool_does_not_block_the_server(tmp_path, monkeypatch):
+    main = _load_server()
+    original_root = main.PROJECT_ROOT
+    admission = AdmissionController(cores=4, memory_mb=10_000, loadavg=lambda: 0.0)
+    monkeypatch.setattr(main, "admission", admission)
+    monkeypatch.setattr(main, "jobs", JobRunner(2))
+    holding, release = threading.Event(), threading.Event()
+
+    def hold_build():
+        with admission.admit("build"):
+            holding.set()
+            release.wait(10)
+
+    async def session():
+        async with Client(main.mcp) as client:
+            build = asyncio.create_task(client.call_tool("run_build", {"app": "docs"}))
+            while not admission.stats()["queued"]:
+                await asyncio.sleep(0.01)
+            status = await asyncio.wait_for(client.call_tool("server_status", {}), timeout=2)
+            release.set()
+            return status.data, await build
+
+    holder = threading.Thread(target=hold_build)
+    holder.start()
+    holding.wait()
+    with FakeToolchain(tmp_path) as toolchain:
+        main.set_project_root(toolchain.project_root)
+        try:
+            status, build = asyncio.run(session())
+        finally:
+            release.set()
+            holder.join()
+            main.set_project_root(original_root)
+
+    assert status["admission"]["queued"] == 1 and status["admission"]["running"] == 1
+    assert "fake pnpm --filter @riddle-rush/docs run build" in build.data
+    assert admission.stats()["admitted"] == 2
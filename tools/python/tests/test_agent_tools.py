@@ -0,0 +1,135 @@
+"""Tests for tools/ai-agents/agent-tools.py (workspace health and command runner)."""
+
+import importlib.util
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# agent-tools.py is a script with a dashed name: load it from its path
+AGENT_TOOLS = Path(__file__).resolve().parents[2] / "ai-agents" / "agent-tools.py"
+spec = importlib.util.spec_from_file_location("agent_tools", AGENT_TOOLS)
+agent_tools = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(agent_tools)
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()  # let probes still sleeping in the abandoned pool finish
+
+
+def test_slow_probe_times_out_while_others_report(monkeypatch, release):
+    def ok(deadline):
+        return {"indicators": [{"type": "git", "status": "ok", "message": "Working tree clean"}]}
+
+    def issue(deadline):
+        return {"issues": [{"type": "build", "severity": "low", "message": "No build", "details": "Build it"}]}
+
+    def slow(deadline):
+        release.wait(30)
+        return {"issues": [{"type": "artifacts", "severity": "high", "message": "late", "details": ""}]}
+
+    def broken(deadline):
+        raise OSError("permission denied")
+
+    monkeypatch.setattr(agent_tools, "HEALTH_PROBES", {"git": ok, "build": issue, "artifacts": slow, "plans": broken})
+
+    started = time.monotonic()
+    report = agent_tools.analyze_workspace_health(deadline_s=0.5)
+
+    assert time.monotonic() - started < 2
+    assert report["probes"]["artifacts"] == {"status": "timeout", "elapsed_ms": 500.0}
+    assert report["probes"]["git"]["status"] == "ok" and report["probes"]["build"]["status"] == "issue"
+    assert report["probes"]["plans"] == {"status": "error", "error": "permission denied"}
+    assert [i["message"] for i in report["issues_found"]] == ["No build"]
+    assert report["health_indicators"][0]["message"] == "Working tree clean"
+    assert report["overall_score"] == 95
+
+
+RESULT_KEYS = {
+    "stdout",
+    "stderr",
+    "returncode",
+    "wall_time_s",
+    "user_time_s",
+    "sys_time_s",
+    "peak_rss_mb",
+    "output_bytes",
+    "timed_out",
+}
+
+
+def test_timeout_kills_the_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+
+    result = agent_tools.run_command(f"sleep 30 & echo $! > {pid_file}; echo started; wait", timeout=1)
+
+    assert result["timed_out"] is True and result["returncode"] == -1
+    assert result["stdout"] == "started\n"
+    assert result["stderr"].endswith("Command timed out after 1 seconds")
+    assert result["wall_time_s"] < 1 + agent_tools.KILL_GRACE + agent_tools.STRAGGLER_GRACE + 1
+    with pytest.raises(ProcessLookupError):
+        for _ in range(50):
+            os.kill(int(pid_file.read_text()), 0)
+            time.sleep(0.1)
+
+
+def test_rusage_of_the_command():
+    code = (
+        "import time\n"
+        "block = bytearray(64 * 1024 * 1024)\n"
+        "start = time.process_time()\n"
+        "while time.process_time() - start < 0.3:\n"
+        "    pass\n"
+        "print('x' * 1000)\n"
+    )
+
+    result = agent_tools.run_command([sys.executable, "-c", code])
+
+    assert set(result) == RESULT_KEYS
+    assert result["returncode"] == 0 and result["timed_out"] is False
+    assert result["user_time_s"] + result["sys_time_s"] >= 0.25  # process_time() counts both
+    assert result["peak_rss_mb"] >= 64
+    assert result["output_bytes"] == 1001
+
+
+def test_memory_and_cpu_limits():
+    allocate = agent_tools.run_command([sys.executable, "-c", "bytearray(512 * 1024 * 1024)"], memory_limit_mb=256)
+    spin = agent_tools.run_command([sys.executable, "-c", "while True: pass"], cpu_limit_s=1, timeout=15)
+
+    assert allocate["returncode"] == 1 and "MemoryError" in allocate["stderr"]
+    assert spin["returncode"] == -signal.SIGXCPU and spin["timed_out"] is False
+    assert spin["user_time_s"] + spin["sys_time_s"] >= 0.9
+
+
+def test_start_failure_has_the_same_keys(tmp_path):
+    result = agent_tools.run_command(["/nonexistent/binary"], cwd=str(tmp_path))
+
+    assert set(result) == RESULT_KEYS
+    assert result["returncode"] == -2 and result["timed_out"] is False
+    assert "nonexistent" in result["stderr"]
+
+
+def test_dependency_drift_follows_the_last_install(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_tools, "PROJECT_ROOT", tmp_path)
+    (tmp_path / "node_modules" / ".pnpm").mkdir(parents=True)
+    lockfile = tmp_path / "pnpm-lock.yaml"
+    modules_yaml = tmp_path / "node_modules" / ".modules.yaml"
+    lockfile.write_text("lockfileVersion: '9.0'\npackages:\n  fsevents@2.3.3: {}\n  vite@6.0.0: {}\n")
+    # pnpm's copy leaves out the skipped optional package: not drift
+    installed_lock = tmp_path / "node_modules" / ".pnpm" / "lock.yaml"
+    installed_lock.write_text("lockfileVersion: '9.0'\npackages:\n  vite@6.0.0: {}\n")
+    modules_yaml.write_text("layoutVersion: 5\n")
+    os.utime(lockfile, (time.time() - 60, time.time() - 60))
+
+    assert agent_tools._probe_dependencies(time.monotonic() + 5)["indicators"][0]["status"] == "ok"
+
+    os.utime(lockfile, (time.time() + 60, time.time() + 60))  # lockfile changed after the install
+    issue = agent_tools._probe_dependencies(time.monotonic() + 5)["issues"][0]
+    assert issue["severity"] == "high" and "newer than node_modules/.modules.yaml" in issue["details"]
@@ -0,0 +1,79 @@
+"""Tests for the offline answer bundle compiler."""
+
+import hashlib
+import json
+
+from answer_bundle import INDEX_FILE, build_shards, compile_answers, fold_letter, normalize, slug
+
+CATEGORIES = [
+    {"id": 1, "name": "Blumen", "searchWord": "Blumen", "key": "Blumen", "searchProvider": "offline"},
+    {"id": 2, "name": "Boot", "searchWord": "Wasserfahrzeug", "key": "Wasserfahrzeug", "searchProvider": "offline"},
+    {"id": 3, "name": "Tier", "searchWord": "Tier", "key": "Tier", "searchProvider": "offline"},
+]
+ANSWERS = {
+    "Blumen": {"a": ["Aster", "aster", " Akelei "], "L": ["Lilie"]},
+    "Wasserfahrzeug": {"o": ["Öltanker"], "b": ["Boot", "Ölkahn"]},
+}
+
+
+def _project(tmp_path, answers=ANSWERS):
+    data = tmp_path / "apps" / "game" / "public" / "data"
+    data.mkdir(parents=True)
+    (data / "offlineAnswers.json").write_text(json.dumps(answers, ensure_ascii=False), encoding="utf-8")
+    (data / "categories.json").write_text(json.dumps(CATEGORIES, ensure_ascii=False), encoding="utf-8")
+    return tmp_path
+
+
+def test_normalize_fixes_and_reports():
+    answers, issues = normalize(ANSWERS, CATEGORIES)
+
+    assert answers["Blumen"] == {"a": ["Aster", "Akelei"], "l": ["Lilie"]}
+    assert answers["Wasserfahrzeug"] == {"b": ["Boot"], "o": ["Öltanker", "Ölkahn"]}
+    kinds = {(i["issue"], i.get("answer")) for i in issues}
+    assert ("duplicate", "Aster") in kinds
+    assert ("normalized", " Akelei ") in kinds
+    assert ("wrong letter", "Ölkahn") in kinds
+    assert ("offline category without answers", None) in kinds
+    assert fold_letter("Über") == "u" and slug("Männlicher_Vorname") == "maennlicher_vorname"
+
+
+def test_shards_and_index(tmp_path):
+    root = _project(tmp_path)
+    report = compile_answers(root, benchmark=True, synthetic_factor=10)
+
+    out = root / "apps" / "game" / "public" / "data" / "answers"
+    index = json.loads((out / INDEX_FILE).read_text(encoding="utf-8"))
+    entry = index["categories"]["Blumen"]
+    assert index["shardBy"] == "letter" and entry["letters"] == "al"
+    source = (root / "apps" / "game" / "public" / "data" / "offlineAnswers.json").read_bytes()
+    assert index["source"] == report["source"] == hashlib.sha256(source).hexdigest()[:16]
+    assert json.loads((out / entry["path"] / "a.json").read_text(encoding="utf-8")) == ["Aster", "Akelei"]
+    assert (out / f"{INDEX_FILE}.gz").exists()
+    assert report["shards"] == 4 and report["written"] == 4
+
+    current = report["benchmark"]["current"]
+    assert current["after"]["shard"]["raw"] < current["before"]["raw"]
+    scaled = report["benchmark"]["synthetic_10x"]
+    assert scaled["before"]["raw"] > 5 * current["before"]["raw"]
+
+
+def test_recompile_keeps_unchanged_and_removes_stale_shards(tmp_path):
+    root = _project(tmp_path)
+    compile_answers(root)
+    changed = {**ANSWERS, "Blumen": {"a": ["Aster"]}}
+    (root / "apps" / "game" / "public" / "data" / "offlineAnswers.json").write_text(json.dumps(changed))
+
+    report = compile_answers(root)
+
+    out = root / "apps" / "game" / "public" / "data" / "answers"
+    assert (report["written"], report["unchanged"], report["removed"]) == (1, 2, 1)
+    assert sorted(p.name for p in out.iterdir() if p.is_dir()) == sorted(
+        entry["path"] for entry in json.loads((out / INDEX_FILE).read_text())["categories"].values()
+    )
+
+
+def test_category_shards():
+    index, files = build_shards({"Blumen": {"a": ["Aster"]}}, shard_by="category")
+    path = index["categories"]["Blumen"]["path"]
+    assert path.startswith("blumen.") and path.endswith(".json")
+    assert json.loads(files[path]) == {"a": ["Aster"]}
@@ -0,0 +1,81 @@
+"""Tests for the fuzzy answer matcher."""
+
+import json
+import os
+
+from answer_matcher import AnswerMatcher, TrigramIndex, benchmark, bounded_distance, match_key
+
+ANSWERS = {
+    "Beruf": {"a": ["Arzt", "Apotheker", "Architekt"], "m": ["Müller", "Maurer"], "s": ["Schneider"]},
+    "Blumen": {"r": ["Rose"], "l": ["Lilie", "Lilie"], "o": ["Öltanker"]},
+}
+
+
+def test_match_key_and_distance():
+    assert match_key("  Groß  Straße ") == "gross strasse"
+    assert match_key("MÜLLER") == match_key("Muller") == "muller"
+    assert bounded_distance("arzt", "artz", 2) == 1  # swapped letters are one edit
+    assert bounded_distance("apotheker", "apoteker", 2) == 1
+    assert bounded_distance("rose", "tulpe", 1) == 2  # bound + 1 when too far
+
+
+def test_validate_exact_fuzzy_and_rejected():
+    matcher = AnswerMatcher(answers=ANSWERS)
+
+    assert matcher.validate("Beruf", "m", "muller") == {
+        "answer": "muller",
+        "valid": True,
+        "match": "Müller",
+        "distance": 0,
+    }
+    assert matcher.validate("Beruf", "A", "Artz")["match"] == "Arzt"
+    assert matcher.validate("Beruf", "a", "Architeckt")["distance"] == 1
+    assert matcher.validate("Blumen", "o", "oltanker")["match"] == "Öltanker"
+    assert matcher.validate("Blumen", "r", "Rise")["distance"] == 1
+    assert matcher.validate("Beruf", "a", "Arz")["valid"] is False  # no typos in answers of up to 3 letters
+    assert matcher.validate("Beruf", "a", "Bäcker")["reason"] == "does not start with A"
+    assert matcher.validate("Beruf", "a", "Astronaut")["reason"] == "not in answer list"
+    assert matcher.validate("Beruf", "z", "Zahnarzt")["reason"] == "no answers for this letter"
+    assert matcher.validate("Tier", "a", "Affe")["reason"] == "unknown category"
+    assert matcher.validate("Beruf", "a", "  ")["reason"] == "empty answer"
+
+
+def test_batch_passes_fields_through_and_memoizes():
+    matcher = AnswerMatcher(answers=ANSWERS)
+    items = [{"player": n, "answer": answer} for n, answer in enumerate(["Maurer", "maurer", "Mauer", "Maler"])]
+
+    results = matcher.validate_batch(items, category="Beruf", letter="m")
+
+    assert [r["player"] for r in results] == [0, 1, 2, 3]
+    assert [r["valid"] for r in results] == [True, True, True, False]
+    assert matcher.stats["memo_hits"] == 1
+
+
+def test_index_matches_linear_search():
+    keys = ["apotheker", "architekt", "arzt", "anwalt", "astronaut", "autor", "artist", "arzthelfer"]
+    index = TrigramIndex(keys)
+    for query in ["artz", "apotekher", "anwald", "autoren", "artzhelfer", "xyz"]:
+        distances = ((bounded_distance(query, key, 2), key) for key in keys)
+        assert index.search(query, 2) == sorted(d for d in distances if d[0] <= 2)
+
+
+def test_reloads_when_file_changes(tmp_path):
+    data = tmp_path / "apps" / "game" / "public" / "data"
+    data.mkdir(parents=True)
+    path = data / "offlineAnswers.json"
+    path.write_text(json.dumps(ANSWERS), encoding="utf-8")
+    matcher = AnswerMatcher(tmp_path)
+    assert matcher.validate("Beruf", "a", "Astronaut")["valid"] is False
+
+    path.write_text(json.dumps({"Beruf": {"a": ["Astronaut"]}}), encoding="utf-8")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+
+    assert matcher.validate("Beruf", "a", "Astronaut")["valid"] is True
+    assert matcher.stats["rebuilds"] == 2
+
+
+def test_benchmark_reports_rates():
+    report = benchmark(ANSWERS, size=60, repeat=1)
+
+    assert report["batch"] == 60 and report["answers"] == 9
+    assert report["indexed_per_s"] > 0 and report["linear_per_s"] > 0
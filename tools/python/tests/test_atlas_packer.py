@@ -0,0 +1,77 @@
+"""Tests for the MaxRects texture atlas packer."""
+
+import json
+import random
+
+import pytest
+
+from atlas_packer import OUTPUT_DIR, Rect, build_atlases, pack
+
+
+def test_pack_places_every_sprite_without_overlap():
+    rng = random.Random(7)
+    sizes = {f"s{i}.png": (rng.randint(8, 300), rng.randint(8, 300)) for i in range(60)}
+
+    pages = pack(sizes, atlas_size=1024, padding=2)
+
+    placed = {name: rect for page in pages for name, rect in page["frames"].items()}
+    assert set(placed) == set(sizes)
+    for page in pages:
+        rects = list(page["frames"].values())
+        width, height = page["size"]
+        assert width <= 1024 and height <= 1024
+        for i, a in enumerate(rects):
+            assert a.x + a.w <= width and a.y + a.h <= height
+            padded = Rect(a.x, a.y, a.w + 2, a.h + 2)
+            assert not any(padded.intersects(b) for b in rects[i + 1 :])
+
+
+def test_pack_rejects_oversized_sprite():
+    with pytest.raises(ValueError):
+        pack({"huge.png": (3000, 10)}, atlas_size=2048)
+
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def project(tmp_path):
+    screen = tmp_path / "apps" / "game" / "public" / "assets" / "scoring"
+    screen.mkdir(parents=True)
+    Image.new("RGBA", (1080, 1920), (0, 0, 0, 255)).save(screen / "BACKGROUND.png")
+    for i, size in enumerate([(132, 132), (77, 77), (742, 166), (324, 106)]):
+        Image.new("RGBA", size, (i * 40, 100, 200, 255)).save(screen / f"sprite{i}.png")
+    return tmp_path
+
+
+def test_build_writes_pages_and_frame_map(project):
+    report = build_atlases(project, ("scoring",))
+
+    screen = report["screens"]["scoring"]
+    assert screen["left_separate"] == ["BACKGROUND.png"]
+    assert (screen["requests_before"], screen["requests_after"]) == (4, 2)
+    output = project / OUTPUT_DIR
+    frame_map = json.loads((output / "scoring.json").read_text())
+    assert frame_map["meta"]["pages"] == ["/atlases/scoring.png"]
+    frame = frame_map["frames"]["sprite0.png"]["frame"]
+    with Image.open(output / "scoring.png") as atlas:
+        crop = atlas.crop((frame["x"], frame["y"], frame["x"] + frame["w"], frame["y"] + frame["h"]))
+        assert crop.getpixel((10, 10)) == (0, 100, 200, 255)
+
+
+def test_rebuild_only_when_sources_change(project):
+    build_atlases(project, ("scoring",))
+    assert build_atlases(project, ("scoring",))["screens"]["scoring"]["rebuilt"] is False
+
+    sprite = project / "apps" / "game" / "public" / "assets" / "scoring" / "sprite1.png"
+    Image.new("RGBA", (90, 90), (1, 2, 3, 255)).save(sprite)
+    report = build_atlases(project, ("scoring",))
+
+    assert report["screens"]["scoring"]["rebuilt"] is True
+    frame_map = json.loads((project / OUTPUT_DIR / "scoring.json").read_text())
+    assert frame_map["frames"]["sprite1.png"]["frame"]["w"] == 90
+
+
+def test_unknown_screen(project):
+    with pytest.raises(FileNotFoundError):
+        build_atlases(project, ("missing",))
@@ -0,0 +1,80 @@
+"""Tests for the pooled AWS status checks (against moto)."""
+
+import time
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from aws_status import ClientPool, deployment_status, run_checks  # noqa: E402
+
+BUCKET = "riddle-rush-status"
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-central-1")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    with moto.mock_aws():
+        yield ClientPool()
+
+
+def _distribution(pool):
+    origin = {
+        "Id": "s3",
+        "DomainName": f"{BUCKET}.s3.eu-central-1.amazonaws.com",
+        "S3OriginConfig": {"OriginAccessIdentity": ""},
+    }
+    config = {
+        "CallerReference": "status-test",
+        "Comment": "",
+        "Enabled": True,
+        "Origins": {"Quantity": 1, "Items": [origin]},
+        "DefaultCacheBehavior": {"TargetOriginId": "s3", "ViewerProtocolPolicy": "redirect-to-https", "MinTTL": 0},
+    }
+    return pool.client("cloudfront").create_distribution(DistributionConfig=config)["Distribution"]["Id"]
+
+
+def test_ready_environment(aws):
+    aws.client("s3").create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
+    distribution_id = _distribution(aws)
+
+    status = deployment_status(aws, BUCKET, distribution_id)
+
+    checks = status["checks"]
+    assert checks["credentials"]["status"] == "ok"
+    assert checks["bucket"] == {**checks["bucket"], "status": "ok", "region": "eu-central-1"}
+    assert checks["distribution"]["distribution_id"] == distribution_id
+    assert checks["distribution"]["status"] in ("ok", "warning")
+    assert checks["invalidation"]["detail"] == "no invalidations yet"
+    assert status["ready"] is True
+
+
+def test_missing_bucket_and_distribution(aws):
+    status = deployment_status(aws, "does-not-exist", "E000000000000")
+
+    assert status["checks"]["bucket"]["detail"] == "bucket does not exist"
+    assert status["checks"]["distribution"]["status"] == "error"
+    assert status["ready"] is False
+    assert deployment_status(aws)["ready"] is False  # no bucket known
+
+
+def test_clients_are_pooled(aws):
+    deployment_status(aws, BUCKET, "E000000000000")
+    created = aws.created
+    deployment_status(aws, BUCKET, "E000000000000")
+
+    assert created == aws.created == 3  # sts, s3, cloudfront
+    assert aws.stats()["sessions"] == 1
+
+
+def test_deadline_reports_slow_checks():
+    start = time.perf_counter()
+    results = run_checks({"fast": lambda: {"status": "ok"}, "slow": lambda: time.sleep(2) or {"status": "ok"}}, 0.2)
+
+    assert time.perf_counter() - start < 1
+    assert results["fast"]["status"] == "ok"
+    assert results["slow"]["status"] == "timeout"
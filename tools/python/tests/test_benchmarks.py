@@ -0,0 +1,72 @@
+"""Tests for the benchmark suite and its fake toolchain."""
+
+import asyncio
+import json
+import subprocess
+
+import pytest
+
+from benchmarks.bench_tools import TOOL_ARGS, _load_server, compare_to_baseline, fake_aws, run_suite
+from benchmarks.fake_bins import FAKE_BUCKET, FakeToolchain
+
+
+def test_fake_binaries_are_deterministic_and_configurable(tmp_path):
+    with FakeToolchain(tmp_path, output_bytes=4096) as toolchain:
+        listed = subprocess.run(["pnpm", "list", "-r", "--depth", "0", "--json"], capture_output=True, text=True)
+        toolchain.configure(output_bytes=0)
+        branch = subprocess.run(["git", "branch", "--show-current"], capture_output=True, text=True)
+
+        assert len(listed.stdout) >= 4096
+        assert [pkg["name"] for pkg in json.loads(listed.stdout)][0] == "@riddle-rush/game"
+        assert branch.stdout.strip() == "main"
+        assert [call["tool"] for call in toolchain.invocations()] == ["pnpm", "git"]
+        assert (toolchain.project_root / ".trunk-cache/cli/1.25.0-linux-x86_64/trunk").exists()
+
+
+def test_run_suite_reports_every_metric():
+    results = asyncio.run(
+        run_suite(tools=["cicd_check", "workspace_info"], repeats=2, concurrency=[1, 2], huge_output_bytes=1_000_000, cold_start=False)
+    )
+
+    workspace = results["tools"]["workspace_info"]
+    assert {"p50_ms", "p95_ms", "mean_ms", "throughput_per_s", "peak_memory_mb"} <= set(workspace)
+    assert set(workspace["throughput_per_s"]) == {"1", "2"}
+    assert workspace["peak_memory_mb"] >= 1.0
+    assert results["meta"]["concurrency"] == [1, 2]
+
+
+def test_tools_run_against_the_sandbox_and_moto(tmp_path):
+    pytest.importorskip("moto")
+    from fastmcp import Client
+
+    server = _load_server()
+    original_root = server.PROJECT_ROOT
+    names = ("find_symbol", "load_skill", "validate_answers", "aws_list_releases", "aws_sync_build")
+
+    async def call_tools():
+        async with Client(server.mcp) as client:
+            return {name: (await client.call_tool(name, TOOL_ARGS[name])).structured_content for name in names}
+
+    with FakeToolchain(tmp_path) as toolchain:
+        _load_server(toolchain.project_root)
+        try:
+            with fake_aws(server):
+                results = asyncio.run(call_tools())
+        finally:
+            server.set_project_root(original_root)
+
+    assert [s["path"] for s in results["find_symbol"]["symbols"]] == ["packages/shared/src/index.ts"]
+    assert results["load_skill"]["name"] == "demo-skill" and results["load_skill"]["error"] is None
+    assert results["validate_answers"]["valid"] == 1
+    assert results["aws_list_releases"] == {"current": None, "releases": []}
+    assert results["aws_sync_build"]["bucket"] == FAKE_BUCKET
+    assert server.symbols.project_root == original_root
+
+
+def test_compare_to_baseline_flags_slower_and_lower_throughput():
+    baseline = {"tools": {"run_tests": {"p50_ms": 10.0, "peak_memory_mb": 5.0, "throughput_per_s": {"4": 100.0}}}}
+    current = {"tools": {"run_tests": {"p50_ms": 14.0, "peak_memory_mb": 5.5, "throughput_per_s": {"4": 60.0}}}}
+
+    regressions = compare_to_baseline(current, baseline, tolerance=0.25)
+
+    assert {r["metric"] for r in regressions} == {"p50_ms", "throughput_per_s[4]"}
@@ -0,0 +1,123 @@
+"""Tests for the minimal CloudFront invalidation planner."""
+
+import pytest
+
+from cloudfront_invalidation import (
+    INVALIDATE_ALL,
+    batch_paths,
+    collapse_paths,
+    is_immutable,
+    plan_invalidation,
+    submit_invalidation,
+)
+
+
+class TooManyInvalidationsInProgress(Exception):
+    pass
+
+
+class StubCloudFront:
+    """Records invalidations; rejects batches while ``max_in_progress`` are still running."""
+
+    class exceptions:
+        TooManyInvalidationsInProgress = TooManyInvalidationsInProgress
+
+    def __init__(self, max_in_progress: int = 100):
+        self.max_in_progress = max_in_progress
+        self.batches: list[list[str]] = []
+        self.in_progress: set[str] = set()
+
+    def create_invalidation(self, DistributionId, InvalidationBatch):
+        if len(self.in_progress) >= self.max_in_progress:
+            raise TooManyInvalidationsInProgress()
+        assert InvalidationBatch["Paths"]["Quantity"] == len(InvalidationBatch["Paths"]["Items"])
+        self.batches.append(InvalidationBatch["Paths"]["Items"])
+        invalidation_id = f"I{len(self.batches)}"
+        self.in_progress.add(invalidation_id)
+        return {"Invalidation": {"Id": invalidation_id, "Status": "InProgress"}}
+
+    def get_invalidation(self, DistributionId, Id):
+        self.in_progress.discard(Id)
+        return {"Invalidation": {"Id": Id, "Status": "Completed"}}
+
+
+def test_immutable_detection():
+    assert is_immutable("_nuxt/BkX9a2Lm.js")
+    assert is_immutable("assets/logo.3f9a2b1c.png")
+    assert not is_immutable("index.html")
+    assert not is_immutable("sw.js")
+    assert not is_immutable("manifest.webmanifest")
+    assert not is_immutable("workbox-4f2a9c1d.js")
+    assert not is_immutable("data/categories.json")
+    assert not is_immutable("icon-maskable.svg")
+    assert not is_immutable("pwa-512x512-maskable.png")
+    assert not is_immutable("pwa-icon-template.svg")
+    assert not is_immutable("images/background_landscape.webp")
+
+
+def test_plan_skips_hashed_assets_and_keeps_entry_points():
+    previous = {"index.html": {"md5": "a"}, "sw.js": {"md5": "a"}, "_nuxt/old1234567.js": {"md5": "a"},
+                "favicon.ico": {"md5": "a"}}
+    current = {"index.html": {"md5": "b"}, "sw.js": {"md5": "b"}, "_nuxt/new7654321.js": {"md5": "b"},
+               "favicon.ico": {"md5": "a"}}
+
+    plan = plan_invalidation(previous, current)
+
+    assert plan.paths == ["/", "/index.html", "/sw.js"]
+    assert plan.skipped_immutable == ["_nuxt/new7654321.js", "_nuxt/old1234567.js"]
+
+
+def test_first_deploy_invalidates_everything():
+    assert plan_invalidation({}, {"index.html": {"md5": "a"}}).paths == [INVALIDATE_ALL]
+
+
+def test_lossless_collapse_of_fully_changed_directory():
+    known = {"data/a.json", "data/b.json", "data/c.json", "index.html", "robots.txt"}
+    paths = collapse_paths({"data/a.json", "data/b.json", "data/c.json", "index.html"}, known)
+    assert paths == ["/", "/data/*", "/index.html"]
+
+
+def test_index_documents_invalidate_their_directory_urls():
+    known = {"index.html", "about/index.html", "about/team/index.html", "about/team/photo.png", "robots.txt"}
+
+    assert collapse_paths({"about/index.html"}, known) == ["/about", "/about/", "/about/index.html"]
+    assert collapse_paths({"about/team/index.html", "about/team/photo.png"}, known) == ["/about/team", "/about/team/*"]
+    assert collapse_paths({"index.html", "robots.txt"}, {"index.html", "robots.txt", "about/index.html"}) == [
+        "/",
+        "/index.html",
+        "/robots.txt",
+    ]
+
+
+def test_lossy_collapse_respects_max_paths():
+    known = {f"data/{i}.json" for i in range(20)} | {f"img/{i}.png" for i in range(20)} | {"index.html"}
+    targets = {f"data/{i}.json" for i in range(18)} | {"img/1.png", "index.html"}
+
+    paths = collapse_paths(targets, known, max_paths=5)
+
+    assert len(paths) <= 5
+    assert "/data/*" in paths
+    assert "/img/1.png" in paths
+
+
+def test_batches_respect_wildcard_limit():
+    paths = [f"/dir{i}/*" for i in range(20)] + ["/index.html"]
+    batches = batch_paths(paths)
+    assert [len(b) for b in batches] == [15, 6]
+    assert all(sum(p.endswith("*") for p in b) <= 15 for b in batches)
+
+
+def test_submit_waits_when_too_many_in_progress():
+    client = StubCloudFront(max_in_progress=1)
+    paths = [f"/dir{i}/*" for i in range(31)]
+
+    ids = submit_invalidation(client, "E123", paths, poll=0)
+
+    assert ids == ["I1", "I2", "I3"]
+    assert [len(b) for b in client.batches] == [15, 15, 1]
+
+
+def test_submit_raises_when_nothing_to_wait_for():
+    client = StubCloudFront(max_in_progress=0)
+    with pytest.raises(TooManyInvalidationsInProgress):
+        submit_invalidation(client, "E123", ["/index.html"], poll=0)
@@ -0,0 +1,111 @@
+"""Tests for resolving an environment's bucket and distribution in main.py."""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+import main  # noqa: E402
+from job_runner import JobRunner  # noqa: E402
+
+# Outputs of an environment that defines no bucket_name / cloudfront_distribution_id
+APP_OUTPUTS = {"website_url": "https://d111.cloudfront.net", "deploy_command": "./scripts/aws-deploy.sh development"}
+
+# Stands in for terraform on PATH: prints the outputs written by _outputs
+FAKE_TERRAFORM = '#!/bin/sh\ncat "$FAKE_TERRAFORM_OUTPUTS"\n'
+
+
+def _state(root, environment):
+    resources = [
+        {
+            "module": "module.s3_website",
+            "mode": "managed",
+            "type": "aws_s3_bucket",
+            "name": "website",
+            "instances": [{"attributes": {"id": f"riddle-rush-{environment}", "bucket": f"riddle-rush-{environment}"}}],
+        },
+        {
+            "module": "module.cloudfront",
+            "mode": "managed",
+            "type": "aws_cloudfront_distribution",
+            "name": "website",
+            "instances": [{"attributes": {"id": "E2ABCDEF123456", "domain_name": "d111.cloudfront.net"}}],
+        },
+    ]
+    path = root / "infrastructure" / "environments" / environment / "terraform.tfstate"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": 4, "serial": 1, "lineage": "x", "outputs": {}, "resources": resources}))
+
+
+def _outputs(root, values):
+    outputs = {key: {"value": value, "type": "string", "sensitive": False} for key, value in values.items()}
+    (root / "outputs.json").write_text(json.dumps(outputs))
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.delenv("AWS_S3_BUCKET", raising=False)
+    monkeypatch.delenv("AWS_CLOUDFRONT_ID", raising=False)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "terraform").write_text(FAKE_TERRAFORM)
+    (bin_dir / "terraform").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TERRAFORM_OUTPUTS", str(tmp_path / "outputs.json"))
+    _outputs(tmp_path, APP_OUTPUTS)
+    monkeypatch.setattr(main, "jobs", JobRunner(2))
+    monkeypatch.setattr(main.cache, "enabled", False)
+    original_root = main.PROJECT_ROOT
+    main.set_project_root(tmp_path)
+    yield tmp_path
+    main.set_project_root(original_root)
+
+
+def test_get_outputs_runs_terraform(project):
+    _state(project, "development")
+
+    assert main.aws_get_outputs("development") == APP_OUTPUTS
+    assert "error" in main.aws_get_outputs("staging")  # no environments/staging to run terraform in
+
+
+def test_outputs_without_bucket_fall_back_to_local_state(project):
+    _state(project, "development")
+
+    outputs = main._deploy_outputs("development")
+
+    assert outputs["bucket_name"] == "riddle-rush-development"
+    assert outputs["cloudfront_distribution_id"] == "E2ABCDEF123456"
+    assert outputs["website_url"] == APP_OUTPUTS["website_url"]
+
+
+def test_environment_variables_override_missing_outputs(project, monkeypatch):
+    monkeypatch.setenv("AWS_S3_BUCKET", "riddle-rush-ci")
+    monkeypatch.setenv("AWS_CLOUDFRONT_ID", "E0CI")
+
+    outputs = main._deploy_outputs("production")
+
+    assert (outputs["bucket_name"], outputs["cloudfront_distribution_id"]) == ("riddle-rush-ci", "E0CI")
+
+
+def test_terraform_outputs_win_when_defined(project):
+    _state(project, "docs")
+    docs = {"bucket_name": "riddle-rush-docs-site", "cloudfront_distribution_id": "E9DOCS"}
+    _outputs(project, docs)
+
+    assert main._deploy_outputs("docs") == docs
+
+
+def test_release_tools_report_missing_bucket(project):
+    _state(project, "development")  # another environment's state is not used
+
+    for result in (main.aws_sync_build("production"), main.aws_list_releases("production")):
+        assert "No bucket for production" in result["error"]
+
+
+def test_short_environment_names(project):
+    _state(project, "production")
+
+    assert main._deploy_targets("prod") == ("riddle-rush-production", "E2ABCDEF123456", "local Terraform state")
+    assert main._deploy_outputs("prod")["bucket_name"] == "riddle-rush-production"
@@ -0,0 +1,129 @@
+"""Tests for content-addressed release manifests and rollback (against moto's S3)."""
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from deploy_releases import (  # noqa: E402
+    BLOBS_PREFIX,
+    diff_releases,
+    is_content_addressed,
+    list_releases,
+    load_current_manifest,
+    load_release,
+    rollback,
+)
+from s3_sync import SHORT_CACHE_CONTROL, sync_directory  # noqa: E402
+
+BUCKET = "riddle-rush-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-central-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="eu-central-1")
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
+        yield client
+
+
+@pytest.fixture
+def two_releases(s3, tmp_path):
+    root = tmp_path / "public"
+    (root / "_nuxt").mkdir(parents=True)
+    (root / "index.html").write_text("<html>v1</html>")
+    (root / "_nuxt" / "entry.aaa111.js").write_text("console.log(1)")
+    first = sync_directory(BUCKET, root, client=s3, workers=2)["release"]
+
+    (root / "index.html").write_text("<html>v2</html>")
+    (root / "_nuxt" / "entry.aaa111.js").unlink()
+    (root / "_nuxt" / "entry.bbb222.js").write_text("console.log(2)")
+    second = sync_directory(BUCKET, root, client=s3, workers=2, delete=True)["release"]
+    return first, second
+
+
+def _body(s3, key):
+    return s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+
+def test_each_sync_records_a_release(s3, two_releases):
+    first, second = two_releases
+
+    assert [r["id"] for r in list_releases(s3, BUCKET)] == [first, second]
+    assert load_current_manifest(s3, BUCKET)["release"] == second
+    assert load_release(s3, BUCKET, "previous")["release"] == first
+    assert load_release(s3, BUCKET, first[:6])["release"] == first
+    with pytest.raises(KeyError):
+        load_release(s3, BUCKET, "ffffffff")
+
+
+def test_diff_releases(s3, two_releases):
+    diff = diff_releases(load_release(s3, BUCKET, "previous"), load_release(s3, BUCKET, "current"))
+
+    assert diff["added"] == ["_nuxt/entry.bbb222.js"]
+    assert diff["removed"] == ["_nuxt/entry.aaa111.js"]
+    assert diff["changed"] == ["index.html"]
+
+
+def test_rollback_restores_mutable_files_from_blobs(s3, two_releases):
+    first, second = two_releases
+
+    result = rollback(s3, BUCKET, "previous")
+
+    assert (result["release"], result["from_release"]) == (first, second)
+    assert result["restored"] == ["index.html"]
+    assert result["missing"] == []
+    assert result["invalidation"]["paths"] == ["/", "/index.html"]
+    assert _body(s3, "index.html") == b"<html>v1</html>"
+    head = s3.head_object(Bucket=BUCKET, Key="index.html")
+    assert head["CacheControl"] == SHORT_CACHE_CONTROL
+    assert head["ContentType"].startswith("text/html")
+    assert load_current_manifest(s3, BUCKET)["release"] == first
+
+    # ... and forward again
+    assert rollback(s3, BUCKET, second)["restored"] == ["index.html"]
+    assert _body(s3, "index.html") == b"<html>v2</html>"
+
+
+def test_dry_run_changes_nothing(s3, two_releases):
+    _, second = two_releases
+
+    result = rollback(s3, BUCKET, "previous", dry_run=True)
+
+    assert result["restored"] == ["index.html"]
+    assert _body(s3, "index.html") == b"<html>v2</html>"
+    assert load_current_manifest(s3, BUCKET)["release"] == second
+
+
+def test_rollback_refused_when_objects_are_gone(s3, two_releases):
+    first, _ = two_releases
+    release = load_release(s3, BUCKET, first)
+    s3.delete_object(Bucket=BUCKET, Key=BLOBS_PREFIX + release["files"]["index.html"]["md5"])
+    s3.delete_object(Bucket=BUCKET, Key="_nuxt/entry.aaa111.js")
+
+    result = rollback(s3, BUCKET, first)
+
+    assert sorted(result["missing"]) == ["_nuxt/entry.aaa111.js", "index.html"]
+    assert _body(s3, "index.html") == b"<html>v2</html>"
+
+
+def test_only_content_addressed_keys_skip_blobs(s3, tmp_path):
+    root = tmp_path / "public"
+    (root / "images").mkdir(parents=True)
+    (root / "index.html").write_text("<html>v1</html>")
+    (root / "images" / "logo.deadbeef.svg").write_text("<svg>v1</svg>")  # looks hashed, is not
+    first = sync_directory(BUCKET, root, client=s3, workers=2)["release"]
+    md5 = load_release(s3, BUCKET, first)["files"]["images/logo.deadbeef.svg"]["md5"]
+    assert not is_content_addressed("images/logo.deadbeef.svg", md5)
+    assert is_content_addressed(f"images/logo.{md5[:8]}.svg", md5)
+    assert is_content_addressed("_nuxt/entry.js", md5)
+
+    (root / "images" / "logo.deadbeef.svg").write_text("<svg>v2</svg>")
+    sync_directory(BUCKET, root, client=s3, workers=2)
+
+    result = rollback(s3, BUCKET, first)
+    assert result["restored"] == ["images/logo.deadbeef.svg"] and result["missing"] == []
+    assert _body(s3, "images/logo.deadbeef.svg") == b"<svg>v1</svg>"
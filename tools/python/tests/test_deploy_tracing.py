@@ -0,0 +1,123 @@
+"""Tests for deploy_tracing."""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from deploy_tracing import (
+    STATUS_CODE_ERROR,
+    STATUS_CODE_OK,
+    DeployTrace,
+    compare_traces,
+    latest_traces,
+    load_phase_durations,
+    run_traced,
+    write_trace,
+)
+
+SCRIPT = """
+import sys, time
+print("starting")
+print("::deploy-phase::start::build", flush=True)
+time.sleep(0.05)
+print("::deploy-phase::end::build::ok", flush=True)
+print("::deploy-phase::start::upload", flush=True)
+print("uploading", flush=True)
+sys.exit(int(sys.argv[1]))
+"""
+
+
+def _run(returncode: int = 0) -> tuple[DeployTrace, dict]:
+    trace = DeployTrace("deploy test", {"deploy.environment": "test"})
+    result = run_traced([sys.executable, "-c", SCRIPT, str(returncode)], trace, timeout=30)
+    return trace, result
+
+
+def test_markers_become_spans_and_are_stripped_from_output():
+    trace, result = _run()
+
+    assert result["returncode"] == 0
+    assert "::deploy-phase::" not in result["stdout"]
+    assert "starting" in result["stdout"] and "uploading" in result["stdout"]
+    assert [span.name for span in trace.phases] == ["build", "upload"]
+    assert trace.phases[0].duration_ms >= 40
+    assert all(span.parent_span_id == trace.root.span_id for span in trace.phases)
+
+
+def test_failing_script_closes_open_phase_with_error():
+    trace, result = _run(returncode=3)
+
+    assert result["returncode"] == 3
+    upload = trace.phases[-1]
+    assert upload.end_ns is not None
+    assert upload.status == "error"
+    assert trace.root.status == "error"
+
+
+def test_otlp_export_layout():
+    trace, _ = _run()
+    spans = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+    assert len(spans) == 3
+    root, build, _upload = spans
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert root["parentSpanId"] == ""
+    assert build["parentSpanId"] == root["spanId"]
+    assert int(build["endTimeUnixNano"]) > int(build["startTimeUnixNano"])
+    assert build["status"]["code"] == STATUS_CODE_OK
+    assert {"key": "deploy.environment", "value": {"stringValue": "test"}} in root["attributes"]
+
+
+def test_timeout_marks_trace(tmp_path):
+    trace = DeployTrace("deploy slow")
+    result = run_traced([sys.executable, "-c", "import time; print('::deploy-phase::start::tests', flush=True); time.sleep(10)"], trace, timeout=1)
+
+    assert result["timed_out"] is True
+    assert trace.phases[0].status == "error"
+    assert trace.root.attributes["deploy.timed_out"] is True
+
+
+def test_timeout_kills_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    script = f"sleep 30 & echo $! > {pid_file}; echo '::deploy-phase::start::apply'; wait"
+    trace = DeployTrace("deploy slow")
+
+    started = time.monotonic()
+    result = run_traced(["sh", "-c", script], trace, timeout=1)
+
+    assert result["timed_out"] is True
+    assert time.monotonic() - started < 10  # readers are not blocked by the orphaned child
+    child = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        for _ in range(50):
+            os.kill(child, 0)
+            time.sleep(0.1)
+
+
+def test_write_and_compare_traces(tmp_path):
+    baseline = DeployTrace("deploy production")
+    baseline.start_phase("build", timestamp_ns=0)
+    baseline.end_phase("build", timestamp_ns=2_000_000_000)
+    baseline.finish(0)
+    current = DeployTrace("deploy production")
+    current.start_phase("build", timestamp_ns=0)
+    current.end_phase("build", timestamp_ns=3_000_000_000)
+    current.start_phase("verify", timestamp_ns=3_000_000_000)
+    current.end_phase("verify", status="error", timestamp_ns=3_500_000_000)
+    current.finish(1)
+
+    old_path = write_trace(baseline, tmp_path, "production")
+    new_path = write_trace(current, tmp_path, "production")
+
+    assert load_phase_durations(new_path) == {"build": 3000.0, "verify": 500.0}
+    spans = json.loads(new_path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[-1]["status"]["code"] == STATUS_CODE_ERROR
+
+    comparison = compare_traces(old_path, new_path)
+    assert comparison["build"]["delta_ms"] == 1000.0
+    assert comparison["build"]["delta_pct"] == 50.0
+    assert comparison["verify"]["baseline_ms"] is None
+    assert set(latest_traces(tmp_path, "production")) == {old_path, new_path}
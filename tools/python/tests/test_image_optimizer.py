@@ -0,0 +1,65 @@
+"""Tests for the responsive WebP/AVIF image pipeline."""
+
+import json
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from image_optimizer import ImageTarget, available_formats, optimize_images, optimize_target  # noqa: E402
+
+TARGET = ImageTarget("game", "public/assets", ("**/*",), "public/optimized", "/optimized/", "/assets/")
+
+
+@pytest.fixture
+def project(tmp_path):
+    assets = tmp_path / "public" / "assets"
+    (assets / "splash").mkdir(parents=True)
+    Image.new("RGBA", (800, 400), (255, 107, 53, 200)).save(assets / "splash" / "LOGO.png")
+    Image.new("RGB", (200, 100), (10, 20, 30)).save(assets / "splash" / "back.png")
+    (assets / "splash" / "notes.txt").write_text("not an image")
+    return tmp_path
+
+
+def test_variants_manifest_and_srcset(project):
+    report = optimize_target(project, TARGET, widths=(320, 640), formats=("webp",))
+
+    assert report["processed"] == 2
+    manifest = json.loads((project / "public" / "optimized" / "manifest.json").read_text())
+    logo = manifest["/assets/splash/LOGO.png"]
+    assert [v["width"] for v in logo["variants"]["webp"]] == [320, 640, 800]
+    assert logo["srcset"]["webp"].startswith("/optimized/splash/LOGO-320w.webp 320w, ")
+    assert [v["width"] for v in manifest["/assets/splash/back.png"]["variants"]["webp"]] == [200]
+    assert (project / "public" / "optimized" / "splash" / "LOGO-640w.webp").exists()
+    with Image.open(project / "public" / "optimized" / "splash" / "LOGO-320w.webp") as variant:
+        assert variant.size == (320, 160)
+        assert variant.mode == "RGBA"
+
+
+def test_unchanged_inputs_are_skipped(project):
+    optimize_target(project, TARGET, widths=(320,), formats=("webp",))
+    Image.new("RGB", (200, 100), (200, 0, 0)).save(project / "public" / "assets" / "splash" / "back.png")
+
+    report = optimize_target(project, TARGET, widths=(320,), formats=("webp",))
+    assert (report["processed"], report["unchanged"]) == (1, 1)
+
+    report = optimize_target(project, TARGET, widths=(320, 640), formats=("webp",))
+    assert report["processed"] == 2  # settings changed
+
+
+def test_removed_source_drops_variants(project):
+    optimize_target(project, TARGET, widths=(320,), formats=("webp",))
+    (project / "public" / "assets" / "splash" / "back.png").unlink()
+
+    report = optimize_target(project, TARGET, widths=(320,), formats=("webp",))
+
+    assert report["removed"] == 1
+    assert not (project / "public" / "optimized" / "splash" / "back-200w.webp").exists()
+
+
+def test_totals_across_targets(project):
+    report = optimize_images(project, targets=(TARGET,), widths=(320,), formats=available_formats(), workers=2)
+
+    assert report["bytes_before"] > 0
+    for fmt in available_formats():
+        assert 0 < report["bytes_after_full_width"][fmt] < report["bytes_before"]
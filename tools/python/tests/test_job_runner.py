@@ -0,0 +1,119 @@
+"""Tests for job_runner."""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from fastmcp import Client
+
+from benchmarks.bench_tools import _load_server
+from benchmarks.fake_bins import FakeToolchain
+from job_runner import JobRejected, JobRunner
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+
+def _alive(pid: int) -> bool:
+    # Killed orphans may linger as zombies until init reaps them
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_run_matches_subprocess_run():
+    result = JobRunner(2).run([sys.executable, "-c", "print('hi')"], capture_output=True, text=True, timeout=10)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "hi"
+
+
+def test_worker_slots_cap_concurrency():
+    runner = JobRunner(max_workers=2)
+    peak = 0
+
+    def job():
+        runner.run(SLEEP, timeout=10)
+
+    def watch():
+        nonlocal peak
+        while any(t.is_alive() for t in threads):
+            peak = max(peak, len(runner.running()))
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=job) for _ in range(5)]
+    for t in threads:
+        t.start()
+    watch()
+
+    assert peak == 2
+    assert runner.stats()["started"] == 5
+
+
+def test_timeout_kills_whole_process_group(tmp_path):
+    marker = tmp_path / "grandchild.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+        f"open({str(marker)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(30)\n"
+    )
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        JobRunner(1).run([sys.executable, "-c", script], timeout=1)
+
+    time.sleep(0.2)
+    assert not _alive(int(marker.read_text()))
+
+
+def test_drain_waits_then_rejects_new_jobs():
+    runner = JobRunner(2)
+    worker = threading.Thread(target=runner.run, args=(SLEEP,), kwargs={"timeout": 10})
+    worker.start()
+    time.sleep(0.1)
+
+    outcome = runner.drain(grace=5)
+    worker.join()
+
+    assert outcome == {"finished": 1, "terminated": 0}
+    with pytest.raises(JobRejected):
+        runner.run(SLEEP)
+    runner.resume()
+    assert runner.run([sys.executable, "-c", "pass"]).returncode == 0
+
+
+def test_drain_terminates_jobs_past_grace():
+    runner = JobRunner(1)
+    with runner.slot():
+        process = runner.popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        outcome = runner.drain(grace=0.2, kill_after=2)
+
+    assert outcome == {"finished": 0, "terminated": 1}
+    assert process.wait(timeout=5) != 0
+
+
+def test_tool_calls_overlap_through_the_mcp_client(tmp_path, monkeypatch):
+    main = _load_server()
+    original_root = main.PROJECT_ROOT
+    monkeypatch.setattr(main, "jobs", JobRunner(max_workers=2))
+
+    async def two_calls():
+        async with Client(main.mcp) as client:
+            start = time.monotonic()
+            results = await asyncio.gather(*(client.call_tool("run_quality_checks", {}) for _ in range(2)))
+            return time.monotonic() - start, results
+
+    with FakeToolchain(tmp_path, latency_ms=1000) as toolchain:
+        main.set_project_root(toolchain.project_root)
+        try:
+            elapsed, results = asyncio.run(two_calls())
+        finally:
+            main.set_project_root(original_root)
+
+    assert all("fake pnpm run workspace:check" in r.data for r in results)
+    assert len(toolchain.invocations()) == 2
+    assert elapsed < 1.8  # one call takes over a second: sync tools must not run one after the other
@@ -0,0 +1,80 @@
+"""Tests for the tool-call recorder and the load replay harness."""
+
+import asyncio
+import time
+
+import pytest
+from fastmcp import Client
+
+from benchmarks.bench_tools import _load_server
+from benchmarks.fake_bins import FakeToolchain
+from benchmarks.load_replay import CallResult, RateLimiter, run_load, summarize
+from call_recorder import ToolCallRecorder, load_trace
+
+SHORT_TRACE = [
+    {"t": 0.0, "tool": "list_tools", "args": {}},
+    {"t": 0.1, "tool": "cicd_check", "args": {}},
+    {"t": 0.2, "tool": "workspace_info", "args": {}},
+]
+
+
+def test_recorder_writes_replayable_trace(tmp_path):
+    main = _load_server()
+    original_root = main.PROJECT_ROOT
+    trace_file = tmp_path / "trace.jsonl"
+    recorder = ToolCallRecorder(trace_file)
+    main.mcp.add_middleware(recorder)
+
+    async def session():
+        async with Client(main.mcp) as client:
+            await client.list_tools()
+            await client.call_tool("get_quick_reference", {})
+            await client.call_tool("run_build", {"app": "docs"}, raise_on_error=False)
+
+    with FakeToolchain(tmp_path / "sandbox") as toolchain:
+        _load_server(toolchain.project_root)  # run_build runs the fake pnpm, not a real build
+        try:
+            asyncio.run(session())
+        finally:
+            main.mcp.middleware.remove(recorder)
+            main.set_project_root(original_root)
+
+    assert [call["tool"] for call in toolchain.invocations()] == ["pnpm"]
+
+    trace = load_trace(trace_file)
+    assert [entry["tool"] for entry in trace] == ["list_tools", "get_quick_reference", "run_build"]
+    assert trace[2]["args"] == {"app": "docs"}
+    assert trace[0]["t"] == 0.0 and trace[2]["t"] >= trace[1]["t"]
+
+
+def test_summarize_reports_error_rate_and_tails():
+    results = [CallResult(0, "run_tests", float(ms), ok=ms != 100) for ms in range(1, 101)]
+    results[-1].error = "tool error"
+
+    summary = summarize(results, elapsed=2.0, setup_ms=[5.0, 7.0])
+
+    assert summary["calls"] == 100
+    assert summary["error_rate"] == 0.01
+    assert summary["throughput_per_s"] == 50.0
+    assert summary["latency_ms"]["p99"] == 100.0
+    assert summary["error_kinds"] == {"tool error": 1}
+
+
+def test_rate_limiter_spaces_requests():
+    async def burst():
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+        return time.monotonic() - start
+
+    assert asyncio.run(burst()) >= 0.09
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("transport", ["stdio", "http"])
+def test_replay_against_local_server(transport):
+    summary = asyncio.run(run_load(transport=transport, trace=SHORT_TRACE, sessions=2, iterations=2))
+
+    assert summary["calls"] == 12
+    assert summary["errors"] == 0
+    assert summary["per_tool"]["workspace_info"]["calls"] == 4
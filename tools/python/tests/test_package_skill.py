@@ -0,0 +1,127 @@
+"""Tests for the deterministic .skill packager of the skill-creator skill."""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# The skill-creator scripts ship inside the skill, not next to main.py
+SCRIPTS = Path(__file__).resolve().parents[3] / ".agents" / "skills" / "skill-creator" / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+import package_skill  # noqa: E402
+import quick_validate  # noqa: E402
+
+SKILL_MD = """---
+name: {name}
+description: Test skill for the packager.
+---
+
+# {name}
+
+See references/guide.md and run scripts/run.sh.
+"""
+
+
+@pytest.fixture(autouse=True)
+def validate_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(quick_validate, "CACHE_FILE", tmp_path / "validate-cache.json")
+    monkeypatch.setattr(quick_validate, "_memory_cache", {})
+
+
+def _skill(parent, name="demo-skill"):
+    skill = parent / name
+    (skill / "references").mkdir(parents=True)
+    (skill / "scripts").mkdir()
+    (skill / "SKILL.md").write_text(SKILL_MD.format(name=name))
+    (skill / "references" / "guide.md").write_text("# Guide\n\n" + "Use the skill.\n" * 200)
+    (skill / "scripts" / "run.sh").write_text("#!/bin/sh\necho run\n")
+    (skill / "scripts" / "run.sh").chmod(0o755)
+    (skill / "icon.png").write_bytes(b"\x89PNG\r\n" + bytes(range(256)) * 4)
+    return skill
+
+
+def test_repack_is_byte_identical_and_readable(tmp_path):
+    skill = _skill(tmp_path / "src")
+
+    archive = package_skill.package_skill(skill, tmp_path / "dist")
+    first = archive.read_bytes()
+    assert package_skill.package_skill(skill, tmp_path / "dist") == archive
+    assert archive.read_bytes() == first
+
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == [
+            "demo-skill/SKILL.md",
+            "demo-skill/icon.png",
+            "demo-skill/references/guide.md",
+            "demo-skill/scripts/run.sh",
+        ]
+        for info in zipf.infolist():
+            assert zipf.read(info) == (skill.parent / info.filename).read_bytes()
+            assert info.date_time == (1980, 1, 1, 0, 0, 0)
+        assert zipf.getinfo("demo-skill/icon.png").compress_type == zipfile.ZIP_STORED
+        assert zipf.getinfo("demo-skill/references/guide.md").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo("demo-skill/scripts/run.sh").external_attr >> 16 == 0o100755
+
+
+def test_repack_reuses_unchanged_members(tmp_path):
+    skill = _skill(tmp_path / "src")
+    archive = tmp_path / "demo-skill.skill"
+    package_skill.write_archive(skill, archive)
+
+    (skill / "SKILL.md").write_text(SKILL_MD.format(name="demo-skill") + "\nMore.\n")
+    result = package_skill.write_archive(skill, archive)
+
+    assert result["reused"] == ["demo-skill/icon.png", "demo-skill/references/guide.md", "demo-skill/scripts/run.sh"]
+    fresh = tmp_path / "fresh" / "demo-skill.skill"
+    fresh.parent.mkdir()
+    package_skill.write_archive(skill, fresh)
+    assert fresh.read_bytes() == archive.read_bytes()
+
+
+def _repository(tmp_path):
+    root = tmp_path / "repo"
+    real = _skill(root / ".agents" / "skills")
+    _skill(root / ".agents" / "skills", "other-skill")
+    (root / ".codex" / "skills").mkdir(parents=True)
+    (root / ".codex" / "skills" / "demo-skill").symlink_to(real, target_is_directory=True)
+    (root / ".cursor").mkdir()
+    (root / ".cursor" / "skills").symlink_to(root / ".agents" / "skills", target_is_directory=True)
+    (root / ".github" / "skills" / "notes").mkdir(parents=True)  # no SKILL.md
+    return root
+
+
+def test_discover_skills_deduplicates_mirrors(tmp_path):
+    root = _repository(tmp_path)
+
+    skills = package_skill.discover_skills(root)
+
+    agents = root / ".agents" / "skills"
+    assert list(skills) == [(agents / "demo-skill").resolve(), (agents / "other-skill").resolve()]
+    assert skills[(agents / "demo-skill").resolve()] == [
+        agents / "demo-skill",
+        root / ".codex" / "skills" / "demo-skill",
+        root / ".cursor" / "skills" / "demo-skill",
+    ]
+
+
+def test_package_all_packages_each_skill_once(tmp_path, monkeypatch, capsys):
+    root = _repository(tmp_path)
+    (root / "skills" / "broken").mkdir(parents=True)
+    (root / "skills" / "broken" / "SKILL.md").write_text("no frontmatter\n")
+
+    results = {r["name"]: r for r in package_skill.package_all(root, tmp_path / "dist", workers=2)}
+
+    assert sorted(results) == ["broken", "demo-skill", "other-skill"]
+    assert len(results["demo-skill"]["aliases"]) == 3 and results["demo-skill"]["files"] == 4
+    assert results["broken"]["error"] == "No YAML frontmatter found"
+    assert sorted(p.name for p in (tmp_path / "dist").iterdir()) == ["demo-skill.skill", "other-skill.skill"]
+
+    (root / "skills" / "broken" / "SKILL.md").unlink()
+    monkeypatch.setattr(sys, "argv", ["package_skill.py", "--all", str(tmp_path / "dist"), str(root)])
+    with pytest.raises(SystemExit) as exit_info:
+        package_skill.main()
+    assert exit_info.value.code == 0
+    assert "2/2 skills packaged" in capsys.readouterr().out
@@ -0,0 +1,77 @@
+"""Tests for the brotli/gzip pre-compression stage."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+import precompress
+from precompress import precompress_tree
+
+
+@pytest.fixture
+def build(tmp_path):
+    root = tmp_path / "public"
+    (root / "data").mkdir(parents=True)
+    answers = {"categories": [{"id": i, "answers": [f"answer-{i}-{j}" for j in range(50)]} for i in range(20)]}
+    (root / "data" / "offlineAnswers.json").write_text(json.dumps(answers))
+    (root / "index.html").write_text("<html>" + "<div class='card'>riddle</div>" * 200 + "</html>")
+    (root / "tiny.css").write_text("a{}")
+    (root / "random.js").write_bytes(os.urandom(2048))  # incompressible
+    (root / "logo.png").write_bytes(b"\x89PNG" * 1000)
+    return root
+
+
+def test_writes_variants_and_reports_savings(build, tmp_path):
+    report = precompress_tree(build, tmp_path / "cache", encodings=("gzip",), workers=2)
+
+    variant = build / "data" / "offlineAnswers.json.gz"
+    assert gzip.decompress(variant.read_bytes()) == (build / "data" / "offlineAnswers.json").read_bytes()
+    assert (build / "index.html.gz").exists()
+    assert not (build / "tiny.css.gz").exists()
+    assert not (build / "random.js.gz").exists()
+    assert not (build / "logo.png.gz").exists()
+
+    assert report["files"] == 4
+    assert report["per_type"][".json"]["saved"]["gzip"] > 0
+    assert report["per_type"][".js"]["skipped"]["gzip"] == 1
+    assert report["saved"]["gzip"] == sum(t["saved"]["gzip"] for t in report["per_type"].values())
+
+
+def test_unchanged_assets_come_from_cache(build, tmp_path):
+    cache = tmp_path / "cache"
+    first = precompress_tree(build, cache, encodings=("gzip",), workers=2)
+    second = precompress_tree(build, cache, encodings=("gzip",), workers=2)
+
+    assert first["cache_hits"] == 0
+    assert second["cache_hits"] == 3  # every file above MIN_SIZE
+    assert second["saved"] == first["saved"]
+    assert not list(build.rglob("*.gz.gz"))
+
+
+def test_variant_removed_when_it_no_longer_pays_off(build, tmp_path):
+    precompress_tree(build, tmp_path / "cache", encodings=("gzip",), workers=1)
+    (build / "index.html").write_bytes(os.urandom(2048))
+
+    precompress_tree(build, tmp_path / "cache", encodings=("gzip",), workers=1)
+
+    assert not (build / "index.html.gz").exists()
+
+
+@pytest.mark.skipif(precompress.brotli is None, reason="brotli not installed")
+def test_brotli_beats_gzip(build, tmp_path):
+    report = precompress_tree(build, tmp_path / "cache", workers=2)
+    assert report["encodings"] == ["br", "gzip"]
+    assert report["saved"]["br"] >= report["saved"]["gzip"]
+    assert (build / "index.html.br").exists()
+
+
+def test_cli_builds_only_the_uploaded_encoding(build, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("S3_CONTENT_ENCODING", "gzip")
+
+    assert precompress.main([str(build), "--cache-dir", str(tmp_path / "cache"), "--workers", "1"]) == 0
+
+    assert json.loads(capsys.readouterr().out)["encodings"] == ["gzip"]
+    assert (build / "index.html.gz").exists()
+    assert not list(build.rglob("*.br"))
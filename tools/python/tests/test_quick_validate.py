@@ -0,0 +1,84 @@
+"""Tests for the cached skill validator of the skill-creator skill."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# The skill-creator scripts ship inside the skill, not next to main.py
+SCRIPTS = Path(__file__).resolve().parents[3] / ".agents" / "skills" / "skill-creator" / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+import quick_validate  # noqa: E402
+
+SKILL_MD = """---
+name: {name}
+description: Test skill for the validator.
+---
+
+Read references/guide.md first. `references/example.md` in code is not checked.
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "validate-cache.json"
+    monkeypatch.setattr(quick_validate, "CACHE_FILE", path)
+    monkeypatch.setattr(quick_validate, "_memory_cache", {})
+    return path
+
+
+def _skill(parent, name):
+    skill = parent / name
+    (skill / "references").mkdir(parents=True)
+    (skill / "SKILL.md").write_text(SKILL_MD.format(name=name))
+    (skill / "references" / "guide.md").write_text("# Guide\n")
+    return skill
+
+
+def test_validate_skills_caches_by_content(tmp_path, cache_file):
+    skills = [_skill(tmp_path, "first-skill"), _skill(tmp_path, "second-skill")]
+
+    first = quick_validate.validate_skills(skills, workers=2)
+    second = quick_validate.validate_skills(skills, workers=2)
+
+    assert [r["valid"] for r in first] == [True, True]
+    assert first[0]["references"] == ["references/guide.md"]
+    assert [r["cached"] for r in first] == [False, False]
+    assert [r["cached"] for r in second] == [True, True]
+    assert len(json.loads(cache_file.read_text())) == 2
+
+    (skills[0] / "SKILL.md").write_text(SKILL_MD.format(name="first-skill").replace("first.", "first!"))
+    changed = quick_validate.validate_skills(skills)
+    assert [r["cached"] for r in changed] == [False, True]
+    assert [r["cached"] for r in quick_validate.validate_skills(skills)] == [True, True]
+
+
+def test_missing_reference_is_checked_on_cache_hits(tmp_path):
+    skill = _skill(tmp_path, "demo-skill")
+    assert quick_validate.validate_skill(skill) == (True, "Skill is valid!")
+
+    (skill / "references" / "guide.md").unlink()
+    result = quick_validate.validate_skills([skill, tmp_path / "missing"])
+
+    assert result[0]["cached"] is True and result[0]["valid"] is False
+    assert result[0]["missing_references"] == ["references/guide.md"]
+    assert result[0]["message"] == "Referenced file(s) not found: references/guide.md"
+    assert result[1]["message"] == "SKILL.md not found"
+
+
+def test_json_cli(tmp_path, cache_file):
+    valid = _skill(tmp_path, "demo-skill")
+    broken = _skill(tmp_path, "Broken_Skill")
+    script = SCRIPTS / "quick_validate.py"
+    env = {"SKILL_VALIDATE_CACHE": str(cache_file), "PATH": "/usr/bin:/bin"}
+
+    ok = subprocess.run([sys.executable, script, "--json", valid], capture_output=True, text=True, env=env)
+    failed = subprocess.run([sys.executable, script, "--json", valid, broken], capture_output=True, text=True, env=env)
+
+    assert ok.returncode == 0 and json.loads(ok.stdout)[0]["valid"] is True
+    assert failed.returncode == 1
+    assert [r["valid"] for r in json.loads(failed.stdout)] == [True, False]
+    assert "hyphen-case" in json.loads(failed.stdout)[1]["message"]
@@ -0,0 +1,122 @@
+"""Tests for the delta S3 sync engine (against moto's S3)."""
+
+import gzip
+import json
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from deploy_releases import MANIFEST_KEY  # noqa: E402
+from s3_sync import (  # noqa: E402
+    IMMUTABLE_CACHE_CONTROL,
+    SHORT_CACHE_CONTROL,
+    cache_control_for,
+    hash_file,
+    sync_directory,
+)
+
+BUCKET = "riddle-rush-test"
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-central-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="eu-central-1")
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
+        yield client
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "public"
+    (root / "_nuxt").mkdir(parents=True)
+    (root / "data").mkdir()
+    (root / "index.html").write_text("<html>v1</html>")
+    (root / "sw.js").write_text("self.addEventListener('fetch', () => {})")
+    (root / "_nuxt" / "entry.abc123.js").write_text("console.log(1)")
+    (root / "data" / "answers.csv").write_text("a,b\n")
+    return root
+
+
+def test_cache_control_follows_edge_rules():
+    assert cache_control_for("index.html") == SHORT_CACHE_CONTROL
+    assert cache_control_for("sw.js") == SHORT_CACHE_CONTROL
+    assert cache_control_for("workbox-4f2a.js") == SHORT_CACHE_CONTROL
+    assert cache_control_for("_nuxt/entry.abc123.js") == IMMUTABLE_CACHE_CONTROL
+    assert cache_control_for("data/answers.csv") == "public, max-age=3600, must-revalidate"
+    assert cache_control_for("data/categories.json") == IMMUTABLE_CACHE_CONTROL
+
+
+def test_first_sync_uploads_everything_with_headers(s3, site):
+    summary = sync_directory(BUCKET, site, client=s3, workers=4)
+
+    assert sorted(summary["uploaded"]) == ["_nuxt/entry.abc123.js", "data/answers.csv", "index.html", "sw.js"]
+    head = s3.head_object(Bucket=BUCKET, Key="index.html")
+    assert head["CacheControl"] == SHORT_CACHE_CONTROL
+    assert head["ContentType"] == "text/html; charset=utf-8"
+    manifest = json.loads(s3.get_object(Bucket=BUCKET, Key=MANIFEST_KEY)["Body"].read())
+    assert set(manifest["files"]) == set(summary["uploaded"])
+    assert summary["invalidation"]["paths"] == ["/*"]
+
+
+def test_second_sync_uploads_only_changes_and_deletes_stale(s3, site):
+    sync_directory(BUCKET, site, client=s3, workers=4)
+    (site / "index.html").write_text("<html>v2</html>")
+    (site / "data" / "answers.csv").unlink()
+
+    dry = sync_directory(BUCKET, site, client=s3, workers=4, delete=True, dry_run=True)
+    assert dry["uploaded"] == ["index.html"]
+    assert s3.get_object(Bucket=BUCKET, Key="index.html")["Body"].read() == b"<html>v1</html>"
+
+    summary = sync_directory(BUCKET, site, client=s3, workers=4, delete=True)
+    assert summary["uploaded"] == ["index.html"]
+    assert summary["unchanged"] == 2
+    assert summary["deleted"] == []  # still part of the previous release
+    assert summary["invalidation"]["paths"] == ["/", "/data/answers.csv", "/index.html"]
+
+    summary = sync_directory(BUCKET, site, client=s3, workers=4, delete=True, retain_releases=0)
+    assert summary["deleted"] == ["data/answers.csv"]
+    keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKET)["Contents"]}
+    assert {k for k in keys if not k.startswith(".deploy/")} == {"index.html", "sw.js", "_nuxt/entry.abc123.js"}
+    assert MANIFEST_KEY in keys
+
+
+def test_multipart_upload_etag_is_predicted(s3, site):
+    big = site / "_nuxt" / "atlas.png"
+    big.write_bytes(b"\x89PNG" + bytes(range(256)) * (23 * 1024))  # ~5.9 MB, two parts
+
+    sync_directory(BUCKET, site, client=s3, workers=4, multipart_threshold=5 * MB, chunksize=5 * MB)
+    expected = hash_file(big, "_nuxt/atlas.png", 5 * MB, 5 * MB)
+    assert expected.etag.endswith("-2")
+    assert s3.head_object(Bucket=BUCKET, Key="_nuxt/atlas.png")["ETag"].strip('"') == expected.etag
+
+    again = sync_directory(BUCKET, site, client=s3, workers=4, multipart_threshold=5 * MB, chunksize=5 * MB)
+    assert again["uploaded"] == []
+
+
+def test_missing_build_dir(s3, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        sync_directory(BUCKET, tmp_path / "missing", client=s3)
+
+
+def test_precompressed_variants_replace_the_original(s3, site):
+    html = "<html>" + "<p>riddle</p>" * 500 + "</html>"
+    (site / "index.html").write_text(html)
+    (site / "index.html.gz").write_bytes(gzip.compress(html.encode(), mtime=0))
+
+    summary = sync_directory(BUCKET, site, client=s3, workers=4, content_encoding="gzip")
+
+    assert "index.html.gz" not in summary["uploaded"]
+    obj = s3.get_object(Bucket=BUCKET, Key="index.html")
+    assert obj["ContentEncoding"] == "gzip"
+    assert gzip.decompress(obj["Body"].read()).decode() == html
+    assert s3.head_object(Bucket=BUCKET, Key="sw.js").get("ContentEncoding") is None
+
+    plain = sync_directory(BUCKET, site, client=s3, workers=4)
+    assert plain["uploaded"] == ["index.html"]
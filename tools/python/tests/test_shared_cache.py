@@ -0,0 +1,66 @@
+"""Tests for shared_cache."""
+
+import threading
+import time
+
+from shared_cache import SharedCache
+
+
+def test_cached_results_expire():
+    cache = SharedCache()
+    calls = []
+
+    @cache.cached(ttl=0.2)
+    def status(env: str) -> dict:
+        calls.append(env)
+        return {"env": env}
+
+    assert status("dev") == status("dev") == {"env": "dev"}
+    assert status("prod") == {"env": "prod"}
+    assert calls == ["dev", "prod"]
+    time.sleep(0.25)
+    status("dev")
+    assert calls == ["dev", "prod", "dev"]
+
+
+def test_sessions_get_isolated_copies():
+    cache = SharedCache()
+    first = cache.get_or_compute(("docs",), 60, lambda: {"files": ["a.md"]})
+    first["files"].append("mutated.md")
+
+    assert cache.get_or_compute(("docs",), 60, lambda: {"files": []}) == {"files": ["a.md"]}
+
+
+def test_errors_are_not_cached():
+    cache = SharedCache()
+    results = iter([{"error": "pnpm missing"}, {"packages": []}])
+
+    assert cache.get_or_compute(("ws",), 60, lambda: next(results)) == {"error": "pnpm missing"}
+    assert cache.get_or_compute(("ws",), 60, lambda: next(results)) == {"packages": []}
+
+
+def test_concurrent_misses_compute_once():
+    cache = SharedCache()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"ok": True}
+
+    threads = [threading.Thread(target=cache.get_or_compute, args=(("tf",), 60, slow)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 7
+
+
+def test_disabled_cache_always_computes():
+    cache = SharedCache(enabled=False)
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute(("x",), 60, lambda: calls.append(1))
+    assert len(calls) == 3
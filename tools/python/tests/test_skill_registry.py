@@ -0,0 +1,112 @@
+"""Tests for the section-level skill registry."""
+
+import os
+
+import pytest
+
+from skill_registry import SkillRegistry, outline, parse_frontmatter
+
+REFERENCE = """# Hook Extraction
+
+Intro.
+
+## When to Extract
+
+Extract when state is coupled.
+
+```bash
+# not a heading
+```
+
+### Signals
+
+Many useState calls.
+
+## Naming
+
+Use `use` prefixes.
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    skill = tmp_path / ".agents" / "skills" / "refactoring"
+    (skill / "references").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: refactoring\ndescription: Split components\n---\n# Body\n\nSteps.\n")
+    (skill / "references" / "hooks.md").write_text(REFERENCE)
+    mirror = tmp_path / ".cursor" / "skills"
+    mirror.mkdir(parents=True)
+    os.symlink(skill, mirror / "refactoring")
+    return tmp_path
+
+
+def test_outline_ignores_code_fences_and_nests_sections():
+    sections = {s["id"]: s for s in outline(REFERENCE)}
+
+    assert list(sections) == ["hook-extraction", "when-to-extract", "signals", "naming"]
+    lines = REFERENCE.splitlines()
+    when = sections["when-to-extract"]
+    assert lines[when["end"]] == "## Naming"  # includes the ### subsection and the code block
+
+
+def test_mirrored_skill_is_indexed_once(project):
+    listed = SkillRegistry(project).list_skills()
+
+    assert [s["name"] for s in listed] == ["refactoring"]
+    assert listed[0]["aliases"] == [".agents/skills/refactoring", ".cursor/skills/refactoring"]
+    assert [s["id"] for s in listed[0]["references"]["references/hooks.md"]] == [
+        "hook-extraction",
+        "when-to-extract",
+        "signals",
+        "naming",
+    ]
+
+
+def test_sections_are_served_on_demand_with_metrics(project):
+    registry = SkillRegistry(project)
+
+    assert registry.load_skill("refactoring")["body"] == "# Body\n\nSteps.\n"
+    section = registry.load_reference("refactoring", "hooks.md", "Naming")["content"]
+
+    assert section == "## Naming\n\nUse `use` prefixes.\n"
+    stats = registry.stats()
+    assert stats["requests"] == 2
+    assert stats["bytes_served"] < stats["bytes_full_load"]
+    assert stats["cache_hits"] >= 2  # index already loaded both files
+
+
+def test_changed_reference_is_reindexed(project):
+    registry = SkillRegistry(project)
+    path = project / ".agents" / "skills" / "refactoring" / "references" / "hooks.md"
+    path.write_text(REFERENCE + "\n## Testing\n\nTest hooks.\n")
+
+    assert registry.load_reference("refactoring", "hooks.md", "testing")["content"].startswith("## Testing")
+
+
+def test_unknown_names_raise(project):
+    registry = SkillRegistry(project)
+
+    with pytest.raises(KeyError):
+        registry.load_skill("missing")
+    with pytest.raises(KeyError):
+        registry.load_reference("refactoring", "hooks.md", "nope")
+
+
+def test_broken_frontmatter_marks_skill_invalid(project):
+    broken = project / ".agents" / "skills" / "broken"
+    broken.mkdir()
+    (broken / "SKILL.md").write_text("---\nname: broken\ndescription: [unclosed\n---\n# Body\n")
+    listing = project / ".agents" / "skills" / "listing"
+    listing.mkdir()
+    (listing / "SKILL.md").write_text("---\n- name\n- description\n---\nText.\n")
+
+    registry = SkillRegistry(project)
+    listed = {s["name"]: s for s in registry.list_skills()}
+
+    assert listed["refactoring"]["valid"] is True and listed["refactoring"]["error"] is None
+    assert listed["broken"]["valid"] is False
+    assert listed["broken"]["error"].startswith("Invalid YAML in frontmatter")
+    assert listed["listing"]["error"] == "Frontmatter must be a YAML mapping, got list"
+    assert registry.load_skill("broken")["body"] == "# Body\n"
+    with pytest.raises(ValueError):
+        parse_frontmatter("---\nname: [\n---\n")
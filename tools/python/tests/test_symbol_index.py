@@ -0,0 +1,182 @@
+"""Tests for the SQLite symbol index over TS/Vue sources."""
+
+import json
+import os
+
+from symbol_index import SymbolIndex, _starts_with, mask_script
+
+UTILS_TS = """\
+// formatScore is documented here, not used
+import { ALPHABET, type Letter } from './constants'
+import * as path from 'node:path'
+
+export interface Score { value: number }
+export type Mode = 'solo' | 'team'
+export const formatScore = (score: Score): string => `${score.value} / ${ALPHABET.length}`
+export async function loadScores() {
+  const local = /formatScore\\/x/.test('formatScore')
+  return formatScore({ value: local ? 1 : 0 })
+}
+export { formatScore as format }
+"""
+CONSTANTS_TS = "export const ALPHABET = 'ABC'\nexport type Letter = string\n"
+INDEX_TS = "export * from './utils'\nexport { ALPHABET } from './constants'\n"
+BUTTON_VUE = """\
+<template>
+  <button @click="handleClick"><slot /></button>
+</template>
+
+<script setup lang="ts">
+const emit = defineEmits<{ click: [] }>()
+function handleClick() {
+  emit('click')
+}
+</script>
+"""
+PAGE_VUE = """\
+<template>
+  <BaseButton @click="start" />
+  <base-button :label="formatScore(score)">{{ score.value }}</base-button>
+</template>
+
+<script setup lang="ts">
+import { formatScore } from '@riddle-rush/shared'
+const score = { value: 3 }
+const start = () => formatScore(score)
+</script>
+"""
+
+
+def _project(tmp_path):
+    files = {
+        "packages/shared/package.json": json.dumps({"name": "@riddle-rush/shared", "exports": {".": "./src/index.ts"}}),
+        "packages/shared/src/utils.ts": UTILS_TS,
+        "packages/shared/src/constants.ts": CONSTANTS_TS,
+        "packages/shared/src/index.ts": INDEX_TS,
+        "packages/shared/node_modules/dep/index.ts": "export const ignored = 1\n",
+        "apps/game/components/Base/Button.vue": BUTTON_VUE,
+        "apps/game/pages/index.vue": PAGE_VUE,
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return tmp_path, SymbolIndex(tmp_path, tmp_path / "index.sqlite")
+
+
+def test_mask_keeps_offsets_and_code_in_templates():
+    source = "const a = 'x // y' // c\nconst r = /a'b/g; const t = `n ${a + `${r}`} m`\n"
+    masked = mask_script(source)
+
+    assert len(masked) == len(source) and masked.count("\n") == 2
+    assert "x" not in masked and "c\n" not in masked and "a'b" not in masked
+    assert "${a + `${r}`}" in masked
+
+
+def test_definitions_and_vue_components(tmp_path):
+    _, index = _project(tmp_path)
+
+    found = index.find_symbol("formatScore")["symbols"]
+    assert found == [
+        {
+            "name": "formatScore",
+            "kind": "function",
+            "path": "packages/shared/src/utils.ts",
+            "line": 7,
+            "col": 14,
+            "exported": True,
+            "signature": found[0]["signature"],
+        }
+    ]
+    kinds = {s["name"]: s["kind"] for s in index.find_symbol("*")["symbols"]}
+    assert kinds["Score"] == "interface" and kinds["Mode"] == "type" and kinds["loadScores"] == "function"
+    assert kinds["BaseButton"] == "component" and kinds["Index"] == "page"
+    assert "local" not in kinds and "ignored" not in kinds  # function locals and node_modules
+    assert [s["name"] for s in index.find_symbol("load*", exported_only=True)["symbols"]] == ["loadScores"]
+
+
+def test_references_skip_comments_and_strings(tmp_path):
+    _, index = _project(tmp_path)
+
+    refs = index.find_references("formatScore")["references"]
+    places = [(r["path"], r["line"], r["kind"]) for r in refs]
+    assert places == [
+        ("apps/game/pages/index.vue", 3, "template"),
+        ("apps/game/pages/index.vue", 7, "import"),
+        ("apps/game/pages/index.vue", 9, "code"),
+        ("packages/shared/src/utils.ts", 10, "code"),
+        ("packages/shared/src/utils.ts", 12, "export"),
+    ]
+    buttons = index.find_references("BaseButton")["references"]
+    assert [(r["line"], r["kind"]) for r in buttons] == [(2, "template"), (3, "template")]
+    assert index.find_references("ALPHABET", path="packages/shared/src/utils.ts")["total"] == 2
+    assert index.find_references("value", kinds="member")["total"] == 2
+
+
+def test_prefixes_match_literally(tmp_path):
+    root, _ = _project(tmp_path)
+    (root / "packages/shared/src/load_data.ts").write_text("export const load_data = 1\nexport const loadXdata = 2\n")
+    (root / "packages/shared/src/LoadAll.ts").write_text("export const LoadAll = 3\n")
+    (root / "packages/game_100%/app.ts").parent.mkdir()
+    (root / "packages/game_100%/app.ts").write_text("import { formatScore } from '@riddle-rush/shared'\n")
+    (root / "packages/gameX100X/app.ts").parent.mkdir()
+    (root / "packages/gameX100X/app.ts").write_text("import { formatScore } from '@riddle-rush/shared'\n")
+    index = SymbolIndex(root, root / "index.sqlite")
+
+    assert [s["name"] for s in index.find_symbol("load_*")["symbols"]] == ["load_data"]
+    assert sorted(s["name"] for s in index.find_symbol("load*")["symbols"]) == ["loadScores", "loadXdata", "load_data"]
+    assert [s["name"] for s in index.find_symbol("Load*")["symbols"]] == ["LoadAll"]
+    refs = index.find_references("formatScore", path="packages/game_100%/")["references"]
+    assert [r["path"] for r in refs] == ["packages/game_100%/app.ts"]
+    assert index.find_references("formatScore", path="PACKAGES/")["total"] == 0
+
+
+def test_prefix_lookups_use_the_indexes(tmp_path):
+    _, index = _project(tmp_path)
+    index.find_symbol("load*")
+
+    lookups = [("symbols", "name", "symbols_name"), ("files", "path", "sqlite_autoindex_files_1")]
+    for table, column, index_name in lookups:
+        where, params = _starts_with(column, "load")
+        plan = index._connect().execute(f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE {where}", params).fetchall()
+        assert f"USING INDEX {index_name} ({column}>? AND {column}<?)" in " ".join(row[-1] for row in plan)
+    assert [s["name"] for s in index.find_symbol("loadScore\U0010ffff*")["symbols"]] == []
+
+
+def test_list_exports_follows_reexports(tmp_path):
+    _, index = _project(tmp_path)
+
+    exports = index.list_exports("@riddle-rush/shared")["modules"]["packages/shared/src/index.ts"]
+    names = {(e["name"], e["kind"], e.get("from")) for e in exports}
+    assert ("formatScore", "function", "packages/shared/src/utils.ts") in names
+    assert ("format", "function", "packages/shared/src/utils.ts") in names
+    assert ("Score", "interface", "packages/shared/src/utils.ts") in names
+    assert ("ALPHABET", "reexport", "packages/shared/src/constants.ts") in names
+    assert list(index.list_exports("apps/game")["modules"]) == [
+        "apps/game/components/Base/Button.vue",
+        "apps/game/pages/index.vue",
+    ]
+    assert "error" in index.list_exports("@riddle-rush/unknown")
+
+
+def test_incremental_refresh_and_watch_updates(tmp_path):
+    root, index = _project(tmp_path)
+    assert index.refresh(force=True)["added"] == 5
+
+    utils = root / "packages/shared/src/utils.ts"
+    utils.write_text(UTILS_TS.replace("loadScores", "fetchScores"), encoding="utf-8")
+    constants = root / "packages/shared/src/constants.ts"
+    os.utime(constants, ns=(0, constants.stat().st_mtime_ns + 10**9))  # touched, same content
+    (root / "apps/game/pages/index.vue").unlink()
+
+    result = index.refresh(force=True)
+    assert (result["updated"], result["touched"], result["removed"], result["unchanged"]) == (1, 1, 1, 2)
+    assert index.find_symbol("loadScores")["total"] == 0 and index.find_symbol("fetchScores")["total"] == 1
+    assert index.find_references("BaseButton")["total"] == 0
+
+    (root / "apps/game/pages/index.vue").write_text(PAGE_VUE, encoding="utf-8")
+    assert index.update(["apps/game/pages/index.vue", str(root / "README.md")]) == {"added": 1}
+    assert index.find_references("BaseButton")["total"] == 2
+
+    reopened = SymbolIndex(root, root / "index.sqlite")
+    assert reopened.refresh(force=True)["unchanged"] == 5
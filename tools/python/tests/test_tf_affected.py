@@ -0,0 +1,138 @@
+"""Tests for affected-module Terraform planning."""
+
+import json
+import os
+import subprocess
+import time
+
+import pytest
+
+from tf_affected import affected_scope, decide_refresh, parse_blocks, terraform_plan_args
+from tfstate_index import StateIndex
+
+MAIN_TF = """\
+terraform {
+  required_version = ">= 1.5.0"
+}
+
+locals {
+  # "}" in comments and strings must not end the block
+  bucket = "site-${lookup({ a = "}" }, "a", "x")}"
+  origin = module.s3_website.bucket_regional_domain_name
+}
+
+module "s3_website" {
+  source      = "../../modules/s3-website"
+  bucket_name = local.bucket
+}
+
+module "cloudfront" {
+  source = "../../modules/cloudfront"
+  origin = local.origin
+}
+
+resource "aws_route53_record" "a" {
+  name    = "example.org"
+  alias   = module.cloudfront.domain_name
+  records = [<<-EOT
+    {not a block}
+  EOT
+  ]
+}
+"""
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    env = tmp_path / "infrastructure" / "environments" / "development"
+    env.mkdir(parents=True)
+    (env / "main.tf").write_text(MAIN_TF)
+    (env / "variables.tf").write_text('variable "region" {\n  default = "eu-central-1"\n}\n')
+    for name in ("s3-website", "cloudfront"):
+        module = tmp_path / "infrastructure" / "modules" / name
+        module.mkdir(parents=True)
+        (module / "main.tf").write_text('resource "null_resource" "this" {}\n')
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return tmp_path
+
+
+def test_parse_blocks_ignores_braces_in_strings_comments_and_heredocs():
+    blocks = parse_blocks(MAIN_TF)
+    assert [(b.kind, b.labels, b.start, b.end) for b in blocks] == [
+        ("terraform", [], 1, 3),
+        ("locals", [], 5, 9),
+        ("module", ["s3_website"], 11, 14),
+        ("module", ["cloudfront"], 16, 19),
+        ("resource", ["aws_route53_record", "a"], 21, 28),
+    ]
+
+
+def test_module_change_targets_instances_and_dependents(repo):
+    (repo / "infrastructure" / "modules" / "s3-website" / "main.tf").write_text('resource "null_resource" "b" {}\n')
+
+    scope = affected_scope(repo, "development")
+
+    # cloudfront reads s3_website through local.origin, the record reads cloudfront
+    assert scope.mode == "targeted"
+    assert scope.targets == ["aws_route53_record.a", "module.cloudfront", "module.s3_website"]
+    assert scope.changed_files == ["infrastructure/modules/s3-website/main.tf"]
+
+
+def test_root_changes_map_to_blocks_or_force_full_plan(repo):
+    main_tf = repo / "infrastructure" / "environments" / "development" / "main.tf"
+    main_tf.write_text(MAIN_TF.replace('name    = "example.org"', 'name    = "www.example.org"'))
+    assert affected_scope(repo, "development").targets == ["aws_route53_record.a"]
+
+    # Deleting a block targets it through the old side of the diff
+    main_tf.write_text(MAIN_TF.split('resource "aws_route53_record"')[0])
+    assert affected_scope(repo, "development").targets == ["aws_route53_record.a"]
+
+    main_tf.write_text(MAIN_TF.replace(">= 1.5.0", ">= 1.6.0"))
+    scope = affected_scope(repo, "development")
+    assert scope.mode == "full"
+    assert scope.reasons == ["infrastructure/environments/development/main.tf: terraform block changed"]
+    assert terraform_plan_args(decide_refresh(scope, repo)) == []
+
+
+def test_unrelated_changes_plan_nothing(repo):
+    (repo / "infrastructure" / "modules" / "unused").mkdir()
+    (repo / "infrastructure" / "modules" / "unused" / "main.tf").write_text("")
+    assert affected_scope(repo, "development").mode == "none"
+
+
+def test_refresh_is_skipped_only_when_safe(repo):
+    (repo / "infrastructure" / "modules" / "cloudfront" / "main.tf").write_text('resource "null_resource" "b" {}\n')
+    state = repo / "infrastructure" / "environments" / "development" / "terraform.tfstate"
+
+    # No local state: remote backend, always refresh
+    scope = decide_refresh(affected_scope(repo, "development"), repo)
+    assert scope.refresh is True
+    assert terraform_plan_args(scope) == ["-target=aws_route53_record.a", "-target=module.cloudfront"]
+
+    resources = [
+        {
+            "module": "module.cloudfront",
+            "mode": "managed",
+            "type": "null_resource",
+            "name": "this",
+            "instances": [{"attributes": {"id": "1"}}],
+        }
+    ]
+    state.write_text(json.dumps({"version": 4, "serial": 1, "lineage": "l", "resources": resources}))
+    assert decide_refresh(affected_scope(repo, "development"), repo).refresh is False
+
+    old = time.time() - 7200
+    os.utime(state, (old, old))
+    assert decide_refresh(affected_scope(repo, "development"), repo, StateIndex(repo)).refresh is True
+
+    state.write_text(json.dumps({"version": 4, "serial": 2, "lineage": "l", "resources": []}))
+    os.utime(state, (old, old))
+    scope = decide_refresh(affected_scope(repo, "development"), repo, StateIndex(repo))
+    assert scope.refresh is False
+    assert terraform_plan_args(scope)[-1] == "-refresh=false"
@@ -0,0 +1,117 @@
+"""Tests for the Terraform state index."""
+
+import json
+
+import pytest
+
+import tfstate_index
+from tfstate_index import StateIndex, discover_states, read_header
+
+
+def _state(serial, resources):
+    return {
+        "version": 4,
+        "terraform_version": "1.14.3",
+        "serial": serial,
+        "lineage": "3f6c2a1e-0000-4000-8000-000000000000",
+        "outputs": {},
+        "resources": resources,
+    }
+
+
+BUCKET = {
+    "module": "module.website",
+    "mode": "managed",
+    "type": "aws_s3_bucket",
+    "name": "site",
+    "provider": 'provider["registry.terraform.io/hashicorp/aws"]',
+    "instances": [
+        {"index_key": "assets", "attributes": {"id": "riddle-rush-assets", "bucket": "riddle-rush-assets"}},
+        {"index_key": "pwa", "attributes": {"id": "riddle-rush-pwa", "bucket": "riddle-rush-pwa"}},
+    ],
+}
+DISTRIBUTION = {
+    "module": "module.cdn",
+    "mode": "managed",
+    "type": "aws_cloudfront_distribution",
+    "name": "this",
+    "instances": [{"attributes": {"id": "E2ABCDEF123456", "domain_name": "d111.cloudfront.net", "tags": {}}}],
+}
+IDENTITY = {
+    "mode": "data",
+    "type": "aws_caller_identity",
+    "name": "current",
+    "instances": [{"attributes": {"id": "123456789012", "arn": ""}}],
+}
+
+
+def _write(root, serial, resources):
+    path = root / "infrastructure" / "environments" / "development" / "terraform.tfstate"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(_state(serial, resources), indent=2))
+    return path
+
+
+@pytest.fixture(params=["json", "ijson"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(tfstate_index, "ijson", None)
+    else:
+        monkeypatch.setattr(tfstate_index, "ijson", pytest.importorskip("ijson"))
+    return request.param
+
+
+def test_index_by_address_type_module_and_attributes(tmp_path, backend):
+    _write(tmp_path, 3, [BUCKET, DISTRIBUTION, IDENTITY])
+    index = StateIndex(tmp_path)
+
+    by_id = index.find_resource(query="E2ABCDEF123456")["matches"]
+    assert [m["address"] for m in by_id] == ["module.cdn.aws_cloudfront_distribution.this"]
+    assert by_id[0]["attributes"] == {"id": "E2ABCDEF123456", "domain_name": "d111.cloudfront.net"}
+    assert by_id[0]["state"] == "infrastructure/environments/development/terraform.tfstate"
+
+    buckets = index.find_resource(type="aws_s3_bucket")["matches"]
+    assert [m["address"] for m in buckets] == [
+        'module.website.aws_s3_bucket.site["assets"]',
+        'module.website.aws_s3_bucket.site["pwa"]',
+    ]
+    assert index.find_resource(query="riddle-rush-pwa", module="module.website")["total"] == 1
+    assert [m["address"] for m in index.find_resource(module="root")["matches"]] == [
+        "data.aws_caller_identity.current"
+    ]
+    assert index.find_resource(address="module.cdn.aws_cloudfront_distribution.this")["total"] == 1
+    assert index.find_resource(type="aws_s3_bucket", state="environments/production")["total"] == 0
+
+
+def test_reindexes_only_when_serial_changes(tmp_path):
+    path = _write(tmp_path, 1, [BUCKET])
+    index = StateIndex(tmp_path)
+
+    assert index.refresh()["reindexed"] == ["infrastructure/environments/development/terraform.tfstate"]
+    assert index.refresh()["reindexed"] == []
+
+    # Rewritten with the same serial (e.g. reformatted): header read, no re-index
+    path.write_text(json.dumps(_state(1, [BUCKET])))
+    assert index.refresh()["reindexed"] == []
+
+    _write(tmp_path, 2, [BUCKET, DISTRIBUTION])
+    assert len(index.refresh()["reindexed"]) == 1
+    assert index.find_resource(type="aws_cloudfront_distribution")["total"] == 1
+    assert index.reindexed == 2
+
+    path.unlink()
+    assert index.refresh()["states"] == 0
+
+
+def test_discovery_skips_backend_caches(tmp_path):
+    _write(tmp_path, 1, [])
+    (tmp_path / "terraform.tfstate").write_text(json.dumps(_state(1, [])))
+    cached = tmp_path / "infrastructure" / "environments" / "development" / ".terraform" / "terraform.tfstate"
+    cached.parent.mkdir()
+    cached.write_text(json.dumps({"version": 3, "serial": 1, "lineage": "x", "backend": {}}))
+
+    assert [p.relative_to(tmp_path).as_posix() for p in discover_states(tmp_path)] == [
+        "infrastructure/environments/development/terraform.tfstate",
+        "terraform.tfstate",
+    ]
+    assert read_header(tmp_path / "terraform.tfstate")["serial"] == 1
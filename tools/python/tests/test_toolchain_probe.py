@@ -0,0 +1,63 @@
+"""Tests for the cached toolchain probe."""
+
+import json
+import os
+import platform
+import sys
+
+from toolchain_probe import pinned_versions, probe_toolchain
+
+
+def _repo(tmp_path):
+    (tmp_path / ".trunk").mkdir()
+    (tmp_path / ".trunk" / "trunk.yaml").write_text("version: 0.1\ncli:\n  version: 1.25.0\nplugins: {}\n")
+    (tmp_path / "package.json").write_text(json.dumps({"packageManager": "pnpm@10.28.1"}))
+    (tmp_path / ".python-version").write_text("3.14\n")
+    (tmp_path / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\n")
+    return tmp_path
+
+
+def test_pinned_versions_and_trunk_location(tmp_path):
+    root = _repo(tmp_path)
+    machine = "arm64" if platform.machine().lower() in ("arm64", "aarch64") else platform.machine().lower()
+    trunk = root / ".trunk-cache" / "cli" / f"1.25.0-{sys.platform}-{machine}" / "trunk"
+    trunk.parent.mkdir(parents=True)
+    trunk.write_text("#!/bin/sh\n")
+    trunk.chmod(0o755)
+
+    result = probe_toolchain(root, cache_path=tmp_path / "probe.json")
+
+    assert pinned_versions(root) == {"pnpm": "10.28.1", "python": "3.14", "trunk": "1.25.0"}
+    assert result["trunk"] == {"available": True, "path": str(trunk), "version": "1.25.0"}
+
+
+def test_result_is_reused_until_fingerprint_changes(tmp_path, monkeypatch):
+    root = _repo(tmp_path)
+    cache = tmp_path / "probe.json"
+
+    first = probe_toolchain(root, cache_path=cache)
+    second = probe_toolchain(root, cache_path=cache)
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["binaries"] == first["binaries"]
+
+    (root / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\npackages: {}\n")
+    assert probe_toolchain(root, cache_path=cache)["cached"] is False
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ.get("PATH", "")]))
+    assert probe_toolchain(root, cache_path=cache)["cached"] is False
+    assert probe_toolchain(root, cache_path=cache, force=True)["cached"] is False
+
+
+def test_binaries_are_found_on_path(tmp_path, monkeypatch):
+    root = _repo(tmp_path)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    terraform = bin_dir / "terraform"
+    terraform.write_text("#!/bin/sh\n")
+    terraform.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    result = probe_toolchain(root, cache_path=tmp_path / "probe.json")
+
+    assert result["binaries"]["terraform"] == {"available": True, "path": str(terraform)}
+    assert result["binaries"]["pnpm"]["available"] is False
@@ -0,0 +1,405 @@
+"""
+Terraform Affected - plan only the module instances a change touches
+
+``terraform plan`` of an environment refreshes and plans every resource, even
+when a change only touches one module. This reads the HCL of the environment
+root (infrastructure/environments/<env>/*.tf) and of the local modules it
+calls, builds the module instance graph, and maps the changed files from git
+onto it:
+
+- a file inside a module directory (infrastructure/modules/<name>/...)
+  targets every instance of that module (``module.cloudfront``);
+- changed lines of a root ``*.tf`` file target the ``module``, ``resource``
+  or ``data`` block they fall into. Both sides of the diff are used, so a
+  deleted block is targeted too;
+- changes to anything else in the root (terraform/provider/variable/locals/
+  output blocks, tfvars, the lock file, new or deleted files we cannot map)
+  need a full plan;
+- module calls and resources that reference a targeted module are added,
+  because ``-target`` pulls in a target's dependencies but not its dependents.
+
+A targeted plan skips the refresh (``-refresh=false``) only when that cannot
+hide drift from the plan. The environment must use local state, and either
+the state was written within REFRESH_MAX_AGE_S or the targets have no
+resources in it yet. Remote state and full plans are always refreshed.
+
+Usage:
+    scope = affected_scope(project_root, "development")
+    terraform_plan_args(scope)   # ["-target=module.cloudfront", "-refresh=false"]
+"""
+
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REFRESH_MAX_AGE_S = 3600
+TARGETABLE = ("module", "resource", "data")
+
+IDENT = re.compile(r"[A-Za-z_][\w-]*")
+LABEL = re.compile(r'"([^"]*)"|([A-Za-z_][\w-]*)')
+HEREDOC = re.compile(r"<<-?([A-Za-z_]\w*)[ \t]*\n")
+SOURCE = re.compile(r'^\s*source\s*=\s*"([^"]+)"', re.MULTILINE)
+MODULE_REF = re.compile(r"\bmodule\.([A-Za-z_][\w-]*)")
+LOCAL_REF = re.compile(r"\blocal\.([A-Za-z_][\w-]*)")
+LOCAL_NAME = re.compile(r"^\s*([A-Za-z_][\w-]*)\s*=", re.MULTILINE)
+HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+@dataclass
+class Block:
+    """A top-level HCL block with its 1-based, inclusive line range."""
+
+    kind: str
+    labels: list[str]
+    start: int
+    end: int
+    body: str
+
+    @property
+    def address(self) -> str | None:
+        """Address usable with -target, None for blocks that cannot be targeted."""
+        if self.kind == "module" and len(self.labels) == 1:
+            return f"module.{self.labels[0]}"
+        if self.kind == "resource" and len(self.labels) == 2:
+            return ".".join(self.labels)
+        if self.kind == "data" and len(self.labels) == 2:
+            return "data." + ".".join(self.labels)
+        return None
+
+
+@dataclass
+class ModuleInstance:
+    address: str
+    source: str
+    path: Path
+
+
+@dataclass
+class Scope:
+    """What a plan of one environment has to cover."""
+
+    environment: str
+    mode: str = "none"  # none | targeted | full
+    targets: list[str] = field(default_factory=list)
+    reasons: list[str] = field(default_factory=list)
+    changed_files: list[str] = field(default_factory=list)
+    refresh: bool = True
+    refresh_reason: str = ""
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def _mask(text: str) -> str:
+    """
+    Copy of ``text`` with comments, heredoc bodies and string contents blanked.
+
+    Quotes and newlines are kept, so offsets and line numbers match the
+    original and quoted labels can be read back from it. ``${...}`` templates
+    may contain nested strings and braces.
+    """
+    out = list(text)
+    stack: list[str] = []  # '"' for a string, "{" for a template (or a brace inside one)
+    i, n = 0, len(text)
+
+    def blank(start, end):
+        for k in range(start, min(end, n)):
+            if out[k] != "\n":
+                out[k] = " "
+
+    while i < n:
+        char = text[i]
+        if stack and stack[-1] == '"':
+            if char == "\\":
+                blank(i, i + 2)
+                i += 2
+                continue
+            if text.startswith(("${", "%{"), i):
+                stack.append("{")
+                blank(i, i + 2)
+                i += 2
+                continue
+            if char == '"':
+                stack.pop()
+                if stack:
+                    blank(i, i + 1)
+            else:
+                blank(i, i + 1)
+            i += 1
+            continue
+
+        if char == "#" or text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end == -1 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+        elif heredoc := HEREDOC.match(text, i):
+            close = re.compile(rf"^[ \t]*{heredoc.group(1)}[ \t]*$", re.MULTILINE).search(text, heredoc.end())
+            end = n if close is None else close.end()
+        else:
+            if stack:  # inside a template expression, which is part of the enclosing string
+                if char == '"':
+                    stack.append('"')
+                elif char == "{":
+                    stack.append("{")
+                elif char == "}":
+                    stack.pop()
+                blank(i, i + 1)
+            elif char == '"':
+                stack.append('"')
+            i += 1
+            continue
+        blank(i, end)
+        i = end
+    return "".join(out)
+
+
+def parse_blocks(text: str) -> list[Block]:
+    """Top-level blocks of an HCL file; braces in strings, heredocs and comments are ignored."""
+    masked = _mask(text)
+    blocks, depth, boundary, opened = [], 0, 0, 0
+    for i, char in enumerate(masked):
+        if char == "{":
+            if depth == 0:
+                opened = i
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth:
+                continue
+            header = masked[boundary:opened]
+            tokens = [
+                (text[boundary + m.start() + 1 : boundary + m.end() - 1] if m.group(1) is not None else m.group(2))
+                for m in LABEL.finditer(header)
+            ]
+            if tokens and IDENT.fullmatch(tokens[0]) and header.strip()[0] != '"':
+                start = boundary + len(header) - len(header.lstrip())
+                blocks.append(
+                    Block(
+                        kind=tokens[0],
+                        labels=tokens[1:],
+                        start=text.count("\n", 0, start) + 1,
+                        end=text.count("\n", 0, i) + 1,
+                        body=text[opened + 1 : i],
+                    )
+                )
+            boundary = i + 1
+    return blocks
+
+
+def read_blocks(directory: Path) -> dict[str, list[Block]]:
+    """Blocks of every *.tf file of one module directory, by file name."""
+    return {path.name: parse_blocks(path.read_text(encoding="utf-8")) for path in sorted(directory.glob("*.tf"))}
+
+
+def module_instances(root: Path, prefix: str = "", seen: frozenset = frozenset()) -> list[ModuleInstance]:
+    """All local module instances below a root module, nested ones included."""
+    instances = []
+    for blocks in read_blocks(root).values():
+        for block in blocks:
+            if block.kind != "module" or len(block.labels) != 1:
+                continue
+            match = SOURCE.search(block.body)
+            if not match or not match.group(1).startswith(("./", "../")):
+                continue  # registry/git modules do not live in this repo
+            path = (root / match.group(1)).resolve()
+            address = f"{prefix}module.{block.labels[0]}"
+            instances.append(ModuleInstance(address, match.group(1), path))
+            if path.is_dir() and path not in seen:
+                instances.extend(module_instances(path, f"{address}.", seen | {path}))
+    return instances
+
+
+def changed_lines(project_root: Path, base_ref: str = "", paths: tuple[str, ...] = ("infrastructure",)) -> dict:
+    """
+    Files changed against ``base_ref`` (default: HEAD, i.e. uncommitted changes), untracked files included.
+
+    Returns:
+        {path: {"old": old line numbers, "new": new line numbers}}; both are None
+        for added, deleted and untracked files (the whole file changed)
+    """
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=project_root, capture_output=True, text=True, check=True).stdout
+
+    changes: dict[str, dict] = {}
+    old_path = current = None
+    diff = git("diff", "-U0", "--no-color", "--no-renames", base_ref or "HEAD", "--", *paths)
+    for row in diff.splitlines():
+        if row.startswith("--- "):
+            old_path = None if row == "--- /dev/null" else row[6:]
+        elif row.startswith("+++ "):
+            new_path = None if row == "+++ /dev/null" else row[6:]
+            whole = old_path is None or new_path is None
+            current = changes[new_path or old_path] = {"old": None if whole else set(), "new": None if whole else set()}
+        elif row.startswith("@@") and current and current["new"] is not None:
+            old_start, old_count, new_start, new_count = HUNK.match(row).groups()
+            for side, start, count in (("old", old_start, old_count), ("new", new_start, new_count)):
+                start, count = int(start), 1 if count is None else int(count)
+                # count 0: lines were only added (old side) or only removed (new side) after ``start``
+                current[side].update(range(start, start + count) if count else [start])
+    for path in git("ls-files", "--others", "--exclude-standard", "--", *paths).splitlines():
+        changes[path] = {"old": None, "new": None}
+    return changes
+
+
+def _old_text(project_root: Path, base_ref: str, path: str) -> str:
+    result = subprocess.run(
+        ["git", "show", f"{base_ref or 'HEAD'}:{path}"], cwd=project_root, capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else ""
+
+
+def _touched(blocks: list[Block], lines: set[int] | None) -> list[Block]:
+    if lines is None:
+        return blocks
+    return [b for b in blocks if any(b.start <= number <= b.end for number in lines)]
+
+
+def affected_scope(
+    project_root: Path,
+    environment: str,
+    changes: dict | None = None,
+    base_ref: str = "",
+) -> Scope:
+    """
+    Map changed files onto the module instances of an environment.
+
+    Args:
+        project_root: Repository root
+        environment: Folder under infrastructure/environments
+        changes: Output of changed_lines (read from git when omitted)
+        base_ref: Git ref to compare with (default: HEAD)
+
+    Returns:
+        Scope with mode "none", "targeted" (targets set) or "full" (reasons set)
+    """
+    project_root = Path(project_root).resolve()
+    env_dir = project_root / "infrastructure" / "environments" / environment
+    if not env_dir.is_dir():
+        raise FileNotFoundError(f"Environment not found: {env_dir}")
+    if changes is None:
+        changes = changed_lines(project_root, base_ref)
+
+    scope = Scope(environment)
+    instances = module_instances(env_dir)
+    # Deepest directory first, so a file of a nested module maps to that module
+    module_dirs = sorted({i.path for i in instances}, key=lambda p: len(p.parts), reverse=True)
+    targets: set[str] = set()
+
+    for rel, lines in sorted(changes.items()):
+        path = project_root / rel
+        if ".terraform" in path.parts:
+            continue
+        if path.parent == env_dir:
+            if path.suffix != ".tf":
+                if path.name.endswith((".tfvars", ".tfvars.json")) or path.name == ".terraform.lock.hcl":
+                    scope.changed_files.append(rel)
+                    scope.reasons.append(f"{rel}: variables or provider versions changed")
+                continue  # state, plan files and docs do not change the configuration
+            scope.changed_files.append(rel)
+            new = parse_blocks(path.read_text(encoding="utf-8")) if path.is_file() else []
+            old = parse_blocks(_old_text(project_root, base_ref, rel)) if lines["old"] or not new else []
+            for block in _touched(new, lines["new"]) + _touched(old, lines["old"]):
+                if block.kind in TARGETABLE and block.address:
+                    targets.add(block.address)
+                else:
+                    scope.reasons.append(f"{rel}: {' '.join([block.kind, *block.labels])} block changed")
+            continue
+        module_dir = next((d for d in module_dirs if d in path.resolve().parents), None)
+        if module_dir is not None:
+            scope.changed_files.append(rel)
+            targets.update(i.address for i in instances if i.path == module_dir)
+
+    if scope.reasons:
+        scope.mode = "full"
+        scope.reasons = list(dict.fromkeys(scope.reasons))
+        return scope
+    if not targets:
+        return scope
+
+    scope.mode = "targeted"
+    scope.targets = sorted(targets | _dependents(env_dir, targets))
+    return scope
+
+
+def _dependents(env_dir: Path, targets: set[str]) -> set[str]:
+    """
+    Root blocks that read outputs of a targeted module, directly or through local values.
+
+    ``-target`` includes a target's dependencies but not its dependents.
+    """
+    blocks = [b for file_blocks in read_blocks(env_dir).values() for b in file_blocks]
+
+    # Module references per local value (coarse: every value of a locals block shares the block's references)
+    local_refs: dict[str, set[str]] = {}
+    for block in (b for b in blocks if b.kind == "locals"):
+        for name in LOCAL_NAME.findall(block.body):
+            local_refs.setdefault(name, set()).update(MODULE_REF.findall(block.body))
+    for block in (b for b in blocks if b.kind == "locals"):
+        for name in LOCAL_NAME.findall(block.body):
+            for used in LOCAL_REF.findall(block.body):
+                local_refs[name] |= local_refs.get(used, set())
+
+    def references(block: Block) -> set[str]:
+        modules = set(MODULE_REF.findall(block.body))
+        for used in LOCAL_REF.findall(block.body):
+            modules |= local_refs.get(used, set())
+        return {f"module.{m}" for m in modules}
+
+    found: set[str] = set()
+    changed = {".".join(t.split(".")[:2]) for t in targets if t.startswith("module.")}
+    while changed:
+        added = {
+            b.address
+            for b in blocks
+            if b.kind in TARGETABLE and b.address and b.address not in targets | found and references(b) & changed
+        }
+        found |= added
+        changed = {a for a in added if a.startswith("module.")}
+    return found
+
+
+def decide_refresh(scope: Scope, project_root: Path, state_index=None, max_age_s: float = REFRESH_MAX_AGE_S) -> Scope:
+    """
+    Set scope.refresh: False only for targeted plans on fresh local state or on targets not in state yet.
+
+    Args:
+        scope: Result of affected_scope
+        project_root: Repository root
+        state_index: tfstate_index.StateIndex used to look the targets up (optional)
+        max_age_s: How old the local state may be for its last refresh to count
+    """
+    if scope.mode != "targeted":
+        scope.refresh, scope.refresh_reason = True, "full plans always refresh" if scope.mode == "full" else ""
+        return scope
+    state = Path(project_root) / "infrastructure" / "environments" / scope.environment / "terraform.tfstate"
+    if not state.is_file():
+        scope.refresh, scope.refresh_reason = True, "no local state (remote backend): refresh to catch drift"
+        return scope
+    age = time.time() - state.stat().st_mtime
+    if age <= max_age_s:
+        scope.refresh = False
+        scope.refresh_reason = f"local state written by an apply or refresh {age / 60:.0f} min ago"
+        return scope
+    if state_index is not None:
+        rel = state.relative_to(Path(project_root)).as_posix()
+        # Address substring match: covers count/for_each instances and resources of nested modules
+        if not any(state_index.find_resource(query=target, state=rel)["total"] for target in scope.targets):
+            scope.refresh, scope.refresh_reason = False, "targets have no resources in state yet"
+            return scope
+    scope.refresh, scope.refresh_reason = True, f"local state is {age / 3600:.1f} h old"
+    return scope
+
+
+def terraform_plan_args(scope: Scope) -> list[str]:
+    """Extra ``terraform plan`` arguments for a scope."""
+    if scope.mode != "targeted":
+        return []
+    args = [f"-target={target}" for target in scope.targets]
+    if not scope.refresh:
+        args.append("-refresh=false")
+    return args
@@ -0,0 +1,221 @@
+"""
+Terraform State Index - resource lookups straight from local state files
+
+``terraform state list`` starts Terraform (and its providers) per environment
+and only returns addresses. The repo's local states (``terraform.tfstate`` at
+the root, in infrastructure/state-bucket, infrastructure/outputs-bucket and
+infrastructure/environments/<env>) are plain JSON (format version 4), so this
+reads them directly and indexes every resource instance by:
+
+    address   module.cdn.aws_cloudfront_distribution.this, aws_s3_bucket.site["assets"]
+    type      aws_s3_bucket
+    module    module.cdn ("" for the root module)
+    key attributes: id, arn, bucket, name, domain_name, ... -> address
+
+Large states are streamed resource by resource with ijson when it is
+installed (``uv sync --extra terraform``), otherwise loaded with json. A
+state is re-indexed only when its serial or lineage changes; an unchanged
+file (same mtime and size) is not even opened.
+
+Usage:
+    index = StateIndex(project_root)
+    index.find_resource(type="aws_s3_bucket")
+    index.find_resource(query="riddle-rush-pwa")
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:  # optional dependency
+    ijson = None
+
+STATE_VERSION = 4
+KEY_ATTRIBUTES = (
+    "id",
+    "arn",
+    "bucket",
+    "name",
+    "domain_name",
+    "hosted_zone_id",
+    "zone_id",
+    "function_name",
+    "table_name",
+    "fqdn",
+)
+HEADER_BYTES = 4096
+HEADER_PATTERNS = {
+    "version": re.compile(r'"version":\s*(\d+)'),
+    "serial": re.compile(r'"serial":\s*(\d+)'),
+    "lineage": re.compile(r'"lineage":\s*"([^"]*)"'),
+}
+STATE_GLOBS = ("terraform.tfstate", "infrastructure/**/terraform.tfstate")
+
+
+def discover_states(project_root: Path) -> list[Path]:
+    """Local state files of the repo (backend caches under .terraform/ excluded)."""
+    paths = {p for pattern in STATE_GLOBS for p in Path(project_root).glob(pattern)}
+    return sorted(p for p in paths if ".terraform" not in p.parts and "node_modules" not in p.parts)
+
+
+def read_header(path: Path) -> dict:
+    """version, serial and lineage without parsing the whole state (Terraform writes them first)."""
+    with path.open("rb") as handle:
+        head = handle.read(HEADER_BYTES).decode("utf-8", errors="replace")
+    header = {}
+    for key, pattern in HEADER_PATTERNS.items():
+        match = pattern.search(head)
+        if match:
+            header[key] = int(match.group(1)) if key != "lineage" else match.group(1)
+    if HEADER_PATTERNS.keys() - header.keys():
+        state = json.loads(path.read_text(encoding="utf-8"))
+        header = {key: state.get(key) for key in HEADER_PATTERNS}
+    return header
+
+
+def iter_resources(path: Path):
+    """Resources of a state file, streamed when ijson is available."""
+    if ijson is not None:
+        with path.open("rb") as handle:
+            yield from ijson.items(handle, "resources.item", use_float=True)
+        return
+    yield from json.loads(path.read_text(encoding="utf-8")).get("resources", [])
+
+
+def _index_key(key) -> str:
+    if key is None:
+        return ""
+    return f"[{key}]" if isinstance(key, int) else f'["{key}"]'
+
+
+def resource_address(resource: dict, instance: dict) -> str:
+    """Full instance address as Terraform prints it."""
+    module = resource.get("module", "")
+    local = ("data." if resource.get("mode") == "data" else "") + f"{resource['type']}.{resource['name']}"
+    return (f"{module}." if module else "") + local + _index_key(instance.get("index_key"))
+
+
+def index_state(path: Path, header: dict) -> dict:
+    """Index one state file: per-instance records plus lookup tables."""
+    records = {}
+    by_type: dict[str, list[str]] = {}
+    by_module: dict[str, list[str]] = {}
+    by_value: dict[str, list[str]] = {}
+    for resource in iter_resources(path):
+        for instance in resource.get("instances", []):
+            address = resource_address(resource, instance)
+            attributes = instance.get("attributes") or {}
+            keys = {
+                k: attributes[k]
+                for k in KEY_ATTRIBUTES
+                if isinstance(attributes.get(k), (str, int)) and attributes[k] != ""
+            }
+            records[address] = {
+                "address": address,
+                "mode": resource.get("mode", "managed"),
+                "type": resource["type"],
+                "name": resource["name"],
+                "module": resource.get("module", ""),
+                "provider": resource.get("provider", ""),
+                "attributes": keys,
+            }
+            by_type.setdefault(resource["type"], []).append(address)
+            by_module.setdefault(resource.get("module", ""), []).append(address)
+            for value in keys.values():
+                by_value.setdefault(str(value), []).append(address)
+    return {"header": header, "records": records, "by_type": by_type, "by_module": by_module, "by_value": by_value}
+
+
+class StateIndex:
+    """Index over all local state files of a checkout, refreshed by serial."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self._states: dict[Path, dict] = {}
+        self._stat: dict[Path, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.reindexed = 0
+
+    def refresh(self) -> dict:
+        """Re-index states whose serial/lineage changed; drop states that disappeared."""
+        with self._lock:
+            paths = discover_states(self.project_root)
+            for gone in set(self._states) - set(paths):
+                self._states.pop(gone)
+                self._stat.pop(gone, None)
+            reindexed = []
+            for path in paths:
+                stat = path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._stat.get(path) == signature:
+                    continue
+                header = read_header(path)
+                if header.get("version") != STATE_VERSION:
+                    self._states.pop(path, None)
+                    continue
+                current = self._states.get(path)
+                if current is None or current["header"] != header:
+                    self._states[path] = index_state(path, header)
+                    reindexed.append(self._name(path))
+                    self.reindexed += 1
+                self._stat[path] = signature
+            return {"states": len(self._states), "reindexed": reindexed}
+
+    def _name(self, path: Path) -> str:
+        return path.relative_to(self.project_root).as_posix()
+
+    def _snapshot(self) -> list[tuple[Path, dict]]:
+        """Indexed states, sorted; taken under the lock since refresh() may run in another thread."""
+        with self._lock:
+            return sorted(self._states.items())
+
+    def summary(self) -> dict:
+        """Per state: serial, lineage and resource count."""
+        return {
+            self._name(path): {**state["header"], "resources": len(state["records"])}
+            for path, state in self._snapshot()
+        }
+
+    def find_resource(
+        self,
+        query: str = "",
+        type: str = "",
+        module: str = "",
+        address: str = "",
+        state: str = "",
+        limit: int = 100,
+    ) -> dict:
+        """
+        Find resource instances across all indexed states.
+
+        Args:
+            query: Exact key attribute value (bucket name, distribution id, ARN, ...) or address substring
+            type: Resource type, e.g. aws_cloudfront_distribution
+            module: Module path, e.g. module.cdn ("root" for the root module)
+            address: Exact resource address
+            state: Only search states whose path contains this
+            limit: Maximum number of matches returned
+
+        Returns:
+            Dictionary with matches (state, address, type, module, key attributes) and the refresh result
+        """
+        refreshed = self.refresh()
+        matches = []
+        for path, index in self._snapshot():
+            name = self._name(path)
+            if state and state not in name:
+                continue
+            candidates = set(index["records"])
+            if address:
+                candidates &= {address}
+            if type:
+                candidates &= set(index["by_type"].get(type, []))
+            if module:
+                candidates &= set(index["by_module"].get("" if module == "root" else module, []))
+            if query:
+                candidates &= set(index["by_value"].get(query, [])) | {a for a in candidates if query in a}
+            matches.extend({"state": name, **index["records"][a]} for a in sorted(candidates))
+        return {"matches": matches[:limit], "total": len(matches), "index": refreshed}
@@ -0,0 +1,223 @@
+"""
+Toolchain Probe - cached detection of the Python packages and CLIs the agents use
+
+Status tools used to start a fresh interpreter per check (``python -c "import
+fastmcp"``) and assume pnpm, terraform and the trunk CLI at a fixed path. This
+detects all of them in parallel without running any of them:
+
+- Python packages with ``importlib.util.find_spec`` and their installed
+  version from the distribution metadata;
+- binaries with PATH lookups (``shutil.which``);
+- pinned versions from version files (``packageManager`` in package.json,
+  .python-version, .nvmrc, .terraform-version, .trunk/trunk.yaml), which also
+  locate the trunk CLI under .trunk-cache/cli/<version>-<platform>/trunk.
+
+The result is stored with a fingerprint of PATH, the interpreter/venv (and its
+site-packages mtime) and the lockfiles/version files. Later calls return the
+stored result until the fingerprint changes.
+
+Usage:
+    python toolchain_probe.py            # cached
+    python toolchain_probe.py --force    # probe again
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PYTHON_MODULES = {
+    "fastmcp": "fastmcp",
+    "langchain": "langchain",
+    "langchain_google_genai": "langchain-google-genai",
+    "boto3": "boto3",
+    "moto": "moto",
+    "PIL": "Pillow",
+    "brotli": "Brotli",
+}
+BINARIES = ("pnpm", "node", "terraform", "git", "uv", "aws", "docker")
+FINGERPRINT_FILES = (
+    "package.json",
+    "pnpm-lock.yaml",
+    ".python-version",
+    ".nvmrc",
+    ".node-version",
+    ".terraform-version",
+    ".trunk/trunk.yaml",
+    "tools/python/pyproject.toml",
+    "tools/python/uv.lock",
+)
+VERSION_FILES = (
+    ("python", ".python-version"),
+    ("node", ".nvmrc"),
+    ("node", ".node-version"),
+    ("terraform", ".terraform-version"),
+)
+CACHE_FILE = ".toolchain-probe.json"
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def fingerprint(project_root: Path) -> str:
+    """Hash of everything that can change the probe result."""
+    site_packages = Path(sysconfig.get_paths()["purelib"])
+    parts = [
+        os.environ.get("PATH", ""),
+        os.environ.get("VIRTUAL_ENV", ""),
+        sys.executable,
+        sys.prefix,
+        str(site_packages.stat().st_mtime_ns) if site_packages.exists() else "",
+    ]
+    for name in FINGERPRINT_FILES:
+        path = project_root / name
+        try:
+            stat = path.stat()
+            parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{name}:-")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def probe_module(module: str, distribution: str) -> dict:
+    """Whether a module is importable by this interpreter, without importing it."""
+    try:
+        available = importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        available = False
+    version = None
+    if available:
+        with contextlib.suppress(importlib.metadata.PackageNotFoundError):
+            version = importlib.metadata.version(distribution)
+    return {"available": available, "version": version}
+
+
+def probe_binary(name: str) -> dict:
+    path = shutil.which(name)
+    return {"available": path is not None, "path": path}
+
+
+def pinned_versions(project_root: Path) -> dict:
+    """Tool versions the repo pins in its version files."""
+    pins = {}
+    package_json = _read(project_root / "package.json")
+    if package_json:
+        try:
+            manager = json.loads(package_json).get("packageManager", "")
+        except ValueError:
+            manager = ""
+        if manager.startswith("pnpm@"):
+            pins["pnpm"] = manager.split("@", 1)[1].split("+", 1)[0]
+    for name, file in VERSION_FILES:
+        value = _read(project_root / file)
+        if value:
+            pins.setdefault(name, value.splitlines()[0].lstrip("v"))
+    trunk_yaml = _read(project_root / ".trunk" / "trunk.yaml")
+    if trunk_yaml:
+        match = re.search(r"^cli:\s*\n\s+version:\s*([\w.\-]+)", trunk_yaml, re.MULTILINE)
+        if match:
+            pins["trunk"] = match.group(1)
+    return pins
+
+
+def probe_trunk(project_root: Path, version: str | None) -> dict:
+    """The trunk CLI: the pinned version in .trunk-cache, else the ./trunk launcher or PATH."""
+    machine = {"x86_64": "x86_64", "amd64": "x86_64", "arm64": "arm64", "aarch64": "arm64"}.get(
+        platform.machine().lower(), platform.machine().lower()
+    )
+    candidates = []
+    if version:
+        candidates.append(project_root / ".trunk-cache" / "cli" / f"{version}-{sys.platform}-{machine}" / "trunk")
+    candidates.append(project_root / "trunk")
+    for path in candidates:
+        if path.is_file() and os.access(path, os.X_OK):
+            return {"available": True, "path": str(path), "version": version}
+    path = shutil.which("trunk")
+    return {"available": path is not None, "path": path, "version": version}
+
+
+def run_probe(project_root: Path) -> dict:
+    """Probe everything in parallel (no caching)."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        modules = {m: pool.submit(probe_module, m, dist) for m, dist in PYTHON_MODULES.items()}
+        binaries = {b: pool.submit(probe_binary, b) for b in BINARIES}
+        pins = pool.submit(pinned_versions, project_root).result()
+        trunk = pool.submit(probe_trunk, project_root, pins.get("trunk"))
+        result = {
+            "python": {"executable": sys.executable, "version": platform.python_version()},
+            "python_modules": {m: f.result() for m, f in modules.items()},
+            "binaries": {b: f.result() for b, f in binaries.items()},
+            "pinned_versions": pins,
+            "trunk": trunk.result(),
+        }
+    result["probe_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def probe_toolchain(project_root: Path, cache_path: Path | None = None, force: bool = False) -> dict:
+    """
+    Toolchain capabilities, re-probed only when the fingerprint changed.
+
+    Args:
+        project_root: Repository root
+        cache_path: Where the result is persisted (default: TOOLCHAIN_PROBE_CACHE or <root>/.toolchain-probe.json)
+        force: Probe even if the stored result is still valid
+
+    Returns:
+        Probe result plus "fingerprint", "cached" and "elapsed_ms"
+    """
+    start = time.perf_counter()
+    project_root = Path(project_root)
+    cache_path = Path(cache_path or os.environ.get("TOOLCHAIN_PROBE_CACHE") or project_root / CACHE_FILE)
+    current = fingerprint(project_root)
+
+    result = None
+    if not force:
+        try:
+            stored = json.loads(cache_path.read_text(encoding="utf-8"))
+            if stored.get("fingerprint") == current:
+                result = {**stored, "cached": True}
+        except (OSError, ValueError):
+            pass
+
+    if result is None:
+        result = {**run_probe(project_root), "fingerprint": current, "probed_at": time.time()}
+        try:
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(result, indent=2), encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # read-only checkout: probe every time
+        result = {**result, "cached": False}
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent.parent)
+    parser.add_argument("--force", action="store_true", help="ignore the stored result")
+    args = parser.parse_args(argv)
+    print(json.dumps(probe_toolchain(args.root, force=args.force), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())